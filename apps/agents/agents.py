@@ -17,24 +17,42 @@ a chat between collaborative agents.
 """
 
 import argparse
+import asyncio
 import os
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import gradio as gr
 import openai
 
+from apps.agents.session_manager import SessionBusyError, SessionManager
 from apps.agents.text_utils import split_markdown_code
 from camel.agents import TaskSpecifyAgent
+from camel.configs import ChatGPTConfig
 from camel.messages import BaseMessage
+from camel.responses import ChatAgentResponse
 from camel.societies import RolePlaying
-from camel.types import TaskType
+from camel.types import RoleType, TaskType
 
 REPO_ROOT = os.path.realpath(
     os.path.join(os.path.dirname(os.path.abspath(__file__)), "../.."))
 
 ChatBotHistory = List[Tuple[Optional[str], Optional[str]]]
+ChatOutputs = Tuple['State', str, Dict, ChatBotHistory, Dict, Dict]
+
+# Minimal interval in seconds between two updates of the chatbot while the
+# tokens of a message are streamed
+STREAM_UPDATE_INTERVAL = 0.1
 
 
 @dataclass
@@ -71,9 +89,18 @@ def parse_arguments():
     parser.add_argument('--inbrowser', type=bool, default=False,
                         help='Open the web UI in the default browser on lunch')
     parser.add_argument(
-        '--concurrency-count', type=int, default=1,
-        help='Number if concurrent threads at Gradio websocket queue. ' +
+        '--concurrency-count', type=int, default=64,
+        help='Number if concurrent events at Gradio websocket queue. ' +
+        'The sessions run on an async backend, so it can be larger ' +
+        'than the number of concurrent sessions.')
+    parser.add_argument(
+        '--max-sessions', type=int, default=8,
+        help='Number of role playing sessions running at once. ' +
         'Increase to serve more requests but keep an eye on RAM usage.')
+    parser.add_argument(
+        '--max-waiting-sessions', type=int, default=32,
+        help='Number of sessions waiting for a running one to finish, ' +
+        'beyond which new sessions are rejected.')
     args, unknown = parser.parse_known_args()
     if len(unknown) > 0:
         print("Unknown args: ", unknown)
@@ -116,7 +143,7 @@ def cleanup_on_launch(state) -> Tuple[State, ChatBotHistory, Dict]:
             - Chatbot window contents.
             - Start button state (disabled).
     """
-    # The line below breaks the every=N runner
+    # The line below breaks the running session which holds the state
     # `state = State.empty()`
 
     State.construct_inplace(state, None, 0, [], None)
@@ -193,13 +220,17 @@ def role_playing_start(
             extend_sys_msg_meta_dicts=extend_sys_msg_meta_dicts,
             extend_task_specify_meta_dict=meta_dict,
             output_language=language,
+            # Stream the tokens of the agents to the chatbot
+            assistant_agent_kwargs=dict(model_config=ChatGPTConfig(
+                stream=True)),
+            user_agent_kwargs=dict(model_config=ChatGPTConfig(stream=True)),
         )
     except (openai.RateLimitError, RuntimeError) as ex:
         print("OpenAI API exception 0 " + str(ex))
         return (state, str(ex), "", [], gr.update())
 
     # Can't re-create a state like below since it
-    # breaks 'role_playing_chat_cont' runner with every=N.
+    # breaks 'role_playing_chat' which holds the state.
     # `state = State(session=session, max_messages=int(max_messages), chat=[],`
     # `             saved_assistant_msg=None)`
 
@@ -221,77 +252,55 @@ def role_playing_start(
             progress_update)
 
 
-def role_playing_chat_init(state) -> \
-        Union[Dict, Tuple[State, ChatBotHistory, Dict]]:
-    """ Initialize role playing.
+def role_playing_step(
+    emit: Callable[[Tuple[RoleType, str]], None],
+    session: RolePlaying,
+    assistant_msg: BaseMessage,
+) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
+    """ Produce a pair of messages by a user and an assistant,
+        emitting their tokens as they are generated.
 
     Args:
-        state (State): Role playing state.
+        emit (Callable[[Tuple[RoleType, str]], None]): Function called
+            with the role type of the agent and each token.
+        session (RolePlaying): Role playing session.
+        assistant_msg (BaseMessage): The last message of the assistant.
 
     Returns:
-        Union[Dict, Tuple[State, ChatBotHistory, Dict]]:
-            - Updated state.
-            - Chatbot window contents.
-            - Progress bar contents.
+        Tuple[ChatAgentResponse, ChatAgentResponse]: The responses of the
+        assistant and the user.
     """
 
-    if state.session is None:
-        print("Error: session is none on role_playing_chat_init call")
-        return state, state.chat, gr.update()
-
-    session: RolePlaying = state.session
+    def stream_callback(role_type: RoleType, index: int, content: str):
+        if index == 0:
+            emit((role_type, content))
 
+    session.user_agent.stream_callback = \
+        lambda index, content: stream_callback(RoleType.USER, index, content)
+    session.assistant_agent.stream_callback = \
+        lambda index, content: stream_callback(
+            RoleType.ASSISTANT, index, content)
     try:
-        init_assistant_msg: BaseMessage
-        init_assistant_msg, _ = session.init_chat()
-    except (openai.RateLimitError, RuntimeError) as ex:
-        print("OpenAI API exception 1 " + str(ex))
-        state.session = None
-        return state, state.chat, gr.update()
+        return session.step(assistant_msg)
+    finally:
+        session.user_agent.stream_callback = None
+        session.assistant_agent.stream_callback = None
 
-    state.saved_assistant_msg = init_assistant_msg
 
-    progress_update = gr.update(maximum=state.max_messages, value=1,
-                                visible=True)
-
-    return state, state.chat, progress_update
-
-
-# WORKAROUND: do not add type hints for session and chatbot_history
-def role_playing_chat_cont(state) -> \
-        Tuple[State, ChatBotHistory, Dict, Dict]:
-    """ Produce a pair of messages by an assistant and a user.
-        To be run multiple times.
+def record_step(state, assistant_response: ChatAgentResponse,
+                user_response: ChatAgentResponse) -> None:
+    """ Add the messages of a step to the chat and end the session
+        when it is over.
 
     Args:
         state (State): Role playing state.
-
-    Returns:
-        Union[Dict, Tuple[State, ChatBotHistory, Dict]]:
-            - Updated state.
-            - Chatbot window contents.
-            - Progress bar contents.
-            - Start button state (to be eventually enabled).
+        assistant_response (ChatAgentResponse): Response of the assistant.
+        user_response (ChatAgentResponse): Response of the user.
     """
 
-    if state.session is None:
-        return state, state.chat, gr.update(visible=False), gr.update()
-
-    session: RolePlaying = state.session
-
-    if state.saved_assistant_msg is None:
-        return state, state.chat, gr.update(), gr.update()
-
-    try:
-        assistant_response, user_response = session.step(
-            state.saved_assistant_msg)
-    except (openai.RateLimitError, RuntimeError) as ex:
-        print("OpenAI API exception 2 " + str(ex))
-        state.session = None
-        return state, state.chat, gr.update(), gr.update()
-
     if len(user_response.msgs) != 1 or len(assistant_response.msgs) != 1:
-        return state, state.chat, gr.update(), gr.update()
+        state.session = None
+        return
 
     u_msg = user_response.msg
     a_msg = assistant_response.msg
@@ -308,13 +317,142 @@ def role_playing_chat_cont(state) -> \
             "CAMEL_TASK_DONE" in u_msg.content:
         state.session = None
 
-    progress_update = gr.update(maximum=state.max_messages,
-                                value=len(state.chat), visible=state.session
-                                is not None)
 
+def chat_outputs(state, chat: Optional[ChatBotHistory] = None,
+                 specified_task: Any = None,
+                 planned_task_upd: Optional[Dict] = None) -> ChatOutputs:
+    """ Build the updates of the UI elements during a session.
+
+    Args:
+        state (State): Role playing state.
+        chat (Optional[ChatBotHistory]): Chatbot window contents, if
+            different from the chat of the state.
+        specified_task (Any): New specified task, if any.
+        planned_task_upd (Optional[Dict]): Planned task update, if any.
+
+    Returns:
+        ChatOutputs:
+            - Updated state.
+            - Specified task contents.
+            - Planned task contents.
+            - Chatbot window contents.
+            - Progress bar contents.
+            - Start button state (to be eventually enabled).
+    """
+
+    chat = state.chat if chat is None else chat
+    progress_update = gr.update(maximum=state.max_messages,
+                                value=max(len(state.chat), 1),
+                                visible=state.session is not None)
     start_bn_update = gr.update(interactive=state.session is None)
+    if specified_task is None:
+        specified_task = gr.update()
+    if planned_task_upd is None:
+        planned_task_upd = gr.update()
+    return (state, specified_task, planned_task_upd, chat, progress_update,
+            start_bn_update)
 
-    return state, state.chat, progress_update, start_bn_update
+
+async def role_playing_chat(
+    session_manager: SessionManager,
+    state,
+    society_name: str,
+    assistant: str,
+    user: str,
+    original_task: str,
+    max_messages: float,
+    with_task_specifier: bool,
+    word_limit: int,
+    language: str,
+) -> AsyncIterator[ChatOutputs]:
+    """ Run a role playing session, streaming the messages of the agents
+        to the chatbot as they are generated. The blocking calls run in
+        the threads of the session manager, so the session does not
+        hold a Gradio worker.
+
+    Args:
+        session_manager (SessionManager): Manager running the sessions.
+        state (State): Role playing state.
+        society_name: Name of the society.
+        assistant (str): Contents of the Assistant field.
+        user (str): Contents of the User field.
+        original_task (str): Original task field.
+        max_messages (float): Number of messages to generate.
+        with_task_specifier (bool): Enable/Disable task specifier.
+        word_limit (int): Limit of words for task specifier.
+        language (str): Language of the agents.
+
+    Yields:
+        ChatOutputs: Updates of the UI elements.
+    """
+
+    if session_manager.num_running >= session_manager.max_sessions:
+        yield chat_outputs(state, [],
+                           "Waiting for other sessions to finish...")
+    try:
+        async with session_manager.session():
+            start = await session_manager.run(role_playing_start, state,
+                                              society_name, assistant, user,
+                                              original_task, max_messages,
+                                              with_task_specifier, word_limit,
+                                              language)
+            if not isinstance(start, tuple):
+                return  # Double click or unknown society
+            _, specified_task, planned_task_upd, _, _ = start
+            yield chat_outputs(state, specified_task=specified_task,
+                               planned_task_upd=planned_task_upd)
+
+            session: Optional[RolePlaying] = state.session
+            if session is None:
+                return
+            try:
+                init_assistant_msg, _ = await session_manager.run(
+                    session.init_chat)
+            except (openai.RateLimitError, RuntimeError) as ex:
+                print("OpenAI API exception 1 " + str(ex))
+                state.session = None
+                yield chat_outputs(state)
+                return
+            state.saved_assistant_msg = init_assistant_msg
+
+            loop = asyncio.get_running_loop()
+            while state.session is session:
+                contents = {RoleType.USER: "", RoleType.ASSISTANT: ""}
+                last_update = loop.time()
+                # Leaving the block early, e.g. when stopped by the user or
+                # disconnected, aborts the step and waits for its thread
+                call = session_manager.stream(role_playing_step, session,
+                                              state.saved_assistant_msg)
+                async with call:
+                    async for role_type, content in call:
+                        if state.session is not session:
+                            break  # Stopped by the user
+                        contents[role_type] += content
+                        if (loop.time() - last_update <
+                                STREAM_UPDATE_INTERVAL):
+                            continue
+                        last_update = loop.time()
+                        chat = state.chat + [
+                            (None, split_markdown_code(
+                                contents[RoleType.USER]))
+                        ]
+                        if contents[RoleType.ASSISTANT]:
+                            chat.append((split_markdown_code(
+                                contents[RoleType.ASSISTANT]), None))
+                        yield chat_outputs(state, chat)
+                if state.session is not session:
+                    break
+                try:
+                    assistant_response, user_response = await call.result()
+                except (openai.RateLimitError, RuntimeError) as ex:
+                    print("OpenAI API exception 2 " + str(ex))
+                    state.session = None
+                    break
+                record_step(state, assistant_response, user_response)
+                yield chat_outputs(state)
+            yield chat_outputs(state)
+    except SessionBusyError as ex:
+        yield chat_outputs(state, [], str(ex))
 
 
 def stop_session(state) -> Tuple[State, Dict, Dict]:
@@ -334,11 +472,14 @@ def stop_session(state) -> Tuple[State, Dict, Dict]:
     return state, gr.update(visible=False), gr.update(interactive=True)
 
 
-def construct_ui(blocks, api_key: Optional[str] = None) -> None:
+def construct_ui(blocks, api_key: Optional[str] = None,
+                 session_manager: Optional[SessionManager] = None) -> None:
     """ Build Gradio UI and populate with topics.
 
     Args:
         api_key (str): OpenAI API key.
+        session_manager (Optional[SessionManager]): Manager running the
+            role playing sessions. If None, a default one is created.
 
     Returns:
         None
@@ -347,6 +488,9 @@ def construct_ui(blocks, api_key: Optional[str] = None) -> None:
     if api_key is not None:
         openai.api_key = api_key
 
+    if session_manager is None:
+        session_manager = SessionManager()
+
     society_dict: Dict[str, Dict[str, Any]] = {}
     for society_name in ("AI Society", "Code"):
         if society_name == "AI Society":
@@ -463,20 +607,18 @@ def construct_ui(blocks, api_key: Optional[str] = None) -> None:
     task_specifier_cb.change(lambda v: gr.update(visible=v), task_specifier_cb,
                              ts_word_limit_nb)
 
+    async def run_chat(*args) -> AsyncIterator[ChatOutputs]:
+        async for outputs in role_playing_chat(session_manager, *args):
+            yield outputs
+
     start_bn.click(cleanup_on_launch, session_state,
                    [session_state, chatbot, start_bn], queue=False) \
-            .then(role_playing_start,
+            .then(run_chat,
                   [session_state, society_dd, assistant_ta, user_ta,
                    original_task_ta, num_messages_sl,
                    task_specifier_cb, ts_word_limit_nb, language_ta],
                   [session_state, specified_task_ta, task_prompt_ta,
-                   chatbot, progress_sl],
-                  queue=False) \
-            .then(role_playing_chat_init, session_state,
-                  [session_state, chatbot, progress_sl], queue=False)
-
-    blocks.load(role_playing_chat_cont, session_state,
-                [session_state, chatbot, progress_sl, start_bn], every=0.5)
+                   chatbot, progress_sl, start_bn])
 
     clear_bn.click(stop_session, session_state,
                    [session_state, progress_sl, start_bn])
@@ -492,11 +634,14 @@ def construct_ui(blocks, api_key: Optional[str] = None) -> None:
     blocks.load(lambda dd: dd, user_dd, user_ta)
 
 
-def construct_blocks(api_key: Optional[str]):
+def construct_blocks(api_key: Optional[str],
+                     session_manager: Optional[SessionManager] = None):
     """ Construct Agents app but do not launch it.
 
     Args:
         api_key (Optional[str]): OpenAI API key.
+        session_manager (Optional[SessionManager]): Manager running the
+            role playing sessions. If None, a default one is created.
 
     Returns:
         gr.Blocks: Blocks instance.
@@ -505,7 +650,7 @@ def construct_blocks(api_key: Optional[str]):
     css_str = "#start_button {border: 3px solid #4CAF50; font-size: 20px;}"
 
     with gr.Blocks(css=css_str) as blocks:
-        construct_ui(blocks, api_key)
+        construct_ui(blocks, api_key, session_manager)
 
     return blocks
 
@@ -517,7 +662,9 @@ def main():
 
     print("Getting Agents web server online...")
 
-    blocks = construct_blocks(args.api_key)
+    session_manager = SessionManager(args.max_sessions,
+                                     args.max_waiting_sessions)
+    blocks = construct_blocks(args.api_key, session_manager)
 
     blocks.queue(args.concurrency_count) \
           .launch(share=args.share, inbrowser=args.inbrowser,
@@ -0,0 +1,185 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+"""
+Async backend running the blocking role-playing calls of the web app
+sessions in worker threads, with a bounded number of concurrent sessions.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Optional
+
+# Marks the end of the items of a `StreamingCall`
+_DONE = object()
+
+
+class SessionBusyError(RuntimeError):
+    """ Raised when too many sessions are already waiting to start. """
+
+
+class StreamCancelled(Exception):
+    """ Raised by `emit` in the thread of a cancelled `StreamingCall`. """
+
+
+class StreamingCall:
+    """ A blocking function running in a worker thread, whose emitted
+        items are consumed asynchronously while it runs. Used as an async
+        context manager, it is cancelled when the consumer stops early, and
+        the exit waits for the thread to be free.
+
+    Args:
+        executor (ThreadPoolExecutor): The pool running the function.
+        func (Callable[..., Any]): The function, called with a thread-safe
+            `emit` function as first argument followed by `args`.
+        *args: The other arguments of the function.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, func: Callable[..., Any],
+                 *args: Any) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._cancelled = threading.Event()
+        self.future = self._loop.run_in_executor(
+            executor, partial(func, self.emit, *args))
+        # Queued after the items emitted before the function returned
+        self.future.add_done_callback(lambda _: self._queue.put_nowait(_DONE))
+
+    async def __aenter__(self) -> "StreamingCall":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        if not self.future.done():
+            self.cancel()
+        # The thread is only free once the function returns
+        await asyncio.wait([self.future])
+
+    def emit(self, item: Any) -> None:
+        """ Sends an item to the consumer, from any thread.
+
+        Args:
+            item (Any): The item.
+
+        Raises:
+            StreamCancelled: If the call is cancelled, to abort the function.
+        """
+        if self._cancelled.is_set():
+            raise StreamCancelled()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+    def cancel(self) -> None:
+        """ Cancels the call: the next `emit` of the function raises. """
+        self._cancelled.set()
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        while True:
+            item = await self._queue.get()
+            if item is _DONE:
+                return
+            yield item
+
+    async def result(self) -> Any:
+        """ Waits for the function to return.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        return await self.future
+
+
+class SessionManager:
+    """ Runs the sessions of the web app on the event loop, with their
+        blocking calls in a thread pool. At most `max_sessions` sessions
+        run at once, the next ones wait for a slot in arrival order, and
+        new sessions are rejected when `max_waiting` sessions are waiting.
+
+    Args:
+        max_sessions (int): The number of sessions running at once.
+        max_waiting (int): The number of sessions waiting for a slot.
+    """
+
+    def __init__(self, max_sessions: int = 8, max_waiting: int = 32) -> None:
+        if max_sessions <= 0:
+            raise ValueError("`max_sessions` should be larger than 0.")
+        self.max_sessions = max_sessions
+        self.max_waiting = max_waiting
+        self.num_running = 0
+        self.num_waiting = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_sessions, thread_name_prefix="agents-session")
+        # Created in the event loop of the app
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        """ Waits for a slot and holds it for the duration of a session.
+
+        Raises:
+            SessionBusyError: If too many sessions are waiting.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_sessions)
+        if self._semaphore.locked() and self.num_waiting >= self.max_waiting:
+            raise SessionBusyError(
+                "Too many sessions are running, please try again later.")
+        self.num_waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.num_waiting -= 1
+        self.num_running += 1
+        try:
+            yield
+        finally:
+            self.num_running -= 1
+            self._semaphore.release()
+
+    def stream(self, func: Callable[..., Any], *args: Any) -> StreamingCall:
+        """ Starts a blocking function in the thread pool.
+
+        Args:
+            func (Callable[..., Any]): The function, called with a
+                thread-safe `emit` function as first argument followed
+                by `args`.
+            *args: The other arguments of the function.
+
+        Returns:
+            StreamingCall: The call, yielding the emitted items. Use it in
+            an `async with` block within the session, so that the session
+            holds its slot until the thread is free.
+        """
+        return StreamingCall(self._executor, func, *args)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """ Runs a blocking function in the thread pool. If the caller is
+            cancelled, it still waits for the function to return, so that
+            the session holds its slot until the thread is free.
+
+        Args:
+            func (Callable[..., Any]): The function.
+            *args: The arguments of the function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, partial(func, *args))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Hold the slot of the session until the thread is free
+            await asyncio.wait([future])
+            raise
@@ -11,6 +11,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import asyncio
+
 import gradio as gr
 import pytest
 
@@ -19,11 +21,10 @@ from apps.agents.agents import (
     cleanup_on_launch,
     construct_blocks,
     parse_arguments,
-    role_playing_chat_cont,
-    role_playing_chat_init,
-    role_playing_start,
+    role_playing_chat,
     stop_session,
 )
+from apps.agents.session_manager import SessionManager
 
 
 def test_construct_blocks():
@@ -58,22 +59,24 @@ def test_session():
         with_task_specifier = False
         word_limit = 50
         language = "English"
-        state, specified_task_prompt, planned_task_upd, chat, progress_upd = \
-            role_playing_start(state, society_name, assistant, user,
-                               original_task, max_messages,
-                               with_task_specifier, word_limit, language)
-
-        assert state.session is not None
-
-        state, chat, progress_update = \
-            role_playing_chat_init(state)
-
-        assert state.session is not None
-
-        for _ in range(5):
-            state, chat, progress_update, start_bn_update =\
-                role_playing_chat_cont(state)
-
-        state, _, _ = stop_session(state)
-
+        session_manager = SessionManager(max_sessions=1)
+
+        async def run_session():
+            num_updates = 0
+            async for outputs in role_playing_chat(session_manager, state,
+                                                   society_name, assistant,
+                                                   user, original_task,
+                                                   max_messages,
+                                                   with_task_specifier,
+                                                   word_limit, language):
+                assert outputs[0] is state
+                num_updates += 1
+                if len(state.chat) >= 4:
+                    stop_session(state)
+            return num_updates
+
+        num_updates = asyncio.run(run_session())
+
+        assert num_updates > 0
+        assert len(state.chat) >= 2
         assert state.session is None
@@ -0,0 +1,164 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import asyncio
+import threading
+
+import pytest
+
+from apps.agents.session_manager import (
+    SessionBusyError,
+    SessionManager,
+    StreamCancelled,
+)
+
+
+def test_stream_yields_emitted_items_in_order():
+
+    def count(emit, num_items):
+        for i in range(num_items):
+            emit(i)
+        return "done"
+
+    async def run():
+        call = SessionManager().stream(count, 100)
+        items = [item async for item in call]
+        return items, await call.result()
+
+    items, result = asyncio.run(run())
+    assert items == list(range(100))
+    assert result == "done"
+
+
+def test_stream_raises_exception_of_function():
+
+    def fail(emit):
+        emit("token")
+        raise RuntimeError("failed")
+
+    async def run():
+        call = SessionManager().stream(fail)
+        items = [item async for item in call]
+        assert items == ["token"]
+        await call.result()
+
+    with pytest.raises(RuntimeError, match="failed"):
+        asyncio.run(run())
+
+
+def test_sessions_are_limited():
+    manager = SessionManager(max_sessions=2)
+    lock = threading.Lock()
+    num_active = 0
+    max_active = 0
+
+    def work():
+        nonlocal num_active, max_active
+        with lock:
+            num_active += 1
+            max_active = max(max_active, num_active)
+        threading.Event().wait(0.02)
+        with lock:
+            num_active -= 1
+
+    async def session():
+        async with manager.session():
+            await manager.run(work)
+
+    async def run():
+        await asyncio.gather(*(session() for _ in range(6)))
+
+    asyncio.run(run())
+    assert max_active == 2
+    assert manager.num_running == 0
+    assert manager.num_waiting == 0
+
+
+def test_too_many_waiting_sessions_are_rejected():
+    manager = SessionManager(max_sessions=1, max_waiting=1)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def session():
+            async with manager.session():
+                await release.wait()
+
+        tasks = [asyncio.create_task(session()) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert manager.num_running == 1
+        assert manager.num_waiting == 1
+        with pytest.raises(SessionBusyError):
+            async with manager.session():
+                pass
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert manager.num_running == 0
+
+
+def test_leaving_stream_early_aborts_function():
+    emitted = []
+
+    def count(emit):
+        for i in range(1000):
+            emit(i)
+            emitted.append(i)
+            threading.Event().wait(0.001)
+        return "done"
+
+    async def run():
+        manager = SessionManager()
+        async with manager.stream(count) as call:
+            async for item in call:
+                if item == 3:
+                    break
+        # The function is aborted and done once the block exits
+        assert call.future.done()
+        with pytest.raises(StreamCancelled):
+            await call.result()
+
+    asyncio.run(run())
+    assert len(emitted) < 1000
+
+
+def test_session_slot_is_held_until_thread_is_free():
+    manager = SessionManager(max_sessions=1)
+    release = threading.Event()
+    order = []
+
+    def block():
+        release.wait(10)
+        order.append("first done")
+
+    async def first():
+        async with manager.session():
+            task = asyncio.create_task(manager.run(block))
+            await asyncio.sleep(0.05)
+            # E.g. the user disconnected
+            task.cancel()
+            threading.Timer(0.1, release.set).start()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    async def second():
+        await asyncio.sleep(0.01)
+        async with manager.session():
+            order.append("second started")
+
+    async def run():
+        await asyncio.gather(first(), second())
+
+    asyncio.run(run())
+    assert order == ["first done", "second started"]
@@ -11,17 +11,83 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import fnmatch
 import json
 import os
 import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import Any, Callable, Deque, Iterator, List, Optional, Tuple
+
+MemberPredicate = Callable[[zipfile.ZipInfo], bool]
+MemberTransform = Callable[[Any], Any]
+
+# The zip file opened once by each worker process of `AutoZip.iter_members`
+_worker_zip: Optional[zipfile.ZipFile] = None
+
+
+def _open_worker_zip(zip_path: str) -> None:
+    global _worker_zip
+    _worker_zip = zipfile.ZipFile(zip_path, "r")
+
+
+def _read_members(
+    zip_file: zipfile.ZipFile,
+    names: List[str],
+    parse_json: bool,
+    transform: Optional[MemberTransform],
+) -> List[Tuple[str, Any]]:
+    results = []
+    for name in names:
+        with zip_file.open(name) as f:
+            value: Any = f.read().decode("utf-8")
+        if parse_json:
+            value = json.loads(value)
+        if transform is not None:
+            value = transform(value)
+        results.append((name, value))
+    return results
+
+
+def _read_worker_members(
+    names: List[str],
+    parse_json: bool,
+    transform: Optional[MemberTransform],
+) -> List[Tuple[str, Any]]:
+    assert _worker_zip is not None
+    return _read_members(_worker_zip, names, parse_json, transform)
 
 
 class AutoZip:
+    """ Reads the members of a zip file.
+
+    Args:
+        zip_path (str): path to the ZIP file.
+        ext (str): Extension of the members to read.
+        pattern (Optional[str]): Glob pattern the names of the
+            members to read must match, e.g. "ai_society/*.json".
+        predicate (Optional[MemberPredicate]): Function telling from
+            its ZipInfo whether to read a member. The members are
+            filtered before being decompressed.
+    """
 
-    def __init__(self, zip_path: str, ext: str = ".json"):
+    def __init__(self, zip_path: str, ext: str = ".json",
+                 pattern: Optional[str] = None,
+                 predicate: Optional[MemberPredicate] = None):
         self.zip_path = zip_path
+        self.ext = ext
         self.zip = zipfile.ZipFile(zip_path, "r")
-        self.fl = [f for f in self.zip.filelist if f.filename.endswith(ext)]
+        self.fl = []
+        for f in self.zip.filelist:
+            if not f.filename.endswith(ext):
+                continue
+            if pattern is not None and not fnmatch.fnmatchcase(
+                    f.filename, pattern):
+                continue
+            if predicate is not None and not predicate(f):
+                continue
+            self.fl.append(f)
 
     def __next__(self):
         if self.index >= len(self.fl):
@@ -51,3 +117,80 @@ class AutoZip:
                 key = finfo.filename
             d[key] = raw_text
         return d
+
+    def iter_members(
+        self,
+        num_workers: Optional[int] = None,
+        ordered: bool = True,
+        parse_json: Optional[bool] = None,
+        transform: Optional[MemberTransform] = None,
+        batch_size: int = 16,
+    ) -> Iterator[Tuple[str, Any]]:
+        """ Decompresses and parses the members in a pool of processes,
+            streaming the results. At most two batches per worker are
+            read ahead of the consumer.
+
+        Args:
+            num_workers (Optional[int]): The number of processes. If None,
+                the number of CPUs. If 1, the members are read in the
+                calling process.
+            ordered (bool): Whether to yield the members in the order of
+                the archive, otherwise as soon as they are read.
+            parse_json (Optional[bool]): Whether to parse the members as
+                JSON, otherwise yield their text. If None, they are parsed
+                if the extension is ".json".
+            transform (Optional[MemberTransform]): Function applied to
+                each parsed member in the worker, e.g. to extract the
+                needed fields and send less data back. It must be
+                picklable, e.g. defined at the top level of a module.
+            batch_size (int): The number of members read by a worker
+                per task.
+
+        Yields:
+            Tuple[str, Any]: The name of a member and its parsed
+            (and transformed) contents.
+        """
+
+        if parse_json is None:
+            parse_json = self.ext == ".json"
+        names = [finfo.filename for finfo in self.fl]
+        batches = [
+            names[i:i + batch_size] for i in range(0, len(names), batch_size)
+        ]
+        num_workers = min(num_workers or os.cpu_count() or 1, len(batches))
+        if num_workers <= 1:
+            for batch in batches:
+                yield from _read_members(self.zip, batch, parse_json,
+                                         transform)
+            return
+
+        executor = ProcessPoolExecutor(max_workers=num_workers,
+                                       initializer=_open_worker_zip,
+                                       initargs=(self.zip_path, ))
+        pending_batches: Iterator[List[str]] = iter(batches)
+        pending: Deque[Future] = deque()
+        try:
+            while True:
+                while len(pending) < 2 * num_workers:
+                    next_batch: Optional[List[str]] = next(
+                        pending_batches, None)
+                    if next_batch is None:
+                        break
+                    pending.append(
+                        executor.submit(_read_worker_members, next_batch,
+                                        parse_json, transform))
+                if len(pending) == 0:
+                    break
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait_futures(pending,
+                                           return_when=FIRST_COMPLETED)
+                    future = done.pop()
+                    pending.remove(future)
+                yield from future.result()
+        finally:
+            # The consumer may stop early
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
@@ -11,7 +11,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import json
 import os
+import zipfile
+
+import pytest
 
 from apps.common.auto_zip import AutoZip
 
@@ -30,3 +34,56 @@ def test_dict():
     d = zp.as_dict(include_zip_name=True)
     assert isinstance(d, dict)
     assert len(d) == 3
+
+
+def _get_id(chat):
+    return chat["id"]
+
+
+@pytest.fixture
+def json_zip_path(tmp_path):
+    path = str(tmp_path / "chats.zip")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for i in range(50):
+            folder = "code" if i % 2 else "society"
+            zip_file.writestr(f"{folder}/{i:03d}.json",
+                              json.dumps(dict(id=i, text="text " * i)))
+        zip_file.writestr("readme.txt", "not a chat")
+    return path
+
+
+@pytest.mark.parametrize("num_workers", [1, 3])
+def test_iter_members_ordered(json_zip_path, num_workers):
+    zp = AutoZip(json_zip_path)
+    members = list(zp.iter_members(num_workers=num_workers, batch_size=4))
+    assert [name for name, _ in members] == [f.filename for f in zp.fl]
+    assert [chat for _, chat in members] == list(iter(zp))
+
+
+def test_iter_members_unordered(json_zip_path):
+    zp = AutoZip(json_zip_path)
+    members = zp.iter_members(num_workers=3, ordered=False, batch_size=4,
+                              transform=_get_id)
+    assert sorted(chat_id for _, chat_id in members) == list(range(50))
+
+
+def test_iter_members_stop_early(json_zip_path):
+    zp = AutoZip(json_zip_path)
+    members = zp.iter_members(num_workers=2, batch_size=1)
+    assert next(members)[0] == "society/000.json"
+    members.close()
+
+
+def test_member_filters(json_zip_path):
+    zp = AutoZip(json_zip_path, pattern="code/*")
+    assert len(zp) == 25
+    zp = AutoZip(json_zip_path,
+                 predicate=lambda info: info.filename.endswith("7.json"))
+    names = [name for name, _ in zp.iter_members(num_workers=1)]
+    assert names == [f"code/{i:03d}.json" for i in range(7, 50, 10)]
+
+
+def test_iter_members_text():
+    path = os.path.join(REPO_ROOT, "apps/common/test/test_archive_1.zip")
+    zp = AutoZip(path, ".txt")
+    assert dict(zp.iter_members(num_workers=2, batch_size=1)) == zp.as_dict()
@@ -21,7 +21,7 @@ from typing import Dict, List, Optional, Tuple
 
 import gradio as gr
 
-from apps.data_explorer.loader import Datasets, load_datasets
+from apps.data_explorer.loader import ChatIndex, load_dataset_indexes
 
 
 def parse_arguments():
@@ -52,14 +52,14 @@ def parse_arguments():
     return args
 
 
-def construct_ui(blocks, datasets: Datasets,
+def construct_ui(blocks, datasets: Dict[str, ChatIndex],
                  default_dataset: Optional[str] = None):
     """ Build Gradio UI and populate with chat data from JSONs.
 
     Args:
         blocks: Gradio blocks
-        datasets (Datasets): Several parsed
-        multi-JSON dataset with chats.
+        datasets (Dict[str, ChatIndex]): Several indexed
+        multi-JSON dataset with chats, loaded when selected.
         default_dataset (str): Default selection of the dataset.
 
     Returns:
@@ -186,8 +186,8 @@ def construct_ui(blocks, datasets: Datasets,
                               choices=[]), gr.update(value="N/A", choices=[]))
 
         dataset = datasets[dataset_name]
-        assistant_roles = dataset['assistant_roles']
-        user_roles = dataset['user_roles']
+        assistant_roles = dataset.assistant_roles
+        user_roles = dataset.user_roles
         assistant_role = random.choice(assistant_roles) \
             if len(assistant_roles) > 0 else ""
         user_role = random.choice(user_roles) if len(user_roles) > 0 else ""
@@ -205,14 +205,12 @@ def construct_ui(blocks, datasets: Datasets,
         Returns:
             Dict: New original roles state dictionary.
         """
-        matrix = datasets[dataset_name]['matrix']
-        if (assistant_role, user_role) in matrix:
-            record: Dict[str, Dict] = matrix[(assistant_role, user_role)]
-            original_task_options = list(record.keys())
+        original_task_options = datasets[dataset_name].tasks(
+            assistant_role, user_role)
+        if len(original_task_options) > 0:
             original_task = original_task_options[0]
         else:
             original_task = "N/A"
-            original_task_options = []
 
         choices = gr.Dropdown.update(choices=original_task_options,
                                      value=original_task, interactive=True)
@@ -260,16 +258,11 @@ def construct_ui(blocks, datasets: Datasets,
             and chatbot history UI elements.
         """
 
-        matrix = datasets[dataset_name]['matrix']
-        if (assistant_role, user_role) in matrix:
-            task_dict: Dict[str, Dict] = matrix[(assistant_role, user_role)]
-            if original_task in task_dict:
-                chat = task_dict[original_task]
-                specified_task = chat['specified_task']
-                history = build_chat_history(chat['messages'])
-            else:
-                specified_task = "N/A"
-                history = []
+        chat = datasets[dataset_name].load_chat(assistant_role, user_role,
+                                                original_task)
+        if chat is not None:
+            specified_task = chat['specified_task']
+            history = build_chat_history(chat['messages'])
         else:
             specified_task = "N/A"
             history = []
@@ -319,9 +312,9 @@ def construct_blocks(data_path: str, default_dataset: Optional[str]):
         gr.Blocks: Blocks instance.
     """
 
-    print("Loading the dataset...")
-    datasets = load_datasets(data_path)
-    print("Dataset is loaded")
+    print("Loading the dataset index...")
+    datasets = load_dataset_indexes(data_path)
+    print("Dataset index is loaded")
 
     print("Getting Data Explorer web server online...")
 
@@ -16,9 +16,13 @@ Everything related to parsing the data JSONs into UI-compatible format.
 """
 
 import glob
+import json
 import os
 import re
-from typing import Any, Dict, Optional, Tuple, Union
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from tqdm import tqdm
 
@@ -28,21 +32,30 @@ ChatHistory = Dict[str, Any]
 ParsedChatHistory = Dict[str, Any]
 AllChats = Dict[str, Any]
 Datasets = Dict[str, AllChats]
+ChatHeader = Tuple[str, str, str, str]
+ZipIndex = Dict[str, Any]
 
 REPO_ROOT = os.path.realpath(
     os.path.join(os.path.dirname(os.path.abspath(__file__)), "../.."))
 
+# Bumped when the format of the cached indexes changes
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".index.json"
 
-def parse(raw_chat: ChatHistory) -> Union[ParsedChatHistory, None]:
-    """ Gets the JSON raw chat data, validates it and transforms
-        into an easy to work with form.
+MESSAGE_KEY_PATTERN = re.compile("message_(?P<number>[0-9]+)")
+
+
+def parse_header(raw_chat: ChatHistory) -> Optional[ChatHeader]:
+    """ Validates the JSON raw chat data and extracts its roles and tasks,
+        without going through its messages.
 
     Args:
         raw_chat (ChatHistory): In-memory loaded JSON data file.
 
     Returns:
-        Union[ParsedChatHistory, None]: Parsed chat data or None
-        if there were parsing errors.
+        Optional[ChatHeader]: The assistant role, the user role, the
+        original task and the specified task, or None if there were
+        parsing errors.
     """
 
     if "role_1" not in raw_chat:
@@ -76,9 +89,29 @@ def parse(raw_chat: ChatHistory) -> Union[ParsedChatHistory, None]:
     if len(specified_task) <= 0:
         return None
 
+    return assistant_role, user_role, original_task, specified_task
+
+
+def parse(raw_chat: ChatHistory) -> Union[ParsedChatHistory, None]:
+    """ Gets the JSON raw chat data, validates it and transforms
+        into an easy to work with form.
+
+    Args:
+        raw_chat (ChatHistory): In-memory loaded JSON data file.
+
+    Returns:
+        Union[ParsedChatHistory, None]: Parsed chat data or None
+        if there were parsing errors.
+    """
+
+    header = parse_header(raw_chat)
+    if header is None:
+        return None
+    assistant_role, user_role, original_task, specified_task = header
+
     messages = dict()
     for key in raw_chat:
-        match = re.search("message_(?P<number>[0-9]+)", key)
+        match = MESSAGE_KEY_PATTERN.search(key)
         if match:
             number = int(match.group("number"))
             messages[number] = raw_chat[key]
@@ -105,8 +138,8 @@ def load_zip(zip_path: str) -> AllChats:
 
     zip_inst = AutoZip(zip_path)
     parsed_list = []
-    for raw_chat in tqdm(iter(zip_inst)):
-        parsed = parse(raw_chat)
+    for _, parsed in tqdm(zip_inst.iter_members(transform=parse),
+                          total=len(zip_inst)):
         if parsed is None:
             continue
         parsed_list.append(parsed)
@@ -159,3 +192,213 @@ def load_datasets(path: Optional[str] = None) -> Datasets:
         name = os.path.splitext(os.path.basename(file_name))[0]
         datasets[name] = load_zip(file_name)
     return datasets
+
+
+def build_index(zip_path: str, num_workers: int = 1) -> ZipIndex:
+    """ Reads the chats of a zip file once and indexes their members
+        by roles and original task, without keeping the chats.
+
+    Args:
+        zip_path (str): path to the ZIP file.
+        num_workers (int): The number of processes reading the chats.
+
+    Returns:
+        ZipIndex: The index, with the size and modification time
+        of the ZIP file it was built from.
+    """
+
+    stat = os.stat(zip_path)
+    entries = []
+    zip_inst = AutoZip(zip_path)
+    for member, header in zip_inst.iter_members(num_workers=num_workers,
+                                                transform=parse_header):
+        if header is None:
+            continue
+        assistant_role, user_role, original_task, _ = header
+        entries.append([assistant_role, user_role, original_task, member])
+
+    return dict(
+        version=INDEX_VERSION,
+        zip_size=stat.st_size,
+        zip_mtime=stat.st_mtime,
+        entries=entries,
+    )
+
+
+def read_cached_index(zip_path: str) -> Optional[ZipIndex]:
+    """ Reads the cached index of a zip file.
+
+    Args:
+        zip_path (str): path to the ZIP file.
+
+    Returns:
+        Optional[ZipIndex]: The index, or None if it is missing
+        or the ZIP file changed since it was built.
+    """
+
+    try:
+        with open(zip_path + INDEX_SUFFIX, "r") as f:
+            index = json.load(f)
+        stat = os.stat(zip_path)
+    except (OSError, ValueError):
+        return None
+    if (index.get("version") != INDEX_VERSION
+            or index.get("zip_size") != stat.st_size
+            or index.get("zip_mtime") != stat.st_mtime):
+        return None
+    return index
+
+
+def write_cached_index(zip_path: str, index: ZipIndex) -> None:
+    """ Caches the index of a zip file next to it. The index is not
+        cached if the folder is read-only.
+
+    Args:
+        zip_path (str): path to the ZIP file.
+        index (ZipIndex): The index of the ZIP file.
+    """
+
+    index_path = zip_path + INDEX_SUFFIX
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class ChatIndex:
+    """ The chats of a ZIP dataset indexed by roles and original task.
+        A chat is read from the ZIP file and parsed only when loaded.
+
+    Args:
+        zip_path (str): path to the ZIP file.
+        index (ZipIndex): The index of the ZIP file.
+    """
+
+    def __init__(self, zip_path: str, index: ZipIndex) -> None:
+        self.zip_path = zip_path
+        self.matrix: Dict[Tuple[str, str], Dict[str, str]] = dict()
+        for assistant_role, user_role, original_task, member in \
+                index["entries"]:
+            key = (assistant_role, user_role)
+            self.matrix.setdefault(key, dict())[original_task] = member
+        self.assistant_roles = sorted({key[0] for key in self.matrix})
+        self.user_roles = sorted({key[1] for key in self.matrix})
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(tasks) for tasks in self.matrix.values())
+
+    def tasks(self, assistant_role: str, user_role: str) -> List[str]:
+        """ Gets the original tasks of a pair of roles.
+
+        Args:
+            assistant_role (str): An assistant role.
+            user_role (str): A user role.
+
+        Returns:
+            List[str]: The original tasks, empty if there is no chat
+            between the roles.
+        """
+        return list(self.matrix.get((assistant_role, user_role), dict()))
+
+    def load_chat(self, assistant_role: str, user_role: str,
+                  original_task: str) -> Optional[ParsedChatHistory]:
+        """ Reads and parses a chat from the ZIP file.
+
+        Args:
+            assistant_role (str): An assistant role.
+            user_role (str): A user role.
+            original_task (str): The original task.
+
+        Returns:
+            Optional[ParsedChatHistory]: Parsed chat data or None
+            if there is no such chat.
+        """
+        member = self.matrix.get((assistant_role, user_role),
+                                 dict()).get(original_task)
+        if member is None:
+            return None
+        with self._lock:
+            if self._zip is None:
+                self._zip = zipfile.ZipFile(self.zip_path, "r")
+            with self._zip.open(member) as f:
+                raw_chat = json.load(f)
+        return parse(raw_chat)
+
+    def close(self) -> None:
+        """ Closes the ZIP file. """
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+
+
+def load_index(zip_path: str) -> ChatIndex:
+    """ Loads the cached index of a zip file, building and
+        caching it if needed.
+
+    Args:
+        zip_path (str): path to the ZIP file.
+
+    Returns:
+        ChatIndex: The chats of the ZIP file.
+    """
+
+    index = read_cached_index(zip_path)
+    if index is None:
+        index = build_index(zip_path)
+        write_cached_index(zip_path, index)
+    return ChatIndex(zip_path, index)
+
+
+def load_dataset_indexes(
+        path: Optional[str] = None,
+        num_workers: Optional[int] = None) -> Dict[str, ChatIndex]:
+    """ Load the indexes of a set of zip files, building the
+        missing ones in parallel. Unlike `load_datasets`, the chats
+        are not loaded.
+
+    Args:
+        path (str): path to the folder with ZIP datasets.
+        num_workers (Optional[int]): The number of processes
+            building the indexes. If None, the number of CPUs.
+
+    Returns:
+        Dict[str, ChatIndex]: A dictionary of dataset name
+        and dataset index.
+    """
+
+    if path is None:
+        path = os.path.join(REPO_ROOT, "datasets")
+
+    files = sorted(glob.glob(os.path.join(path, "*.zip")))
+    cached = {file_name: read_cached_index(file_name) for file_name in files}
+    indexes = {
+        file_name: index
+        for file_name, index in cached.items() if index is not None
+    }
+    missing = [file_name for file_name in files if file_name not in indexes]
+    if len(missing) > 1 and num_workers != 1:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            built = list(
+                tqdm(executor.map(build_index, missing), total=len(missing)))
+    else:
+        # Parallel across the chats of the zip file instead
+        built = [
+            build_index(file_name, num_workers or os.cpu_count() or 1)
+            for file_name in tqdm(missing)
+        ]
+    for file_name, index in zip(missing, built):
+        write_cached_index(file_name, index)
+        indexes[file_name] = index
+
+    datasets = {}
+    for file_name in files:
+        name = os.path.splitext(os.path.basename(file_name))[0]
+        datasets[name] = ChatIndex(file_name, indexes[file_name])
+    return datasets
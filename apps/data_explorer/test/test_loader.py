@@ -11,9 +11,86 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import json
+import os
+import zipfile
+
 import apps.data_explorer.loader as loader
 
 
 def test_load_datasets_smoke():
     data = loader.load_datasets()
     assert data is not None
+
+
+def _chat(assistant_role, user_role, original_task, num_messages=2):
+    chat = {
+        "role_1": f"{assistant_role}_RoleType.ASSISTANT",
+        "role_2": f"{user_role}_RoleType.USER",
+        "original_task": original_task,
+        "specified_task": f"Specified {original_task}",
+    }
+    for i in range(1, num_messages + 1):
+        chat[f"message_{i}"] = {
+            "role_type": "USER" if i % 2 else "ASSISTANT",
+            "content": f"Message {i}",
+        }
+    return chat
+
+
+def _write_zip(path, chats):
+    with zipfile.ZipFile(path, "w") as zip_file:
+        for i, chat in enumerate(chats):
+            zip_file.writestr(f"chats/{i:03d}.json", json.dumps(chat))
+        zip_file.writestr("chats/readme.txt", "not a chat")
+
+
+def test_load_dataset_indexes(tmp_path):
+    _write_zip(tmp_path / "code.zip", [
+        _chat("Programmer", "Writer", "Task 1"),
+        _chat("Programmer", "Writer", "Task 2"),
+        _chat("Doctor", "Patient", "Task 3"),
+        {
+            "role_1": "Invalid"
+        },
+    ])
+    _write_zip(tmp_path / "society.zip", [_chat("Chef", "Guest", "Task 4")])
+
+    datasets = loader.load_dataset_indexes(str(tmp_path), num_workers=2)
+    assert set(datasets) == {"code", "society"}
+    code = datasets["code"]
+    assert len(code) == 3
+    assert code.assistant_roles == ["Doctor", "Programmer"]
+    assert code.user_roles == ["Patient", "Writer"]
+    assert code.tasks("Programmer", "Writer") == ["Task 1", "Task 2"]
+    assert code.tasks("Programmer", "Patient") == []
+
+    chat = code.load_chat("Programmer", "Writer", "Task 2")
+    assert chat["specified_task"] == "Specified Task 2"
+    assert chat["messages"][2] == {
+        "role_type": "ASSISTANT",
+        "content": "Message 2"
+    }
+    assert code.load_chat("Programmer", "Writer", "Task 3") is None
+    code.close()
+
+
+def test_index_cached(tmp_path):
+    zip_path = str(tmp_path / "code.zip")
+    _write_zip(zip_path, [_chat("Programmer", "Writer", "Task 1")])
+    index = loader.load_index(zip_path)
+    assert os.path.exists(zip_path + loader.INDEX_SUFFIX)
+    assert loader.read_cached_index(zip_path)["entries"] == [[
+        "Programmer", "Writer", "Task 1", "chats/000.json"
+    ]]
+    assert index.tasks("Programmer", "Writer") == ["Task 1"]
+
+    # The index is rebuilt when the zip file changes
+    _write_zip(zip_path, [
+        _chat("Programmer", "Writer", "Task 1"),
+        _chat("Programmer", "Writer", "Task 2"),
+    ])
+    os.utime(zip_path, (0, 0))
+    assert loader.read_cached_index(zip_path) is None
+    index = loader.load_index(zip_path)
+    assert index.tasks("Programmer", "Writer") == ["Task 1", "Task 2"]
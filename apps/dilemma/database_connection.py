@@ -11,6 +11,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+from datetime import datetime
+from typing import Sequence, Tuple
+
 import sqlalchemy
 from google.cloud.sql.connector import Connector, IPTypes
 
@@ -46,13 +49,24 @@ class DatabaseConnection:
         self.connector.close()
 
     def add_record(self, file_name: str, who_is_better: str):
+        self.add_records([(file_name, who_is_better, datetime.now())])
+
+    def add_records(self, records: Sequence[Tuple[str, str, datetime]]):
+        """ Insert votes in a single transaction.
+
+        Args:
+            records (Sequence[Tuple[str, str, datetime]]): File name,
+                better option and date of each vote.
+        """
+        if len(records) == 0:
+            return
         with self.pool.connect() as db_conn:
             insert_stmt = sqlalchemy.text(
                 "INSERT INTO choices2 (file_name, who_is_better, date)"
-                " VALUES (:file_name, :who_is_better, NOW())")
-            db_conn.execute(
-                insert_stmt, parameters={
-                    "file_name": file_name,
-                    "who_is_better": who_is_better,
-                })
+                " VALUES (:file_name, :who_is_better, :date)")
+            # Batched into multi-row inserts by the pymysql executemany
+            db_conn.execute(insert_stmt, [
+                dict(file_name=file_name, who_is_better=who_is_better,
+                     date=date) for file_name, who_is_better, date in records
+            ])
             db_conn.commit()
@@ -17,13 +17,15 @@ options and save the answers to a database.
 """
 
 import argparse
-import json
+import atexit
+import os
 import random
 from functools import partial
-from typing import Dict
+from typing import Dict, Optional
 
 import gradio as gr
 from database_connection import DatabaseConnection
+from vote_recorder import VoteRecorder
 
 from apps.common.auto_zip import AutoZip
 
@@ -36,6 +38,15 @@ def parse_arguments():
                         help='Path to ZIP file containing JSONs')
     parser.add_argument('--no-db', dest='no_db', action='store_true',
                         help="Set in development environment")
+    parser.add_argument(
+        '--spill-path', type=str, default="dilemma_votes.db",
+        help='Local SQLite database keeping the votes ' +
+        'while the database is unreachable')
+    parser.add_argument('--vote-batch-size', type=int, default=64,
+                        help='Number of votes written to the database at once')
+    parser.add_argument(
+        '--vote-flush-interval', type=float, default=2.0,
+        help='Maximal time in seconds before a vote is written')
     parser.add_argument('--share', type=bool, default=False,
                         help='Expose the web UI to Gradio')
     parser.add_argument(
@@ -55,39 +66,42 @@ def parse_arguments():
     return args
 
 
+def parse_record(js: Dict) -> Optional[Dict[str, str]]:
+    if 'summary' not in js:
+        return None
+    if 'gpt_solution' not in js:
+        return None
+    if 'specified_task' not in js:
+        return None
+    return dict(summary=js['summary'], gpt_solution=js['gpt_solution'],
+                specified_task=js['specified_task'])
+
+
 def load_dataset(data_path: str) -> Dict[str, Dict[str, str]]:
     zip_inst = AutoZip(data_path, ext=".json")
-    text_dict = zip_inst.as_dict(include_zip_name=True)
+    zip_name = os.path.split(data_path)[1]
     res_dict = {}
-    for path, json_str in text_dict.items():
-        js = json.loads(json_str)
-        if 'summary' not in js:
-            continue
-        if 'gpt_solution' not in js:
+    for member, record in zip_inst.iter_members(transform=parse_record):
+        if record is None:
             continue
-        if 'specified_task' not in js:
-            continue
-        res_dict[path] = dict(summary=js['summary'],
-                              gpt_solution=js['gpt_solution'],
-                              specified_task=js['specified_task'])
+        res_dict[zip_name + "/" + member] = record
     return res_dict
 
 
 def construct_ui(blocks, dataset: Dict[str, Dict[str, str]],
-                 has_connection: bool = True):
+                 recorder: Optional[VoteRecorder] = None):
     """ Build Gradio UI and populate with texts from JSONs.
 
     Args:
         blocks: Gradio blocks
         dataset: Parsed multi-JSON dataset.
-        has_connection (bool): if the DB connection exists.
+        recorder (Optional[VoteRecorder]): Recorder of the votes, if the
+            DB connection exists.
 
     Returns:
         None
     """
 
-    db_conn = DatabaseConnection() if has_connection else None
-
     gr.Markdown("## Dilemma app")
     specified_task_ta = gr.TextArea(label="Specified task prompt", lines=1,
                                     interactive=False)
@@ -133,8 +147,8 @@ def construct_ui(blocks, dataset: Dict[str, Dict[str, str]],
         name = state['name']
         print("choice=", choice, "who_is_better=", who_is_better, "name=",
               name)
-        if db_conn is not None:
-            db_conn.add_record(name, who_is_better)
+        if recorder is not None:
+            recorder.add_record(name, who_is_better)
 
     updated_controls = [state_st, left_md, right_md, specified_task_ta]
 
@@ -150,11 +164,20 @@ def construct_ui(blocks, dataset: Dict[str, Dict[str, str]],
     blocks.load(load_random, state_st, updated_controls)
 
 
-def construct_blocks(data_path: str, has_connection: bool):
+def construct_blocks(data_path: str, has_connection: bool,
+                     spill_path: str = "dilemma_votes.db",
+                     vote_batch_size: int = 64,
+                     vote_flush_interval: float = 2.0):
     """ Construct Blocs app but do not launch it.
 
     Args:
         data_path (str): Path to the ZIP dataset with JOSNs inside.
+        has_connection (bool): if the DB connection exists.
+        spill_path (str): Local SQLite database keeping the votes while
+            the database is unreachable.
+        vote_batch_size (int): Number of votes written at once.
+        vote_flush_interval (float): Maximal time in seconds before a vote
+            is written.
 
     Returns:
         gr.Blocks: Blocks instance.
@@ -166,8 +189,17 @@ def construct_blocks(data_path: str, has_connection: bool):
 
     print("Getting Dilemma web server online...")
 
+    recorder = None
+    if has_connection:
+        recorder = VoteRecorder(DatabaseConnection().add_records,
+                                spill_path=spill_path,
+                                max_batch_size=vote_batch_size,
+                                flush_interval=vote_flush_interval)
+        # Write the queued votes on exit
+        atexit.register(recorder.close)
+
     with gr.Blocks() as blocks:
-        construct_ui(blocks, dataset, has_connection)
+        construct_ui(blocks, dataset, recorder)
 
     return blocks
 
@@ -177,7 +209,8 @@ def main():
 
     args = parse_arguments()
 
-    blocks = construct_blocks(args.data_path, not args.no_db)
+    blocks = construct_blocks(args.data_path, not args.no_db, args.spill_path,
+                              args.vote_batch_size, args.vote_flush_interval)
 
     blocks.queue(args.concurrency_count) \
           .launch(share=args.share, inbrowser=args.inbrowser,
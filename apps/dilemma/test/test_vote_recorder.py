@@ -0,0 +1,142 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from typing import List
+
+import pytest
+
+from apps.dilemma.vote_recorder import Vote, VoteRecorder
+
+
+class SQLiteChoices:
+    """ Local SQLite database in place of the Cloud SQL one. """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.reachable = True
+        self.num_transactions = 0
+        with closing(sqlite3.connect(path)) as conn, conn:
+            conn.execute("CREATE TABLE choices2 "
+                         "(file_name TEXT, who_is_better TEXT, date TEXT)")
+
+    def add_records(self, votes: List[Vote]) -> None:
+        if not self.reachable:
+            raise sqlite3.OperationalError("unable to open database")
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.executemany(
+                "INSERT INTO choices2 (file_name, who_is_better, date) "
+                "VALUES (?, ?, ?)",
+                [(file_name, who_is_better, date.isoformat())
+                 for file_name, who_is_better, date in votes])
+        self.num_transactions += 1
+
+    def rows(self):
+        with closing(sqlite3.connect(self.path)) as conn:
+            return conn.execute("SELECT file_name, who_is_better, date "
+                                "FROM choices2 ORDER BY rowid").fetchall()
+
+
+@pytest.fixture
+def choices(tmp_path):
+    return SQLiteChoices(str(tmp_path / "choices.db"))
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return str(tmp_path / "spill.db")
+
+
+def test_votes_are_written_in_batches(choices, spill_path):
+    with VoteRecorder(choices.add_records, spill_path, max_batch_size=10,
+                      flush_interval=60) as recorder:
+        for i in range(25):
+            recorder.add_record(f"file_{i}", "summary",
+                                datetime(2023, 5, 9, 12, 0, i))
+    rows = choices.rows()
+    assert [row[0] for row in rows] == [f"file_{i}" for i in range(25)]
+    assert rows[3] == ("file_3", "summary", "2023-05-09T12:00:03")
+    assert choices.num_transactions <= 3
+
+
+def test_votes_are_written_after_flush_interval(choices, spill_path):
+    written = threading.Event()
+
+    def add_records(votes):
+        choices.add_records(votes)
+        written.set()
+
+    with VoteRecorder(add_records, spill_path, max_batch_size=100,
+                      flush_interval=0.05) as recorder:
+        recorder.add_record("file", "gpt_solution")
+        assert written.wait(5)
+    assert choices.rows()[0][:2] == ("file", "gpt_solution")
+
+
+def test_votes_are_spilled_when_unreachable(choices, spill_path):
+    choices.reachable = False
+    recorder = VoteRecorder(choices.add_records, spill_path, flush_interval=60,
+                            retry_interval=0)
+    for i in range(5):
+        recorder.add_record(f"file_{i}", "none")
+    recorder.flush()
+    assert recorder.num_spilled == 5
+    assert choices.rows() == []
+
+    choices.reachable = True
+    recorder.add_record("file_5", "none")
+    recorder.close()
+    assert recorder.num_spilled == 0
+    assert [row[0] for row in choices.rows()] == \
+        [f"file_{i}" for i in range(6)]
+
+
+def test_spilled_votes_are_written_on_restart(choices, spill_path):
+    choices.reachable = False
+    with VoteRecorder(choices.add_records, spill_path,
+                      flush_interval=60) as recorder:
+        recorder.add_record("file", "summary")
+    assert recorder.num_spilled == 1
+
+    choices.reachable = True
+    with VoteRecorder(choices.add_records, spill_path,
+                      flush_interval=60) as recorder:
+        assert recorder.num_spilled == 1
+    assert recorder.num_spilled == 0
+    assert [row[0] for row in choices.rows()] == ["file"]
+
+
+def test_remote_is_not_retried_before_retry_interval(choices, spill_path):
+    calls = []
+
+    def add_records(votes):
+        calls.append(len(votes))
+        raise sqlite3.OperationalError("unable to open database")
+
+    with VoteRecorder(add_records, spill_path, flush_interval=60,
+                      retry_interval=60) as recorder:
+        for _ in range(3):
+            recorder.add_record("file", "summary")
+            recorder.flush()
+    assert calls == [1]
+    assert recorder.num_spilled == 3
+
+
+def test_add_record_after_close(choices, spill_path):
+    recorder = VoteRecorder(choices.add_records, spill_path)
+    recorder.close()
+    with pytest.raises(RuntimeError):
+        recorder.add_record("file", "summary")
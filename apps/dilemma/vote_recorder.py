@@ -0,0 +1,198 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+"""
+Buffered recording of the Dilemma votes. The votes are queued in memory
+and written in batches by a background thread, and spilled to a local
+SQLite database while the remote database is unreachable.
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional
+
+SPILL_SCHEMA = ("CREATE TABLE IF NOT EXISTS votes ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "file_name TEXT NOT NULL, "
+                "who_is_better TEXT NOT NULL, "
+                "date TEXT NOT NULL)")
+
+
+class Vote(NamedTuple):
+    file_name: str
+    who_is_better: str
+    date: datetime
+
+
+class VoteRecorder:
+    """ Queues votes in memory and writes them in batches on a background
+        thread, once `max_batch_size` votes are queued or every
+        `flush_interval` seconds. If writing a batch fails, it is spilled
+        to a local SQLite database, the remote database is not tried again
+        before `retry_interval` seconds, and the spilled votes are written
+        once it succeeds.
+
+    Args:
+        write_votes (Callable[[List[Vote]], None]): Writes a batch of votes
+            to the remote database in one transaction.
+        spill_path (str): Path to the local SQLite database.
+        max_batch_size (int): Number of queued votes triggering a write.
+        flush_interval (float): Maximal time in seconds a vote is queued.
+        retry_interval (float): Time in seconds after a failed write before
+            the remote database is tried again.
+    """
+
+    def __init__(self, write_votes: Callable[[List[Vote]], None],
+                 spill_path: str = "dilemma_votes.db",
+                 max_batch_size: int = 64, flush_interval: float = 2.0,
+                 retry_interval: float = 30.0) -> None:
+        if max_batch_size <= 0:
+            raise ValueError("`max_batch_size` should be larger than 0.")
+        self.write_votes = write_votes
+        self.spill_path = spill_path
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+
+        self._votes: List[Vote] = []
+        self._cond = threading.Condition()
+        # Serializes the writes of the thread and of `flush`
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._retry_time = 0.0
+
+        with closing(self._spill_db()) as conn, conn:
+            conn.execute(SPILL_SCHEMA)
+            self._num_spilled: int = conn.execute(
+                "SELECT COUNT(*) FROM votes").fetchone()[0]
+
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="dilemma-votes")
+        self._thread.start()
+
+    def __enter__(self) -> "VoteRecorder":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def num_spilled(self) -> int:
+        """ Number of votes in the local SQLite database. """
+        return self._num_spilled
+
+    def add_record(self, file_name: str, who_is_better: str,
+                   date: Optional[datetime] = None) -> None:
+        """ Queues a vote.
+
+        Args:
+            file_name (str): Name of the voted record.
+            who_is_better (str): The better option.
+            date (Optional[datetime]): Time of the vote. If None, now.
+        """
+        vote = Vote(file_name, who_is_better, date or datetime.now())
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Cannot add a vote after close.")
+            self._votes.append(vote)
+            if len(self._votes) >= self.max_batch_size:
+                self._cond.notify()
+
+    def flush(self) -> None:
+        """ Writes the queued votes and waits for the write to finish. """
+        with self._write_lock:
+            self._write(self._take_votes())
+
+    def close(self) -> None:
+        """ Stops the background thread and writes the queued votes. """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+
+    def _take_votes(self) -> List[Vote]:
+        with self._cond:
+            votes, self._votes = self._votes, []
+        return votes
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and \
+                        len(self._votes) < self.max_batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._closed:
+                    return
+            self.flush()
+
+    def _spill_db(self) -> sqlite3.Connection:
+        # Committed when leaving a `with` block of the connection
+        return sqlite3.connect(self.spill_path)
+
+    def _write(self, votes: List[Vote]) -> None:
+        if time.monotonic() < self._retry_time:
+            self._spill(votes)
+            return
+        try:
+            if self._num_spilled > 0:
+                self._write_spilled()
+            if len(votes) > 0:
+                self.write_votes(votes)
+        except Exception as ex:
+            print(f"Could not write {len(votes)} votes, spilling them "
+                  f"to {self.spill_path}: {ex!r}")
+            self._retry_time = time.monotonic() + self.retry_interval
+            self._spill(votes)
+
+    def _spill(self, votes: List[Vote]) -> None:
+        if len(votes) == 0:
+            return
+        try:
+            with closing(self._spill_db()) as conn, conn:
+                conn.executemany(
+                    "INSERT INTO votes (file_name, who_is_better, date) "
+                    "VALUES (?, ?, ?)", [(vote.file_name, vote.who_is_better,
+                                          vote.date.isoformat())
+                                         for vote in votes])
+        except sqlite3.Error as ex:
+            print(f"Could not spill {len(votes)} votes: {ex!r}")
+            # Kept in memory for the next write
+            with self._cond:
+                self._votes[:0] = votes
+            return
+        self._num_spilled += len(votes)
+
+    def _write_spilled(self) -> None:
+        with closing(self._spill_db()) as conn:
+            while self._num_spilled > 0:
+                rows = conn.execute(
+                    "SELECT id, file_name, who_is_better, date FROM votes "
+                    "ORDER BY id LIMIT ?", (self.max_batch_size, )).fetchall()
+                if len(rows) == 0:
+                    self._num_spilled = 0
+                    return
+                self.write_votes([
+                    Vote(file_name, who_is_better,
+                         datetime.fromisoformat(date))
+                    for _, file_name, who_is_better, date in rows
+                ])
+                with conn:
+                    conn.execute("DELETE FROM votes WHERE id <= ?",
+                                 (rows[-1][0], ))
+                self._num_spilled -= len(rows)
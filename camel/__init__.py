@@ -11,20 +11,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-import camel.agents
-import camel.configs
-import camel.generators
-import camel.messages
-import camel.prompts
-import camel.types
-import camel.utils
-import camel.functions
-import camel.memories
-import camel.storages
+from camel.utils.lazy_import import lazy_attributes
 
 __version__ = '0.1.0'
 
 __all__ = [
     '__version__',
-    'camel',
 ]
+
+# The subpackages are imported on first access, so that importing one of
+# them does not import the dependencies of the others
+_LAZY_ATTRIBUTES = {
+    'agents': '.agents',
+    'configs': '.configs',
+    'generators': '.generators',
+    'messages': '.messages',
+    'prompts': '.prompts',
+    'types': '.types',
+    'utils': '.utils',
+    'functions': '.functions',
+    'memories': '.memories',
+    'storages': '.storages',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -11,19 +11,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from .base import BaseAgent
-from .chat_agent import ChatAgent
-from .task_agent import (
-    TaskSpecifyAgent,
-    TaskPlannerAgent,
-    TaskCreationAgent,
-    TaskPrioritizationAgent,
-)
-from .critic_agent import CriticAgent
-from .tool_agents.base import BaseToolAgent
-from .tool_agents.hugging_face_tool_agent import HuggingFaceToolAgent
-from .embodied_agent import EmbodiedAgent
-from .role_assignment_agent import RoleAssignmentAgent
+from typing import TYPE_CHECKING
+
+from camel.utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .base import BaseAgent
+    from .chat_agent import ChatAgent
+    from .task_agent import (
+        TaskSpecifyAgent,
+        TaskPlannerAgent,
+        TaskCreationAgent,
+        TaskPrioritizationAgent,
+    )
+    from .critic_agent import CriticAgent
+    from .tool_agents.base import BaseToolAgent
+    from .tool_agents.hugging_face_tool_agent import HuggingFaceToolAgent
+    from .embodied_agent import EmbodiedAgent
+    from .role_assignment_agent import RoleAssignmentAgent
 
 __all__ = [
     'BaseAgent',
@@ -38,3 +43,19 @@ __all__ = [
     'EmbodiedAgent',
     'RoleAssignmentAgent',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'BaseAgent': '.base',
+    'ChatAgent': '.chat_agent',
+    'TaskSpecifyAgent': '.task_agent',
+    'TaskPlannerAgent': '.task_agent',
+    'TaskCreationAgent': '.task_agent',
+    'TaskPrioritizationAgent': '.task_agent',
+    'CriticAgent': '.critic_agent',
+    'BaseToolAgent': '.tool_agents.base',
+    'HuggingFaceToolAgent': '.tool_agents.hugging_face_tool_agent',
+    'EmbodiedAgent': '.embodied_agent',
+    'RoleAssignmentAgent': '.role_assignment_agent',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -50,10 +50,16 @@ class FunctionCallingRecord:
         args (Dict[str, Any]): The dictionary of arguments passed to
             the function.
         result (Any): The execution result of calling this function.
+        cache_hit (bool, optional): Whether the result was found in the cache
+            of the function, or `None` if the function has no cache.
+        cache_hit_rate (float, optional): The hit rate of the cache of the
+            function so far, or `None` if the function has no cache.
     """
     func_name: str
     args: Dict[str, Any]
     result: Any
+    cache_hit: Optional[bool] = None
+    cache_hit_rate: Optional[float] = None
 
     def __str__(self) -> str:
         r"""Overridden version of the string function.
@@ -62,9 +68,13 @@ class FunctionCallingRecord:
             str: Modified string to represent the function calling.
         """
 
-        return (f"Function Execution: {self.func_name}\n"
-                f"\tArgs: {self.args}\n"
-                f"\tResult: {self.result}")
+        record_str = (f"Function Execution: {self.func_name}\n"
+                      f"\tArgs: {self.args}\n"
+                      f"\tResult: {self.result}")
+        if self.cache_hit is not None:
+            record_str += (f"\n\tCache: {'hit' if self.cache_hit else 'miss'}"
+                           f" (hit rate: {self.cache_hit_rate:.0%})")
+        return record_str
 
 
 class ChatAgent(BaseAgent):
@@ -93,6 +103,12 @@ class ChatAgent(BaseAgent):
         response_terminators (List[ResponseTerminator], optional): List of
             :obj:`ResponseTerminator` bind to one chat agent.
             (default: :obj:`None`)
+        stream_callback (Callable[[int, str], None], optional): A function
+            called with the choice index and each piece of content of a
+            streamed response as it arrives, e.g. to display the response
+            while it is generated. Only used when the model streams, i.e.
+            with :obj:`stream=True` in the model config. An exception raised
+            by the function aborts the step. (default: :obj:`None`)
     """
 
     def __init__(
@@ -106,6 +122,7 @@ class ChatAgent(BaseAgent):
         output_language: Optional[str] = None,
         function_list: Optional[List[OpenAIFunction]] = None,
         response_terminators: Optional[List[ResponseTerminator]] = None,
+        stream_callback: Optional[Callable[[int, str], None]] = None,
     ) -> None:
 
         self.orig_sys_message: BaseMessage = system_message
@@ -122,8 +139,8 @@ class ChatAgent(BaseAgent):
         self.func_dict: Dict[str, Callable] = {}
         if function_list is not None:
             for func in function_list:
-                self.func_dict[func.name] = func.func
-        self.model_config = model_config or ChatGPTConfig()
+                self.func_dict[func.name] = func
+        self.model_config: BaseConfig = model_config or ChatGPTConfig()
 
         self.model_backend: BaseModelBackend = ModelFactory.create(
             self.model_type, self.model_config.__dict__)
@@ -137,6 +154,7 @@ class ChatAgent(BaseAgent):
 
         self.terminated: bool = False
         self.response_terminators = response_terminators or []
+        self.stream_callback = stream_callback
         self.init_messages()
 
     def reset(self):
@@ -257,6 +275,52 @@ class ChatAgent(BaseAgent):
         """
         self.update_memory(message, OpenAIBackendRole.ASSISTANT)
 
+    def get_state(self) -> Dict[str, Any]:
+        r"""Returns the state of the conversation held by the agent, which can
+        be loaded into another agent with :meth:`load_state` to continue the
+        conversation. The model backend and the functions are not part of the
+        state.
+
+        Returns:
+            Dict[str, Any]: The picklable state of the agent.
+        """
+        return {
+            "model_type":
+            self.model_type,
+            "model_config":
+            self.model_config,
+            "orig_sys_message":
+            self.orig_sys_message,
+            "system_message":
+            self.system_message,
+            "output_language":
+            self.output_language,
+            "terminated":
+            self.terminated,
+            "response_terminators":
+            self.response_terminators,
+            "memory_records":
+            [record.to_dict() for record in self.memory.get_records()],
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        r"""Loads a state returned by :meth:`get_state`, replacing the system
+        message, the memory and the terminators of the agent.
+
+        Args:
+            state (Dict[str, Any]): The state to load.
+        """
+        self.orig_sys_message = state["orig_sys_message"]
+        self.system_message = state["system_message"]
+        self.output_language = state["output_language"]
+        self.terminated = state["terminated"]
+        self.response_terminators = state["response_terminators"]
+        self.memory.clear()
+        self.memory.write_records([
+            MemoryRecord.from_dict(record_dict)
+            for record_dict in state["memory_records"]
+        ])
+
     @openai_api_key_required
     def step(
         self,
@@ -407,6 +471,8 @@ class ChatAgent(BaseAgent):
                     # When response has not been stopped
                     # Notice that only the first chunk_dict has the "role"
                     content_dict[index] += delta.content
+                    if self.stream_callback is not None:
+                        self.stream_callback(index, delta.content)
                 else:
                     finish_reasons_dict[index] = choice.finish_reason
                     chat_message = BaseMessage(role_name=self.role_name,
@@ -481,12 +547,18 @@ class ChatAgent(BaseAgent):
         args = json.loads(args_str.replace("\'", "\""))
 
         # Pass the extracted arguments to the indicated function
+        cache_hit: Optional[bool] = None
         try:
-            result = func(**args)
+            if isinstance(func, OpenAIFunction):
+                result, cache_hit = func.call(args)
+            else:
+                result = func(**args)
+        except TimeoutError as e:
+            # Let the model know, rather than stalling or failing the step
+            result = str(e)
         except Exception:
-            raise ValueError(
-                f"Execution of function {func.__name__} failed with "
-                f"arguments being {args}.")
+            raise ValueError(f"Execution of function {func_name} failed with "
+                             f"arguments being {args}.")
 
         assist_msg = FunctionCallingMessage(
             role_name=self.role_name,
@@ -506,7 +578,12 @@ class ChatAgent(BaseAgent):
         )
 
         # Record information about this function call
-        func_record = FunctionCallingRecord(func_name, args, result)
+        cache_hit_rate = None
+        if cache_hit is not None and isinstance(func, OpenAIFunction):
+            assert func.cache is not None
+            cache_hit_rate = func.cache.hit_rate
+        func_record = FunctionCallingRecord(func_name, args, result, cache_hit,
+                                            cache_hit_rate)
         return assist_msg, func_msg, func_record
 
     def get_usage_dict(self, output_messages: List[BaseMessage],
@@ -11,6 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import json
 import random
 import warnings
 from typing import Any, Dict, Optional, Sequence
@@ -18,11 +19,24 @@ from typing import Any, Dict, Optional, Sequence
 from colorama import Fore
 
 from camel.agents import ChatAgent
-from camel.memories import BaseMemory
+from camel.memories import BaseMemory, MemoryRecord
 from camel.messages import BaseMessage
+from camel.models import BaseModelBackend, ModelFactory
 from camel.responses import ChatAgentResponse
-from camel.types import ModelType
-from camel.utils import get_first_int, print_text_animated
+from camel.types import (
+    ChatCompletion,
+    CriticSelectionMode,
+    ModelType,
+    OpenAIBackendRole,
+)
+from camel.utils import (
+    get_first_int,
+    get_model_encoding,
+    openai_api_key_required,
+    print_text_animated,
+)
+
+CHOOSE_OPTION_FUNC_NAME = "choose_option"
 
 
 class CriticAgent(ChatAgent):
@@ -39,7 +53,17 @@ class CriticAgent(ChatAgent):
             messages to include in the context window. If `None`, no windowing
             is performed. (default: :obj:`6`)
         retry_attempts (int, optional): The number of retry attempts if the
-            critic fails to return a valid option. (default: :obj:`2`)
+            critic fails to return a valid option. Only used in the
+            :obj:`CriticSelectionMode.TEXT` mode. (default: :obj:`2`)
+        selection_mode (CriticSelectionMode, optional): How the critic
+            chooses an option. :obj:`CriticSelectionMode.TEXT` parses the
+            choice from a free text answer, retrying on invalid answers.
+            :obj:`CriticSelectionMode.FUNCTION_CALL` forces a function call
+            whose only argument is an enum of the options, and
+            :obj:`CriticSelectionMode.LOGIT_BIAS` restricts a one-token answer
+            to the option numbers, so both get a valid choice in exactly one
+            call. They require an OpenAI model (or the stub model).
+            (default: :obj:`CriticSelectionMode.TEXT`)
         verbose (bool, optional): Whether to print the critic's messages.
         logger_color (Any): The color of the menu options displayed to the
             user. (default: :obj:`Fore.MAGENTA`)
@@ -53,6 +77,7 @@ class CriticAgent(ChatAgent):
         memory: Optional[BaseMemory] = None,
         message_window_size: int = 6,
         retry_attempts: int = 2,
+        selection_mode: CriticSelectionMode = CriticSelectionMode.TEXT,
         verbose: bool = False,
         logger_color: Any = Fore.MAGENTA,
     ) -> None:
@@ -61,6 +86,9 @@ class CriticAgent(ChatAgent):
                          message_window_size=message_window_size)
         self.options_dict: Dict[str, str] = dict()
         self.retry_attempts = retry_attempts
+        self.selection_mode = selection_mode
+        # Backends of the constrained selection modes, by number of options
+        self._selection_backends: Dict[int, BaseModelBackend] = dict()
         self.verbose = verbose
         self.logger_color = logger_color
 
@@ -74,6 +102,7 @@ class CriticAgent(ChatAgent):
             str: A string containing the flattened options to the critic.
         """
         options = [message.content for message in messages]
+        self.options_dict = dict()
         flatten_options = (
             f"> Proposals from "
             f"{messages[0].role_name} ({messages[0].role_type}). "
@@ -97,6 +126,8 @@ class CriticAgent(ChatAgent):
             str: The option selected by the critic.
         """
         # TODO: Add support for editing options by the critic.
+        if self.selection_mode != CriticSelectionMode.TEXT:
+            return self.select_option(input_message)
         msg_content = input_message.content
         i = 0
         while i < self.retry_attempts:
@@ -130,6 +161,110 @@ class CriticAgent(ChatAgent):
                       "Returning a random option.")
         return random.choice(list(self.options_dict.values()))
 
+    def get_selection_backend(self, num_options: int) -> BaseModelBackend:
+        r"""Gets the model backend constraining the answer of the critic to
+        one of the options.
+
+        Args:
+            num_options (int): The number of options.
+
+        Returns:
+            BaseModelBackend: The backend, whose configuration is the one of
+                the agent, restricted to a single choice.
+        """
+        if num_options in self._selection_backends:
+            return self._selection_backends[num_options]
+        choices = [str(i + 1) for i in range(num_options)]
+        config_dict = dict(self.model_config.__dict__, n=1, stream=False)
+        if self.selection_mode == CriticSelectionMode.FUNCTION_CALL:
+            config_dict["functions"] = [{
+                "name": CHOOSE_OPTION_FUNC_NAME,
+                "description": "Chooses one of the proposed options.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "option": {
+                            "type": "string",
+                            "enum": choices,
+                            "description": "The number of the option.",
+                        },
+                    },
+                    "required": ["option"],
+                },
+            }]
+            config_dict["function_call"] = {"name": CHOOSE_OPTION_FUNC_NAME}
+        else:
+            encoding = get_model_encoding(self.model_type.value_for_tiktoken)
+            logit_bias = dict()
+            for choice in choices:
+                tokens = encoding.encode(choice)
+                if len(tokens) != 1:
+                    raise ValueError(f"Option {choice} is not a single token, "
+                                     "cannot restrict the answer with "
+                                     "`logit_bias`.")
+                logit_bias[tokens[0]] = 100
+            config_dict.pop("functions", None)
+            config_dict.pop("function_call", None)
+            config_dict["logit_bias"] = logit_bias
+            config_dict["max_tokens"] = 1
+        backend = ModelFactory.create(self.model_type, config_dict)
+        self._selection_backends[num_options] = backend
+        return backend
+
+    @openai_api_key_required
+    def select_option(self, input_message: BaseMessage) -> str:
+        r"""Gets the option selected by the critic in a single call to the
+        model, whose answer is constrained to the option numbers. Only the
+        input message and the choice are recorded in the memory.
+
+        Args:
+            input_message (BaseMessage): A `BaseMessage` object representing
+                the input message.
+
+        Returns:
+            str: The option selected by the critic.
+        """
+        openai_messages, _ = self.memory.get_context()
+        openai_messages = openai_messages + [
+            input_message.to_openai_user_message()
+        ]
+        backend = self.get_selection_backend(len(self.options_dict))
+        response = backend.run(openai_messages)
+        if not isinstance(response, ChatCompletion):
+            raise RuntimeError("Critic selection does not support streaming.")
+        message = response.choices[0].message
+        choice: Optional[str]
+        if self.selection_mode == CriticSelectionMode.FUNCTION_CALL:
+            if message.function_call is None:
+                # The model answered in text instead, parse it as in the
+                # TEXT mode.
+                choice = str(get_first_int(message.content or ""))
+            else:
+                try:
+                    arguments = json.loads(message.function_call.arguments)
+                    choice = str(arguments["option"])
+                except (KeyError, TypeError, ValueError):
+                    choice = None
+        else:
+            choice = (message.content or "").strip()
+
+        if choice not in self.options_dict:
+            warnings.warn("Critic failed to get a valid option. "
+                          "Returning a random option.")
+            return random.choice(list(self.options_dict.values()))
+
+        critic_msg = BaseMessage(role_name=self.role_name,
+                                 role_type=self.role_type, meta_dict=dict(),
+                                 content=f"Option {choice}")
+        self.memory.write_records([
+            MemoryRecord(input_message, OpenAIBackendRole.USER),
+            MemoryRecord(critic_msg, OpenAIBackendRole.ASSISTANT),
+        ])
+        if self.verbose:
+            print_text_animated(self.logger_color + "\n> Critic response: "
+                                f"\x1b[3m{critic_msg.content}\x1b[0m\n")
+        return self.options_dict[choice]
+
     def parse_critic(self, critic_msg: BaseMessage) -> Optional[str]:
         r"""Parses the critic's message and extracts the choice.
 
@@ -11,7 +11,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from typing import Any, Dict, List, Optional
+import reprlib
+from typing import Any, Dict, List, Optional, Tuple
 
 from colorama import Fore
 
@@ -39,6 +40,12 @@ class EmbodiedAgent(ChatAgent):
         verbose (bool, optional): Whether to print the critic's messages.
         logger_color (Any): The color of the logger displayed to the user.
             (default: :obj:`Fore.MAGENTA`)
+        max_value_length (int, optional): The maximum number of characters of
+            a variable value reported after executing code.
+            (default: :obj:`200`)
+        max_reported_variables (int, optional): The maximum number of changed
+            variables reported after executing a code block.
+            (default: :obj:`20`)
     """
 
     def __init__(
@@ -50,17 +57,32 @@ class EmbodiedAgent(ChatAgent):
         action_space: Optional[List[BaseToolAgent]] = None,
         verbose: bool = False,
         logger_color: Any = Fore.MAGENTA,
+        max_value_length: int = 200,
+        max_reported_variables: int = 20,
     ) -> None:
-        default_action_space = [
-            HuggingFaceToolAgent('hugging_face_tool_agent',
-                                 model_type=model_type.value),
-        ]
-        self.action_space = action_space or default_action_space
+        if not action_space:
+            action_space = [
+                HuggingFaceToolAgent('hugging_face_tool_agent',
+                                     model_type=model_type.value),
+            ]
+        self.action_space = action_space
         action_space_prompt = self.get_action_space_prompt()
         system_message.content = system_message.content.format(
             action_space=action_space_prompt)
         self.verbose = verbose
         self.logger_color = logger_color
+        self.max_value_length = max_value_length
+        self.max_reported_variables = max_reported_variables
+        self._value_repr = reprlib.Repr()
+        self._value_repr.maxstring = max_value_length
+        self._value_repr.maxother = max_value_length
+        action_space_dict: Dict[str, Any] = {
+            action.name: action
+            for action in self.action_space
+        }
+        action_space_dict.update({"print": print, "enumerate": enumerate})
+        # The interpreter session persists across the steps of the agent
+        self.interpreter = PythonInterpreter(action_space=action_space_dict)
         super().__init__(
             system_message=system_message,
             model_type=model_type,
@@ -68,6 +90,12 @@ class EmbodiedAgent(ChatAgent):
             message_window_size=message_window_size,
         )
 
+    def reset(self):
+        r"""Resets the agent to its initial state, including the variables
+        of its interpreter session."""
+        super().reset()
+        self.interpreter.clear_state()
+
     def get_action_space_prompt(self) -> str:
         r"""Returns the action space prompt.
 
@@ -79,6 +107,42 @@ class EmbodiedAgent(ChatAgent):
             for action in self.action_space
         ])
 
+    def _snapshot_state(self) -> Dict[str, Tuple[int, int, str]]:
+        # Cheap fingerprints of the variables to detect the changed ones
+        snapshot = {}
+        for name, value in self.interpreter.state.items():
+            if self.interpreter.action_space.get(name, None) is value:
+                continue
+            try:
+                length = len(value)
+            except TypeError:
+                length = -1
+            snapshot[name] = (id(value), length, self._format_value(value))
+        return snapshot
+
+    def _format_value(self, value: Any) -> str:
+        text = self._value_repr.repr(value)
+        if len(text) > self.max_value_length:
+            text = text[:self.max_value_length - 3] + "..."
+        return text
+
+    def _format_state_diff(self, before: Dict[str, Tuple[int, int, str]],
+                           after: Dict[str, Tuple[int, int, str]]) -> str:
+        changed = [
+            f"    {name} = {fingerprint[2]}"
+            for name, fingerprint in after.items()
+            if before.get(name) != fingerprint
+        ]
+        removed = [f"    del {name}" for name in before if name not in after]
+        lines = changed + removed
+        if len(lines) == 0:
+            return "    (none)"
+        if len(lines) > self.max_reported_variables:
+            num_omitted = len(lines) - self.max_reported_variables
+            lines = lines[:self.max_reported_variables]
+            lines.append(f"    ... and {num_omitted} more")
+        return "\n".join(lines)
+
     def step(
         self,
         input_message: BaseMessage,
@@ -117,17 +181,15 @@ class EmbodiedAgent(ChatAgent):
 
         if codes is not None:
             content = "\n> Executed Results:"
-            action_space: Dict[str, Any] = {
-                action.name: action
-                for action in self.action_space
-            }
-            action_space.update({"print": print, "enumerate": enumerate})
-            interpreter = PythonInterpreter(action_space=action_space)
+            snapshot = self._snapshot_state()
             for block_idx, code in enumerate(codes):
-                executed_outputs, _ = code.execute(interpreter)
+                executed_outputs, _ = code.execute(self.interpreter)
+                new_snapshot = self._snapshot_state()
+                state_diff = self._format_state_diff(snapshot, new_snapshot)
+                snapshot = new_snapshot
                 content += (f"Executing code block {block_idx}:\n"
                             f"  - execution output:\n{executed_outputs}\n"
-                            f"  - Local variables:\n{interpreter.state}\n")
+                            f"  - Changed variables:\n{state_diff}\n")
                 content += "*" * 50 + "\n"
 
         # TODO: Handle errors
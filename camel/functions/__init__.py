@@ -11,15 +11,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+from typing import TYPE_CHECKING
 
-from .math_functions import MATH_FUNCS
-from .openai_function import OpenAIFunction
-from .search_functions import SEARCH_FUNCS
-from .weather_functions import WEATHER_FUNCS
+from camel.utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .math_functions import MATH_FUNCS
+    from .function_cache import FunctionCache
+    from .openai_function import OpenAIFunction
+    from .search_functions import SEARCH_FUNCS
+    from .weather_functions import WEATHER_FUNCS
 
 __all__ = [
     'OpenAIFunction',
+    'FunctionCache',
     'MATH_FUNCS',
     'SEARCH_FUNCS',
     'WEATHER_FUNCS',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'MATH_FUNCS': '.math_functions',
+    'FunctionCache': '.function_cache',
+    'OpenAIFunction': '.openai_function',
+    'SEARCH_FUNCS': '.search_functions',
+    'WEATHER_FUNCS': '.weather_functions',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
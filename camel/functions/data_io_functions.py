@@ -11,13 +11,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import codecs
 import json
+import mmap
+import os
 import re
+import zipfile
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from copy import deepcopy
 from hashlib import md5
 from io import BytesIO
-from typing import Any, Dict, List, Optional
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
+from xml.etree import ElementTree
+
+from camel.utils import TextChunker
 
 
 class File(ABC):
@@ -47,17 +66,33 @@ class File(ABC):
 
     @classmethod
     @abstractmethod
-    def from_bytes(cls, file: BytesIO) -> "File":
-        r"""Creates a File object from a BytesIO object.
+    def from_bytes(cls, file: IO[bytes]) -> "File":
+        r"""Creates a File object from a binary stream.
 
         Args:
-            file (BytesIO):
-            A BytesIO object representing the contents of the file.
+            file (IO[bytes]):
+            A binary stream representing the contents of the file.
 
         Returns:
             File: A File object.
         """
 
+    @classmethod
+    def iter_docs(cls, source: "FileSource") -> Iterator[Dict[str, Any]]:
+        r"""Extracts the documents of a file lazily, e.g. page by page, so
+        that only one of them is in memory at a time. By default, the file is
+        read with :meth:`from_bytes`.
+
+        Args:
+            source (FileSource): The path of the file, or a binary stream of
+                its contents.
+
+        Yields:
+            Dict[str, Any]: The documents of the file.
+        """
+        with open_source(source) as file:
+            yield from cls.from_bytes(file).docs
+
     def __repr__(self) -> str:
         return (f"File(name={self.name}, id={self.id}, "
                 f"metadata={self.metadata}, docs={self.docs})")
@@ -77,6 +112,99 @@ class File(ABC):
         )
 
 
+FileSource = Union[str, "os.PathLike[str]", IO[bytes]]
+
+# Size of the blocks read from streams
+_BLOCK_SIZE = 1 << 20
+
+
+@contextmanager
+def open_source(source: FileSource) -> Iterator[IO[bytes]]:
+    r"""Opens the path of a file as a binary stream, or passes a stream
+    through. Only the streams opened here are closed on exit.
+
+    Args:
+        source (FileSource): The path of the file, or a binary stream of its
+            contents.
+
+    Yields:
+        IO[bytes]: The binary stream of the contents of the file.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            yield file
+    else:
+        yield source
+
+
+def _get_local_path(file: IO[bytes]) -> Optional[str]:
+    r"""Returns the path of a stream opened from a local file, if any."""
+    name = getattr(file, "name", None)
+    if (isinstance(name, str) and hasattr(file, "fileno")
+            and os.path.isfile(name)):
+        return name
+    return None
+
+
+def hash_file(source: FileSource) -> str:
+    r"""Computes the MD5 digest identifying the contents of a file, without
+    copying them in memory. Local files are memory-mapped, and other streams
+    are hashed block by block from their start, then moved back to their
+    position.
+
+    Args:
+        source (FileSource): The path of the file, or a binary stream of its
+            contents.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = md5()
+    with open_source(source) as file:
+        if isinstance(file, BytesIO):
+            with file.getbuffer() as buffer:
+                digest.update(buffer)
+            return digest.hexdigest()
+        if _get_local_path(file) is not None:
+            if os.fstat(file.fileno()).st_size > 0:
+                with mmap.mmap(file.fileno(), 0,
+                               access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+            return digest.hexdigest()
+        position = file.tell()
+        file.seek(0)
+        try:
+            for block in iter(lambda: file.read(_BLOCK_SIZE), b""):
+                digest.update(block)
+        finally:
+            file.seek(position)
+    return digest.hexdigest()
+
+
+def _iter_sections(file: IO[bytes]) -> Iterator[str]:
+    r"""Decodes a UTF-8 text stream block by block, and yields its sections,
+    i.e. its runs of non-blank lines."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    lines: List[str] = []
+    pending = ""
+    while True:
+        block = file.read(_BLOCK_SIZE)
+        pending += decoder.decode(block, final=not block)
+        *new_lines, pending = pending.split("\n")
+        if not block:
+            new_lines.append(pending)
+        for line in new_lines:
+            if line.strip():
+                lines.append(line)
+            elif lines:
+                yield "\n".join(lines)
+                lines = []
+        if not block:
+            break
+    if lines:
+        yield "\n".join(lines)
+
+
 def strip_consecutive_newlines(text: str) -> str:
     r"""Strips consecutive newlines from a string.
 
@@ -92,12 +220,12 @@ def strip_consecutive_newlines(text: str) -> str:
 class DocxFile(File):
 
     @classmethod
-    def from_bytes(cls, file: BytesIO) -> "DocxFile":
-        r"""Creates a DocxFile object from a BytesIO object.
+    def from_bytes(cls, file: IO[bytes]) -> "DocxFile":
+        r"""Creates a DocxFile object from a binary stream.
 
         Args:
-            file (BytesIO):
-            A BytesIO object representing the contents of the docx file.
+            file (IO[bytes]):
+            A binary stream representing the contents of the docx file.
 
         Returns:
             DocxFile: A DocxFile object.
@@ -114,56 +242,116 @@ class DocxFile(File):
         # Create a dictionary with the extracted text
         doc = {"page_content": text.strip()}
         # Calculate a unique identifier for the file
-        file_id = md5(file.getvalue()).hexdigest()
+        file_id = hash_file(file)
         # Reset the file pointer to the beginning
         file.seek(0)
         return cls(name=file.name, id=file_id, docs=[doc])
 
+    @classmethod
+    def iter_docs(cls, source: FileSource) -> Iterator[Dict[str, Any]]:
+        r"""Extracts the paragraphs of a docx file lazily, parsing its XML
+        incrementally.
+
+        Args:
+            source (FileSource): The path of the file, or a binary stream of
+                its contents.
+
+        Yields:
+            Dict[str, Any]: One document per non-empty paragraph, with its
+                index under the key "section".
+        """
+        namespace = ("{http://schemas.openxmlformats.org/wordprocessingml/"
+                     "2006/main}")
+        with open_source(source) as file, zipfile.ZipFile(file) as archive, \
+                archive.open("word/document.xml") as document:
+            parts: List[str] = []
+            section = 0
+            for event, element in ElementTree.iterparse(
+                    document, events=("start", "end")):
+                if event == "start":
+                    if element.tag == namespace + "p":
+                        parts = []
+                    continue
+                if element.tag == namespace + "t":
+                    parts.append(element.text or "")
+                elif element.tag == namespace + "tab":
+                    parts.append("\t")
+                elif element.tag in (namespace + "br", namespace + "cr"):
+                    parts.append("\n")
+                elif element.tag == namespace + "p":
+                    text = strip_consecutive_newlines("".join(parts)).strip()
+                    if text:
+                        yield {"page_content": text, "section": section}
+                        section += 1
+                # Paragraphs are cleared once read, so that memory is bounded
+                # by the largest paragraph
+                if element.tag == namespace + "p":
+                    element.clear()
+
 
 class PdfFile(File):
 
     @classmethod
-    def from_bytes(cls, file: BytesIO) -> "PdfFile":
-        r"""Creates a PdfFile object from a BytesIO object.
+    def from_bytes(cls, file: IO[bytes]) -> "PdfFile":
+        r"""Creates a PdfFile object from a binary stream.
 
         Args:
-            file (BytesIO):
-            A BytesIO object representing the contents of the pdf file.
+            file (IO[bytes]):
+            A binary stream representing the contents of the pdf file.
 
         Returns:
             PdfFile: A PdfFile object.
         """
-        # Use fitz to extract text from pdf files
+        # Use fitz to extract text from pdf files, page by page
+        docs = list(cls.iter_docs(file))
+        # Calculate a unique identifier for the file
+        file_id = hash_file(file)
+        # Reset the file pointer to the beginning
+        file.seek(0)
+        return cls(name=file.name, id=file_id, docs=docs)
+
+    @classmethod
+    def iter_docs(cls, source: FileSource) -> Iterator[Dict[str, Any]]:
+        r"""Extracts the pages of a pdf file lazily. Local files are opened
+        by path, so that pages are only loaded when they are extracted.
+
+        Args:
+            source (FileSource): The path of the file, or a binary stream of
+                its contents.
+
+        Yields:
+            Dict[str, Any]: One document per page, with its number under the
+                key "page".
+        """
         try:
             import fitz
         except ImportError:
             raise ImportError("Please install `PyMuPDF` first. "
                               "You can install it by running "
                               "`pip install PyMuPDF`.")
-        pdf = fitz.open(stream=file.read(), filetype="pdf")
-        docs = []
-        for i, page in enumerate(pdf):
-            text = page.get_text(sort=True)
-            text = strip_consecutive_newlines(text)
-            # Create a dictionary with the extracted text
-            doc = {"page_content": text.strip(), "page": i + 1}
-            docs.append(doc)
-        # Calculate a unique identifier for the file
-        file_id = md5(file.getvalue()).hexdigest()
-        # Reset the file pointer to the beginning
-        file.seek(0)
-        return cls(name=file.name, id=file_id, docs=docs)
+        with open_source(source) as file:
+            path = _get_local_path(file)
+            if path is not None:
+                pdf = fitz.open(path, filetype="pdf")
+            else:
+                pdf = fitz.open(stream=file.read(), filetype="pdf")
+        with pdf:
+            for i, page in enumerate(pdf):
+                text = page.get_text(sort=True)
+                text = strip_consecutive_newlines(text)
+                # Create a dictionary with the extracted text
+                yield {"page_content": text.strip(), "page": i + 1}
 
 
 class TxtFile(File):
 
     @classmethod
-    def from_bytes(cls, file: BytesIO) -> "TxtFile":
-        r"""Creates a TxtFile object from a BytesIO object.
+    def from_bytes(cls, file: IO[bytes]) -> "TxtFile":
+        r"""Creates a TxtFile object from a binary stream.
 
         Args:
-            file (BytesIO):
-            A BytesIO object representing the contents of the txt file.
+            file (IO[bytes]):
+            A binary stream representing the contents of the txt file.
 
         Returns:
             TxtFile: A TxtFile object.
@@ -174,21 +362,39 @@ class TxtFile(File):
         # Create a dictionary with the extracted text
         doc = {"page_content": text.strip()}
         # Calculate a unique identifier for the file
-        file_id = md5(file.getvalue()).hexdigest()
+        file_id = hash_file(file)
         # Reset the file pointer to the beginning
         file.seek(0)
         return cls(name=file.name, id=file_id, docs=[doc])
 
+    @classmethod
+    def iter_docs(cls, source: FileSource) -> Iterator[Dict[str, Any]]:
+        r"""Extracts the sections of a txt file lazily, i.e. its runs of
+        non-blank lines, decoding the file block by block.
+
+        Args:
+            source (FileSource): The path of the file, or a binary stream of
+                its contents.
+
+        Yields:
+            Dict[str, Any]: One document per section, with its index under
+                the key "section".
+        """
+        with open_source(source) as file:
+            for i, text in enumerate(_iter_sections(file)):
+                text = strip_consecutive_newlines(text)
+                yield {"page_content": text.strip(), "section": i}
+
 
 class JsonFile(File):
 
     @classmethod
-    def from_bytes(cls, file: BytesIO) -> "JsonFile":
-        r"""Creates a JsonFile object from a BytesIO object.
+    def from_bytes(cls, file: IO[bytes]) -> "JsonFile":
+        r"""Creates a JsonFile object from a binary stream.
 
         Args:
-            file (BytesIO):
-            A BytesIO object representing the contents of the json file.
+            file (IO[bytes]):
+            A binary stream representing the contents of the json file.
 
         Returns:
             JsonFile: A JsonFile object.
@@ -198,7 +404,7 @@ class JsonFile(File):
         # Create a dictionary with the parsed data
         doc = {"page_content": json.dumps(data)}
         # Calculate a unique identifier for the file
-        file_id = md5(file.getvalue()).hexdigest()
+        file_id = hash_file(file)
         # Reset the file pointer to the beginning
         file.seek(0)
         return cls(name=file.name, id=file_id, docs=[doc])
@@ -207,12 +413,12 @@ class JsonFile(File):
 class HtmlFile(File):
 
     @classmethod
-    def from_bytes(cls, file: BytesIO) -> "HtmlFile":
-        r"""Creates a HtmlFile object from a BytesIO object.
+    def from_bytes(cls, file: IO[bytes]) -> "HtmlFile":
+        r"""Creates a HtmlFile object from a binary stream.
 
         Args:
-            file (BytesIO):
-            A BytesIO object representing the contents of the html file.
+            file (IO[bytes]):
+            A binary stream representing the contents of the html file.
 
         Returns:
             HtmlFile: A HtmlFile object.
@@ -230,32 +436,101 @@ class HtmlFile(File):
         # Create a dictionary with the parsed data
         doc = {"page_content": text.strip()}
         # Calculate a unique identifier for the file
-        file_id = md5(file.getvalue()).hexdigest()
+        file_id = hash_file(file)
         # Reset the file pointer to the beginning
         file.seek(0)
         return cls(name=file.name, id=file_id, docs=[doc])
 
 
-def read_file(file: BytesIO) -> File:
+def _get_file_class(name: str) -> Type[File]:
+    r"""Determines the file type based on the file extension."""
+    if name.lower().endswith(".docx"):
+        return DocxFile
+    elif name.lower().endswith(".pdf"):
+        return PdfFile
+    elif name.lower().endswith(".txt"):
+        return TxtFile
+    elif name.lower().endswith(".json"):
+        return JsonFile
+    elif name.lower().endswith(".html"):
+        return HtmlFile
+    else:
+        raise NotImplementedError(
+            f"File type {name.split('.')[-1]} not supported")
+
+
+def _get_source_name(source: FileSource) -> str:
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return str(getattr(source, "name", ""))
+
+
+def read_file(file: FileSource) -> File:
     r"""Reads an uploaded file and returns a File object.
 
     Args:
-        file (BytesIO): A BytesIO object representing the contents of the file.
+        file (FileSource): A BytesIO object representing the contents of the
+            file, or any binary stream with a name, or the path of the file.
 
     Returns:
         File: A File object.
     """
-    # Determine the file type based on the file extension
-    if file.name.lower().endswith(".docx"):
-        return DocxFile.from_bytes(file)
-    elif file.name.lower().endswith(".pdf"):
-        return PdfFile.from_bytes(file)
-    elif file.name.lower().endswith(".txt"):
-        return TxtFile.from_bytes(file)
-    elif file.name.lower().endswith(".json"):
-        return JsonFile.from_bytes(file)
-    elif file.name.lower().endswith(".html"):
-        return HtmlFile.from_bytes(file)
-    else:
-        raise NotImplementedError(
-            f"File type {file.name.split('.')[-1]} not supported")
+    file_class = _get_file_class(_get_source_name(file))
+    with open_source(file) as stream:
+        return file_class.from_bytes(stream)
+
+
+def iter_file_docs(source: FileSource) -> Iterator[Dict[str, Any]]:
+    r"""Extracts the documents of a file lazily, e.g. page by page, so that
+    peak memory is bounded by a document rather than by the file.
+
+    Args:
+        source (FileSource): The path of the file, or a binary stream of its
+            contents with a name.
+
+    Yields:
+        Dict[str, Any]: The documents of the file.
+    """
+    file_class = _get_file_class(_get_source_name(source))
+    yield from file_class.iter_docs(source)
+
+
+def read_files(sources: Sequence[FileSource],
+               max_workers: Optional[int] = None) -> List[File]:
+    r"""Reads a batch of files in a pool of processes.
+
+    Args:
+        sources (Sequence[FileSource]): The paths of the files, or binary
+            streams of their contents with names. Paths are cheaper, as the
+            workers open the files themselves.
+        max_workers (int, optional): The number of processes. If `None`, the
+            number of CPUs is used. (default: :obj:`None`)
+
+    Returns:
+        List[File]: The File objects, in the order of the sources.
+    """
+    if len(sources) <= 1 or max_workers == 1:
+        return [read_file(source) for source in sources]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(read_file, sources))
+
+
+def split_file(file: File, chunker: TextChunker) -> File:
+    r"""Splits the documents of a file into chunks of a target number of
+    tokens.
+
+    Args:
+        file (File): The file to split.
+        chunker (TextChunker): The chunker splitting the documents.
+
+    Returns:
+        File: A copy of the file, with one document per chunk. Each chunk
+            keeps the metadata of its document, e.g. its page, and records
+            its position in the document under the key "chunk".
+    """
+    docs = []
+    for doc in file.docs:
+        for i, chunk in enumerate(chunker.chunk(doc["page_content"])):
+            docs.append({**deepcopy(doc), "page_content": chunk, "chunk": i})
+    return file.__class__(name=file.name, id=file.id,
+                          metadata=deepcopy(file.metadata), docs=docs)
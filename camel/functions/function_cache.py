@@ -0,0 +1,278 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import hashlib
+import json
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+
+class FunctionCache:
+    r"""A cache of the results of a function, with an optional time to live,
+    a least-recently-used size limit and an optional on-disk tier.
+
+    Calls are keyed by the function name and its canonical arguments: the
+    arguments, with the defaults of the function filled in, serialized as
+    JSON with sorted keys. The on-disk tier stores one file per call, written
+    atomically, in a subdirectory per function, so parallel workers sharing
+    the directory reuse each other's results and clearing the results of a
+    function leaves the other ones in place. Expired files are removed when
+    they are read, or by :meth:`prune`.
+
+    Args:
+        ttl (float, optional): The number of seconds a result stays valid. If
+            `None`, results never expire. (default: :obj:`None`)
+        max_size (int, optional): The maximum number of results kept in
+            memory. (default: :obj:`128`)
+        cache_dir (str, optional): The directory of the on-disk tier. If
+            `None`, results are only cached in memory. (default: :obj:`None`)
+        canonicalize (Callable[[Dict[str, Any]], Any], optional): A function
+            mapping the arguments of a call to the value keying the call,
+            e.g. to ignore the case of a query. If `None`, the arguments are
+            used as they are. (default: :obj:`None`)
+    """
+    # Returned by :meth:`get` for calls that are not cached
+    MISSING: Any = object()
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_size: int = 128,
+        cache_dir: Optional[str] = None,
+        canonicalize: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("`max_size` should be larger than 0.")
+        self.ttl = ttl
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self.canonicalize = canonicalize
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._results: "OrderedDict[str, Tuple[Optional[float], Any]]" = (
+            OrderedDict())
+        self._lock = threading.Lock()
+        # The functions keyed by the cache, whose results :meth:`clear`
+        # removes
+        self._func_names: Set[str] = set()
+        self.num_hits = 0
+        self.num_misses = 0
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @property
+    def hit_rate(self) -> float:
+        r"""The share of the lookups answered by the cache.
+
+        Returns:
+            float: The hit rate, or :obj:`0.0` if nothing was looked up.
+        """
+        num_lookups = self.num_hits + self.num_misses
+        return self.num_hits / num_lookups if num_lookups else 0.0
+
+    def make_key(self, func_name: str, args: Dict[str, Any]) -> str:
+        r"""Makes the key of a call.
+
+        Args:
+            func_name (str): The name of the function.
+            args (Dict[str, Any]): The arguments of the call, by name.
+
+        Returns:
+            str: The directory name of the function, followed by the
+                hexadecimal digest of the canonical call.
+        """
+        canonical_args = (self.canonicalize(args)
+                          if self.canonicalize is not None else args)
+        canonical_call = json.dumps([func_name, canonical_args],
+                                    sort_keys=True, separators=(",", ":"),
+                                    default=repr)
+        digest = hashlib.sha256(canonical_call.encode()).hexdigest()
+        with self._lock:
+            self._func_names.add(func_name)
+        return f"{self._get_func_dir_name(func_name)}/{digest}"
+
+    @staticmethod
+    def _get_func_dir_name(func_name: str) -> str:
+        # The hash keeps apart the names sanitized to the same directory name
+        name_digest = hashlib.sha256(func_name.encode()).hexdigest()[:12]
+        return re.sub(r"[^\w-]", "_", func_name) + f"-{name_digest}"
+
+    def _get_path(self, key: str) -> str:
+        assert self.cache_dir is not None
+        return os.path.join(self.cache_dir, *key.split("/")) + ".pkl"
+
+    def _get_func_dirs(self, func_names: Iterable[str]) -> Iterable[str]:
+        assert self.cache_dir is not None
+        for func_name in func_names:
+            yield os.path.join(self.cache_dir,
+                               self._get_func_dir_name(func_name))
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Removed by another worker
+            pass
+
+    def get(self, key: str) -> Any:
+        r"""Looks up the result of a call, first in memory, then on disk.
+
+        Args:
+            key (str): The key of the call.
+
+        Returns:
+            Any: The result, or :obj:`FunctionCache.MISSING` if it is not
+                cached or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                if entry[0] is None or entry[0] > now:
+                    self._results.move_to_end(key)
+                    self.num_hits += 1
+                    return entry[1]
+                del self._results[key]
+
+        if self.cache_dir is not None:
+            try:
+                with open(self._get_path(key), "rb") as f:
+                    entry = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                entry = None
+            if entry is not None and (entry[0] is None or entry[0] > now):
+                with self._lock:
+                    self._put_in_memory(key, entry)
+                    self.num_hits += 1
+                return entry[1]
+            if entry is not None:
+                self._remove_file(self._get_path(key))
+
+        with self._lock:
+            self.num_misses += 1
+        return self.MISSING
+
+    def _put_in_memory(self, key: str, entry: Tuple[Optional[float],
+                                                    Any]) -> None:
+        self._results[key] = entry
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    def put(self, key: str, result: Any) -> None:
+        r"""Caches the result of a call, in memory and on disk.
+
+        Args:
+            key (str): The key of the call.
+            result (Any): The result of the call. It is only cached on disk
+                if it can be pickled.
+        """
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        entry = (expires_at, result)
+        with self._lock:
+            self._put_in_memory(key, entry)
+
+        if self.cache_dir is not None:
+            try:
+                data = pickle.dumps(entry)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                return
+            path = self._get_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+                                            suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    def clear(self, func_name: Optional[str] = None) -> None:
+        r"""Clears the results cached in memory and on disk, and the
+        statistics of the cache. Results of other functions sharing the
+        on-disk tier are left in place.
+
+        Args:
+            func_name (str, optional): The function whose results are
+                cleared. If `None`, the results of all the functions keyed by
+                the cache are cleared. (default: :obj:`None`)
+        """
+        with self._lock:
+            if func_name is None:
+                func_names = set(self._func_names)
+                self._results.clear()
+            else:
+                func_names = {func_name}
+                prefix = f"{self._get_func_dir_name(func_name)}/"
+                for key in list(self._results):
+                    if key.startswith(prefix):
+                        del self._results[key]
+            self.num_hits = 0
+            self.num_misses = 0
+        if self.cache_dir is None:
+            return
+        for func_dir in self._get_func_dirs(func_names):
+            try:
+                file_names = os.listdir(func_dir)
+            except FileNotFoundError:
+                continue
+            for file_name in file_names:
+                if file_name.endswith(".pkl"):
+                    self._remove_file(os.path.join(func_dir, file_name))
+
+    def prune(self) -> int:
+        r"""Removes the expired results of the functions keyed by the cache
+        from the on-disk tier.
+
+        Returns:
+            int: The number of removed results.
+        """
+        if self.cache_dir is None:
+            return 0
+        with self._lock:
+            func_names = set(self._func_names)
+        now = time.time()
+        num_removed = 0
+        for func_dir in self._get_func_dirs(func_names):
+            try:
+                file_names = os.listdir(func_dir)
+            except FileNotFoundError:
+                continue
+            for file_name in file_names:
+                if not file_name.endswith(".pkl"):
+                    continue
+                path = os.path.join(func_dir, file_name)
+                try:
+                    with open(path, "rb") as f:
+                        expires_at = pickle.load(f)[0]
+                except (OSError, EOFError, pickle.UnpicklingError):
+                    continue
+                if expires_at is not None and expires_at <= now:
+                    self._remove_file(path)
+                    num_removed += 1
+        return num_removed
@@ -14,6 +14,8 @@
 
 from typing import List
 
+from camel.utils.lazy_import import lazy_values
+
 from .openai_function import OpenAIFunction
 
 
@@ -56,6 +58,12 @@ def mul(a: int, b: int) -> int:
     return a * b
 
 
-MATH_FUNCS: List[OpenAIFunction] = [
-    OpenAIFunction(func) for func in [add, sub, mul]
-]
+def _make_math_funcs() -> List[OpenAIFunction]:
+    return [OpenAIFunction(func) for func in [add, sub, mul]]
+
+
+# Built on first access, since wrapping the functions parses their docstrings
+# and validates their schemas
+MATH_FUNCS: List[OpenAIFunction]
+
+__getattr__ = lazy_values(__name__, {"MATH_FUNCS": _make_math_funcs})
@@ -11,13 +11,219 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from typing import Any, Callable, Dict, Optional
-
-from jsonschema.validators import Draft202012Validator as JSONValidator
+import asyncio
+import inspect
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
+from camel.functions.function_cache import FunctionCache
+from camel.types import ExecutorType
 from camel.utils import parse_doc
 
 
+def _run_function(
+    func: Callable, args: Dict[str, Any], timeout: Optional[float],
+    positional_args: Tuple = ()) -> Any:
+    r"""Runs a function, awaiting it with the timeout if it is a coroutine
+    function. Module-level so that it can run in worker processes."""
+    if not inspect.iscoroutinefunction(func):
+        return func(*positional_args, **args)
+
+    async def run() -> Any:
+        try:
+            return await asyncio.wait_for(func(*positional_args, **args),
+                                          timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Execution of function {func.__name__} "
+                               f"timed out after {timeout} seconds.")
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+    # Already inside an event loop, run the coroutine on its own loop
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, run()).result()
+
+
+class _CallTimedOut(Exception):
+    r"""Set on the future of a call stopped by the process pool because it
+    exceeded its timeout."""
+
+
+def _function_worker_main(conn: Connection) -> None:
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if task is None:
+            return
+        func, args, timeout, positional_args = task
+        del task
+        try:
+            response = (True,
+                        _run_function(func, args, timeout, positional_args))
+        except Exception as e:
+            response = (False, e)
+        try:
+            conn.send(response)
+        except Exception as e:
+            # The result or the exception cannot be pickled
+            conn.send((False,
+                       RuntimeError(f"Could not send the result of the "
+                                    f"function: {e!r}")))
+        del response
+
+
+class _FunctionWorker():
+
+    def __init__(self) -> None:
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_function_worker_main,
+                                               args=(child_conn, ),
+                                               daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join()
+        self.conn.close()
+
+
+class _FunctionProcessPool():
+    r"""A pool of warm worker processes running the calls of a function. Each
+    worker is driven by its own thread, which knows the call it runs, so a
+    call exceeding its timeout only stops the worker running it, as in
+    :obj:`InterpreterPool`. The workers are started on their first call.
+
+    Args:
+        num_workers (int): The number of worker processes.
+    """
+
+    def __init__(self, num_workers: int) -> None:
+        self._tasks: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._shutdown = False
+        self._kill = False
+        self._lock = threading.Lock()
+        # The workers running a call, stopped on a cancelling shutdown
+        self._busy_workers: Set[_FunctionWorker] = set()
+        self._threads: List[threading.Thread] = []
+        for _ in range(num_workers):
+            thread = threading.Thread(target=self._run_worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(
+        self, func: Callable, args: Dict[str, Any], timeout: Optional[float],
+        positional_args: Tuple = ()) -> Future:
+        r"""Schedules a call of a function in a worker. The timeout counts
+        from the submission, and a call exceeding it fails with
+        :obj:`_CallTimedOut`."""
+        future: Future = Future()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit a call after shutdown.")
+            self._tasks.put(
+                (future, (func, args, timeout, positional_args), deadline))
+        return future
+
+    def shutdown(self, cancel: bool = True) -> None:
+        r"""Stops the workers. If :obj:`cancel` is :obj:`True`, the waiting
+        calls are cancelled and the running ones are stopped, otherwise the
+        scheduled calls finish first."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            self._kill = cancel
+            while cancel:
+                try:
+                    task = self._tasks.get_nowait()
+                except queue.Empty:
+                    break
+                if task is not None:
+                    task[0].cancel()
+            for _ in self._threads:
+                self._tasks.put(None)
+            busy_workers = list(self._busy_workers) if cancel else []
+        for worker in busy_workers:
+            worker.process.kill()
+        if not cancel:
+            for thread in self._threads:
+                thread.join()
+
+    def _run_worker(self) -> None:
+        worker: Optional[_FunctionWorker] = None
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                if worker is not None:
+                    worker.stop(kill=self._kill)
+                return
+            future, message, deadline = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            if deadline is not None and time.monotonic() >= deadline:
+                future.set_exception(_CallTimedOut())
+                continue
+            if worker is None:
+                worker = _FunctionWorker()
+            busy_worker = worker
+            with self._lock:
+                self._busy_workers.add(busy_worker)
+            try:
+                worker = self._run_task(busy_worker, future, message, deadline)
+            finally:
+                with self._lock:
+                    self._busy_workers.discard(busy_worker)
+
+    def _run_task(self, worker: _FunctionWorker, future: Future,
+                  message: Tuple,
+                  deadline: Optional[float]) -> Optional[_FunctionWorker]:
+        r"""Runs a call in a worker, returning the worker for the next call,
+        or :obj:`None` if it was stopped."""
+        try:
+            worker.conn.send(message)
+            timeout = (None if deadline is None else max(
+                deadline - time.monotonic(), 0))
+            if not worker.conn.poll(timeout):
+                worker.stop(kill=True)
+                future.set_exception(_CallTimedOut())
+                return None
+            success, value = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.stop(kill=True)
+            future.set_exception(
+                RuntimeError(f"The worker process exited with code "
+                             f"{worker.process.exitcode}."))
+            return None
+        except BaseException as e:
+            future.set_exception(e)
+            return worker
+
+        if success:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+        return worker
+
+
 class OpenAIFunction:
     r"""An abstraction of a function that OpenAI chat models can call. See
     https://platform.openai.com/docs/guides/gpt/function-calling. If
@@ -38,18 +244,205 @@ class OpenAIFunction:
             `Function calling guide <https://platform.openai.com/docs/guides/gpt/function-calling>`_
             for examples, and the `JSON Schema reference <https://json-schema.org/understanding-json-schema/>`_
             for documentation about the format.
+        cache (FunctionCache, optional): The cache of the results of the
+            function, for functions that are pure, at least over the time to
+            live of the cache. If :obj:`None`, the function is called every
+            time. (default: :obj:`None`)
+        executor_type (ExecutorType, optional): Where the function runs:
+            in the calling thread, in a thread pool, or in a pool of warm
+            worker processes, for CPU-heavy functions that should not hold the
+            GIL. Functions run in processes must be picklable.
+            (default: :obj:`ExecutorType.INLINE`)
+        timeout (float, optional): The number of seconds after which a call
+            is cancelled and raises :obj:`TimeoutError`. Inline, it only
+            applies to :obj:`async def` functions. A call timing out in a
+            thread cannot be interrupted and finishes in the background,
+            while a call timing out in a process stops the worker process
+            running it, the other calls are not affected.
+            If :obj:`None`, calls are not limited. (default: :obj:`None`)
+        max_concurrency (int, optional): The maximum number of concurrent
+            calls, e.g. from agents running in parallel. Extra calls wait for
+            their turn, within their timeout. If :obj:`None`, calls are only
+            limited by the size of the pool. (default: :obj:`None`)
     """
 
     def __init__(self, func: Callable, name: Optional[str] = None,
                  description: Optional[str] = None,
-                 parameters: Optional[Dict[str, Any]] = None):
+                 parameters: Optional[Dict[str, Any]] = None,
+                 cache: Optional[FunctionCache] = None,
+                 executor_type: ExecutorType = ExecutorType.INLINE,
+                 timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None):
+        if (executor_type == ExecutorType.INLINE and timeout is not None
+                and not inspect.iscoroutinefunction(func)):
+            raise ValueError("A timeout on a synchronous function requires "
+                             "a THREAD or PROCESS executor.")
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError("`max_concurrency` should be larger than 0.")
         self.func = func
         self.name = name or func.__name__
+        self.cache = cache
+        self.executor_type = executor_type
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._init_execution_state()
 
         info = parse_doc(self.func)
         self.description = description or info["description"]
         self.parameters = parameters or info["parameters"]
 
+    def _init_execution_state(self) -> None:
+        self._executor: Optional[Union[ThreadPoolExecutor,
+                                       _FunctionProcessPool]] = None
+        self._executor_lock = threading.Lock()
+        # The calls submitted to the pool and not done yet
+        self._futures: Set[Future] = set()
+        self._semaphore = (threading.BoundedSemaphore(self.max_concurrency)
+                           if self.max_concurrency is not None else None)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for key in ["_executor", "_executor_lock", "_futures", "_semaphore"]:
+            del state[key]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_execution_state()
+
+    def shutdown(self, cancel: bool = True) -> None:
+        r"""Releases the pool running the function. It is created again on
+        the next call.
+
+        Args:
+            cancel (bool, optional): Whether to cancel the calls in progress.
+                Calls waiting in the pool are cancelled, and the worker
+                processes of a process pool are stopped. Threads cannot be
+                stopped and finish their call in the background.
+                (default: :obj:`True`)
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+            futures, self._futures = self._futures, set()
+        if executor is None:
+            return
+        if isinstance(executor, _FunctionProcessPool):
+            executor.shutdown(cancel=cancel)
+            return
+        if cancel:
+            for future in futures:
+                future.cancel()
+        executor.shutdown(wait=not cancel)
+
+    def _execute(self, args: Dict[str, Any],
+                 positional_args: Tuple = ()) -> Any:
+        r"""Runs the function following its execution policy."""
+        if self.executor_type == ExecutorType.INLINE:
+            if self._semaphore is None:
+                return _run_function(self.func, args, self.timeout,
+                                     positional_args)
+            if not self._semaphore.acquire(timeout=self.timeout):
+                raise TimeoutError(f"Execution of function {self.name} "
+                                   f"timed out after {self.timeout} seconds "
+                                   "waiting for its turn.")
+            try:
+                return _run_function(self.func, args, self.timeout,
+                                     positional_args)
+            finally:
+                self._semaphore.release()
+
+        with self._executor_lock:
+            executor = self._executor
+            if executor is None:
+                if self.executor_type == ExecutorType.THREAD:
+                    executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix=f"function-{self.name}")
+                else:
+                    executor = _FunctionProcessPool(self.max_concurrency
+                                                    or os.cpu_count() or 1)
+                self._executor = executor
+            if isinstance(executor, _FunctionProcessPool):
+                future = executor.submit(self.func, args, self.timeout,
+                                         positional_args)
+            else:
+                future = executor.submit(_run_function, self.func, args,
+                                         self.timeout, positional_args)
+            self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        if self.executor_type == ExecutorType.PROCESS:
+            # The pool stops the call at the timeout
+            try:
+                return future.result()
+            except _CallTimedOut:
+                raise TimeoutError(f"Execution of function {self.name} "
+                                   f"timed out after {self.timeout} seconds.")
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            if future.done():
+                # Done right at the timeout, or timed out in the function
+                return future.result()
+            future.cancel()
+            raise TimeoutError(f"Execution of function {self.name} timed "
+                               f"out after {self.timeout} seconds.")
+
+    def _bind_arguments(self, *args: Any,
+                        **kwargs: Any) -> Optional[Dict[str, Any]]:
+        r"""Binds the arguments of a call to the parameters of the function,
+        filling in the defaults. Returns :obj:`None` if the arguments do not
+        match the signature, or if the function has variadic parameters,
+        which have no canonical form by name."""
+        try:
+            signature = inspect.signature(self.func)
+            bound = signature.bind(*args, **kwargs)
+        except (TypeError, ValueError):
+            return None
+        if any(param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+               for param in signature.parameters.values()):
+            return None
+        bound.apply_defaults()
+        return dict(bound.arguments)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        r"""Calls the function, through the cache if there is one and
+        following its execution policy. Calls whose arguments cannot be
+        bound by name, e.g. to variadic parameters, bypass the cache."""
+        bound_args = self._bind_arguments(*args, **kwargs)
+        if bound_args is None:
+            return self._execute(kwargs, args)
+        return self.call(bound_args)[0]
+
+    def call(self, args: Dict[str, Any],
+             use_cache: bool = True) -> Tuple[Any, Optional[bool]]:
+        r"""Calls the function with the arguments given by name, looking up
+        the result in the cache first.
+
+        Args:
+            args (Dict[str, Any]): The arguments of the call, by name.
+            use_cache (bool, optional): Whether to use the cache. If
+                :obj:`False`, the function is called and its result is not
+                cached. (default: :obj:`True`)
+
+        Returns:
+            Tuple[Any, Optional[bool]]: The result of the call, and whether it
+                was found in the cache, or :obj:`None` if the cache was not
+                used.
+        """
+        if self.cache is None or not use_cache:
+            return self._execute(args), None
+        bound_args = self._bind_arguments(**args)
+        if bound_args is None:
+            return self._execute(args), None
+
+        key = self.cache.make_key(self.name, bound_args)
+        result = self.cache.get(key)
+        if result is not FunctionCache.MISSING:
+            return result, True
+        result = self._execute(args)
+        self.cache.put(key, result)
+        return result, False
+
     @property
     def parameters(self) -> Dict[str, Any]:
         r"""Getter method for the property :obj:`parameters`.
@@ -70,7 +463,9 @@ class OpenAIFunction:
             value (Dict[str, Any]): the new dictionary value for the
                 function's parameters.
         """
-        JSONValidator.check_schema(value)
+        from jsonschema.validators import Draft202012Validator
+
+        Draft202012Validator.check_schema(value)
         self._parameters = value
 
     def as_dict(self) -> Dict[str, Any]:
@@ -12,12 +12,22 @@
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
 import os
-from typing import Any, Dict, List
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import camel.agents
 from camel.functions import OpenAIFunction
 from camel.messages import BaseMessage
 from camel.prompts import TextPrompt
+from camel.utils import TextChunker
+from camel.utils.lazy_import import lazy_values
 
 
 def search_wiki(entity: str) -> str:
@@ -196,31 +206,80 @@ def create_chunks(text: str, n: int) -> List[str]:
     chunks = []
     i = 0
     while i < len(text):
-        # Find the nearest end of sentence within a range of 0.5 * n
-        # and 1.5 * n tokens
-        j = min(i + int(1.2 * n), len(text))
-        while j > i + int(0.8 * n):
-            # Decode the tokens and check for full stop or newline
-            chunk = text[i:j]
-            if chunk.endswith(".") or chunk.endswith("\n"):
-                break
-            j -= 1
-        # If no end of sentence found, use n tokens as the chunk size
-        if j == i + int(0.8 * n):
+        # Find the nearest end of sentence within a range of 0.8 * n
+        # and 1.2 * n characters
+        start = i + int(0.8 * n)
+        end = min(i + int(1.2 * n), len(text))
+        j = max(text.rfind(".", start, end), text.rfind("\n", start, end))
+        if j >= start:
+            j += 1
+        elif end <= start:
+            j = end
+        else:
+            # If no end of sentence found, use n characters as the chunk size
             j = min(i + n, len(text))
         chunks.append(text[i:j])
         i = j
     return chunks
 
 
+# Max number of tokens of each chunk summarized
+SUMMARY_CHUNK_SIZE = 1000
+# Max number of summaries merged by one call to the model
+SUMMARY_REDUCE_FAN_IN = 8
+# Max number of pages fetched and prompts run concurrently
+SEARCH_MAX_WORKERS = 8
+
+_single_step_agents = threading.local()
+_search_executor: Optional[ThreadPoolExecutor] = None
+_search_executor_lock = threading.Lock()
+
+
+class _SearchCancelled(Exception):
+    r"""Raised by a step of a search whose result is no longer needed."""
+
+
+def _get_search_executor() -> ThreadPoolExecutor:
+    r"""Gets the executor shared by the searches, creating it on the first
+    use. Its threads live as long as the process, so that their single-step
+    agents are reused across searches."""
+    global _search_executor
+    with _search_executor_lock:
+        if _search_executor is None:
+            _search_executor = ThreadPoolExecutor(
+                max_workers=SEARCH_MAX_WORKERS,
+                thread_name_prefix="camel-search")
+        return _search_executor
+
+
+def _check_cancelled(cancelled: Optional[threading.Event]) -> None:
+    if cancelled is not None and cancelled.is_set():
+        raise _SearchCancelled()
+
+
+@lru_cache(maxsize=None)
+def _get_summary_chunker(chunk_size: int) -> TextChunker:
+    return TextChunker(chunk_size=chunk_size)
+
+
+def _get_single_step_agent() -> "camel.agents.ChatAgent":
+    r"""Gets the single-step agent of the current thread, creating it on the
+    first use, so that prompts do not set up a new agent each time."""
+    agent = getattr(_single_step_agents, "agent", None)
+    if agent is None:
+        assistant_sys_msg = BaseMessage.make_assistant_message(
+            role_name="Assistant",
+            content="You are a helpful assistant.",
+        )
+        agent = camel.agents.ChatAgent(assistant_sys_msg)
+        _single_step_agents.agent = agent
+    return agent
+
+
 def prompt_single_step_agent(prompt: str) -> str:
     """Prompt a single-step agent to summarize texts or answer a question."""
 
-    assistant_sys_msg = BaseMessage.make_assistant_message(
-        role_name="Assistant",
-        content="You are a helpful assistant.",
-    )
-    agent = camel.agents.ChatAgent(assistant_sys_msg)
+    agent = _get_single_step_agent()
     agent.reset()
 
     user_msg = BaseMessage.make_user_message(
@@ -233,41 +292,173 @@ def prompt_single_step_agent(prompt: str) -> str:
     return ""
 
 
-def summarize_text(text: str, query: str) -> str:
-    r"""Summarize the information from the text, base on the query if query is
-    given.
+def _fetch(fetch: Callable[[], str],
+           cancelled: Optional[threading.Event] = None) -> str:
+    _check_cancelled(cancelled)
+    return fetch()
 
-    Args:
-        text (string): Text to summarise.
-        query (string): What information you want.
 
-    Returns:
-        string: Strings with information.
-    """
+def _summarize_chunk(query: str, index: int, chunk: str,
+                     cancelled: Optional[threading.Event] = None) -> str:
+    _check_cancelled(cancelled)
     summary_prompt = TextPrompt(
         '''Gather information from this text that relative to the question, but
          do not directly answer the question.\nquestion: {query}\ntext ''')
     summary_prompt = summary_prompt.format(query=query)
-    # Max length of each chunk
-    max_len = 3000
-    results = ""
-    chunks = create_chunks(text, max_len)
-    # Summarize
-    for i, chunk in enumerate(chunks, start=1):
-        prompt = summary_prompt + str(i) + ": " + chunk
-        result = prompt_single_step_agent(prompt)
-        results += result + "\n"
-
-    # Final summarise
+    return prompt_single_step_agent(summary_prompt + str(index) + ": " + chunk)
+
+
+def _answer_from_summaries(query: str, summaries: Sequence[str],
+                           cancelled: Optional[threading.Event] = None) -> str:
+    _check_cancelled(cancelled)
     final_prompt = TextPrompt(
         '''Here are some summarized texts which split from one text, Using the
         information to answer the question: {query}.\n\nText: ''')
     final_prompt = final_prompt.format(query=query)
-    prompt = final_prompt + results
+    results = "".join(summary + "\n" for summary in summaries)
+    return prompt_single_step_agent(final_prompt + results)
 
-    response = prompt_single_step_agent(prompt)
 
-    return response
+def _is_sufficient_answer(query: str, answer: str,
+                          cancelled: Optional[threading.Event] = None) -> bool:
+    _check_cancelled(cancelled)
+    prompt = TextPrompt(
+        '''Do you think the answer: {answer} can answer the query:
+                {query}. Use only 'yes' or 'no' to answer.''')
+    prompt = prompt.format(answer=answer, query=query)
+    reply = prompt_single_step_agent(prompt)
+    return "yes" in str(reply).lower()
+
+
+def _map_reduce_summarize(
+    query: str,
+    fetches: Sequence[Callable[[], str]],
+    executor: ThreadPoolExecutor,
+    check_answers: bool,
+) -> Optional[str]:
+    r"""Answers a query from several texts with a concurrent map-reduce.
+
+    The texts are fetched concurrently. As soon as a text is available, its
+    chunks are summarized concurrently (map), the summaries are merged
+    :obj:`SUMMARY_REDUCE_FAN_IN` at a time until few enough are left
+    (reduce), and the query is answered from the remaining summaries. Every
+    step of every text is a separate task, so that no task waits for another
+    and the pool cannot deadlock. The steps of a text whose answer is no
+    longer needed are cancelled, and the running ones stop before prompting
+    the model.
+
+    Args:
+        query (str): The query to answer.
+        fetches (Sequence[Callable[[], str]]): The functions fetching the
+            texts, from the highest ranked.
+        executor (ThreadPoolExecutor): The executor running the steps.
+        check_answers (bool): Whether to ask the model whether each answer
+            answers the query. If :obj:`True`, the sufficient answer of the
+            highest ranked text is returned, as soon as the answers of the
+            texts ranked above it are known to be insufficient. Otherwise,
+            the answer of the first text is returned.
+
+    Returns:
+        Optional[str]: The answer, or `None` if no answer is sufficient.
+    """
+    # Pending steps, with their stage, text and position in the stage
+    futures: Dict[Future, Tuple[str, int, int]] = {}
+    summaries: Dict[int, List[Optional[str]]] = {}
+    answers: Dict[int, str] = {}
+    sufficient: Dict[int, bool] = {}
+    cancelled = [threading.Event() for _ in fetches]
+
+    def submit(stage: str, source: int, index: int, func: Callable,
+               *args: Any) -> None:
+        future = executor.submit(func, *args, cancelled=cancelled[source])
+        futures[future] = (stage, source, index)
+
+    def cancel_sources(first_source: int) -> None:
+        for source in range(first_source, len(fetches)):
+            cancelled[source].set()
+        for future, (_, source, _) in list(futures.items()):
+            if source >= first_source:
+                future.cancel()
+                del futures[future]
+
+    def reduce_or_answer(source: int) -> None:
+        done_summaries = [summary or "" for summary in summaries[source]]
+        if len(done_summaries) <= SUMMARY_REDUCE_FAN_IN:
+            submit("answer", source, 0, _answer_from_summaries, query,
+                   done_summaries)
+            return
+        num_groups = ((len(done_summaries) + SUMMARY_REDUCE_FAN_IN - 1) //
+                      SUMMARY_REDUCE_FAN_IN)
+        summaries[source] = [None] * num_groups
+        for i in range(num_groups):
+            group = done_summaries[i * SUMMARY_REDUCE_FAN_IN:(i + 1) *
+                                   SUMMARY_REDUCE_FAN_IN]
+            submit("reduce", source, i, _summarize_chunk, query, i + 1,
+                   "\n".join(group))
+
+    for source, fetch in enumerate(fetches):
+        submit("fetch", source, 0, _fetch, fetch)
+    try:
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future not in futures:
+                    continue  # Cancelled by a previous result
+                stage, source, index = futures.pop(future)
+                result = future.result()
+                if stage == "fetch":
+                    chunker = _get_summary_chunker(SUMMARY_CHUNK_SIZE)
+                    chunks = chunker.chunk(result)
+                    summaries[source] = [None] * len(chunks)
+                    for i, chunk in enumerate(chunks):
+                        submit("map", source, i, _summarize_chunk, query,
+                               i + 1, chunk)
+                    if len(chunks) == 0:
+                        reduce_or_answer(source)
+                elif stage in ("map", "reduce"):
+                    summaries[source][index] = result
+                    if all(summary is not None
+                           for summary in summaries[source]):
+                        reduce_or_answer(source)
+                elif stage == "answer":
+                    if not check_answers:
+                        return result
+                    answers[source] = result
+                    submit("check", source, 0, _is_sufficient_answer, query,
+                           result)
+                else:
+                    sufficient[source] = result
+                    if result:
+                        # The texts ranked below are no longer needed
+                        cancel_sources(source + 1)
+            # Return the highest ranked sufficient answer once the texts
+            # ranked above it are checked
+            for source in range(len(fetches)):
+                if source not in sufficient:
+                    break
+                if sufficient[source]:
+                    return answers[source]
+    finally:
+        # Cancel the steps that did not start yet, the running ones stop
+        # before prompting the model
+        cancel_sources(0)
+    return None
+
+
+def summarize_text(text: str, query: str) -> str:
+    r"""Summarize the information from the text, base on the query if query is
+    given.
+
+    Args:
+        text (string): Text to summarise.
+        query (string): What information you want.
+
+    Returns:
+        string: Strings with information.
+    """
+    answer = _map_reduce_summarize(query, [lambda: text],
+                                   _get_search_executor(), check_answers=False)
+    return answer or ""
 
 
 def search_google_and_summarize(query: str) -> str:
@@ -283,27 +474,27 @@ def search_google_and_summarize(query: str) -> str:
     """
     # Google search will return a list of urls
     responses = search_google(query)
-    for item in responses:
-        if "url" in item:
-            url = item.get("url")
-            # Extract text
-            text = text_extract_from_web(str(url))
-            # Using chatgpt summarise text
-            answer = summarize_text(text, query)
-
-            # Let chatgpt decide whether to continue search or not
-            prompt = TextPrompt(
-                '''Do you think the answer: {answer} can answer the query:
-                {query}. Use only 'yes' or 'no' to answer.''')
-            prompt = prompt.format(answer=answer, query=query)
-            reply = prompt_single_step_agent(prompt)
-            if "yes" in str(reply).lower():
-                return answer
+    urls = [str(item.get("url")) for item in responses if "url" in item]
+    fetches = [partial(text_extract_from_web, url) for url in urls]
+    # Let chatgpt decide whether each answer is enough, and stop at the
+    # highest ranked one that is
+    answer = _map_reduce_summarize(query, fetches, _get_search_executor(),
+                                   check_answers=True)
+    if answer is not None:
+        return answer
 
     return "Failed to find the answer from google search."
 
 
-SEARCH_FUNCS: List[OpenAIFunction] = [
-    OpenAIFunction(func)
-    for func in [search_wiki, search_google_and_summarize]
-]
+def _make_search_funcs() -> List[OpenAIFunction]:
+    return [
+        OpenAIFunction(func)
+        for func in [search_wiki, search_google_and_summarize]
+    ]
+
+
+# Built on first access, since wrapping the functions parses their docstrings
+# and validates their schemas
+SEARCH_FUNCS: List[OpenAIFunction]
+
+__getattr__ = lazy_values(__name__, {"SEARCH_FUNCS": _make_search_funcs})
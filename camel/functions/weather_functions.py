@@ -15,6 +15,7 @@ import os
 from typing import List
 
 from camel.functions import OpenAIFunction
+from camel.utils.lazy_import import lazy_values
 
 
 def get_openweathermap_api_key() -> str:
@@ -131,6 +132,12 @@ def get_weather_data(city: str, temp_units: str = 'kelvin',
         return error_message
 
 
-WEATHER_FUNCS: List[OpenAIFunction] = [
-    OpenAIFunction(func) for func in [get_weather_data]
-]
+def _make_weather_funcs() -> List[OpenAIFunction]:
+    return [OpenAIFunction(func) for func in [get_weather_data]]
+
+
+# Built on first access, since wrapping the functions parses their docstrings
+# and validates their schemas
+WEATHER_FUNCS: List[OpenAIFunction]
+
+__getattr__ = lazy_values(__name__, {"WEATHER_FUNCS": _make_weather_funcs})
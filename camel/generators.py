@@ -11,12 +11,154 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from typing import Dict, Generator, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from camel.messages import BaseMessage
 from camel.prompts import PromptTemplateGenerator, TextPrompt
 from camel.types import RoleType, TaskType
 
+T = TypeVar('T')
+U = TypeVar('U')
+
+# A task generation prompt and the assistant and user role names
+_RolePrompt = Tuple[str, Tuple[str, str]]
+
+
+def _as_pair(first: str, second: str) -> Tuple[str, str]:
+    return first, second
+
+
+class _MappedRow():
+    r"""Picklable composition of the row constructor of a grid and a
+    function applied to its rows."""
+
+    def __init__(self, make_row: Callable[..., Any],
+                 func: Callable[..., Any]) -> None:
+        self.make_row = make_row
+        self.func = func
+
+    def __call__(self, *items: Any) -> Any:
+        return self.func(*self.make_row(*items))
+
+
+class GridGenerator(Generic[T]):
+    r"""A lazy generator over the combinations of the items of some lists, in
+    the order of nested loops over the lists, i.e. the last list varies the
+    fastest. Besides iterating it, the combinations can be accessed by
+    index, sliced and split into shards, so a grid can be generated by
+    several machines and resumed from any position. A row is only built
+    when it is accessed. Like a generator, iterating consumes the rows, use
+    :meth:`seek` to iterate them again.
+
+    Args:
+        axes (Sequence[Sequence[Any]]): The lists to combine.
+        make_row (Callable[..., T]): The function building a row from one
+            item of each list.
+        indices (range, optional): The indices of the combinations in the
+            grid of all combinations. If `None`, all the combinations.
+            (default: :obj:`None`)
+    """
+
+    def __init__(self, axes: Sequence[Sequence[Any]], make_row: Callable[...,
+                                                                         T],
+                 indices: Optional[range] = None) -> None:
+        self.axes = axes
+        self.make_row = make_row
+        if indices is None:
+            num_combinations = 1
+            for axis in axes:
+                num_combinations *= len(axis)
+            indices = range(num_combinations)
+        self.indices = indices
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @overload
+    def __getitem__(self, key: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, key: slice) -> 'GridGenerator[T]':
+        ...
+
+    def __getitem__(self, key: Union[int,
+                                     slice]) -> Union[T, 'GridGenerator[T]']:
+        if isinstance(key, slice):
+            return GridGenerator(self.axes, self.make_row, self.indices[key])
+        index = self.indices[key]
+        items = []
+        for axis in reversed(self.axes):
+            index, item_index = divmod(index, len(axis))
+            items.append(axis[item_index])
+        return self.make_row(*reversed(items))
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        if self.position >= len(self.indices):
+            raise StopIteration
+        row = self[self.position]
+        self.position += 1
+        return row
+
+    def seek(self, position: int) -> None:
+        r"""Sets the position of the next row of the iteration, e.g. to
+        resume an interrupted generation.
+
+        Args:
+            position (int): The index of the next row.
+        """
+        self.position = position
+
+    def shard(self, index: int, count: int) -> 'GridGenerator[T]':
+        r"""Returns one of :obj:`count` contiguous shards of about the same
+        size, which together cover the rows of the generator in order.
+
+        Args:
+            index (int): The index of the shard, from 0 to :obj:`count - 1`.
+            count (int): The number of shards.
+
+        Returns:
+            GridGenerator[T]: The generator of the rows of the shard.
+        """
+        if not 0 <= index < count:
+            raise ValueError(f"The shard index should be in [0, {count}). "
+                             f"Got {index} instead.")
+        num_rows = len(self)
+        return self[index * num_rows // count:(index + 1) * num_rows // count]
+
+    def map(self, func: Callable[..., U]) -> 'GridGenerator[U]':
+        r"""Returns a generator of the same combinations whose rows are
+        :obj:`func` applied to the rows of this generator.
+
+        Args:
+            func (Callable[..., U]): The function called with the items of a
+                row of this generator.
+
+        Returns:
+            GridGenerator[U]: The generator of the new rows.
+        """
+        return GridGenerator(self.axes, _MappedRow(self.make_row, func),
+                             self.indices)
+
 
 class SystemMessageGenerator:
     r"""System message generator for agents.
@@ -43,37 +185,21 @@ class SystemMessageGenerator:
             self.sys_prompts = sys_prompts
             self.sys_msg_meta_dict_keys = sys_msg_meta_dict_keys or set()
         else:
-            assistant_prompt_template = PromptTemplateGenerator(
-            ).get_system_prompt(
-                task_type,
-                RoleType.ASSISTANT,
-            )
-            user_prompt_template = PromptTemplateGenerator().get_system_prompt(
-                task_type,
-                RoleType.USER,
-            )
-            critic_prompt_template = PromptTemplateGenerator(
-            ).get_system_prompt(
-                task_type,
-                RoleType.CRITIC,
-            )
-            embodiment_prompt_template = PromptTemplateGenerator(
-            ).get_system_prompt(
-                task_type,
-                RoleType.EMBODIMENT,
-            )
+            prompt_template_generator = PromptTemplateGenerator()
+            prompt_templates = {
+                role_type: prompt_template_generator.get_system_prompt(
+                    task_type, role_type)
+                for role_type in [
+                    RoleType.ASSISTANT, RoleType.USER, RoleType.CRITIC,
+                    RoleType.EMBODIMENT
+                ]
+            }
 
             self.sys_prompts = dict()
-            self.sys_prompts[RoleType.ASSISTANT] = assistant_prompt_template
-            self.sys_prompts[RoleType.USER] = user_prompt_template
-            self.sys_prompts[RoleType.CRITIC] = critic_prompt_template
-            self.sys_prompts[RoleType.EMBODIMENT] = embodiment_prompt_template
-
-            self.sys_msg_meta_dict_keys = (
-                assistant_prompt_template.key_words
-                | user_prompt_template.key_words
-                | critic_prompt_template.key_words
-                | embodiment_prompt_template.key_words)
+            self.sys_prompts.update(prompt_templates)
+            self.sys_msg_meta_dict_keys = set().union(
+                *(prompt_template.key_words
+                  for prompt_template in prompt_templates.values()))
 
         if RoleType.DEFAULT not in self.sys_prompts:
             self.sys_prompts[RoleType.DEFAULT] = "You are a helpful assistant."
@@ -169,10 +295,9 @@ class RoleNameGenerator:
         else:
             self.user_role_names = user_role_names
 
-    def from_role_files(self) -> Generator[Tuple, None, None]:
-        for assistant_role_name in self.assistant_role_names:
-            for user_role_name in self.user_role_names:
-                yield (assistant_role_name, user_role_name)
+    def from_role_files(self) -> GridGenerator[Tuple[str, str]]:
+        return GridGenerator([self.assistant_role_names, self.user_role_names],
+                             _as_pair)
 
 
 class AISocietyTaskPromptGenerator:
@@ -186,30 +311,42 @@ class AISocietyTaskPromptGenerator:
 
         self.num_tasks = num_tasks
 
+    def _make_prompt(self, role_1: str,
+                     role_2: str) -> Tuple[str, Tuple[str, str]]:
+        generate_tasks_prompt = self.generate_tasks_prompt.format(
+            assistant_role=role_1, user_role=role_2, num_tasks=self.num_tasks)
+        return (generate_tasks_prompt, (role_1, role_2))
+
     # TODO: Return role names for user and assistant with the generator.
     def from_role_files(
         self,
         assistant_role_names_path: str = "data/ai_society/assistant_roles.txt",
         user_role_names_path: str = "data/ai_society/user_roles.txt"
-    ) -> Generator[Tuple[str, Tuple[str, str]], None, None]:
+    ) -> GridGenerator[Tuple[str, Tuple[str, str]]]:
         roles_generator = RoleNameGenerator(
             assistant_role_names_path, user_role_names_path).from_role_files()
-        for role_1, role_2 in roles_generator:
-            generate_tasks_prompt = self.generate_tasks_prompt.format(
-                assistant_role=role_1, user_role=role_2,
-                num_tasks=self.num_tasks)
+        return roles_generator.map(self._make_prompt)
 
-            yield (generate_tasks_prompt, (role_1, role_2))
+    @overload
+    def from_role_generator(
+        self, role_generator: GridGenerator[Tuple[str, str]]
+    ) -> GridGenerator[_RolePrompt]:
+        ...
 
+    @overload
     def from_role_generator(
-        self, role_generator: Generator[Tuple, None, None]
-    ) -> Generator[Tuple[str, Tuple[str, str]], None, None]:
-        for role_1, role_2 in role_generator:
-            generate_tasks_prompt = self.generate_tasks_prompt.format(
-                assistant_role=role_1, user_role=role_2,
-                num_tasks=self.num_tasks)
+        self, role_generator: Generator[Tuple[str, str], None, None]
+    ) -> Generator[_RolePrompt, None, None]:
+        ...
 
-            yield (generate_tasks_prompt, (role_1, role_2))
+    def from_role_generator(
+        self, role_generator: Union[GridGenerator[Tuple[str, str]],
+                                    Generator[Tuple[str, str], None, None]]
+    ) -> Union[GridGenerator[_RolePrompt], Generator[_RolePrompt, None, None]]:
+        if isinstance(role_generator, GridGenerator):
+            return role_generator.map(self._make_prompt)
+        return (self._make_prompt(role_1, role_2)
+                for role_1, role_2 in role_generator)
 
 
 class SingleTxtGenerator:
@@ -242,20 +379,19 @@ class CodeTaskPromptGenerator:
 
         self.num_tasks = num_tasks
 
+    def _make_prompt(self, language: str,
+                     domain: str) -> Tuple[TextPrompt, str, str]:
+        generated_tasks_prompt = self.generate_tasks_prompt.format(
+            language=language, domain=domain, num_tasks=self.num_tasks)
+        return generated_tasks_prompt, language, domain
+
     def from_role_files(
         self, languages_path: str = "data/code/languages.txt",
         domains_path: str = "data/code/domains.txt"
-    ) -> Generator[Tuple[TextPrompt, str, str], None, None]:
-        language_generator = SingleTxtGenerator(
-            languages_path).from_role_files()
-
-        for language in language_generator:
-            domains_generator = SingleTxtGenerator(
-                domains_path).from_role_files()
-            for domain in domains_generator:
-                generated_tasks_prompt = self.generate_tasks_prompt.format(
-                    language=language, domain=domain, num_tasks=self.num_tasks)
-                yield generated_tasks_prompt, language, domain
+    ) -> GridGenerator[Tuple[TextPrompt, str, str]]:
+        languages = SingleTxtGenerator(languages_path).data_list
+        domains = SingleTxtGenerator(domains_path).data_list
+        return GridGenerator([languages, domains], self._make_prompt)
 
     def from_role_generator(
         self, role_generator: Generator[Tuple, None, None]
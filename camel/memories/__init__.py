@@ -11,18 +11,36 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+from typing import TYPE_CHECKING
 
-from .records import MemoryRecord, ContextRecord
-from .base import BaseMemory
-from .context_creators.base import BaseContextCreator
-from .context_creators.score_based import ScoreBasedContextCreator
-from .chat_history_memory import ChatHistoryMemory
+from camel.utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .records import (
+        MemoryRecord,
+        ContextRecord,
+    )
+    from .base import BaseMemory
+    from .context_creators.base import BaseContextCreator
+    from .context_creators.score_based import ScoreBasedContextCreator
+    from .chat_history_memory import ChatHistoryMemory
 
 __all__ = [
     'MemoryRecord',
     'ContextRecord',
     'BaseMemory',
     'ChatHistoryMemory',
-    "BaseContextCreator",
-    "ScoreBasedContextCreator",
+    'BaseContextCreator',
+    'ScoreBasedContextCreator',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'MemoryRecord': '.records',
+    'ContextRecord': '.records',
+    'BaseMemory': '.base',
+    'BaseContextCreator': '.context_creators.base',
+    'ScoreBasedContextCreator': '.context_creators.score_based',
+    'ChatHistoryMemory': '.chat_history_memory',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -60,6 +60,21 @@ class BaseMemory(ABC):
         """
         pass
 
+    def get_records(self) -> List[MemoryRecord]:
+        r"""Gets all the records stored in the memory, in writing order. It is
+        used to snapshot the memory, e.g. by :meth:`ChatAgent.get_state`, and
+        memories that cannot list their records do not need to implement it.
+
+        Returns:
+            List[MemoryRecord]: The stored records.
+
+        Raises:
+            NotImplementedError: If the memory does not support snapshots.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support snapshots, since it "
+            f"does not implement `get_records`.")
+
     def write_record(self, record: MemoryRecord) -> None:
         r"""Writes a record to the memory, appending it to existing ones.
 
@@ -105,6 +105,18 @@ class ChatHistoryMemory(BaseMemory):
             stored_records.append(record.to_dict())
         self.storage.save(stored_records)
 
+    def get_records(self) -> List[MemoryRecord]:
+        r"""Gets all the records of the chat history, regardless of the window
+        size.
+
+        Returns:
+            List[MemoryRecord]: The stored records.
+        """
+        return [
+            MemoryRecord.from_dict(record_dict)
+            for record_dict in self.storage.load()
+        ]
+
     def clear(self) -> None:
         r"""Clears all chat messages from the memory.
         """
@@ -11,28 +11,47 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from camel.types import (
-    ChatCompletionSystemMessageParam,
-    ChatCompletionAssistantMessageParam,
-    ChatCompletionUserMessageParam,
-    ChatCompletionFunctionMessageParam,
-    ChatCompletionMessageParam,
-)
+from typing import TYPE_CHECKING, Dict, Tuple, Union
 
-OpenAISystemMessage = ChatCompletionSystemMessageParam
-OpenAIAssistantMessage = ChatCompletionAssistantMessageParam
-OpenAIUserMessage = ChatCompletionUserMessageParam
-OpenAIFunctionMessage = ChatCompletionFunctionMessageParam
-OpenAIMessage = ChatCompletionMessageParam
+from camel.utils.lazy_import import lazy_attributes
 
-from .base import BaseMessage  # noqa: E402
-from .func_message import FunctionCallingMessage  # noqa: E402
+if TYPE_CHECKING:
+    from camel.types import (
+        ChatCompletionSystemMessageParam as OpenAISystemMessage,
+        ChatCompletionAssistantMessageParam as OpenAIAssistantMessage,
+        ChatCompletionUserMessageParam as OpenAIUserMessage,
+        ChatCompletionFunctionMessageParam as OpenAIFunctionMessage,
+        ChatCompletionMessageParam as OpenAIMessage,
+    )
+    from .base import BaseMessage
+    from .func_message import FunctionCallingMessage
 
 __all__ = [
     'OpenAISystemMessage',
     'OpenAIAssistantMessage',
     'OpenAIUserMessage',
+    'OpenAIFunctionMessage',
     'OpenAIMessage',
     'BaseMessage',
     'FunctionCallingMessage',
 ]
+
+# The OpenAI message types are aliases of the types of camel.types
+_OPENAI_MESSAGE_TYPES = {
+    'OpenAISystemMessage': 'ChatCompletionSystemMessageParam',
+    'OpenAIAssistantMessage': 'ChatCompletionAssistantMessageParam',
+    'OpenAIUserMessage': 'ChatCompletionUserMessageParam',
+    'OpenAIFunctionMessage': 'ChatCompletionFunctionMessageParam',
+    'OpenAIMessage': 'ChatCompletionMessageParam',
+}
+
+_LAZY_ATTRIBUTES: Dict[str, Union[str, Tuple[str, str]]] = {
+    name: ('camel.types', type_name)
+    for name, type_name in _OPENAI_MESSAGE_TYPES.items()
+}
+_LAZY_ATTRIBUTES.update({
+    'BaseMessage': '.base',
+    'FunctionCallingMessage': '.func_message',
+})
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -12,17 +12,19 @@
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
-
-from camel.messages import (
-    OpenAIAssistantMessage,
-    OpenAIMessage,
-    OpenAISystemMessage,
-    OpenAIUserMessage,
-)
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
 from camel.prompts import CodePrompt, TextPrompt
 from camel.types import OpenAIBackendRole, RoleType
 
+if TYPE_CHECKING:
+    from camel.messages import (
+        OpenAIAssistantMessage,
+        OpenAIMessage,
+        OpenAISystemMessage,
+        OpenAIUserMessage,
+    )
+
 
 @dataclass
 class BaseMessage:
@@ -164,7 +166,7 @@ class BaseMessage:
     def to_openai_message(
         self,
         role_at_backend: OpenAIBackendRole,
-    ) -> OpenAIMessage:
+    ) -> "OpenAIMessage":
         r"""Converts the message to an :obj:`OpenAIMessage` object.
 
         Args:
@@ -183,7 +185,7 @@ class BaseMessage:
         else:
             raise ValueError(f"Unsupported role: {role_at_backend}.")
 
-    def to_openai_system_message(self) -> OpenAISystemMessage:
+    def to_openai_system_message(self) -> "OpenAISystemMessage":
         r"""Converts the message to an :obj:`OpenAISystemMessage` object.
 
         Returns:
@@ -192,7 +194,7 @@ class BaseMessage:
         """
         return {"role": "system", "content": self.content}
 
-    def to_openai_user_message(self) -> OpenAIUserMessage:
+    def to_openai_user_message(self) -> "OpenAIUserMessage":
         r"""Converts the message to an :obj:`OpenAIUserMessage` object.
 
         Returns:
@@ -200,7 +202,7 @@ class BaseMessage:
         """
         return {"role": "user", "content": self.content}
 
-    def to_openai_assistant_message(self) -> OpenAIAssistantMessage:
+    def to_openai_assistant_message(self) -> "OpenAIAssistantMessage":
         r"""Converts the message to an :obj:`OpenAIAssistantMessage` object.
 
         Returns:
@@ -12,16 +12,18 @@
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
-
-from camel.messages import (
-    BaseMessage,
-    OpenAIAssistantMessage,
-    OpenAIFunctionMessage,
-    OpenAIMessage,
-)
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from camel.messages import BaseMessage
 from camel.types import OpenAIBackendRole
 
+if TYPE_CHECKING:
+    from camel.messages import (
+        OpenAIAssistantMessage,
+        OpenAIFunctionMessage,
+        OpenAIMessage,
+    )
+
 
 @dataclass
 class FunctionCallingMessage(BaseMessage):
@@ -43,7 +45,7 @@ class FunctionCallingMessage(BaseMessage):
     def to_openai_message(
         self,
         role_at_backend: OpenAIBackendRole,
-    ) -> OpenAIMessage:
+    ) -> "OpenAIMessage":
         r"""Converts the message to an :obj:`OpenAIMessage` object.
 
         Args:
@@ -60,7 +62,7 @@ class FunctionCallingMessage(BaseMessage):
         else:
             raise ValueError(f"Unsupported role: {role_at_backend}.")
 
-    def to_openai_assistant_message(self) -> OpenAIAssistantMessage:
+    def to_openai_assistant_message(self) -> "OpenAIAssistantMessage":
         r"""Converts the message to an :obj:`OpenAIAssistantMessage` object.
 
         Returns:
@@ -72,7 +74,7 @@ class FunctionCallingMessage(BaseMessage):
                 "Invalid request for converting into assistant message"
                 " due to missing function name or arguments.")
 
-        msg_dict: OpenAIAssistantMessage = {
+        msg_dict: "OpenAIAssistantMessage" = {
             "role": "assistant",
             "content": self.content,
             "function_call": {
@@ -83,7 +85,7 @@ class FunctionCallingMessage(BaseMessage):
 
         return msg_dict
 
-    def to_openai_function_message(self) -> OpenAIFunctionMessage:
+    def to_openai_function_message(self) -> "OpenAIFunctionMessage":
         r"""Converts the message to an :obj:`OpenAIMessage` object
         with the role being "function".
 
@@ -97,7 +99,7 @@ class FunctionCallingMessage(BaseMessage):
                 " due to missing function name or results.")
 
         result_content = {"result": {str(self.result)}}
-        msg_dict: OpenAIFunctionMessage = {
+        msg_dict: "OpenAIFunctionMessage" = {
             "role": "function",
             "name": self.func_name,
             "content": f'{result_content}',
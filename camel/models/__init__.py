@@ -11,11 +11,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from .base_model import BaseModelBackend
-from .openai_model import OpenAIModel
-from .stub_model import StubModel
-from .open_source_model import OpenSourceModel
-from .model_factory import ModelFactory
+from typing import TYPE_CHECKING
+
+from camel.utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .base_model import BaseModelBackend
+    from .openai_model import OpenAIModel
+    from .stub_model import StubModel
+    from .open_source_model import OpenSourceModel
+    from .model_factory import ModelFactory
 
 __all__ = [
     'BaseModelBackend',
@@ -24,3 +29,13 @@ __all__ = [
     'OpenSourceModel',
     'ModelFactory',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'BaseModelBackend': '.base_model',
+    'OpenAIModel': '.openai_model',
+    'StubModel': '.stub_model',
+    'OpenSourceModel': '.open_source_model',
+    'ModelFactory': '.model_factory',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -11,16 +11,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from .base import TextPrompt, CodePrompt, TextPromptDict
-from .ai_society import AISocietyPromptTemplateDict
-from .code import CodePromptTemplateDict
-from .misalignment import MisalignmentPromptTemplateDict
-from .translation import TranslationPromptTemplateDict
-from .solution_extraction import SolutionExtractionPromptTemplateDict
-from .evaluation import EvaluationPromptTemplateDict
-from .role_description_prompt_template import RoleDescriptionPromptTemplateDict
-from .task_prompt_template import TaskPromptTemplateDict
-from .prompt_templates import PromptTemplateGenerator
+from typing import TYPE_CHECKING
+
+from camel.utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .base import (
+        TextPrompt,
+        CodePrompt,
+        TextPromptDict,
+    )
+    from .ai_society import AISocietyPromptTemplateDict
+    from .code import CodePromptTemplateDict
+    from .misalignment import MisalignmentPromptTemplateDict
+    from .translation import TranslationPromptTemplateDict
+    from .solution_extraction import SolutionExtractionPromptTemplateDict
+    from .evaluation import EvaluationPromptTemplateDict
+    from .role_description_prompt_template import (
+        RoleDescriptionPromptTemplateDict, )
+    from .task_prompt_template import TaskPromptTemplateDict
+    from .prompt_templates import PromptTemplateGenerator
 
 __all__ = [
     'TextPrompt',
@@ -36,3 +46,20 @@ __all__ = [
     'PromptTemplateGenerator',
     'SolutionExtractionPromptTemplateDict',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'TextPrompt': '.base',
+    'CodePrompt': '.base',
+    'TextPromptDict': '.base',
+    'AISocietyPromptTemplateDict': '.ai_society',
+    'CodePromptTemplateDict': '.code',
+    'MisalignmentPromptTemplateDict': '.misalignment',
+    'TranslationPromptTemplateDict': '.translation',
+    'SolutionExtractionPromptTemplateDict': '.solution_extraction',
+    'EvaluationPromptTemplateDict': '.evaluation',
+    'RoleDescriptionPromptTemplateDict': '.role_description_prompt_template',
+    'TaskPromptTemplateDict': '.task_prompt_template',
+    'PromptTemplateGenerator': '.prompt_templates',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -12,10 +12,12 @@
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
 import inspect
+import string
 from typing import (
     Any,
     Callable,
     Dict,
+    FrozenSet,
     List,
     Optional,
     Set,
@@ -25,10 +27,139 @@ from typing import (
 )
 
 from camel.types import RoleType
-from camel.utils import PythonInterpreter
+from camel.utils import (
+    InterpreterPool,
+    PythonInterpreter,
+    get_prompt_template_key_words,
+)
 
 T = TypeVar('T')
 
+_FORMATTER = string.Formatter()
+
+# Literal text, field name, format spec and conversion of a template part
+_TemplatePart = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+_CONVERSIONS: Dict[Optional[str], Callable[[Any], Any]] = {
+    'r': repr,
+    's': str,
+    'a': ascii,
+}
+
+
+class _CompiledTemplate():
+    r"""A template string parsed once into its literal texts and replacement
+    fields, formatting with the semantics of :meth:`TextPrompt.format`.
+
+    Args:
+        template (str): The template string.
+        parts (List[_TemplatePart], optional): The parts of the template as
+            returned by :meth:`string.Formatter.parse`, if they are already
+            known. (default: :obj:`None`)
+        key_words (FrozenSet[str], optional): The key words of the template,
+            if they are already known. (default: :obj:`None`)
+    """
+
+    __slots__ = ('template', 'parts', 'key_words', 'default_kwargs',
+                 'is_simple')
+
+    def __init__(
+        self,
+        template: str,
+        parts: Optional[List[_TemplatePart]] = None,
+        key_words: Optional[FrozenSet[str]] = None,
+    ) -> None:
+        self.template = template
+        is_valid = True
+        if parts is None:
+            try:
+                parts = list(_FORMATTER.parse(template))
+            except ValueError:
+                # Invalid template, `str.format` raises the error
+                parts = []
+                is_valid = False
+        self.parts = parts
+        if key_words is None:
+            key_words = frozenset(get_prompt_template_key_words(template))
+        self.key_words = key_words
+        self.default_kwargs = {key: '{' + key + '}' for key in key_words}
+        # Partial application only derives the parts of the result of
+        # templates without positions, attributes, indices or nested fields.
+        self.is_simple = is_valid and all(
+            name is None or (name.isidentifier() and '{' not in (spec or ''))
+            for _, name, spec, _ in parts)
+
+    def format(self, args: Tuple, kwargs: Dict[str, Any]) -> str:
+        default_kwargs = self.default_kwargs.copy()
+        default_kwargs.update(kwargs)
+        return str.format(self.template, *args, **default_kwargs)
+
+    def partial(self, kwargs: Dict[str, Any]) -> '_CompiledTemplate':
+        text = self.format((), kwargs)
+        if not self.is_simple:
+            return _compile_template(text)
+
+        # Build the parts of the formatted template from the parts of the
+        # template, unless braces in the text would be parsed differently.
+        parts: List[_TemplatePart] = []
+        literal = ''
+        for part_literal, name, spec, conversion in self.parts:
+            literal += part_literal
+            if '{' in part_literal or '}' in part_literal:
+                return _compile_template(text)
+            if name is None:
+                continue
+            if name in kwargs:
+                value = kwargs[name]
+                if conversion is not None:
+                    value = _CONVERSIONS[conversion](value)
+                value = format(value, spec or '')
+                if '{' in value or '}' in value:
+                    return _compile_template(text)
+                literal += value
+            elif spec or conversion is not None:
+                return _compile_template(text)
+            else:
+                parts.append((literal, name, '', None))
+                literal = ''
+        if literal:
+            parts.append((literal, None, None, None))
+        key_words = frozenset(name for _, name, _, _ in parts if name)
+        compiled = _CompiledTemplate(text, parts, key_words)
+        _cache_template(compiled)
+        return compiled
+
+
+_TEMPLATE_CACHE: Dict[str, _CompiledTemplate] = {}
+_TEMPLATE_CACHE_SIZE = 1024
+
+
+def _cache_template(compiled: _CompiledTemplate) -> None:
+    if len(_TEMPLATE_CACHE) >= _TEMPLATE_CACHE_SIZE:
+        # Evict the oldest template
+        try:
+            del _TEMPLATE_CACHE[next(iter(_TEMPLATE_CACHE))]
+        except (KeyError, RuntimeError, StopIteration):
+            pass
+    _TEMPLATE_CACHE[compiled.template] = compiled
+
+
+def _compile_template(template: str) -> _CompiledTemplate:
+    r"""Returns the compiled template of a template string, which is parsed
+    once and cached.
+
+    Args:
+        template (str): The template string.
+
+    Returns:
+        _CompiledTemplate: The compiled template.
+    """
+    compiled = _TEMPLATE_CACHE.get(template)
+    if compiled is None:
+        compiled = _CompiledTemplate(template)
+        _cache_template(compiled)
+    return compiled
+
 
 def return_prompt_wrapper(
     cls: Any,
@@ -59,8 +190,10 @@ def return_prompt_wrapper(
             Union[Any, str]: The converted return value.
         """
         result = func(*args, **kwargs)
-        if isinstance(result, str) and not isinstance(result, cls):
+        if type(result) is str:
             return cls(result)
+        elif isinstance(result, str):
+            return result if isinstance(result, cls) else cls(result)
         elif isinstance(result, tuple):
             new_result = tuple(
                 cls(item) if isinstance(item, str)
@@ -75,6 +208,16 @@ def return_prompt_wrapper(
     return wrapper
 
 
+# Methods of `str` which never return a string or a tuple
+_NON_STR_METHODS = frozenset([
+    '__contains__', '__eq__', '__ge__', '__gt__', '__hash__', '__iter__',
+    '__le__', '__len__', '__lt__', '__ne__', '__sizeof__', 'count', 'encode',
+    'endswith', 'find', 'index', 'isalnum', 'isalpha', 'isascii', 'isdecimal',
+    'isdigit', 'isidentifier', 'islower', 'isnumeric', 'isprintable',
+    'isspace', 'istitle', 'isupper', 'rfind', 'rindex', 'startswith'
+])
+
+
 def wrap_prompt_functions(cls: T) -> T:
     r"""Decorator that wraps functions of a class inherited from :obj:`str`
     with the :obj:`return_text_prompt` decorator.
@@ -88,6 +231,10 @@ def wrap_prompt_functions(cls: T) -> T:
     excluded_attrs = {'__init__', '__new__', '__str__', '__repr__'}
     for attr_name in dir(cls):
         attr_value = getattr(cls, attr_name)
+        if (attr_name in _NON_STR_METHODS
+                and attr_value is getattr(str, attr_name, None)):
+            # The wrapper would return the result unchanged
+            continue
         if callable(attr_value) and attr_name not in excluded_attrs:
             if inspect.isroutine(attr_value):
                 setattr(cls, attr_name, return_prompt_wrapper(cls, attr_value))
@@ -109,8 +256,7 @@ class TextPrompt(str):
     def key_words(self) -> Set[str]:
         r"""Returns a set of strings representing the keywords in the prompt.
         """
-        from camel.utils import get_prompt_template_key_words
-        return get_prompt_template_key_words(self)
+        return set(_compile_template(self).key_words)
 
     def format(self, *args: Any, **kwargs: Any) -> 'TextPrompt':
         r"""Overrides the built-in :obj:`str.format` method to allow for
@@ -125,9 +271,21 @@ class TextPrompt(str):
             TextPrompt: A new :obj:`TextPrompt` object with the format string
                 replaced with the formatted string.
         """
-        default_kwargs = {key: '{' + f'{key}' + '}' for key in self.key_words}
-        default_kwargs.update(kwargs)
-        return TextPrompt(super().format(*args, **default_kwargs))
+        return TextPrompt(_compile_template(self).format(args, kwargs))
+
+    def partial(self, **kwargs: Any) -> 'TextPrompt':
+        r"""Fills some of the keywords of the prompt, like :meth:`format`,
+        and compiles the resulting template from the compiled prompt instead
+        of parsing it again, to format it repeatedly with the other keywords.
+
+        Args:
+            **kwargs (Any): The values of the keywords to fill.
+
+        Returns:
+            TextPrompt: A new :obj:`TextPrompt` object with the given keywords
+                replaced.
+        """
+        return TextPrompt(_compile_template(self).partial(kwargs).template)
 
 
 @wrap_prompt_functions
@@ -172,26 +330,32 @@ class CodePrompt(TextPrompt):
         self._code_type = code_type
 
     def execute(
-        self, interpreter: Optional[PythonInterpreter] = None,
+        self, interpreter: Optional[Union[PythonInterpreter,
+                                          InterpreterPool]] = None,
         user_variable: Optional[Dict[str, Any]] = None
-    ) -> Tuple[Any, PythonInterpreter]:
+    ) -> Tuple[Any, Union[PythonInterpreter, InterpreterPool]]:
         r"""Executes the code string by a given python interpreter.
 
         Args:
-            interpreter (PythonInterpreter, optional): interpreter to be used
-                during code execution. (default: :obj:`None`)
+            interpreter (Union[PythonInterpreter, InterpreterPool], optional):
+                interpreter to be used during code execution. With an
+                :obj:`InterpreterPool`, the code runs in a worker process
+                with a fresh state. (default: :obj:`None`)
             user_variable (Optional[Dict[str, Any]]): varibales that can be
                 used in the code, which applying fuzzy matching, such as images
                 or documents. (default: :obj:`None`)
 
         Returns:
-            Tuple[Any, PythonInterpreter]: A tuple containing the execution
-                result and the used interpreter. The execution result
-                represents the value of the last statement (excluding "import")
-                in the code. This value could potentially be the desired result
-                of the LLM-generated code.        
+            Tuple[Any, Union[PythonInterpreter, InterpreterPool]]: A tuple
+                containing the execution result and the used interpreter. The
+                execution result represents the value of the last statement
+                (excluding "import") in the code. This value could potentially
+                be the desired result of the LLM-generated code.        
     """
         # NOTE: Only supports Python code for now.
+        if isinstance(interpreter, InterpreterPool):
+            return interpreter.execute(self, fuzz_state=user_variable), \
+                interpreter
         if not interpreter:
             interpreter = PythonInterpreter(action_space=globals())
         execution_res = interpreter.execute(self, fuzz_state=user_variable,
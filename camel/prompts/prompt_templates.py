@@ -11,28 +11,57 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import threading
 import warnings
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
-from camel.prompts import TaskPromptTemplateDict, TextPrompt
+from camel.prompts import TaskPromptTemplateDict, TextPrompt, TextPromptDict
 from camel.types import RoleType, TaskType
 
 
+class _SharedTaskPromptTemplateDict(Dict[Any, TextPromptDict]):
+    r"""A dictionary of the task prompt templates of
+    :obj:`TaskPromptTemplateDict`, creating the prompt template dictionary of
+    a task type on its first lookup."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def __missing__(self, task_type: Any) -> TextPromptDict:
+        template_dict_class = TaskPromptTemplateDict.TEMPLATE_DICT_CLASSES.get(
+            task_type)
+        if template_dict_class is None:
+            raise KeyError(task_type)
+        with self._lock:
+            # Another thread may have created it meanwhile
+            if task_type not in self:
+                self[task_type] = template_dict_class()
+            return dict.__getitem__(self, task_type)
+
+
+# The task prompt templates shared by the generators created without custom
+# templates
+_SHARED_TASK_PROMPT_TEMPLATE_DICT = _SharedTaskPromptTemplateDict()
+
+
 class PromptTemplateGenerator:
     r"""A class for generating prompt templates for tasks.
 
     Args:
         task_prompt_template_dict (TaskPromptTemplateDict, optional):
             A dictionary of task prompt templates for each task type. If not
-            provided, an empty dictionary is used as default.
+            provided, the task prompt templates shared by the process are
+            used, whose templates are created on first use.
+            (default: :obj:`None`)
     """
 
     def __init__(
         self,
         task_prompt_template_dict: Optional[TaskPromptTemplateDict] = None,
     ) -> None:
-        self.task_prompt_template_dict = (task_prompt_template_dict
-                                          or TaskPromptTemplateDict())
+        self.task_prompt_template_dict: Dict[Any, TextPromptDict] = (
+            task_prompt_template_dict or _SHARED_TASK_PROMPT_TEMPLATE_DICT)
 
     def get_prompt_from_key(self, task_type: TaskType, key: Any) -> TextPrompt:
         r"""Generates a text prompt using the specified :obj:`task_type` and
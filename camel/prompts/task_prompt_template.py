@@ -11,7 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from typing import Any, Dict
+from typing import Any, Dict, Type
 
 from camel.prompts import (
     AISocietyPromptTemplateDict,
@@ -35,22 +35,20 @@ class TaskPromptTemplateDict(Dict[Any, TextPromptDict]):
         *args: Positional arguments passed to the :obj:`dict` constructor.
         **kwargs: Keyword arguments passed to the :obj:`dict` constructor.
     """
+    TEMPLATE_DICT_CLASSES: Dict[TaskType, Type[TextPromptDict]] = {
+        TaskType.AI_SOCIETY: AISocietyPromptTemplateDict,
+        TaskType.CODE: CodePromptTemplateDict,
+        TaskType.MISALIGNMENT: MisalignmentPromptTemplateDict,
+        TaskType.TRANSLATION: TranslationPromptTemplateDict,
+        TaskType.EVALUATION: EvaluationPromptTemplateDict,
+        TaskType.SOLUTION_EXTRACTION: SolutionExtractionPromptTemplateDict,
+        TaskType.ROLE_DESCRIPTION: RoleDescriptionPromptTemplateDict,
+    }
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.update({
-            TaskType.AI_SOCIETY:
-            AISocietyPromptTemplateDict(),
-            TaskType.CODE:
-            CodePromptTemplateDict(),
-            TaskType.MISALIGNMENT:
-            MisalignmentPromptTemplateDict(),
-            TaskType.TRANSLATION:
-            TranslationPromptTemplateDict(),
-            TaskType.EVALUATION:
-            EvaluationPromptTemplateDict(),
-            TaskType.SOLUTION_EXTRACTION:
-            SolutionExtractionPromptTemplateDict(),
-            TaskType.ROLE_DESCRIPTION:
-            RoleDescriptionPromptTemplateDict(),
+            task_type: template_dict_class()
+            for task_type, template_dict_class in
+            self.TEMPLATE_DICT_CLASSES.items()
         })
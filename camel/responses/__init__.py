@@ -11,8 +11,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from .agent_responses import ChatAgentResponse
+from typing import TYPE_CHECKING
+
+from camel.utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .agent_responses import ChatAgentResponse
 
 __all__ = [
     'ChatAgentResponse',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'ChatAgentResponse': '.agent_responses',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
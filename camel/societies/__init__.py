@@ -11,10 +11,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from .role_playing import RolePlaying
-from .babyagi_playing import BabyAGI
+from typing import TYPE_CHECKING
+
+from camel.utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .role_playing import RolePlaying
+    from .babyagi_playing import BabyAGI
+    from .role_playing_runner import (
+        RolePlayingJob,
+        RolePlayingRunStats,
+        RolePlayingRunner,
+        run_role_playing_session,
+    )
+    from .role_playing_template import RolePlayingTemplate
 
 __all__ = [
     'RolePlaying',
     'BabyAGI',
+    'RolePlayingJob',
+    'RolePlayingRunStats',
+    'RolePlayingRunner',
+    'run_role_playing_session',
+    'RolePlayingTemplate',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'RolePlaying': '.role_playing',
+    'BabyAGI': '.babyagi_playing',
+    'RolePlayingJob': '.role_playing_runner',
+    'RolePlayingRunStats': '.role_playing_runner',
+    'RolePlayingRunner': '.role_playing_runner',
+    'run_role_playing_session': '.role_playing_runner',
+    'RolePlayingTemplate': '.role_playing_template',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -11,8 +11,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import pickle
+import threading
+import zlib
 from collections import deque
-from typing import Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
 
 from camel.agents import (
     ChatAgent,
@@ -25,6 +29,7 @@ from camel.generators import SystemMessageGenerator
 from camel.messages import BaseMessage
 from camel.prompts import TextPrompt
 from camel.types import RoleType, TaskType
+from camel.utils import TaskIndex
 
 
 class BabyAGI:
@@ -59,6 +64,22 @@ class BabyAGI:
         message_window_size (int, optional): The maximum number of previous
             messages to include in the context window. If `None`, no windowing
             is performed. (default: :obj:`None`)
+        max_pending_updates (int, optional): The number of task list updates,
+            i.e. task creation and prioritization for the result of a solved
+            task, that may still be running when the next task starts being
+            executed. With :obj:`0`, every step waits for the task list to be
+            updated, which is the original serial behavior. Higher values
+            take the update off the critical path of the steps, so a step
+            only lasts as long as the execution of its task, at the cost of
+            picking the next tasks from a task list that does not reflect the
+            latest results yet. The updates are applied in order as soon as
+            they are done, each keeping the tasks queued by the previous
+            ones. (default: :obj:`0`)
+        task_index (TaskIndex, optional): An index of the tasks used to drop
+            the created tasks duplicating a solved or pending task before they
+            are queued, each of which saves an assistant step and a task list
+            update. If `None`, duplicates are only avoided by the task
+            creation agent itself. (default: :obj:`None`)
     """
 
     def __init__(
@@ -76,10 +97,11 @@ class BabyAGI:
         extend_task_specify_meta_dict: Optional[Dict] = None,
         output_language: Optional[str] = None,
         message_window_size: Optional[int] = None,
+        max_pending_updates: int = 0,
+        task_index: Optional[TaskIndex] = None,
     ) -> None:
-        self.task_type = task_type
-        self.task_prompt = task_prompt
-        self.specified_task_prompt: TextPrompt
+        self._init_session(task_type, task_prompt, max_task_history,
+                           max_pending_updates, task_index)
         self.init_specified_task_prompt(assistant_role_name, user_role_name,
                                         task_specify_agent_kwargs,
                                         extend_task_specify_meta_dict,
@@ -101,19 +123,58 @@ class BabyAGI:
             ],
         )
 
-        self.assistant_agent: ChatAgent
-        self.assistant_sys_msg: BaseMessage
-        self.task_creation_agent: TaskCreationAgent
-        self.task_prioritization_agent: TaskPrioritizationAgent
         self.init_agents(init_assistant_sys_msg[0], assistant_agent_kwargs,
                          task_creation_agent_kwargs,
                          task_prioritization_agent_kwargs, output_language,
                          message_window_size)
 
+    def _init_session(self, task_type: TaskType, task_prompt: str,
+                      max_task_history: int, max_pending_updates: int,
+                      task_index: Optional[TaskIndex]) -> None:
+        r"""Sets the configuration of the session and its empty task list,
+        before the task prompt is specified and the agents are created.
+        Shared by the constructor and :meth:`from_snapshot`, which fill in the
+        rest of the session differently.
+
+        Args:
+            task_type (TaskType): The type of task to perform.
+            task_prompt (str): A prompt for the task to be performed.
+            max_task_history (int): The maximum number of previous tasks
+                information to include in the task agent.
+            max_pending_updates (int): The number of task list updates that
+                may still be running when the next task starts being
+                executed.
+            task_index (TaskIndex, optional): An index of the tasks used to
+                drop duplicate created tasks.
+        """
+        if max_pending_updates < 0:
+            raise ValueError("`max_pending_updates` should be non-negative. "
+                             f"Got {max_pending_updates} instead.")
+        self.task_type = task_type
+        self.task_prompt = task_prompt
+        self.specified_task_prompt: TextPrompt
+
+        self.assistant_agent: ChatAgent
+        self.assistant_sys_msg: BaseMessage
+        self.task_creation_agent: TaskCreationAgent
+        self.task_prioritization_agent: TaskPrioritizationAgent
+
         self.subtasks: deque = deque([])
         self.solved_subtasks: List[str] = []
         self.MAX_TASK_HISTORY = max_task_history
 
+        self.task_index = task_index
+        self.num_duplicate_subtasks = 0
+        self.num_llm_calls_saved = 0
+        # Guards the statistics, updated by the steps and the updates.
+        self._stats_lock = threading.Lock()
+
+        self.max_pending_updates = max_pending_updates
+        self._update_executor: Optional[ThreadPoolExecutor] = None
+        # The running updates, with the number of solved tasks and the
+        # pending tasks when they were started.
+        self._pending_updates: Deque[Tuple[Future, int, List[str]]] = deque()
+
     def init_specified_task_prompt(
             self, assistant_role_name: str, user_role_name: str,
             task_specify_agent_kwargs: Optional[Dict],
@@ -200,20 +261,138 @@ class BabyAGI:
         )
         self.task_prioritization_agent.reset()
 
+    @property
+    def num_pending_updates(self) -> int:
+        r"""The number of task list updates not applied yet.
+
+        Returns:
+            int: The number of pending updates.
+        """
+        return len(self._pending_updates)
+
+    def wait_for_updates(self) -> None:
+        r"""Blocks until all the task list updates are done and applies them,
+        so that :obj:`subtasks` reflects the results of all solved tasks."""
+        self._apply_updates(max_pending_updates=0)
+
+    def close(self) -> None:
+        r"""Waits for the task list updates and stops the thread running
+        them. The session can still be stepped afterwards, which starts a new
+        thread."""
+        try:
+            self.wait_for_updates()
+        finally:
+            # Only left if an update failed
+            for future, _, _ in self._pending_updates:
+                future.cancel()
+            self._pending_updates.clear()
+            if self._update_executor is not None:
+                self._update_executor.shutdown()
+                self._update_executor = None
+
+    def __enter__(self) -> "BabyAGI":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _apply_updates(self, max_pending_updates: int) -> None:
+        # Also wait for the updates while there is no task to run next.
+        while self._pending_updates and (
+                len(self._pending_updates) > max_pending_updates
+                or self._pending_updates[0][0].done() or not self.subtasks):
+            future, num_solved_subtasks, update_subtasks = (
+                self._pending_updates.popleft())
+            prioritized_subtask_list = future.result()
+            if prioritized_subtask_list is None:
+                print("no new tasks")
+                continue
+            # Drop the tasks started while the update was running.
+            started_subtasks = set(self.solved_subtasks[num_solved_subtasks:])
+            subtasks = [
+                subtask for subtask in prioritized_subtask_list
+                if subtask not in started_subtasks
+            ]
+            # Keep the tasks queued by the updates applied since this one
+            # was started, which it did not prioritize.
+            update_subtask_set = set(update_subtasks).union(subtasks)
+            subtasks.extend(subtask for subtask in self.subtasks
+                            if subtask not in update_subtask_set)
+            self.subtasks = deque(subtasks)
+
+    def _filter_duplicates(self, subtasks: List[str]) -> List[str]:
+        r"""Drops the tasks duplicating an indexed task, if there is a task
+        index.
+
+        Args:
+            subtasks (List[str]): The created tasks.
+
+        Returns:
+            List[str]: The new tasks.
+        """
+        if self.task_index is None:
+            return subtasks
+        new_subtasks = self.task_index.filter(subtasks)
+        num_duplicates = len(subtasks) - len(new_subtasks)
+        with self._stats_lock:
+            self.num_duplicate_subtasks += num_duplicates
+            # Each duplicate would have cost an assistant step and a task
+            # creation, plus a prioritization if the creation gave new tasks.
+            self.num_llm_calls_saved += 2 * num_duplicates
+        return new_subtasks
+
+    def _update_subtasks(self, assistant_msg: BaseMessage,
+                         past_tasks: List[str],
+                         subtasks: List[str]) -> Optional[List[str]]:
+        r"""Creates new tasks from the result of a solved task and
+        re-prioritizes the task list.
+
+        Args:
+            assistant_msg (BaseMessage): The result of the solved task.
+            past_tasks (List[str]): The solved and pending tasks.
+            subtasks (List[str]): The pending tasks.
+
+        Returns:
+            Optional[List[str]]: The prioritized task list, or `None` if no
+                new task was created.
+        """
+        self.task_creation_agent.record_message(assistant_msg)
+        self.task_prioritization_agent.record_message(assistant_msg)
+
+        new_subtask_list = self.task_creation_agent.run(
+            task_list=past_tasks[-self.MAX_TASK_HISTORY:])
+        if not new_subtask_list:
+            return None
+        new_subtask_list = self._filter_duplicates(new_subtask_list)
+        if not new_subtask_list:
+            # The prioritization is skipped as well.
+            with self._stats_lock:
+                self.num_llm_calls_saved += 1
+            return None
+        subtasks = subtasks + new_subtask_list
+        return self.task_prioritization_agent.run(
+            task_list=subtasks[-self.MAX_TASK_HISTORY:])
+
     def step(self) -> ChatAgentResponse:
         r"""BabyAGI agent would pull the first task from the task list,
         complete the task based on the context, then creates new tasks and
         re-prioritizes the task list based on the objective and the result of
         the previous task. It returns assistant message.
 
+        If :obj:`max_pending_updates` is positive, the creation and
+        prioritization of the new tasks run in the background while the next
+        steps execute the following tasks.
+
         Returns:
             ChatAgentResponse: it contains the resulting assistant message,
             whether the assistant agent terminated the conversation,
             and any additional assistant information.
 
         """
+        self._apply_updates(self.max_pending_updates)
         if not self.subtasks:
-            new_subtask_list = self.task_creation_agent.run(task_list=[])
+            new_subtask_list = self._filter_duplicates(
+                self.task_creation_agent.run(task_list=[]))
             prioritized_subtask_list = self.task_prioritization_agent.run(
                 new_subtask_list)
             self.subtasks = deque(prioritized_subtask_list)
@@ -225,24 +404,38 @@ class BabyAGI:
         assistant_response = self.assistant_agent.step(assistant_msg_msg)
         assistant_msg = assistant_response.msgs[0]
         self.assistant_agent.record_message(assistant_msg)
-        self.task_creation_agent.record_message(assistant_msg)
-        self.task_prioritization_agent.record_message(assistant_msg)
 
         self.solved_subtasks.append(task_name)
-        past_tasks = self.solved_subtasks + list(self.subtasks)
+        if self.task_index is not None:
+            # The task may have been reworded by the prioritization.
+            self.task_index.add(task_name)
+        pending_subtasks = list(self.subtasks)
+        past_tasks = self.solved_subtasks + pending_subtasks
 
-        new_subtask_list = self.task_creation_agent.run(
-            task_list=past_tasks[-self.MAX_TASK_HISTORY:])
-
-        if new_subtask_list:
-            self.subtasks.extend(new_subtask_list)
-            prioritized_subtask_list = self.task_prioritization_agent.run(
-                task_list=list(self.subtasks)[-self.MAX_TASK_HISTORY:])
-            self.subtasks = deque(prioritized_subtask_list)
+        if self.max_pending_updates > 0:
+            if self._update_executor is None:
+                # A single worker keeps the updates in order, and the task
+                # agents out of reach of concurrent calls.
+                self._update_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="BabyAGI")
+            future = self._update_executor.submit(self._update_subtasks,
+                                                  assistant_msg, past_tasks,
+                                                  pending_subtasks)
         else:
-            print("no new tasks")
+            future = Future()
+            future.set_result(
+                self._update_subtasks(assistant_msg, past_tasks,
+                                      pending_subtasks))
+        self._pending_updates.append(
+            (future, len(self.solved_subtasks), pending_subtasks))
+        self._apply_updates(self.max_pending_updates)
+
         assistant_response.info['task_name'] = task_name
         assistant_response.info['subtasks'] = list(self.subtasks)
+        assistant_response.info['num_pending_updates'] = (
+            self.num_pending_updates)
+        assistant_response.info['num_llm_calls_saved'] = (
+            self.num_llm_calls_saved)
         if not self.subtasks:
             terminated = True
             assistant_response.info[
@@ -252,3 +445,107 @@ class BabyAGI:
         return ChatAgentResponse([assistant_msg],
                                  assistant_response.terminated,
                                  assistant_response.info)
+
+    def snapshot(self) -> bytes:
+        r"""Serializes the state of the session, including the specified task
+        prompt, the memories of the agents and the solved and pending
+        subtasks, into a compact blob. The session can be restored from the
+        blob with :meth:`from_snapshot`, possibly in another process, and
+        continued from the same step without calling the task specify agent
+        again.
+
+        Note that the blob is pickled, so only restore snapshots from trusted
+        sources.
+
+        Returns:
+            bytes: The snapshot of the session.
+        """
+        self.wait_for_updates()
+        state = dict(
+            task_type=self.task_type,
+            task_prompt=self.task_prompt,
+            specified_task_prompt=self.specified_task_prompt,
+            max_task_history=self.MAX_TASK_HISTORY,
+            subtasks=list(self.subtasks),
+            solved_subtasks=self.solved_subtasks,
+            task_index=self.task_index,
+            num_duplicate_subtasks=self.num_duplicate_subtasks,
+            num_llm_calls_saved=self.num_llm_calls_saved,
+            assistant_agent=self.assistant_agent.get_state(),
+            task_creation_agent=self.task_creation_agent.get_state(),
+            task_prioritization_agent=(
+                self.task_prioritization_agent.get_state()),
+        )
+        return zlib.compress(pickle.dumps(state))
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot: bytes,
+        assistant_agent_kwargs: Optional[Dict] = None,
+        task_creation_agent_kwargs: Optional[Dict] = None,
+        task_prioritization_agent_kwargs: Optional[Dict] = None,
+        message_window_size: Optional[int] = None,
+        max_pending_updates: int = 0,
+    ) -> "BabyAGI":
+        r"""Restores a session from a blob returned by :meth:`snapshot`.
+
+        Args:
+            snapshot (bytes): The snapshot of the session.
+            assistant_agent_kwargs (Dict, optional): Additional arguments to
+                pass to the assistant agent. The model type and configuration
+                default to the snapshotted ones. (default: :obj:`None`)
+            task_creation_agent_kwargs (Dict, optional): Additional arguments
+                to pass to the task creation agent. (default: :obj:`None`)
+            task_prioritization_agent_kwargs (Dict, optional): Additional
+                arguments to pass to the task prioritization agent.
+                (default: :obj:`None`)
+            message_window_size (int, optional): The maximum number of previous
+                messages to include in the context window. If `None`, no
+                windowing is performed. (default: :obj:`None`)
+            max_pending_updates (int, optional): The number of task list
+                updates that may still be running when the next task starts
+                being executed. (default: :obj:`0`)
+
+        Returns:
+            BabyAGI: The restored session.
+        """
+        state = pickle.loads(zlib.decompress(snapshot))
+        babyagi = cls.__new__(cls)
+        babyagi._init_session(state["task_type"], state["task_prompt"],
+                              state["max_task_history"], max_pending_updates,
+                              state["task_index"])
+        babyagi.specified_task_prompt = state["specified_task_prompt"]
+        babyagi.subtasks = deque(state["subtasks"])
+        babyagi.solved_subtasks = list(state["solved_subtasks"])
+        babyagi.num_duplicate_subtasks = state["num_duplicate_subtasks"]
+        babyagi.num_llm_calls_saved = state["num_llm_calls_saved"]
+
+        assistant_state = state["assistant_agent"]
+        task_creation_state = state["task_creation_agent"]
+        task_prioritization_state = state["task_prioritization_agent"]
+        babyagi.init_agents(
+            assistant_state["orig_sys_message"],
+            {
+                "model_type": assistant_state["model_type"],
+                "model_config": assistant_state["model_config"],
+                **(assistant_agent_kwargs or {})
+            },
+            {
+                "model_type": task_creation_state["model_type"],
+                "model_config": task_creation_state["model_config"],
+                **(task_creation_agent_kwargs or {})
+            },
+            {
+                "model_type": task_prioritization_state["model_type"],
+                "model_config": task_prioritization_state["model_config"],
+                **(task_prioritization_agent_kwargs or {})
+            },
+            assistant_state["output_language"],
+            message_window_size,
+        )
+        babyagi.assistant_agent.load_state(assistant_state)
+        babyagi.assistant_sys_msg = babyagi.assistant_agent.system_message
+        babyagi.task_creation_agent.load_state(task_creation_state)
+        babyagi.task_prioritization_agent.load_state(task_prioritization_state)
+        return babyagi
@@ -11,6 +11,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import pickle
+import zlib
 from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 from camel.agents import (
@@ -24,9 +26,31 @@ from camel.human import Human
 from camel.messages import BaseMessage
 from camel.prompts import TextPrompt
 from camel.responses import ChatAgentResponse
+from camel.terminators import ResponseTerminator
 from camel.types import ModelType, RoleType, TaskType
 
 
+def add_response_terminators(
+        agent_kwargs: Optional[Dict],
+        response_terminators: List[ResponseTerminator]) -> Dict:
+    r"""Adds response terminators to the arguments of a chat agent.
+
+    Args:
+        agent_kwargs (Dict, optional): The arguments of the agent.
+        response_terminators (List[ResponseTerminator]): The terminators to
+            bind to the agent.
+
+    Returns:
+        Dict: A copy of the arguments with the terminators added.
+    """
+    agent_kwargs = dict(agent_kwargs or {})
+    agent_kwargs["response_terminators"] = [
+        *(agent_kwargs.get("response_terminators") or []),
+        *response_terminators,
+    ]
+    return agent_kwargs
+
+
 class RolePlaying:
     r"""Role playing between two agents.
 
@@ -71,6 +95,12 @@ class RolePlaying:
             task specify meta dict with. (default: :obj:`None`)
         output_language (str, optional): The language to be output by the
             agents. (default: :obj:`None`)
+        assistant_response_terminators (List[ResponseTerminator], optional):
+            Terminators bound to the assistant agent, in addition to the
+            ones in :obj:`assistant_agent_kwargs`. (default: :obj:`None`)
+        user_response_terminators (List[ResponseTerminator], optional):
+            Terminators bound to the user agent, in addition to the ones in
+            :obj:`user_agent_kwargs`. (default: :obj:`None`)
     """
 
     def __init__(
@@ -95,21 +125,18 @@ class RolePlaying:
         extend_sys_msg_meta_dicts: Optional[List[Dict]] = None,
         extend_task_specify_meta_dict: Optional[Dict] = None,
         output_language: Optional[str] = None,
+        assistant_response_terminators: Optional[
+            List[ResponseTerminator]] = None,
+        user_response_terminators: Optional[List[ResponseTerminator]] = None,
     ) -> None:
-        self.with_task_specify = with_task_specify
-        self.with_task_planner = with_task_planner
-        self.with_critic_in_the_loop = with_critic_in_the_loop
-        self.model_type = model_type
-        self.task_type = task_type
-        self.task_prompt = task_prompt
-
-        self.specified_task_prompt: Optional[TextPrompt] = None
+        self._init_session(task_prompt, with_task_specify=with_task_specify,
+                           with_task_planner=with_task_planner,
+                           with_critic_in_the_loop=with_critic_in_the_loop,
+                           model_type=model_type, task_type=task_type)
         self.init_specified_task_prompt(assistant_role_name, user_role_name,
                                         task_specify_agent_kwargs,
                                         extend_task_specify_meta_dict,
                                         output_language)
-
-        self.planned_task_prompt: Optional[TextPrompt] = None
         self.init_planned_task_prompt(task_planner_agent_kwargs,
                                       output_language)
 
@@ -121,10 +148,13 @@ class RolePlaying:
              assistant_role_name, user_role_name, sys_msg_generator,
              extend_sys_msg_meta_dicts)
 
-        self.assistant_agent: ChatAgent
-        self.user_agent: ChatAgent
-        self.assistant_sys_msg: BaseMessage
-        self.user_sys_msg: BaseMessage
+        if assistant_response_terminators:
+            assistant_agent_kwargs = add_response_terminators(
+                assistant_agent_kwargs, assistant_response_terminators)
+        if user_response_terminators:
+            user_agent_kwargs = add_response_terminators(
+                user_agent_kwargs, user_response_terminators)
+
         self.init_agents(
             init_assistant_sys_msg,
             assistant_agent_kwargs,
@@ -132,11 +162,51 @@ class RolePlaying:
             user_agent_kwargs,
             output_language,
         )
-        self.critic: Optional[Union[CriticAgent, Human]] = None
-        self.critic_sys_msg: Optional[BaseMessage] = None
         self.init_critic(critic_role_name, critic_criteria, critic_kwargs,
                          sys_msg_generator, sys_msg_meta_dicts)
 
+    def _init_session(
+        self,
+        task_prompt: str,
+        *,
+        with_task_specify: bool,
+        with_task_planner: bool,
+        with_critic_in_the_loop: bool,
+        model_type: Optional[ModelType],
+        task_type: TaskType,
+    ) -> None:
+        r"""Sets the configuration of the session and the task prompt, before
+        the task prompts are generated and the agents are created. Shared by
+        the constructor, :meth:`from_snapshot` and
+        :obj:`RolePlayingTemplate`, which fill in the rest of the session
+        differently.
+
+        Args:
+            task_prompt (str): The prompt of the task to be performed.
+            with_task_specify (bool): Whether to use a task specify agent.
+            with_task_planner (bool): Whether to use a task planner agent.
+            with_critic_in_the_loop (bool): Whether to include a critic in
+                the loop.
+            model_type (ModelType, optional): Model type overriding the model
+                in all agents.
+            task_type (TaskType): The type of task to perform.
+        """
+        self.with_task_specify = with_task_specify
+        self.with_task_planner = with_task_planner
+        self.with_critic_in_the_loop = with_critic_in_the_loop
+        self.model_type = model_type
+        self.task_type = task_type
+        self.task_prompt = task_prompt
+        self.specified_task_prompt: Optional[TextPrompt] = None
+        self.planned_task_prompt: Optional[TextPrompt] = None
+
+        self.assistant_agent: ChatAgent
+        self.user_agent: ChatAgent
+        self.assistant_sys_msg: BaseMessage
+        self.user_sys_msg: BaseMessage
+        self.critic: Optional[Union[CriticAgent, Human]] = None
+        self.critic_sys_msg: Optional[BaseMessage] = None
+
     def init_specified_task_prompt(
             self, assistant_role_name: str, user_role_name: str,
             task_specify_agent_kwargs: Optional[Dict],
@@ -341,14 +411,26 @@ class RolePlaying:
                     critic_msg_meta_dict,
                     role_tuple=(critic_role_name, RoleType.CRITIC),
                 )
-                if self.model_type is not None:
-                    if critic_kwargs is None:
-                        critic_kwargs = {}
-                    critic_kwargs.update(dict(model_type=self.model_type))
-                self.critic = CriticAgent(
-                    self.critic_sys_msg,
-                    **(critic_kwargs or {}),
-                )
+                self.critic = self._create_critic_agent(
+                    self.critic_sys_msg, critic_kwargs)
+
+    def _create_critic_agent(self, critic_sys_msg: BaseMessage,
+                             critic_kwargs: Optional[Dict]) -> CriticAgent:
+        r"""Creates the critic agent of the session, with the model type of
+        the session if there is one.
+
+        Args:
+            critic_sys_msg (BaseMessage): The system message of the critic.
+            critic_kwargs (Dict, optional): Additional arguments to pass to
+                the critic.
+
+        Returns:
+            CriticAgent: The critic agent.
+        """
+        critic_kwargs = dict(critic_kwargs or {})
+        if self.model_type is not None:
+            critic_kwargs.update(dict(model_type=self.model_type))
+        return CriticAgent(critic_sys_msg, **critic_kwargs)
 
     def init_chat(self) -> Tuple[BaseMessage, List[BaseMessage]]:
         r"""Initializes the chat by resetting both of the assistant and user
@@ -454,3 +536,106 @@ class RolePlaying:
             ChatAgentResponse([user_msg], user_response.terminated,
                               user_response.info),
         )
+
+    def snapshot(self) -> bytes:
+        r"""Serializes the state of the session, including the task prompts,
+        the system messages and the memories of the agents, into a compact
+        blob. The session can be restored from the blob with
+        :meth:`from_snapshot`, possibly in another process, and continued from
+        the same turn without calling the task specify and planner agents
+        again.
+
+        Note that the blob is pickled, so only restore snapshots from trusted
+        sources.
+
+        Returns:
+            bytes: The snapshot of the session.
+        """
+        state = dict(
+            with_task_specify=self.with_task_specify,
+            with_task_planner=self.with_task_planner,
+            with_critic_in_the_loop=self.with_critic_in_the_loop,
+            model_type=self.model_type,
+            task_type=self.task_type,
+            task_prompt=self.task_prompt,
+            specified_task_prompt=self.specified_task_prompt,
+            planned_task_prompt=self.planned_task_prompt,
+            assistant_agent=self.assistant_agent.get_state(),
+            user_agent=self.user_agent.get_state(),
+            critic_sys_msg=self.critic_sys_msg,
+            critic=(self.critic.get_state() if isinstance(
+                self.critic, CriticAgent) else None),
+        )
+        return zlib.compress(pickle.dumps(state))
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot: bytes,
+        assistant_agent_kwargs: Optional[Dict] = None,
+        user_agent_kwargs: Optional[Dict] = None,
+        critic_kwargs: Optional[Dict] = None,
+    ) -> "RolePlaying":
+        r"""Restores a session from a blob returned by :meth:`snapshot`.
+
+        Args:
+            snapshot (bytes): The snapshot of the session.
+            assistant_agent_kwargs (Dict, optional): Additional arguments to
+                pass to the assistant agent, e.g. its function list. The model
+                type and configuration default to the snapshotted ones.
+                (default: :obj:`None`)
+            user_agent_kwargs (Dict, optional): Additional arguments to pass to
+                the user agent. (default: :obj:`None`)
+            critic_kwargs (Dict, optional): Additional arguments to pass to the
+                critic. (default: :obj:`None`)
+
+        Returns:
+            RolePlaying: The restored session.
+        """
+        state = pickle.loads(zlib.decompress(snapshot))
+        role_playing = cls.__new__(cls)
+        role_playing._init_session(
+            state["task_prompt"], with_task_specify=state["with_task_specify"],
+            with_task_planner=state["with_task_planner"],
+            with_critic_in_the_loop=state["with_critic_in_the_loop"],
+            model_type=state["model_type"], task_type=state["task_type"])
+        role_playing.specified_task_prompt = state["specified_task_prompt"]
+        role_playing.planned_task_prompt = state["planned_task_prompt"]
+
+        assistant_state = state["assistant_agent"]
+        user_state = state["user_agent"]
+        role_playing.init_agents(
+            assistant_state["orig_sys_message"],
+            {
+                "model_type": assistant_state["model_type"],
+                "model_config": assistant_state["model_config"],
+                **(assistant_agent_kwargs or {})
+            },
+            user_state["orig_sys_message"],
+            {
+                "model_type": user_state["model_type"],
+                "model_config": user_state["model_config"],
+                **(user_agent_kwargs or {})
+            },
+            assistant_state["output_language"],
+        )
+        role_playing.assistant_agent.load_state(assistant_state)
+        role_playing.assistant_sys_msg = (
+            role_playing.assistant_agent.system_message)
+        role_playing.user_agent.load_state(user_state)
+        role_playing.user_sys_msg = role_playing.user_agent.system_message
+
+        role_playing.critic_sys_msg = state["critic_sys_msg"]
+        critic_state = state["critic"]
+        if critic_state is not None:
+            critic = role_playing._create_critic_agent(
+                critic_state["orig_sys_message"], {
+                    "model_type": critic_state["model_type"],
+                    "model_config": critic_state["model_config"],
+                    **(critic_kwargs or {})
+                })
+            critic.load_state(critic_state)
+            role_playing.critic = critic
+        elif role_playing.with_critic_in_the_loop:
+            role_playing.critic = Human(**(critic_kwargs or {}))
+        return role_playing
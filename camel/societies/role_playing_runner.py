@@ -0,0 +1,556 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import asyncio
+import copy
+import json
+import os
+import pickle
+import zlib
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from camel.generators import RoleNameGenerator
+from camel.societies.role_playing import RolePlaying
+from camel.types import ExecutorType
+
+
+@dataclass(frozen=True)
+class RolePlayingJob:
+    r"""A single role-playing session to be run by a
+    :obj:`RolePlayingRunner`.
+
+    Attributes:
+        session_id (str): A unique identifier of the session. It is used to
+            assign the session to an output shard and to skip the session
+            when resuming a run.
+        assistant_role_name (str): The name of the role played by the
+            assistant.
+        user_role_name (str): The name of the role played by the user.
+        task_prompt (str): The prompt of the task to be performed.
+        role_playing_kwargs (Dict[str, Any], optional): Arguments passed to
+            :obj:`RolePlaying` for this session only, overriding the runner's
+            ones. (default: :obj:`{}`)
+    """
+    session_id: str
+    assistant_role_name: str
+    user_role_name: str
+    task_prompt: str
+    role_playing_kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_role_generator(
+        cls,
+        role_generator: RoleNameGenerator,
+        get_task_prompts: Callable[[str, str], Sequence[str]],
+        role_playing_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Generator["RolePlayingJob", None, None]:
+        r"""Generates the jobs of a role × task grid. Session IDs follow the
+        :obj:`<assistant>_<user>_<task>` numbering, starting from 1, used by
+        the CAMEL datasets.
+
+        Args:
+            role_generator (RoleNameGenerator): The generator of the assistant
+                and user role names.
+            get_task_prompts (Callable[[str, str], Sequence[str]]): A function
+                returning the task prompts of an assistant and user role pair.
+            role_playing_kwargs (Dict[str, Any], optional): Arguments passed
+                to :obj:`RolePlaying` for every job. (default: :obj:`None`)
+
+        Returns:
+            Generator[RolePlayingJob, None, None]: The jobs of the grid.
+        """
+        for assistant_idx, assistant_role_name in enumerate(
+                role_generator.assistant_role_names):
+            for user_idx, user_role_name in enumerate(
+                    role_generator.user_role_names):
+                task_prompts = get_task_prompts(assistant_role_name,
+                                                user_role_name)
+                for task_idx, task_prompt in enumerate(task_prompts):
+                    yield cls(
+                        session_id=(f"{(assistant_idx+1):03}_"
+                                    f"{(user_idx+1):03}_{(task_idx+1):03}"),
+                        assistant_role_name=assistant_role_name,
+                        user_role_name=user_role_name,
+                        task_prompt=task_prompt,
+                        role_playing_kwargs=dict(role_playing_kwargs or {}),
+                    )
+
+
+@dataclass
+class RolePlayingRunStats:
+    r"""Statistics of a :meth:`RolePlayingRunner.run` call.
+
+    Attributes:
+        num_completed (int): The number of sessions completed in this run.
+        num_skipped (int): The number of sessions skipped because they were
+            completed in a previous run.
+        num_failed (int): The number of sessions that failed after all
+            retries.
+        num_retries (int): The number of times a failed session was retried.
+    """
+    num_completed: int = 0
+    num_skipped: int = 0
+    num_failed: int = 0
+    num_retries: int = 0
+
+
+def _save_checkpoint(checkpoint_path: str, checkpoint: Dict[str, Any]) -> None:
+    tmp_path = f"{checkpoint_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(checkpoint, f)
+    # Replacing the file is atomic, so a crash never leaves a partial one.
+    os.replace(tmp_path, checkpoint_path)
+
+
+def run_role_playing_session(
+    job: RolePlayingJob,
+    role_playing_kwargs: Optional[Dict[str, Any]] = None,
+    max_num_messages: int = 40,
+    checkpoint_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    r"""Runs a role-playing session to the end and collects the conversation
+    in the CAMEL dataset format.
+
+    Args:
+        job (RolePlayingJob): The session to run.
+        role_playing_kwargs (Dict[str, Any], optional): Arguments passed to
+            :obj:`RolePlaying`, overridden by the ones of the job.
+            (default: :obj:`None`)
+        max_num_messages (int, optional): The maximum number of user and
+            assistant messages in the conversation. (default: :obj:`40`)
+        checkpoint_path (str, optional): A file the session is checkpointed
+            to after every turn. If the file exists, the session is resumed
+            from it instead of being started over. The file is left in place
+            once the session is over. (default: :obj:`None`)
+
+    Returns:
+        Dict[str, Any]: The conversation with its metadata.
+    """
+    kwargs = {**(role_playing_kwargs or {}), **job.role_playing_kwargs}
+    # Terminators are stateful, so sessions running in threads cannot share
+    # them.
+    for key in ["assistant_response_terminators", "user_response_terminators"]:
+        if kwargs.get(key):
+            kwargs[key] = copy.deepcopy(kwargs[key])
+    if checkpoint_path is not None and os.path.exists(checkpoint_path):
+        with open(checkpoint_path, "rb") as f:
+            checkpoint = pickle.load(f)
+        role_play_session = RolePlaying.from_snapshot(
+            checkpoint["snapshot"],
+            assistant_agent_kwargs=kwargs.get("assistant_agent_kwargs"),
+            user_agent_kwargs=kwargs.get("user_agent_kwargs"),
+            critic_kwargs=kwargs.get("critic_kwargs"),
+        )
+        input_assistant_msg = checkpoint["input_assistant_msg"]
+        message_dict: Dict[str, Any] = checkpoint["message_dict"]
+        message_counter: int = checkpoint["message_counter"]
+    else:
+        role_play_session = RolePlaying(job.assistant_role_name,
+                                        job.user_role_name,
+                                        task_prompt=job.task_prompt, **kwargs)
+        input_assistant_msg, _ = role_play_session.init_chat()
+        specified_task_prompt = role_play_session.specified_task_prompt
+        message_dict = {
+            "id":
+            job.session_id,
+            "role_1": (f"{job.assistant_role_name}_"
+                       f"{str(role_play_session.assistant_agent.role_type)}"),
+            "role_2": (f"{job.user_role_name}_"
+                       f"{str(role_play_session.user_agent.role_type)}"),
+            "original_task":
+            job.task_prompt,
+            "specified_task": (str(specified_task_prompt)
+                               if specified_task_prompt is not None else None),
+        }
+        message_counter = 0
+
+    assistant_agent = role_play_session.assistant_agent
+    user_agent = role_play_session.user_agent
+    termination_reason = "max_num_messages"
+    while message_counter < max_num_messages:
+        if checkpoint_path is not None:
+            _save_checkpoint(
+                checkpoint_path,
+                dict(snapshot=role_play_session.snapshot(),
+                     input_assistant_msg=input_assistant_msg,
+                     message_dict=message_dict,
+                     message_counter=message_counter))
+
+        assistant_response, user_response = role_play_session.step(
+            input_assistant_msg)
+
+        if user_response.terminated:
+            termination_reason = (
+                f"{str(user_agent.role_type)}: "
+                f"{user_response.info['termination_reasons'][0]}")
+            break
+        if assistant_response.terminated:
+            termination_reason = (
+                f"{str(assistant_agent.role_type)}: "
+                f"{assistant_response.info['termination_reasons'][0]}")
+            break
+
+        message_counter += 1
+        message_dict[f"message_{message_counter}"] = (
+            user_response.msg.to_dict())
+        if "<CAMEL_TASK_DONE>" in user_response.msg.content:
+            termination_reason = "<CAMEL_TASK_DONE>"
+            break
+
+        message_counter += 1
+        message_dict[f"message_{message_counter}"] = (
+            assistant_response.msg.to_dict())
+        input_assistant_msg = assistant_response.msg
+
+    message_dict["termination_reason"] = termination_reason
+    message_dict["num_messages"] = message_counter
+    return message_dict
+
+
+class _InlineExecutor(Executor):
+    r"""An executor running every submitted call immediately in the calling
+    thread."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class RolePlayingRunner:
+    r"""Runs a grid of :obj:`RolePlaying` sessions on a worker pool and
+    streams the conversations to sharded JSON Lines files.
+
+    Every session is assigned to the shard
+    :obj:`<output_dir>/shard_<index>.jsonl` by a stable hash of its ID, and
+    the shards double as the checkpoint of the run: sessions found in them are
+    skipped when the runner is started again, so an interrupted run resumes
+    where it stopped. Failed sessions are retried, and sessions still failing
+    after all retries are logged to :obj:`<output_dir>/failed.jsonl` and
+    attempted again by the next run. With :obj:`with_checkpoints`, running
+    sessions are additionally checkpointed after every turn to
+    :obj:`<output_dir>/checkpoints`, so an interrupted session resumes from
+    its last turn instead of being started over.
+
+    Args:
+        output_dir (str): The directory the shards are written to.
+        role_playing_kwargs (Dict[str, Any], optional): Arguments passed to
+            :obj:`RolePlaying` for every session. They must be picklable when
+            using a process pool. (default: :obj:`None`)
+        max_num_messages (int, optional): The maximum number of user and
+            assistant messages in a conversation. (default: :obj:`40`)
+        executor_type (ExecutorType, optional): Whether to run the sessions
+            inline, in a thread pool or in a process pool.
+            (default: :obj:`ExecutorType.PROCESS`)
+        num_workers (int, optional): The number of workers of the pool. If
+            `None`, the number of CPUs is used. (default: :obj:`None`)
+        num_shards (int, optional): The number of output shards.
+            (default: :obj:`1`)
+        max_retries (int, optional): The number of times a failed session is
+            retried. (default: :obj:`2`)
+        with_checkpoints (bool, optional): Whether to checkpoint the running
+            sessions after every turn. (default: :obj:`False`)
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        role_playing_kwargs: Optional[Dict[str, Any]] = None,
+        max_num_messages: int = 40,
+        executor_type: ExecutorType = ExecutorType.PROCESS,
+        num_workers: Optional[int] = None,
+        num_shards: int = 1,
+        max_retries: int = 2,
+        with_checkpoints: bool = False,
+    ) -> None:
+        if num_shards < 1:
+            raise ValueError("`num_shards` should be a positive integer. "
+                             f"Got {num_shards} instead.")
+        self.output_dir = output_dir
+        self.role_playing_kwargs = role_playing_kwargs or {}
+        self.max_num_messages = max_num_messages
+        self.executor_type = executor_type
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.num_shards = num_shards
+        self.max_retries = max_retries
+        self.with_checkpoints = with_checkpoints
+
+    def shard_path(self, shard_index: int) -> str:
+        r"""Returns the path of an output shard.
+
+        Args:
+            shard_index (int): The index of the shard.
+
+        Returns:
+            str: The path of the shard.
+        """
+        return os.path.join(self.output_dir, f"shard_{shard_index:05}.jsonl")
+
+    def checkpoint_path(self, session_id: str) -> str:
+        r"""Returns the path a running session is checkpointed to.
+
+        Args:
+            session_id (str): The ID of the session.
+
+        Returns:
+            str: The path of the checkpoint.
+        """
+        return os.path.join(self.output_dir, "checkpoints",
+                            f"{session_id}.pkl")
+
+    def get_shard_index(self, session_id: str) -> int:
+        r"""Returns the index of the shard a session is written to.
+
+        Args:
+            session_id (str): The ID of the session.
+
+        Returns:
+            int: The index of the shard.
+        """
+        return zlib.crc32(session_id.encode()) % self.num_shards
+
+    def load_completed_ids(self) -> Set[str]:
+        r"""Collects the IDs of the sessions already written to the shards.
+        Lines truncated by a crash are ignored.
+
+        Returns:
+            Set[str]: The IDs of the completed sessions.
+        """
+        completed_ids: Set[str] = set()
+        for shard_index in range(self.num_shards):
+            path = self.shard_path(shard_index)
+            if not os.path.exists(path):
+                continue
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        completed_ids.add(json.loads(line)["id"])
+                    except (ValueError, KeyError):
+                        continue
+        return completed_ids
+
+    def run(self, jobs: Iterable[RolePlayingJob]) -> RolePlayingRunStats:
+        r"""Runs the sessions not completed yet, writing each conversation to
+        its shard as soon as it finishes. The jobs are consumed lazily, so
+        arbitrarily large grids can be passed as generators.
+
+        Args:
+            jobs (Iterable[RolePlayingJob]): The sessions to run.
+
+        Returns:
+            RolePlayingRunStats: The statistics of the run.
+        """
+        stats = RolePlayingRunStats()
+        pending_jobs = self._start_run(jobs, stats)
+        shard_files: Dict[int, TextIO] = {}
+        running: Dict[Future, Tuple[RolePlayingJob, int]] = {}
+        # Keep the workers busy without materializing the whole grid.
+        max_running = 2 * self.num_workers
+
+        with self._create_executor() as executor:
+
+            def submit(job: RolePlayingJob, num_attempts: int) -> None:
+                future = executor.submit(run_role_playing_session,
+                                         *self._session_args(job))
+                running[future] = (job, num_attempts)
+
+            def fill() -> None:
+                while len(running) < max_running:
+                    job = next(pending_jobs, None)
+                    if job is None:
+                        return
+                    submit(job, 0)
+
+            try:
+                fill()
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job, num_attempts = running.pop(future)
+                        if self._finish_session(job, num_attempts, future,
+                                                shard_files, stats):
+                            submit(job, num_attempts + 1)
+                    fill()
+            finally:
+                for shard_file in shard_files.values():
+                    shard_file.close()
+        return stats
+
+    async def arun(self,
+                   jobs: Iterable[RolePlayingJob]) -> RolePlayingRunStats:
+        r"""Asynchronous version of :meth:`run`. The sessions are scheduled
+        by the event loop as a bounded set of tasks, each running a session
+        in the pool of the runner, so the loop is never blocked and the run
+        can be cancelled like any task, which cancels the sessions not
+        started yet. With :obj:`ExecutorType.INLINE`, the sessions run one at
+        a time in a worker thread.
+
+        Args:
+            jobs (Iterable[RolePlayingJob]): The sessions to run.
+
+        Returns:
+            RolePlayingRunStats: The statistics of the run.
+        """
+        loop = asyncio.get_running_loop()
+        stats = RolePlayingRunStats()
+        pending_jobs = self._start_run(jobs, stats)
+        shard_files: Dict[int, TextIO] = {}
+        running: Dict[asyncio.Future, Tuple[RolePlayingJob, int]] = {}
+        max_running = 2 * self.num_workers
+
+        if self.executor_type == ExecutorType.INLINE:
+            executor: Executor = ThreadPoolExecutor(1)
+        else:
+            executor = self._create_executor()
+
+        def submit(job: RolePlayingJob, num_attempts: int) -> None:
+            future = loop.run_in_executor(
+                executor,
+                partial(run_role_playing_session, *self._session_args(job)))
+            running[future] = (job, num_attempts)
+
+        def fill() -> None:
+            while len(running) < max_running:
+                job = next(pending_jobs, None)
+                if job is None:
+                    return
+                submit(job, 0)
+
+        try:
+            fill()
+            while running:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    job, num_attempts = running.pop(future)
+                    if self._finish_session(job, num_attempts, future,
+                                            shard_files, stats):
+                        submit(job, num_attempts + 1)
+                fill()
+        finally:
+            for future in running:
+                future.cancel()
+            # Waiting for the running sessions would block the loop.
+            executor.shutdown(wait=False)
+            for shard_file in shard_files.values():
+                shard_file.close()
+        return stats
+
+    def _start_run(self, jobs: Iterable[RolePlayingJob],
+                   stats: RolePlayingRunStats) -> Iterator[RolePlayingJob]:
+        r"""Prepares the output directory and returns the jobs not completed
+        yet, counting the skipped ones in :obj:`stats`."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.with_checkpoints:
+            os.makedirs(os.path.join(self.output_dir, "checkpoints"),
+                        exist_ok=True)
+        completed_ids = self.load_completed_ids()
+
+        def next_jobs() -> Iterator[RolePlayingJob]:
+            for job in jobs:
+                if job.session_id in completed_ids:
+                    stats.num_skipped += 1
+                else:
+                    yield job
+
+        return next_jobs()
+
+    def _session_args(
+        self, job: RolePlayingJob
+    ) -> Tuple[RolePlayingJob, Dict[str, Any], int, Optional[str]]:
+        checkpoint_path = (self.checkpoint_path(job.session_id)
+                           if self.with_checkpoints else None)
+        return (job, self.role_playing_kwargs, self.max_num_messages,
+                checkpoint_path)
+
+    def _finish_session(self, job: RolePlayingJob, num_attempts: int,
+                        future: Union[Future, asyncio.Future],
+                        shard_files: Dict[int, TextIO],
+                        stats: RolePlayingRunStats) -> bool:
+        r"""Writes the conversation of a finished session, or records its
+        failure. Returns whether the session should be retried."""
+        try:
+            message_dict = future.result()
+        except Exception as e:
+            if num_attempts < self.max_retries:
+                stats.num_retries += 1
+                return True
+            stats.num_failed += 1
+            self._write_failure(job, e)
+            return False
+        self._write_record(shard_files, message_dict)
+        stats.num_completed += 1
+        if self.with_checkpoints:
+            checkpoint_path = self.checkpoint_path(job.session_id)
+            if os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+        return False
+
+    def _create_executor(self) -> Executor:
+        if self.executor_type == ExecutorType.INLINE:
+            return _InlineExecutor()
+        elif self.executor_type == ExecutorType.THREAD:
+            return ThreadPoolExecutor(self.num_workers)
+        elif self.executor_type == ExecutorType.PROCESS:
+            return ProcessPoolExecutor(self.num_workers)
+        else:
+            raise ValueError(
+                f"Unsupported executor type `{self.executor_type}`.")
+
+    def _write_record(self, shard_files: Dict[int, TextIO],
+                      message_dict: Dict[str, Any]) -> None:
+        shard_index = self.get_shard_index(message_dict["id"])
+        if shard_index not in shard_files:
+            path = self.shard_path(shard_index)
+            shard_file: TextIO = open(path, "a")
+            # Terminate a line truncated by a previous crash.
+            if shard_file.tell() > 0:
+                with open(path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        shard_file.write("\n")
+            shard_files[shard_index] = shard_file
+        shard_file = shard_files[shard_index]
+        shard_file.write(json.dumps(message_dict) + "\n")
+        shard_file.flush()
+
+    def _write_failure(self, job: RolePlayingJob, error: Exception) -> None:
+        with open(os.path.join(self.output_dir, "failed.jsonl"), "a") as f:
+            f.write(
+                json.dumps(dict(id=job.session_id, error=repr(error))) + "\n")
@@ -0,0 +1,364 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import copy
+import threading
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple
+
+from camel.agents import TaskPlannerAgent, TaskSpecifyAgent
+from camel.generators import SystemMessageGenerator
+from camel.human import Human
+from camel.messages import BaseMessage
+from camel.prompts import TextPrompt
+from camel.societies.role_playing import RolePlaying, add_response_terminators
+from camel.terminators import ResponseTerminator
+from camel.types import ModelType, RoleType, TaskType
+
+_FORMATTER = Formatter()
+
+
+def _escape_braces(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _partial_format(template: str, **kwargs: Any) -> Tuple[str, List[str]]:
+    r"""Fills the given fields of a format string and keeps the other ones,
+    so that formatting the result with the remaining fields gives the same
+    string as formatting the original template with all of them at once.
+
+    Args:
+        template (str): The format string.
+        **kwargs (Any): The values of the fields to fill.
+
+    Returns:
+        Tuple[str, List[str]]: The partially formatted string and the names
+            of the fields left in it.
+    """
+    parts: List[str] = []
+    remaining_fields: List[str] = []
+    for literal, field_name, format_spec, conversion in _FORMATTER.parse(
+            template):
+        parts.append(_escape_braces(literal))
+        if field_name is None:
+            continue
+        if field_name in kwargs:
+            value = kwargs[field_name]
+            if conversion is not None:
+                value = _FORMATTER.convert_field(value, conversion)
+            value = _FORMATTER.format_field(value, format_spec or "")
+            parts.append(_escape_braces(value))
+        else:
+            remaining_fields.append(field_name)
+            conversion_str = f"!{conversion}" if conversion else ""
+            format_spec_str = f":{format_spec}" if format_spec else ""
+            parts.append(f"{{{field_name}{conversion_str}{format_spec_str}}}")
+    return "".join(parts), remaining_fields
+
+
+class _CompiledSysPrompt:
+    r"""A system prompt with the session-invariant fields already filled
+    in."""
+
+    def __init__(self, template: str, invariant_meta_dict: Dict[str, Any],
+                 role_tuple: Tuple[str, RoleType]) -> None:
+        self.template, remaining_fields = _partial_format(
+            template, **invariant_meta_dict)
+        # Mimic :meth:`TextPrompt.format`, which keeps unknown fields as is.
+        self.default_kwargs = {
+            field: "{" + field + "}"
+            for field in remaining_fields
+        }
+        self.invariant_meta_dict = invariant_meta_dict
+        self.role_name, self.role_type = role_tuple
+
+    def make_message(self, task_prompt: str) -> BaseMessage:
+        format_kwargs = dict(self.default_kwargs)
+        format_kwargs["task"] = task_prompt
+        meta_dict = dict(task=task_prompt)
+        meta_dict.update(self.invariant_meta_dict)
+        return BaseMessage(
+            role_name=self.role_name, role_type=self.role_type,
+            meta_dict=meta_dict,
+            content=TextPrompt(self.template.format(**format_kwargs)))
+
+
+class RolePlayingTemplate:
+    r"""A reusable blueprint of :obj:`RolePlaying` sessions between the same
+    pair of roles with the same configuration, which only differ by their
+    task.
+
+    Everything that does not depend on the task is computed once, when the
+    template is created: the system message generator, the system prompts
+    with the role names already filled in, the meta dicts and the keyword
+    arguments of the agents. The task specify and planner agents are also
+    created once (per thread) and reset between sessions. Spinning up a
+    session with :meth:`create_session` then only formats the task into the
+    prompts, runs the task specify and planner agents if enabled, and creates
+    the conversing agents, which is what the sessions do not share.
+
+    The sessions are equivalent to the ones created by :obj:`RolePlaying`
+    with the same arguments.
+
+    Args:
+        assistant_role_name (str): The name of the role played by the
+            assistant.
+        user_role_name (str): The name of the role played by the user.
+        critic_role_name (str): The name of the role played by the critic.
+            Role name with :obj:`"human"` will set critic as a :obj:`Human`
+            agent, else will create a :obj:`CriticAgent`.
+            (default: :obj:`"critic"`)
+        with_task_specify (bool, optional): Whether to use a task specify
+            agent. (default: :obj:`True`)
+        with_task_planner (bool, optional): Whether to use a task planner
+            agent. (default: :obj:`False`)
+        with_critic_in_the_loop (bool, optional): Whether to include a critic
+            in the loop. (default: :obj:`False`)
+        critic_criteria (str, optional): Critic criteria for the critic agent.
+            If not specified, set the criteria to improve task performance.
+        model_type (ModelType, optional): Model type that will be used for
+            role playing. If specified, it will override the model in all
+            agents. (default: :obj:`None`)
+        task_type (TaskType, optional): The type of task to perform.
+            (default: :obj:`TaskType.AI_SOCIETY`)
+        assistant_agent_kwargs (Dict, optional): Additional arguments to pass
+            to the assistant agent. (default: :obj:`None`)
+        user_agent_kwargs (Dict, optional): Additional arguments to pass to
+            the user agent. (default: :obj:`None`)
+        task_specify_agent_kwargs (Dict, optional): Additional arguments to
+            pass to the task specify agent. (default: :obj:`None`)
+        task_planner_agent_kwargs (Dict, optional): Additional arguments to
+            pass to the task planner agent. (default: :obj:`None`)
+        critic_kwargs (Dict, optional): Additional arguments to pass to the
+            critic. (default: :obj:`None`)
+        sys_msg_generator_kwargs (Dict, optional): Additional arguments to
+            pass to the system message generator. (default: :obj:`None`)
+        extend_sys_msg_meta_dicts (List[Dict], optional): A list of dicts to
+            extend the system message meta dicts with. (default: :obj:`None`)
+        extend_task_specify_meta_dict (Dict, optional): A dict to extend the
+            task specify meta dict with. (default: :obj:`None`)
+        output_language (str, optional): The language to be output by the
+            agents. (default: :obj:`None`)
+        assistant_response_terminators (List[ResponseTerminator], optional):
+            Terminators bound to the assistant agent, in addition to the
+            ones in :obj:`assistant_agent_kwargs`. Every session gets its own
+            copy of the terminators. (default: :obj:`None`)
+        user_response_terminators (List[ResponseTerminator], optional):
+            Terminators bound to the user agent, in addition to the ones in
+            :obj:`user_agent_kwargs`. Every session gets its own copy of the
+            terminators. (default: :obj:`None`)
+    """
+
+    def __init__(
+        self,
+        assistant_role_name: str,
+        user_role_name: str,
+        *,
+        critic_role_name: str = "critic",
+        with_task_specify: bool = True,
+        with_task_planner: bool = False,
+        with_critic_in_the_loop: bool = False,
+        critic_criteria: Optional[str] = None,
+        model_type: Optional[ModelType] = None,
+        task_type: TaskType = TaskType.AI_SOCIETY,
+        assistant_agent_kwargs: Optional[Dict] = None,
+        user_agent_kwargs: Optional[Dict] = None,
+        task_specify_agent_kwargs: Optional[Dict] = None,
+        task_planner_agent_kwargs: Optional[Dict] = None,
+        critic_kwargs: Optional[Dict] = None,
+        sys_msg_generator_kwargs: Optional[Dict] = None,
+        extend_sys_msg_meta_dicts: Optional[List[Dict]] = None,
+        extend_task_specify_meta_dict: Optional[Dict] = None,
+        output_language: Optional[str] = None,
+        assistant_response_terminators: Optional[
+            List[ResponseTerminator]] = None,
+        user_response_terminators: Optional[List[ResponseTerminator]] = None,
+    ) -> None:
+        self.assistant_role_name = assistant_role_name
+        self.user_role_name = user_role_name
+        self.critic_role_name = critic_role_name
+        self.with_task_specify = with_task_specify
+        self.with_task_planner = with_task_planner
+        self.with_critic_in_the_loop = with_critic_in_the_loop
+        self.model_type = model_type
+        self.task_type = task_type
+        self.output_language = output_language
+
+        model_type_override = (dict(
+            model_type=model_type) if model_type is not None else {})
+        self.assistant_agent_kwargs = {
+            **(assistant_agent_kwargs or {}),
+            **model_type_override
+        }
+        self.user_agent_kwargs = {
+            **(user_agent_kwargs or {}),
+            **model_type_override
+        }
+        self.task_specify_agent_kwargs = {
+            **(task_specify_agent_kwargs or {}),
+            **model_type_override
+        }
+        self.task_planner_agent_kwargs = {
+            **(task_planner_agent_kwargs or {}),
+            **model_type_override
+        }
+        self.critic_kwargs = dict(critic_kwargs or {})
+        if assistant_response_terminators:
+            self.assistant_agent_kwargs = add_response_terminators(
+                self.assistant_agent_kwargs, assistant_response_terminators)
+        if user_response_terminators:
+            self.user_agent_kwargs = add_response_terminators(
+                self.user_agent_kwargs, user_response_terminators)
+
+        self.task_specify_meta_dict: Dict[str, Any] = dict()
+        if task_type in [TaskType.AI_SOCIETY, TaskType.MISALIGNMENT]:
+            self.task_specify_meta_dict.update(
+                dict(assistant_role=assistant_role_name,
+                     user_role=user_role_name))
+        self.task_specify_meta_dict.update(extend_task_specify_meta_dict or {})
+
+        sys_msg_generator = SystemMessageGenerator(
+            task_type=task_type, **(sys_msg_generator_kwargs or {}))
+        if (extend_sys_msg_meta_dicts is None and task_type in [
+                TaskType.AI_SOCIETY,
+                TaskType.MISALIGNMENT,
+        ]):
+            extend_sys_msg_meta_dicts = [
+                dict(assistant_role=assistant_role_name,
+                     user_role=user_role_name) for _ in range(2)
+            ]
+        if extend_sys_msg_meta_dicts is None:
+            extend_sys_msg_meta_dicts = [{}, {}]
+
+        self._compiled_sys_prompts: List[_CompiledSysPrompt] = []
+        for extend_sys_msg_meta_dict, role_tuple in zip(
+                extend_sys_msg_meta_dicts, [
+                    (assistant_role_name, RoleType.ASSISTANT),
+                    (user_role_name, RoleType.USER),
+                ]):
+            self._compiled_sys_prompts.append(
+                self._compile_sys_prompt(sys_msg_generator,
+                                         extend_sys_msg_meta_dict, role_tuple))
+
+        self._compiled_critic_sys_prompt: Optional[_CompiledSysPrompt] = None
+        if with_critic_in_the_loop and critic_role_name.lower() != "human":
+            critic_msg_meta_dict = dict(
+                critic_role=critic_role_name,
+                criteria=(critic_criteria or "improving the task performance"),
+                **extend_sys_msg_meta_dicts[0])
+            self._compiled_critic_sys_prompt = self._compile_sys_prompt(
+                sys_msg_generator, critic_msg_meta_dict,
+                (critic_role_name, RoleType.CRITIC))
+
+        self._local = threading.local()
+
+    @staticmethod
+    def _compile_sys_prompt(
+        sys_msg_generator: SystemMessageGenerator,
+        invariant_meta_dict: Dict[str, Any],
+        role_tuple: Tuple[str, RoleType],
+    ) -> _CompiledSysPrompt:
+        sys_msg_generator.validate_meta_dict_keys({
+            "task": "",
+            **invariant_meta_dict
+        })
+        return _CompiledSysPrompt(sys_msg_generator.sys_prompts[role_tuple[1]],
+                                  invariant_meta_dict, role_tuple)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The cached agents are per thread, and are not worth shipping to
+        # other processes.
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @staticmethod
+    def _copy_agent_kwargs(agent_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        agent_kwargs = dict(agent_kwargs)
+        # Terminators are stateful, so they cannot be shared by sessions.
+        if agent_kwargs.get("response_terminators"):
+            agent_kwargs["response_terminators"] = copy.deepcopy(
+                agent_kwargs["response_terminators"])
+        return agent_kwargs
+
+    def _get_task_specify_agent(self) -> TaskSpecifyAgent:
+        agent = getattr(self._local, "task_specify_agent", None)
+        if agent is None:
+            agent = TaskSpecifyAgent(task_type=self.task_type,
+                                     output_language=self.output_language,
+                                     **self.task_specify_agent_kwargs)
+            self._local.task_specify_agent = agent
+        return agent
+
+    def _get_task_planner_agent(self) -> TaskPlannerAgent:
+        agent = getattr(self._local, "task_planner_agent", None)
+        if agent is None:
+            agent = TaskPlannerAgent(output_language=self.output_language,
+                                     **self.task_planner_agent_kwargs)
+            self._local.task_planner_agent = agent
+        return agent
+
+    def create_session(self, task_prompt: str = "") -> RolePlaying:
+        r"""Creates a role-playing session for the given task.
+
+        Args:
+            task_prompt (str, optional): A prompt for the task to be
+                performed. (default: :obj:`""`)
+
+        Returns:
+            RolePlaying: The new session, ready for :meth:`init_chat`.
+        """
+        role_playing = RolePlaying.__new__(RolePlaying)
+        role_playing._init_session(
+            task_prompt, with_task_specify=self.with_task_specify,
+            with_task_planner=self.with_task_planner,
+            with_critic_in_the_loop=self.with_critic_in_the_loop,
+            model_type=self.model_type, task_type=self.task_type)
+        if self.with_task_specify:
+            role_playing.specified_task_prompt = (
+                self._get_task_specify_agent().run(
+                    task_prompt, meta_dict=self.task_specify_meta_dict))
+            role_playing.task_prompt = role_playing.specified_task_prompt
+
+        if self.with_task_planner:
+            role_playing.planned_task_prompt = (
+                self._get_task_planner_agent().run(role_playing.task_prompt))
+            role_playing.task_prompt = (f"{role_playing.task_prompt}\n"
+                                        f"{role_playing.planned_task_prompt}")
+
+        assistant_sys_msg, user_sys_msg = [
+            compiled_sys_prompt.make_message(role_playing.task_prompt)
+            for compiled_sys_prompt in self._compiled_sys_prompts
+        ]
+        role_playing.init_agents(
+            assistant_sys_msg,
+            self._copy_agent_kwargs(self.assistant_agent_kwargs),
+            user_sys_msg,
+            self._copy_agent_kwargs(self.user_agent_kwargs),
+            self.output_language,
+        )
+
+        if self.with_critic_in_the_loop:
+            if self._compiled_critic_sys_prompt is None:
+                role_playing.critic = Human(**self.critic_kwargs)
+            else:
+                role_playing.critic_sys_msg = (
+                    self._compiled_critic_sys_prompt.make_message(
+                        role_playing.task_prompt))
+                role_playing.critic = role_playing._create_critic_agent(
+                    role_playing.critic_sys_msg, self.critic_kwargs)
+        return role_playing
@@ -11,13 +11,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+from typing import TYPE_CHECKING
 
-from .key_value_storages.base import BaseKeyValueStorage
-from .key_value_storages.in_memory import InMemoryKeyValueStorage
-from .key_value_storages.json import JsonStorage
+from camel.utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .key_value_storages.base import BaseKeyValueStorage
+    from .key_value_storages.in_memory import InMemoryKeyValueStorage
+    from .key_value_storages.json import JsonStorage
+    from .key_value_storages.write_behind import WriteBehindKeyValueStorage
 
 __all__ = [
     'BaseKeyValueStorage',
     'InMemoryKeyValueStorage',
     'JsonStorage',
+    'WriteBehindKeyValueStorage',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'BaseKeyValueStorage': '.key_value_storages.base',
+    'InMemoryKeyValueStorage': '.key_value_storages.in_memory',
+    'JsonStorage': '.key_value_storages.json',
+    'WriteBehindKeyValueStorage': '.key_value_storages.write_behind',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
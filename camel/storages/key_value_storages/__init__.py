@@ -15,9 +15,11 @@
 from .base import BaseKeyValueStorage
 from .in_memory import InMemoryKeyValueStorage
 from .json import JsonStorage
+from .write_behind import WriteBehindKeyValueStorage
 
 __all__ = [
     'BaseKeyValueStorage',
     'InMemoryKeyValueStorage',
     'JsonStorage',
+    'WriteBehindKeyValueStorage',
 ]
@@ -0,0 +1,210 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+
+import atexit
+import threading
+import time
+import warnings
+import weakref
+from copy import deepcopy
+from typing import Any, Dict, List, Optional
+
+from camel.storages.key_value_storages import BaseKeyValueStorage
+
+_LIVE_STORAGES: "weakref.WeakSet[WriteBehindKeyValueStorage]" = (
+    weakref.WeakSet())
+
+
+@atexit.register
+def _close_live_storages() -> None:
+    for storage in list(_LIVE_STORAGES):
+        try:
+            storage.close()
+        except RuntimeError as e:
+            warnings.warn(f"{e} Unsaved records are lost.")
+
+
+class WriteBehindKeyValueStorage(BaseKeyValueStorage):
+    r"""A :obj:`BaseKeyValueStorage` wrapper that takes persistence off the
+    caller's critical path. Records passed to :meth:`save` are kept in an
+    in-memory mirror, which serves every :meth:`load`, and are written to the
+    wrapped storage in batches by a background thread.
+
+    At most :obj:`max_pending` records can be waiting to be persisted at any
+    time: once the limit is reached, :meth:`save` blocks until the background
+    writer catches up. This bounds what can be lost if the process crashes.
+    Pending records are persisted at the latest :obj:`flush_interval` seconds
+    after they were saved, when :meth:`flush` is called, or when the storage
+    is closed (which also happens automatically at interpreter exit).
+
+    Note that the mirror is loaded from the wrapped storage once, on
+    construction, so records written to the wrapped storage by other parties
+    afterwards are not visible through this wrapper.
+
+    Args:
+        storage (BaseKeyValueStorage): The storage to persist records to.
+        flush_interval (float, optional): The maximum number of seconds a
+            record may wait before being persisted. (default: :obj:`1.0`)
+        max_pending (int, optional): The maximum number of records that may be
+            waiting to be persisted. (default: :obj:`64`)
+    """
+
+    def __init__(
+        self,
+        storage: BaseKeyValueStorage,
+        flush_interval: float = 1.0,
+        max_pending: int = 64,
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError("`max_pending` should be a positive integer. "
+                             f"Got {max_pending} instead.")
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._records: List[Dict[str, Any]] = storage.load()
+        self._pending: List[Dict[str, Any]] = []
+        self._num_in_flight = 0
+        self._num_flush_waiters = 0
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+
+        self._worker = threading.Thread(target=self._write_loop, daemon=True,
+                                        name="WriteBehindKeyValueStorage")
+        self._worker.start()
+        _LIVE_STORAGES.add(self)
+
+    @property
+    def num_pending(self) -> int:
+        r"""The number of saved records that are not persisted yet.
+
+        Returns:
+            int: The number of pending and in-flight records.
+        """
+        with self._cond:
+            return len(self._pending) + self._num_in_flight
+
+    def save(self, records: List[Dict[str, Any]]) -> None:
+        r"""Saves a batch of records to the in-memory mirror and schedules
+        them for persistence. Blocks only if more than :obj:`max_pending`
+        records are waiting to be persisted.
+
+        Args:
+            records (List[Dict[str, Any]]): A list of dictionaries, where each
+                dictionary represents a unique record to be stored.
+        """
+        records = deepcopy(records)
+        with self._cond:
+            self._check_usable()
+            self._records.extend(records)
+            self._pending.extend(records)
+            self._cond.notify_all()
+            while (len(self._pending) + self._num_in_flight > self.max_pending
+                   and self._error is None):
+                self._cond.wait()
+            self._check_usable()
+
+    def load(self) -> List[Dict[str, Any]]:
+        r"""Loads all stored records, including the ones that are not
+        persisted yet, from the in-memory mirror.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, where each dictionary
+                represents a stored record.
+        """
+        with self._cond:
+            return deepcopy(self._records)
+
+    def clear(self) -> None:
+        r"""Removes all records from the mirror and the wrapped storage,
+        discarding the records that are not persisted yet.
+        """
+        with self._cond:
+            self._check_usable()
+            self._pending.clear()
+            while self._num_in_flight > 0:
+                self._cond.wait()
+            self._records.clear()
+            self.storage.clear()
+
+    def flush(self) -> None:
+        r"""Blocks until every record saved so far has been persisted to the
+        wrapped storage. This serves as a durability barrier.
+
+        Raises:
+            RuntimeError: If persisting the records failed.
+        """
+        with self._cond:
+            self._num_flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while ((self._pending or self._num_in_flight > 0)
+                       and self._error is None):
+                    self._cond.wait()
+            finally:
+                self._num_flush_waiters -= 1
+            self._check_usable(allow_closed=True)
+
+    def close(self) -> None:
+        r"""Flushes the pending records and stops the background writer. The
+        storage can no longer be written to afterwards.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join()
+        _LIVE_STORAGES.discard(self)
+        self._check_usable(allow_closed=True)
+
+    def _check_usable(self, allow_closed: bool = False) -> None:
+        if self._error is not None:
+            raise RuntimeError("Failed to persist records to the wrapped "
+                               "storage.") from self._error
+        if self._closed and not allow_closed:
+            raise RuntimeError("The storage has been closed.")
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Give the batch time to grow unless someone is waiting on it.
+                deadline = time.monotonic() + self.flush_interval
+                while (not self._closed and self._num_flush_waiters == 0
+                       and len(self._pending) < self.max_pending):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                self._num_in_flight = len(batch)
+
+            try:
+                self.storage.save(batch)
+            except BaseException as e:
+                with self._cond:
+                    self._error = e
+                    self._pending = batch + self._pending
+                    self._num_in_flight = 0
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                self._num_in_flight = 0
+                self._cond.notify_all()
@@ -11,13 +11,41 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from .base import BaseTerminator
-from .response_terminator import ResponseWordsTerminator, ResponseTerminator
-from .token_limit_terminator import TokenLimitTerminator
+from typing import TYPE_CHECKING
+
+from camel.utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .base import BaseTerminator
+    from .response_terminator import (
+        ResponseWordsTerminator,
+        ResponseTerminator,
+    )
+    from .token_limit_terminator import TokenLimitTerminator
+    from .degeneration_terminator import (
+        NoProgressTerminator,
+        RepetitionTerminator,
+        RoleFlipTerminator,
+    )
 
 __all__ = [
     'BaseTerminator',
     'ResponseTerminator',
     'ResponseWordsTerminator',
     'TokenLimitTerminator',
+    'RepetitionTerminator',
+    'RoleFlipTerminator',
+    'NoProgressTerminator',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'BaseTerminator': '.base',
+    'ResponseWordsTerminator': '.response_terminator',
+    'ResponseTerminator': '.response_terminator',
+    'TokenLimitTerminator': '.token_limit_terminator',
+    'NoProgressTerminator': '.degeneration_terminator',
+    'RepetitionTerminator': '.degeneration_terminator',
+    'RoleFlipTerminator': '.degeneration_terminator',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -0,0 +1,242 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import re
+import zlib
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from camel.messages import BaseMessage
+
+from .base import ResponseTerminator
+
+_HASH_BASE = 1_000_003
+_HASH_MODULUS = (1 << 61) - 1
+
+
+class RepetitionTerminator(ResponseTerminator):
+    r"""Terminate agent when its responses keep repeating its previous
+    responses, which is how conversations degenerate into loops of
+    greetings, thanks or the same answer.
+
+    The words of every response are hashed into word n-grams with a rolling
+    hash, and the response is repetitive if a large enough share of its
+    n-grams already appeared in the last responses. Responses shorter than
+    an n-gram are hashed as a whole. Each turn costs time linear in the
+    length of the response, and the state is bounded by the window of
+    responses it is compared with, whatever the length of the conversation.
+
+    Args:
+        ngram_size (int): The number of words of an n-gram.
+            (default: :obj:`4`)
+        window_size (int): The number of previous responses each response is
+            compared with. (default: :obj:`4`)
+        threshold (float): The share of repeated n-grams from which a
+            response is repetitive. (default: :obj:`0.6`)
+        patience (int): The number of consecutive repetitive responses after
+            which the agent is terminated. (default: :obj:`2`)
+    """
+
+    def __init__(self, ngram_size: int = 4, window_size: int = 4,
+                 threshold: float = 0.6, patience: int = 2):
+        super().__init__()
+        if ngram_size <= 0 or window_size <= 0 or patience <= 0:
+            raise ValueError("`ngram_size`, `window_size` and `patience` "
+                             "should be larger than 0.")
+        self.ngram_size = ngram_size
+        self.window_size = window_size
+        self.threshold = threshold
+        self.patience = patience
+        self._window: Deque[Set[int]] = deque()
+        self._ngram_counts: Dict[int, int] = defaultdict(int)
+        self._num_repetitive = 0
+
+    def _hash_ngrams(self, content: str) -> Set[int]:
+        word_hashes = [
+            zlib.crc32(word.encode())
+            for word in re.findall(r"\w+", content.lower())
+        ]
+        if len(word_hashes) <= self.ngram_size:
+            return {hash(tuple(word_hashes))} if word_hashes else set()
+        # Weight of the word leaving the window of the rolling hash.
+        leading_weight = pow(_HASH_BASE, self.ngram_size - 1, _HASH_MODULUS)
+        ngram_hashes = set()
+        rolling_hash = 0
+        for i, word_hash in enumerate(word_hashes):
+            if i >= self.ngram_size:
+                leaving_hash = word_hashes[i - self.ngram_size]
+                rolling_hash -= leaving_hash * leading_weight
+            rolling_hash = (rolling_hash * _HASH_BASE +
+                            word_hash) % _HASH_MODULUS
+            if i >= self.ngram_size - 1:
+                ngram_hashes.add(rolling_hash)
+        return ngram_hashes
+
+    def is_terminated(
+            self, messages: List[BaseMessage]) -> Tuple[bool, Optional[str]]:
+        r"""Whether terminate the agent by checking how much the response
+        repeats the previous ones.
+
+        Args:
+            messages (list): List of :obj:`BaseMessage` from a response.
+
+        Returns:
+            tuple: A tuple containing whether the agent should be
+                terminated and a string of termination reason.
+        """
+        if self._terminated:
+            return True, self._termination_reason
+
+        ngram_hashes: Set[int] = set()
+        for message in messages:
+            ngram_hashes |= self._hash_ngrams(message.content)
+        if not ngram_hashes:
+            return False, None
+
+        num_repeated = sum(1 for ngram_hash in ngram_hashes
+                           if self._ngram_counts.get(ngram_hash, 0) > 0)
+        repetition = num_repeated / len(ngram_hashes)
+        if repetition >= self.threshold:
+            self._num_repetitive += 1
+        else:
+            self._num_repetitive = 0
+
+        self._window.append(ngram_hashes)
+        for ngram_hash in ngram_hashes:
+            self._ngram_counts[ngram_hash] += 1
+        if len(self._window) > self.window_size:
+            for ngram_hash in self._window.popleft():
+                self._ngram_counts[ngram_hash] -= 1
+                if self._ngram_counts[ngram_hash] == 0:
+                    del self._ngram_counts[ngram_hash]
+
+        if self._num_repetitive >= self.patience:
+            self._terminated = True
+            self._termination_reason = (
+                f"{self._num_repetitive} consecutive responses repeat at "
+                f"least {self.threshold:.0%} of the previous "
+                f"{self.window_size} responses.")
+        return self._terminated, self._termination_reason
+
+    def reset(self):
+        self._terminated = False
+        self._termination_reason = None
+        self._window = deque()
+        self._ngram_counts = defaultdict(int)
+        self._num_repetitive = 0
+
+
+class RoleFlipTerminator(ResponseTerminator):
+    r"""Terminate agent when it takes over the role of its counterpart, e.g.
+    when an assistant starts giving instructions instead of solving them.
+
+    Args:
+        markers (Sequence[str]): The strings marking a response of the
+            counterpart role. (default: :obj:`("Instruction:",)`)
+        patience (int): The number of consecutive flipped responses after
+            which the agent is terminated. (default: :obj:`1`)
+    """
+
+    def __init__(self, markers: Sequence[str] = ("Instruction:", ),
+                 patience: int = 1):
+        super().__init__()
+        if len(markers) == 0:
+            raise ValueError("`markers` cannot be empty")
+        if patience <= 0:
+            raise ValueError("`patience` should be larger than 0.")
+        self.markers = list(markers)
+        self.patience = patience
+        self._num_flipped = 0
+
+    def is_terminated(
+            self, messages: List[BaseMessage]) -> Tuple[bool, Optional[str]]:
+        r"""Whether terminate the agent by checking whether its responses
+        contain the markers of the counterpart role.
+
+        Args:
+            messages (list): List of :obj:`BaseMessage` from a response.
+
+        Returns:
+            tuple: A tuple containing whether the agent should be
+                terminated and a string of termination reason.
+        """
+        if self._terminated:
+            return True, self._termination_reason
+
+        flipped = any(marker in message.content for message in messages
+                      for marker in self.markers)
+        self._num_flipped = self._num_flipped + 1 if flipped else 0
+        if self._num_flipped >= self.patience:
+            self._terminated = True
+            self._termination_reason = (
+                f"{self._num_flipped} consecutive responses contain a marker "
+                f"of the counterpart role among {self.markers}.")
+        return self._terminated, self._termination_reason
+
+    def reset(self):
+        self._terminated = False
+        self._termination_reason = None
+        self._num_flipped = 0
+
+
+class NoProgressTerminator(ResponseTerminator):
+    r"""Terminate agent when its responses stop driving the conversation,
+    e.g. when a user stops giving instructions.
+
+    Args:
+        markers (Sequence[str]): The strings, one of which a response making
+            progress contains. (default: :obj:`("Instruction:",)`)
+        patience (int): The number of consecutive responses without progress
+            after which the agent is terminated. (default: :obj:`3`)
+    """
+
+    def __init__(self, markers: Sequence[str] = ("Instruction:", ),
+                 patience: int = 3):
+        super().__init__()
+        if len(markers) == 0:
+            raise ValueError("`markers` cannot be empty")
+        if patience <= 0:
+            raise ValueError("`patience` should be larger than 0.")
+        self.markers = list(markers)
+        self.patience = patience
+        self._num_stalled = 0
+
+    def is_terminated(
+            self, messages: List[BaseMessage]) -> Tuple[bool, Optional[str]]:
+        r"""Whether terminate the agent by checking whether its responses
+        contain the progress markers.
+
+        Args:
+            messages (list): List of :obj:`BaseMessage` from a response.
+
+        Returns:
+            tuple: A tuple containing whether the agent should be
+                terminated and a string of termination reason.
+        """
+        if self._terminated:
+            return True, self._termination_reason
+
+        progressed = any(marker in message.content for message in messages
+                         for marker in self.markers)
+        self._num_stalled = 0 if progressed else self._num_stalled + 1
+        if self._num_stalled >= self.patience:
+            self._terminated = True
+            self._termination_reason = (
+                f"{self._num_stalled} consecutive responses contain none of "
+                f"the progress markers {self.markers}.")
+        return self._terminated, self._termination_reason
+
+    def reset(self):
+        self._terminated = False
+        self._termination_reason = None
+        self._num_stalled = 0
@@ -11,26 +11,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from .enums import (
-    RoleType,
-    ModelType,
-    TaskType,
-    TerminationMode,
-    OpenAIBackendRole,
-    VectorDistance,
-)
-from .openai_types import (
-    Choice,
-    ChatCompletion,
-    ChatCompletionChunk,
-    ChatCompletionMessage,
-    ChatCompletionMessageParam,
-    ChatCompletionSystemMessageParam,
-    ChatCompletionUserMessageParam,
-    ChatCompletionAssistantMessageParam,
-    ChatCompletionFunctionMessageParam,
-    CompletionUsage,
-)
+from typing import TYPE_CHECKING
+
+from camel.utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .enums import (
+        RoleType,
+        ModelType,
+        TaskType,
+        TerminationMode,
+        OpenAIBackendRole,
+        VectorDistance,
+        ExecutorType,
+        CriticSelectionMode,
+    )
+    from .openai_types import (
+        Choice,
+        ChatCompletion,
+        ChatCompletionChunk,
+        ChatCompletionMessage,
+        ChatCompletionMessageParam,
+        ChatCompletionSystemMessageParam,
+        ChatCompletionUserMessageParam,
+        ChatCompletionAssistantMessageParam,
+        ChatCompletionFunctionMessageParam,
+        CompletionUsage,
+    )
 
 __all__ = [
     'RoleType',
@@ -39,6 +46,8 @@ __all__ = [
     'TerminationMode',
     'OpenAIBackendRole',
     'VectorDistance',
+    'ExecutorType',
+    'CriticSelectionMode',
     'Choice',
     'ChatCompletion',
     'ChatCompletionChunk',
@@ -50,3 +59,26 @@ __all__ = [
     'ChatCompletionFunctionMessageParam',
     'CompletionUsage',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'RoleType': '.enums',
+    'ModelType': '.enums',
+    'TaskType': '.enums',
+    'TerminationMode': '.enums',
+    'OpenAIBackendRole': '.enums',
+    'VectorDistance': '.enums',
+    'ExecutorType': '.enums',
+    'CriticSelectionMode': '.enums',
+    'Choice': '.openai_types',
+    'ChatCompletion': '.openai_types',
+    'ChatCompletionChunk': '.openai_types',
+    'ChatCompletionMessage': '.openai_types',
+    'ChatCompletionMessageParam': '.openai_types',
+    'ChatCompletionSystemMessageParam': '.openai_types',
+    'ChatCompletionUserMessageParam': '.openai_types',
+    'ChatCompletionAssistantMessageParam': '.openai_types',
+    'ChatCompletionFunctionMessageParam': '.openai_types',
+    'CompletionUsage': '.openai_types',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
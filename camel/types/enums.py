@@ -150,3 +150,15 @@ class OpenAIBackendRole(Enum):
 class TerminationMode(Enum):
     ANY = "any"
     ALL = "all"
+
+
+class ExecutorType(Enum):
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class CriticSelectionMode(Enum):
+    TEXT = "text"
+    FUNCTION_CALL = "function_call"
+    LOGIT_BIAS = "logit_bias"
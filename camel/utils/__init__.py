@@ -11,23 +11,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from .python_interpreter import PythonInterpreter
-from .commons import (
-    openai_api_key_required,
-    print_text_animated,
-    get_prompt_template_key_words,
-    get_first_int,
-    download_tasks,
-    parse_doc,
-    get_task_list,
-    check_server_running,
-)
-from .token_counting import (
-    get_model_encoding,
-    BaseTokenCounter,
-    OpenAITokenCounter,
-    OpenSourceTokenCounter,
-)
+from typing import TYPE_CHECKING
+
+from .lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .python_interpreter import PythonInterpreter
+    from .interpreter_pool import InterpreterPool
+    from .commons import (
+        openai_api_key_required,
+        print_text_animated,
+        get_prompt_template_key_words,
+        get_first_int,
+        download_tasks,
+        parse_doc,
+        get_task_list,
+        check_server_running,
+    )
+    from .token_counting import (
+        get_model_encoding,
+        BaseTokenCounter,
+        OpenAITokenCounter,
+        OpenSourceTokenCounter,
+    )
+    from .task_index import TaskIndex
+    from .text_chunker import TextChunker
 
 __all__ = [
     'count_tokens_openai_chat_models',
@@ -37,6 +45,7 @@ __all__ = [
     'get_first_int',
     'download_tasks',
     'PythonInterpreter',
+    'InterpreterPool',
     'parse_doc',
     'get_task_list',
     'get_model_encoding',
@@ -44,4 +53,27 @@ __all__ = [
     'BaseTokenCounter',
     'OpenAITokenCounter',
     'OpenSourceTokenCounter',
+    'TaskIndex',
+    'TextChunker',
 ]
+
+_LAZY_ATTRIBUTES = {
+    'PythonInterpreter': '.python_interpreter',
+    'InterpreterPool': '.interpreter_pool',
+    'openai_api_key_required': '.commons',
+    'print_text_animated': '.commons',
+    'get_prompt_template_key_words': '.commons',
+    'get_first_int': '.commons',
+    'download_tasks': '.commons',
+    'parse_doc': '.commons',
+    'get_task_list': '.commons',
+    'check_server_running': '.commons',
+    'get_model_encoding': '.token_counting',
+    'BaseTokenCounter': '.token_counting',
+    'OpenAITokenCounter': '.token_counting',
+    'OpenSourceTokenCounter': '.token_counting',
+    'TaskIndex': '.task_index',
+    'TextChunker': '.text_chunker',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
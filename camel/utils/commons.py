@@ -31,8 +31,6 @@ from typing import (
 )
 from urllib.parse import urlparse
 
-import requests
-
 from camel.types import ModelType, TaskType
 
 F = TypeVar('F', bound=Callable[..., Any])
@@ -120,6 +118,8 @@ def get_first_int(string: str) -> Optional[int]:
 
 
 def download_tasks(task: TaskType, folder_path: str) -> None:
+    import requests
+
     # Define the path to save the zip file
     zip_file_path = os.path.join(folder_path, "tasks.zip")
 
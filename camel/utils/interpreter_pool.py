@@ -0,0 +1,354 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import Future
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+from camel.utils.python_interpreter import InterpreterError, PythonInterpreter
+
+
+class _SharedValue():
+    r"""A reference to a bytes-like value or a NumPy array copied to shared
+    memory, sent to a worker instead of the value itself."""
+
+    def __init__(self, value: Any) -> None:
+        numpy = sys.modules.get("numpy")
+        if numpy is not None and isinstance(value, numpy.ndarray):
+            self.shape: Optional[Tuple[int, ...]] = value.shape
+            self.dtype = value.dtype
+            data = memoryview(numpy.ascontiguousarray(value)).cast("B")
+        else:
+            self.shape = None
+            self.dtype = type(value)
+            data = memoryview(value).cast("B")
+        self.size = data.nbytes
+        self.shm = SharedMemory(create=True, size=max(self.size, 1))
+        self.shm.buf[:self.size] = data
+        self.name = self.shm.name
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state["shm"]
+        return state
+
+    def load(self) -> Tuple[Any, SharedMemory]:
+        shm = SharedMemory(name=self.name)
+        value: Any
+        if self.shape is not None:
+            import numpy
+            value = numpy.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+        else:
+            value = self.dtype(shm.buf[:self.size])
+        return value, shm
+
+    def release(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _is_large_buffer(value: Any, threshold: int) -> bool:
+    if isinstance(value, (bytes, bytearray)):
+        return len(value) >= threshold
+    numpy = sys.modules.get("numpy")
+    return (numpy is not None and isinstance(value, numpy.ndarray)
+            and value.dtype != object and value.nbytes >= threshold)
+
+
+def _limit_memory(max_memory: int) -> None:
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return
+    # Limit the address space to its current size plus the budget
+    with open(f"/proc/{os.getpid()}/statm") as f:
+        current = int(f.read().split()[0]) * resource.getpagesize()
+    limit = current + max_memory
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(conn: Connection, action_space: Dict[str, Any],
+                 import_white_list: Optional[List[str]],
+                 max_memory: Optional[int], max_tasks: int) -> None:
+    if max_memory is not None and sys.platform.startswith("linux"):
+        _limit_memory(max_memory)
+    interpreter = PythonInterpreter(action_space=action_space,
+                                    import_white_list=import_white_list)
+    for _ in range(max_tasks):
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if task is None:
+            return
+        code, state, fuzz_state = task
+        del task
+        segments = []
+        for name, value in list(fuzz_state.items()):
+            if isinstance(value, _SharedValue):
+                fuzz_state[name], shm = value.load()
+                segments.append(shm)
+        try:
+            response = (True,
+                        interpreter.execute(code, state, fuzz_state,
+                                            keep_state=False))
+        except Exception as e:
+            response = (False, e)
+        del fuzz_state
+        try:
+            conn.send(response)
+        except Exception as e:
+            # The result or the exception cannot be pickled
+            conn.send((False,
+                       InterpreterError(
+                           f"Could not send the result of the code: {e!r}")))
+        del response
+        for shm in segments:
+            try:
+                shm.close()
+            except BufferError:
+                # A value still refers to the segment, it is closed when the
+                # value is collected
+                pass
+
+
+class _Worker():
+
+    def __init__(self, pool: "InterpreterPool") -> None:
+        self.conn, child_conn = pool._context.Pipe()
+        self.process = pool._context.Process(
+            target=_worker_main,
+            args=(child_conn, pool.action_space, pool.import_white_list,
+                  pool.max_memory, pool.max_tasks_per_worker), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.num_tasks = 0
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join()
+        self.conn.close()
+
+
+class InterpreterPool():
+    r"""A pool of worker processes executing code with
+    :obj:`PythonInterpreter`, so code runs on several cores and a crash or a
+    leak of the code does not affect the calling process.
+
+    The workers are started with the action space when the pool is created.
+    Each task runs with a fresh interpreter state. Large bytes-like values
+    and NumPy arrays of :obj:`fuzz_state` are sent to the workers through
+    shared memory instead of being pickled. A worker running a task longer
+    than :obj:`timeout` is killed and replaced, and a worker is replaced
+    after :obj:`max_tasks_per_worker` tasks to bound leaks.
+
+    Args:
+        action_space (Dict[str, Any]): The action space of the interpreters.
+            It must be picklable, e.g. functions and classes defined at the
+            top level of a module.
+        import_white_list (Optional[List[str]], optional): The modules that
+            can be imported in the code. (default: :obj:`None`)
+        num_workers (Optional[int], optional): The number of worker
+            processes. If `None`, the number of CPUs. (default: :obj:`None`)
+        timeout (Optional[float], optional): The maximum time in seconds of a
+            task. If `None`, there is no limit. (default: :obj:`None`)
+        max_memory (Optional[int], optional): The maximum memory in bytes a
+            worker can allocate beyond its size after startup, enforced on
+            Linux by limiting its address space. The code then raises
+            :obj:`MemoryError`. If `None`, there is no limit.
+            (default: :obj:`None`)
+        max_tasks_per_worker (int, optional): The number of tasks after which
+            a worker is replaced. (default: :obj:`100`)
+        shared_memory_threshold (int, optional): The size in bytes from which
+            a value of :obj:`fuzz_state` is sent through shared memory.
+            (default: :obj:`1 << 20`)
+        preload_modules (Optional[List[str]], optional): The modules imported
+            by the forkserver, so the workers forked from it start with them.
+            Only used if the forkserver of the process is not running yet.
+            (default: :obj:`None`)
+        start_method (Optional[str], optional): The start method of the
+            worker processes. If `None`, :obj:`"forkserver"` where available,
+            :obj:`"spawn"` otherwise. (default: :obj:`None`)
+    """
+
+    def __init__(
+        self,
+        action_space: Dict[str, Any],
+        import_white_list: Optional[List[str]] = None,
+        num_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_memory: Optional[int] = None,
+        max_tasks_per_worker: int = 100,
+        shared_memory_threshold: int = 1 << 20,
+        preload_modules: Optional[List[str]] = None,
+        start_method: Optional[str] = None,
+    ) -> None:
+        if max_tasks_per_worker <= 0:
+            raise ValueError("`max_tasks_per_worker` should be larger than 0.")
+        self.action_space = action_space
+        self.import_white_list = import_white_list
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_memory = max_memory
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.shared_memory_threshold = shared_memory_threshold
+
+        if start_method is None:
+            methods = multiprocessing.get_all_start_methods()
+            start_method = "forkserver" if "forkserver" in methods else "spawn"
+        # `get_context` is typed as returning a `BaseContext`, which lacks the
+        # process and pipe factories of the concrete contexts
+        self._context: Any = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            self._context.set_forkserver_preload(
+                ["camel.utils.interpreter_pool"] + (preload_modules or []))
+
+        self._tasks: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._shutdown = False
+        self._shutdown_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        for _ in range(self.num_workers):
+            worker = _Worker(self)
+            thread = threading.Thread(target=self._run_worker, args=(worker, ),
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def __enter__(self) -> "InterpreterPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+    def submit(self, code: str, state: Optional[Dict[str, Any]] = None,
+               fuzz_state: Optional[Dict[str, Any]] = None) -> Future:
+        r"""Schedules the execution of code in a worker.
+
+        Args:
+            code (str): The code to execute.
+            state (Optional[Dict[str, Any]], optional): The variables of the
+                code. (default: :obj:`None`)
+            fuzz_state (Optional[Dict[str, Any]], optional): The variables of
+                the code accessed with fuzzy matching. (default: :obj:`None`)
+
+        Returns:
+            Future: The future of the value of the last statement of the code.
+                It raises :obj:`TimeoutError` if the task exceeds the timeout,
+                and :obj:`RuntimeError` if the worker exited.
+        """
+        future: Future = Future()
+        shared = []
+        fuzz_state = dict(fuzz_state or {})
+        for name, value in fuzz_state.items():
+            if _is_large_buffer(value, self.shared_memory_threshold):
+                fuzz_state[name] = _SharedValue(value)
+                shared.append(fuzz_state[name])
+        with self._shutdown_lock:
+            if self._shutdown:
+                for value in shared:
+                    value.release()
+                raise RuntimeError("Cannot submit code after shutdown.")
+            self._tasks.put((future, (str(code), state
+                                      or {}, fuzz_state), shared))
+        return future
+
+    def execute(self, code: str, state: Optional[Dict[str, Any]] = None,
+                fuzz_state: Optional[Dict[str, Any]] = None) -> Any:
+        r"""Executes code in a worker and waits for its result.
+
+        Args:
+            code (str): The code to execute.
+            state (Optional[Dict[str, Any]], optional): The variables of the
+                code. (default: :obj:`None`)
+            fuzz_state (Optional[Dict[str, Any]], optional): The variables of
+                the code accessed with fuzzy matching. (default: :obj:`None`)
+
+        Returns:
+            Any: The value of the last statement of the code.
+        """
+        return self.submit(code, state, fuzz_state).result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        r"""Stops the workers once the scheduled tasks are done.
+
+        Args:
+            wait (bool, optional): Whether to wait for the workers to stop.
+                (default: :obj:`True`)
+        """
+        with self._shutdown_lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            for _ in self._threads:
+                self._tasks.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _run_worker(self, worker: _Worker) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                worker.stop()
+                return
+            future, message, shared = task
+            try:
+                if future.set_running_or_notify_cancel():
+                    worker = self._run_task(worker, future, message)
+            finally:
+                for value in shared:
+                    value.release()
+            if worker.num_tasks >= self.max_tasks_per_worker:
+                # The worker exits after its last task
+                worker.stop()
+                worker = _Worker(self)
+
+    def _run_task(self, worker: _Worker, future: Future,
+                  message: Tuple) -> _Worker:
+        try:
+            worker.conn.send(message)
+            worker.num_tasks += 1
+            if not worker.conn.poll(self.timeout):
+                worker.stop(kill=True)
+                future.set_exception(
+                    TimeoutError(f"The code did not finish within "
+                                 f"{self.timeout} seconds."))
+                return _Worker(self)
+            success, value = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.stop(kill=True)
+            future.set_exception(
+                RuntimeError(f"The worker process exited with code "
+                             f"{worker.process.exitcode}."))
+            return _Worker(self)
+        except BaseException as e:
+            future.set_exception(e)
+            return worker
+
+        if success:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+        return worker
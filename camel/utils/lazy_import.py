@@ -0,0 +1,95 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import importlib
+import sys
+import threading
+from typing import Any, Callable, List, Mapping, Tuple, Union
+
+
+def lazy_attributes(
+    module_name: str,
+    attributes: Mapping[str, Union[str, Tuple[str, str]]],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    r"""Creates the module :obj:`__getattr__` and :obj:`__dir__` functions
+    (PEP 562) of a package whose attributes are imported on first access, so
+    importing the package does not import its dependencies.
+
+    Args:
+        module_name (str): The name of the package, i.e. its
+            :obj:`__name__`.
+        attributes (Mapping[str, Union[str, Tuple[str, str]]]): The lazy
+            attributes, mapped to the module defining them, relative to the
+            package if it starts with a dot, or to a tuple of the module and
+            the name of the attribute in it. An attribute mapped to the
+            submodule of the same name is the submodule itself.
+
+    Returns:
+        Tuple[Callable[[str], Any], Callable[[], List[str]]]: The
+            :obj:`__getattr__` and :obj:`__dir__` functions of the package.
+    """
+    module = sys.modules[module_name]
+
+    def __getattr__(name: str) -> Any:
+        target = attributes.get(name)
+        if target is None:
+            raise AttributeError(
+                f"module {module_name!r} has no attribute {name!r}")
+        submodule_name, attribute = ((target, name)
+                                     if isinstance(target, str) else target)
+        submodule = importlib.import_module(submodule_name, module_name)
+        if submodule_name == f".{name}":
+            value: Any = submodule
+        else:
+            value = getattr(submodule, attribute)
+        # Later accesses do not go through this function
+        setattr(module, name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(module)) | set(attributes))
+
+    return __getattr__, __dir__
+
+
+def lazy_values(
+    module_name: str,
+    factories: Mapping[str, Callable[[], Any]],
+) -> Callable[[str], Any]:
+    r"""Creates the module :obj:`__getattr__` function (PEP 562) of a module
+    whose attributes are built on first access, e.g. registries that are
+    costly to build.
+
+    Args:
+        module_name (str): The name of the module, i.e. its :obj:`__name__`.
+        factories (Mapping[str, Callable[[], Any]]): The functions building
+            the lazy attributes.
+
+    Returns:
+        Callable[[str], Any]: The :obj:`__getattr__` function of the module.
+    """
+    module = sys.modules[module_name]
+    lock = threading.Lock()
+
+    def __getattr__(name: str) -> Any:
+        factory = factories.get(name)
+        if factory is None:
+            raise AttributeError(
+                f"module {module_name!r} has no attribute {name!r}")
+        with lock:
+            # Another thread may have built the value meanwhile
+            if name not in vars(module):
+                setattr(module, name, factory())
+        return vars(module)[name]
+
+    return __getattr__
@@ -14,16 +14,148 @@
 import ast
 import difflib
 import importlib
-import typing
-from typing import Any, Dict, List, Optional
+import operator
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+# The interpreters with a memory budget running at once, which share the
+# process-wide tracing of tracemalloc
+_memory_tracing_lock = threading.Lock()
+_num_memory_tracing_users = 0
+_memory_tracing_started = False
+
+
+def _start_memory_tracing() -> None:
+    global _num_memory_tracing_users, _memory_tracing_started
+    with _memory_tracing_lock:
+        if _num_memory_tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _memory_tracing_started = True
+        _num_memory_tracing_users += 1
+
+
+def _stop_memory_tracing() -> None:
+    global _num_memory_tracing_users, _memory_tracing_started
+    with _memory_tracing_lock:
+        _num_memory_tracing_users -= 1
+        # Tracing started by the caller of the interpreters is left running
+        if _num_memory_tracing_users == 0 and _memory_tracing_started:
+            tracemalloc.stop()
+            _memory_tracing_started = False
 
 
 class InterpreterError(ValueError):
     r"""An error raised when the interpreter cannot evaluate a Python
-    expression, due to syntax error or unsupported operations.
+    expression, due to syntax error, unsupported operations or exceeded
+    execution budgets.
+
+    Args:
+        message (str): The error message.
+        partial_result (Any, optional): The value of the last statement
+            evaluated before the error. (default: :obj:`None`)
     """
 
-    pass
+    def __init__(self, message: str, partial_result: Any = None) -> None:
+        super().__init__(message)
+        self.partial_result = partial_result
+
+
+def _new_stats() -> List[float]:
+    return [0, 0.]
+
+
+class InterpreterProfiler():
+    r"""Collects the number of evaluations and the time spent per AST node
+    type and per action-space function of a :obj:`PythonInterpreter`.
+
+    The time of a node includes the time of its children, e.g. the time of a
+    :obj:`For` node includes the time of the statements of its body.
+    """
+
+    def __init__(self) -> None:
+        # [count, total time in seconds] by name
+        self.node_stats: Dict[str, List[float]] = defaultdict(_new_stats)
+        self.function_stats: Dict[str, List[float]] = defaultdict(_new_stats)
+
+    def record_node(self, node_type: str, elapsed: float) -> None:
+        stats = self.node_stats[node_type]
+        stats[0] += 1
+        stats[1] += elapsed
+
+    def record_function(self, name: str, elapsed: float) -> None:
+        stats = self.function_stats[name]
+        stats[0] += 1
+        stats[1] += elapsed
+
+    def reset(self) -> None:
+        r"""Clears the collected statistics."""
+        self.node_stats.clear()
+        self.function_stats.clear()
+
+    def report(self) -> str:
+        r"""Formats the collected statistics, sorted by total time.
+
+        Returns:
+            str: A table of the number of calls and the total time of each
+                node type and each action-space function.
+        """
+        lines = []
+        for title, stats in [("Node type", self.node_stats),
+                             ("Function", self.function_stats)]:
+            lines.append(f"{title:<24} {'calls':>10} {'total (ms)':>12}")
+            for name, (count, total) in sorted(stats.items(),
+                                               key=lambda item: -item[1][1]):
+                lines.append(f"{name:<24} {int(count):>10} "
+                             f"{total * 1e3:>12.3f}")
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=256)
+def _parse_code(code: str) -> ast.Module:
+    r"""Parses code, caching the ASTs of the most recent snippets, since
+    agents often run the same snippets again. The ASTs are shared between
+    interpreters and must not be modified."""
+    try:
+        return ast.parse(code)
+    except SyntaxError as e:
+        raise InterpreterError(f"Syntax error in code: {e}")
+
+
+_BINARY_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift,
+    ast.MatMult: operator.matmul,
+}
+
+_COMPARISON_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+}
+
+_UNARY_OPERATORS: Dict[type, Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+    ast.Not: operator.not_,
+}
 
 
 class PythonInterpreter():
@@ -77,14 +209,48 @@ class PythonInterpreter():
             importable. Any other import statements will be rejected. The
             module and its submodule or function name are separated by a period
             (:obj:`.`). (default: :obj:`None`)
+        max_instructions (Optional[int], optional): The maximum number of AST
+            nodes evaluated by one call of :meth:`execute`. If `None`, there
+            is no limit. (default: :obj:`None`)
+        max_time (Optional[float], optional): The maximum wall-clock time in
+            seconds of one call of :meth:`execute`. The budgets are checked
+            between nodes, so a single slow function call is only stopped
+            after it returns. If `None`, there is no limit.
+            (default: :obj:`None`)
+        max_memory (Optional[int], optional): The maximum memory in bytes
+            allocated by one call of :meth:`execute`, as traced by
+            :mod:`tracemalloc`, which only sees the memory allocated through
+            Python. The tracing covers the whole process, so the memory
+            allocated by other threads meanwhile counts towards the budget;
+            use :obj:`InterpreterPool` to bound the memory of the code alone.
+            If `None`, there is no limit. (default: :obj:`None`)
+        profile (bool, optional): Whether to collect the time spent per AST
+            node type and per action-space function in :obj:`profiler`.
+            (default: :obj:`False`)
     """
 
     def __init__(self, action_space: Dict[str, Any],
-                 import_white_list: Optional[List[str]] = None) -> None:
+                 import_white_list: Optional[List[str]] = None,
+                 max_instructions: Optional[int] = None,
+                 max_time: Optional[float] = None,
+                 max_memory: Optional[int] = None,
+                 profile: bool = False) -> None:
         self.action_space = action_space
         self.state = self.action_space.copy()
         self.fuzz_state: Dict[str, Any] = {}
         self.import_white_list = import_white_list or []
+        self._import_white_set = frozenset(self.import_white_list)
+        # Results of the import checks, by full name of the imported object
+        self._import_checks: Dict[str, bool] = {}
+        self.max_instructions = max_instructions
+        self.max_time = max_time
+        self.max_memory = max_memory
+        self.profiler = InterpreterProfiler() if profile else None
+        # Budget state of the current execution
+        self._num_instructions = 0
+        self._deadline = 0.
+        self._memory_baseline = 0
+        self._partial_result: Any = None
 
     def execute(self, code: str, state: Optional[Dict[str, Any]] = None,
                 fuzz_state: Optional[Dict[str, Any]] = None,
@@ -117,25 +283,37 @@ class PythonInterpreter():
         if fuzz_state is not None:
             self.fuzz_state.update(fuzz_state)
 
-        try:
-            expression = ast.parse(code)
-        except SyntaxError as e:
-            raise InterpreterError(f"Syntax error in code: {e}")
+        expression = _parse_code(code)
 
-        result = None
-        for idx, node in enumerate(expression.body):
-            try:
-                line_result = self._execute_ast(node)
-            except InterpreterError as e:
-                if not keep_state:
-                    self.clear_state()
-                msg = (f"Evaluation of the code stopped at node {idx}. "
-                       f"See:\n{e}")
-                # More information can be provided by `ast.unparse()`,
-                # which is new in python 3.9.
-                raise InterpreterError(msg)
-            if line_result is not None:
-                result = line_result
+        self._num_instructions = 0
+        if self.max_time is not None:
+            self._deadline = time.perf_counter() + self.max_time
+        stop_tracing = False
+        if self.max_memory is not None:
+            _start_memory_tracing()
+            stop_tracing = True
+            self._memory_baseline = tracemalloc.get_traced_memory()[0]
+        self._partial_result = None
+
+        try:
+            result = None
+            for idx, node in enumerate(expression.body):
+                try:
+                    line_result = self._execute_ast(node)
+                except InterpreterError as e:
+                    if not keep_state:
+                        self.clear_state()
+                    msg = (f"Evaluation of the code stopped at node {idx}. "
+                           f"See:\n{e}")
+                    # More information can be provided by `ast.unparse()`,
+                    # which is new in python 3.9.
+                    raise InterpreterError(msg, self._partial_result)
+                if line_result is not None:
+                    result = line_result
+                    self._partial_result = line_result
+        finally:
+            if stop_tracing:
+                _stop_memory_tracing()
 
         if not keep_state:
             self.clear_state()
@@ -147,83 +325,76 @@ class PythonInterpreter():
         self.state = self.action_space.copy()
         self.fuzz_state = {}
 
-    # ast.Index is deprecated after python 3.9, which cannot pass type check,
-    # but is still necessary for older versions.
-    @typing.no_type_check
     def _execute_ast(self, expression: ast.AST) -> Any:
-        if isinstance(expression, ast.Assign):
-            # Assignment -> evaluate the assignment which should
-            # update the state. We return the variable assigned as it may
-            # be used to determine the final result.
-            return self._execute_assign(expression)
-        elif isinstance(expression, ast.Attribute):
-            value = self._execute_ast(expression.value)
-            return getattr(value, expression.attr)
-        elif isinstance(expression, ast.BinOp):
-            # Binary Operator -> return the result value
-            return self._execute_binop(expression)
-        elif isinstance(expression, ast.Call):
-            # Function call -> return the value of the function call
-            return self._execute_call(expression)
-        elif isinstance(expression, ast.Compare):
-            # Compare -> return True or False
-            return self._execute_condition(expression)
-        elif isinstance(expression, ast.Constant):
-            # Constant -> just return the value
-            return expression.value
-        elif isinstance(expression, ast.Dict):
-            # Dict -> evaluate all keys and values
-            result: Dict = {}
-            for k, v in zip(expression.keys, expression.values):
-                if k is not None:
-                    result[self._execute_ast(k)] = self._execute_ast(v)
-                else:
-                    result.update(self._execute_ast(v))
-            return result
-        elif isinstance(expression, ast.Expr):
-            # Expression -> evaluate the content
-            return self._execute_ast(expression.value)
-        elif isinstance(expression, ast.For):
-            return self._execute_for(expression)
-        elif isinstance(expression, ast.FormattedValue):
-            # Formatted value (part of f-string) -> evaluate the content
-            # and return
-            return self._execute_ast(expression.value)
-        elif isinstance(expression, ast.If):
-            # If -> execute the right branch
-            return self._execute_if(expression)
-        elif isinstance(expression, ast.Import):
-            # Import -> add imported names in self.state and return None.
-            self._execute_import(expression)
-            return None
-        elif isinstance(expression, ast.ImportFrom):
-            self._execute_import_from(expression)
-            return None
-        elif hasattr(ast, "Index") and isinstance(expression, ast.Index):
-            # cannot pass type check
-            return self._execute_ast(expression.value)
-        elif isinstance(expression, ast.JoinedStr):
-            return "".join(
-                [str(self._execute_ast(v)) for v in expression.values])
-        elif isinstance(expression, ast.List):
-            # List -> evaluate all elements
-            return [self._execute_ast(elt) for elt in expression.elts]
-        elif isinstance(expression, ast.Name):
-            # Name -> pick up the value in the state
-            return self._execute_name(expression)
-        elif isinstance(expression, ast.Subscript):
-            # Subscript -> return the value of the indexing
-            return self._execute_subscript(expression)
-        elif isinstance(expression, ast.Tuple):
-            return tuple([self._execute_ast(elt) for elt in expression.elts])
-        elif isinstance(expression, ast.UnaryOp):
-            # Binary Operator -> return the result value
-            return self._execute_unaryop(expression)
-        else:
+        handler = self._NODE_HANDLERS.get(type(expression))
+        if handler is None:
             # For now we refuse anything else. Let's add things as we need
             # them.
             raise InterpreterError(
                 f"{expression.__class__.__name__} is not supported.")
+        if (self.max_instructions is None and self.max_time is None
+                and self.max_memory is None and self.profiler is None):
+            return handler(self, expression)
+
+        self._check_budgets()
+        if self.profiler is None:
+            return handler(self, expression)
+        start = time.perf_counter()
+        try:
+            return handler(self, expression)
+        finally:
+            self.profiler.record_node(expression.__class__.__name__,
+                                      time.perf_counter() - start)
+
+    def _check_budgets(self) -> None:
+        self._num_instructions += 1
+        if (self.max_instructions is not None
+                and self._num_instructions > self.max_instructions):
+            raise InterpreterError(f"Exceeded the budget of "
+                                   f"{self.max_instructions} instructions.")
+        if (self.max_time is not None
+                and time.perf_counter() > self._deadline):
+            raise InterpreterError(
+                f"Exceeded the time budget of {self.max_time} seconds.")
+        if self.max_memory is not None:
+            memory = (tracemalloc.get_traced_memory()[0] -
+                      self._memory_baseline)
+            if memory > self.max_memory:
+                raise InterpreterError(f"Exceeded the memory budget of "
+                                       f"{self.max_memory} bytes.")
+
+    def _execute_attribute(self, attribute: ast.Attribute) -> Any:
+        value = self._execute_ast(attribute.value)
+        return getattr(value, attribute.attr)
+
+    def _execute_constant(self, constant: ast.Constant) -> Any:
+        # Constant -> just return the value
+        return constant.value
+
+    def _execute_dict(self, dict_expression: ast.Dict) -> Dict:
+        # Dict -> evaluate all keys and values
+        result: Dict = {}
+        for k, v in zip(dict_expression.keys, dict_expression.values):
+            if k is not None:
+                result[self._execute_ast(k)] = self._execute_ast(v)
+            else:
+                result.update(self._execute_ast(v))
+        return result
+
+    def _execute_value(self, expression: Any) -> Any:
+        # Expression, formatted value (part of f-string) or index ->
+        # evaluate the content
+        return self._execute_ast(expression.value)
+
+    def _execute_joined_str(self, joined_str: ast.JoinedStr) -> str:
+        return "".join([str(self._execute_ast(v)) for v in joined_str.values])
+
+    def _execute_list(self, list_expression: ast.List) -> List:
+        # List -> evaluate all elements
+        return [self._execute_ast(elt) for elt in list_expression.elts]
+
+    def _execute_tuple(self, tuple_expression: ast.Tuple) -> tuple:
+        return tuple([self._execute_ast(elt) for elt in tuple_expression.elts])
 
     def _execute_assign(self, assign: ast.Assign) -> Any:
         targets = assign.targets
@@ -260,7 +431,28 @@ class PythonInterpreter():
             keyword.arg: self._execute_ast(keyword.value)
             for keyword in call.keywords
         }
-        return callable_func(*args, **kwargs)
+        if self.profiler is None:
+            return callable_func(*args, **kwargs)
+
+        name = self._get_action_name(call.func)
+        if name is None:
+            return callable_func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return callable_func(*args, **kwargs)
+        finally:
+            self.profiler.record_function(name, time.perf_counter() - start)
+
+    def _get_action_name(self, func: ast.expr) -> Optional[str]:
+        # Name of the called action-space function or member function of an
+        # action-space object, e.g. "obj.method"
+        attributes: List[str] = []
+        while isinstance(func, ast.Attribute):
+            attributes.append(func.attr)
+            func = func.value
+        if not isinstance(func, ast.Name) or func.id not in self.action_space:
+            return None
+        return ".".join([func.id] + attributes[::-1])
 
     def _execute_subscript(self, subscript: ast.Subscript):
         index = self._execute_ast(subscript.slice)
@@ -300,28 +492,10 @@ class PythonInterpreter():
         comparator = condition.ops[0]
         right = self._execute_ast(condition.comparators[0])
 
-        if isinstance(comparator, ast.Eq):
-            return left == right
-        elif isinstance(comparator, ast.NotEq):
-            return left != right
-        elif isinstance(comparator, ast.Lt):
-            return left < right
-        elif isinstance(comparator, ast.LtE):
-            return left <= right
-        elif isinstance(comparator, ast.Gt):
-            return left > right
-        elif isinstance(comparator, ast.GtE):
-            return left >= right
-        elif isinstance(comparator, ast.Is):
-            return left is right
-        elif isinstance(comparator, ast.IsNot):
-            return left is not right
-        elif isinstance(comparator, ast.In):
-            return left in right
-        elif isinstance(comparator, ast.NotIn):
-            return left not in right
-        else:
+        comparison = _COMPARISON_OPERATORS.get(type(comparator))
+        if comparison is None:
             raise InterpreterError(f"Unsupported operator: {comparator}")
+        return comparison(left, right)
 
     def _execute_if(self, if_statement: ast.If):
         result = None
@@ -334,11 +508,13 @@ class PythonInterpreter():
                 line_result = self._execute_ast(line)
                 if line_result is not None:
                     result = line_result
+                    self._partial_result = line_result
         else:
             for line in if_statement.orelse:
                 line_result = self._execute_ast(line)
                 if line_result is not None:
                     result = line_result
+                    self._partial_result = line_result
         return result
 
     def _execute_for(self, for_statement: ast.For):
@@ -349,16 +525,18 @@ class PythonInterpreter():
                 line_result = self._execute_ast(line)
                 if line_result is not None:
                     result = line_result
+                    self._partial_result = line_result
 
         return result
 
     def _execute_import(self, import_module: ast.Import) -> None:
+        # Import -> add imported names in self.state and return None.
         for module in import_module.names:
             self._validate_import(module.name)
             alias = module.asname or module.name
             self.state[alias] = importlib.import_module(module.name)
 
-    def _execute_import_from(self, import_from: ast.ImportFrom):
+    def _execute_import_from(self, import_from: ast.ImportFrom) -> None:
         if import_from.module is None:
             raise InterpreterError("\"from . import\" is not supported.")
         for import_name in import_from.names:
@@ -369,59 +547,38 @@ class PythonInterpreter():
             self.state[alias] = getattr(imported_module, import_name.name)
 
     def _validate_import(self, full_name: str):
-        tmp_name = ""
-        found_name = False
-        for name in full_name.split("."):
-            tmp_name += name if tmp_name == "" else f".{name}"
-            if tmp_name in self.import_white_list:
-                found_name = True
-                return
-
-        if not found_name:
+        allowed = self._import_checks.get(full_name)
+        if allowed is None:
+            names = full_name.split(".")
+            prefixes = (".".join(names[:i]) for i in range(1, len(names) + 1))
+            allowed = any(prefix in self._import_white_set
+                          for prefix in prefixes)
+            self._import_checks[full_name] = allowed
+
+        if not allowed:
             raise InterpreterError(f"It is not permitted to import modules "
                                    f"than module white list (try to import "
                                    f"{full_name}).")
 
     def _execute_binop(self, binop: ast.BinOp):
         left = self._execute_ast(binop.left)
-        operator = binop.op
+        binary_operator = binop.op
         right = self._execute_ast(binop.right)
 
-        if isinstance(operator, ast.Add):
-            return left + right
-        elif isinstance(operator, ast.Sub):
-            return left - right
-        elif isinstance(operator, ast.Mult):
-            return left * right
-        elif isinstance(operator, ast.Div):
-            return left / right
-        elif isinstance(operator, ast.FloorDiv):
-            return left // right
-        elif isinstance(operator, ast.Mod):
-            return left % right
-        elif isinstance(operator, ast.Pow):
-            return left**right
-        elif isinstance(operator, ast.LShift):
-            return left << right
-        elif isinstance(operator, ast.RShift):
-            return left >> right
-        elif isinstance(operator, ast.MatMult):
-            return left @ right
-        else:
-            raise InterpreterError(f"Operator not supported: {operator}")
+        operation = _BINARY_OPERATORS.get(type(binary_operator))
+        if operation is None:
+            raise InterpreterError(
+                f"Operator not supported: {binary_operator}")
+        return operation(left, right)
 
     def _execute_unaryop(self, unaryop: ast.UnaryOp):
         operand = self._execute_ast(unaryop.operand)
-        operator = unaryop.op
-
-        if isinstance(operator, ast.UAdd):
-            return +operand
-        elif isinstance(operator, ast.USub):
-            return -operand
-        elif isinstance(operator, ast.Not):
-            return not operand
-        else:
-            raise InterpreterError(f"Operator not supported: {operator}")
+        unary_operator = unaryop.op
+
+        operation = _UNARY_OPERATORS.get(type(unary_operator))
+        if operation is None:
+            raise InterpreterError(f"Operator not supported: {unary_operator}")
+        return operation(operand)
 
     def _get_value_from_state(self, key: str) -> Any:
         if key in self.state:
@@ -433,3 +590,31 @@ class PythonInterpreter():
                 return self.fuzz_state[close_matches[0]]
             else:
                 raise InterpreterError(f"The variable `{key}` is not defined.")
+
+    # Handlers of the supported node types, dispatched on the exact type of
+    # the node
+    _NODE_HANDLERS: Dict[type, Callable[["PythonInterpreter", Any], Any]] = {
+        ast.Assign: _execute_assign,
+        ast.Attribute: _execute_attribute,
+        ast.BinOp: _execute_binop,
+        ast.Call: _execute_call,
+        ast.Compare: _execute_condition,
+        ast.Constant: _execute_constant,
+        ast.Dict: _execute_dict,
+        ast.Expr: _execute_value,
+        ast.For: _execute_for,
+        ast.FormattedValue: _execute_value,
+        ast.If: _execute_if,
+        ast.Import: _execute_import,
+        ast.ImportFrom: _execute_import_from,
+        ast.JoinedStr: _execute_joined_str,
+        ast.List: _execute_list,
+        ast.Name: _execute_name,
+        ast.Subscript: _execute_subscript,
+        ast.Tuple: _execute_tuple,
+        ast.UnaryOp: _execute_unaryop,
+    }
+    # ast.Index is deprecated after python 3.9, but is still necessary for
+    # older versions.
+    if hasattr(ast, "Index") and isinstance(getattr(ast, "Index"), type):
+        _NODE_HANDLERS[getattr(ast, "Index")] = _execute_value
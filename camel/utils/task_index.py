@@ -0,0 +1,213 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import math
+import random
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+class TaskIndex:
+    r"""An index of task descriptions detecting near-duplicate tasks.
+
+    Tasks are normalized (lower-cased, punctuation and extra whitespace
+    removed) and split into character shingles. Candidate duplicates are
+    looked up in sub-linear time with MinHash signatures and locality
+    sensitive hashing, then confirmed with the exact Jaccard similarity of
+    their shingles. Optionally, tasks that are not duplicates by their
+    wording are also compared by the cosine similarity of their embeddings,
+    to catch paraphrases.
+
+    Args:
+        threshold (float, optional): The Jaccard similarity of the shingles
+            from which two tasks are duplicates. (default: :obj:`0.7`)
+        shingle_size (int, optional): The number of characters of a shingle.
+            (default: :obj:`3`)
+        num_perm (int, optional): The number of hash functions of the MinHash
+            signatures. It must be a multiple of :obj:`num_bands`.
+            (default: :obj:`64`)
+        num_bands (int, optional): The number of bands the signatures are
+            split into for locality sensitive hashing. More bands find more
+            candidates, at the cost of more exact comparisons.
+            (default: :obj:`16`)
+        embedding_fn (Callable[[str], Sequence[float]], optional): A function
+            embedding a task description. If `None`, only the wording of the
+            tasks is compared. (default: :obj:`None`)
+        embedding_threshold (float, optional): The cosine similarity of the
+            embeddings from which two tasks are duplicates.
+            (default: :obj:`0.9`)
+        seed (int, optional): The seed of the hash functions.
+            (default: :obj:`0`)
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        shingle_size: int = 3,
+        num_perm: int = 64,
+        num_bands: int = 16,
+        embedding_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        embedding_threshold: float = 0.9,
+        seed: int = 0,
+    ) -> None:
+        if num_perm % num_bands != 0:
+            raise ValueError("`num_perm` should be a multiple of `num_bands`. "
+                             f"Got {num_perm} and {num_bands} instead.")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+        self.embedding_fn = embedding_fn
+        self.embedding_threshold = embedding_threshold
+
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME),
+                        rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+
+        self.tasks: List[str] = []
+        self._shingles: List[FrozenSet[str]] = []
+        self._buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._embeddings: List[List[float]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(task: str) -> str:
+        r"""Normalizes a task description for comparison.
+
+        Args:
+            task (str): The task description.
+
+        Returns:
+            str: The lower-cased description, without punctuation and with
+                single spaces between the words.
+        """
+        return " ".join(re.sub(r"[^\w\s]", " ", task.lower()).split())
+
+    def _get_shingles(self, task: str) -> FrozenSet[str]:
+        text = self.normalize(task)
+        if len(text) <= self.shingle_size:
+            return frozenset([text])
+        return frozenset(text[i:i + self.shingle_size]
+                         for i in range(len(text) - self.shingle_size + 1))
+
+    def _get_band_keys(self,
+                       shingles: FrozenSet[str]) -> List[Tuple[int, int]]:
+        hashes = [zlib.crc32(shingle.encode()) for shingle in shingles]
+        signature = [
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._perms
+        ]
+        rows = self.num_perm // self.num_bands
+        return [(i, hash(tuple(signature[i * rows:(i + 1) * rows])))
+                for i in range(self.num_bands)]
+
+    def _find_duplicate(
+        self,
+        shingles: FrozenSet[str],
+        band_keys: List[Tuple[int, int]],
+        embedding: Optional[List[float]],
+    ) -> Optional[str]:
+        candidates = {
+            index
+            for band_key in band_keys
+            for index in self._buckets.get(band_key, [])
+        }
+        for index in sorted(candidates):
+            other = self._shingles[index]
+            similarity = len(shingles & other) / len(shingles | other)
+            if similarity >= self.threshold:
+                return self.tasks[index]
+        if embedding is not None:
+            for index, other_embedding in enumerate(self._embeddings):
+                similarity = sum(x * y
+                                 for x, y in zip(embedding, other_embedding))
+                if similarity >= self.embedding_threshold:
+                    return self.tasks[index]
+        return None
+
+    def _embed(self, task: str) -> Optional[List[float]]:
+        if self.embedding_fn is None:
+            return None
+        embedding = [float(x) for x in self.embedding_fn(task)]
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        return [x / norm for x in embedding]
+
+    def find_duplicate(self, task: str) -> Optional[str]:
+        r"""Looks up an indexed task that the given task duplicates.
+
+        Args:
+            task (str): The task description.
+
+        Returns:
+            Optional[str]: The duplicated task, or `None` if the task is new.
+        """
+        shingles = self._get_shingles(task)
+        band_keys = self._get_band_keys(shingles)
+        embedding = self._embed(task)
+        with self._lock:
+            return self._find_duplicate(shingles, band_keys, embedding)
+
+    def add(self, task: str) -> bool:
+        r"""Adds a task to the index unless it duplicates an indexed one.
+
+        Args:
+            task (str): The task description.
+
+        Returns:
+            bool: Whether the task was added, i.e. is not a duplicate.
+        """
+        shingles = self._get_shingles(task)
+        band_keys = self._get_band_keys(shingles)
+        embedding = self._embed(task)
+        with self._lock:
+            if self._find_duplicate(shingles, band_keys,
+                                    embedding) is not None:
+                return False
+            index = len(self.tasks)
+            self.tasks.append(task)
+            self._shingles.append(shingles)
+            for band_key in band_keys:
+                self._buckets[band_key].append(index)
+            if embedding is not None:
+                self._embeddings.append(embedding)
+            return True
+
+    def filter(self, tasks: Sequence[str]) -> List[str]:
+        r"""Adds the given tasks to the index, and returns the ones that do
+        not duplicate an indexed task or a previous task of the list.
+
+        Args:
+            tasks (Sequence[str]): The task descriptions.
+
+        Returns:
+            List[str]: The new tasks, in their original order.
+        """
+        return [task for task in tasks if self.add(task)]
@@ -0,0 +1,179 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import re
+from collections import deque
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional
+
+from camel.types import ModelType
+from camel.utils.token_counting import get_model_encoding
+
+# The end of a sentence or of a line, with the whitespace following it
+_SEGMENT_END = re.compile(r"(?:[.!?]+|\n)\s*")
+
+
+class TextChunker:
+    r"""Splits texts into chunks of a target number of tokens, at sentence
+    and paragraph boundaries.
+
+    The text is split into segments (sentences or lines) in a single pass,
+    and every segment is tokenized once. Segments are then packed greedily
+    into chunks of at most :obj:`chunk_size` tokens, so chunking takes time
+    linear in the length of the text. A segment longer than a chunk is split
+    at token boundaries. Without overlap, the chunks of a text concatenate
+    back to the text.
+
+    Args:
+        chunk_size (int, optional): The maximum number of tokens of a chunk.
+            (default: :obj:`512`)
+        overlap (int, optional): The maximum number of tokens of the trailing
+            segments of a chunk that are repeated at the start of the next
+            one, to keep context across chunks. (default: :obj:`0`)
+        encoding (Any, optional): The tokenizer, with :obj:`encode` and
+            :obj:`decode` methods like a :obj:`tiktoken.Encoding`. If `None`,
+            the tiktoken encoding of :obj:`model_type` is used.
+            (default: :obj:`None`)
+        model_type (ModelType, optional): The model whose encoding is used
+            if :obj:`encoding` is `None`.
+            (default: :obj:`ModelType.GPT_3_5_TURBO`)
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 512,
+        overlap: int = 0,
+        encoding: Optional[Any] = None,
+        model_type: ModelType = ModelType.GPT_3_5_TURBO,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("`chunk_size` should be larger than 0.")
+        if not 0 <= overlap < chunk_size:
+            raise ValueError("`overlap` should be at least 0 and smaller "
+                             "than `chunk_size`.")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.model_type = model_type
+        self._encoding = encoding
+        self._encode: Optional[Callable[[str], List[int]]] = None
+
+    @property
+    def encoding(self) -> Any:
+        r"""The tokenizer, loaded on first use."""
+        if self._encoding is None:
+            self._encoding = get_model_encoding(
+                self.model_type.value_for_tiktoken)
+        return self._encoding
+
+    def encode(self, text: str) -> List[int]:
+        r"""Tokenizes a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            List[int]: The tokens of the text.
+        """
+        if self._encode is None:
+            encoding = self.encoding
+            if type(encoding).__module__.startswith("tiktoken"):
+                # Special tokens in the text are plain text to be chunked
+                def encode(text: str) -> List[int]:
+                    return encoding.encode(text, disallowed_special=())
+
+                self._encode = encode
+            else:
+                self._encode = encoding.encode
+        return self._encode(text)
+
+    def _split_segments(self, pieces: Iterable[str]) -> Iterator[str]:
+        buffer = ""
+        # A segment without boundary is cut at a space once it is this long,
+        # so that the buffer stays bounded
+        max_segment_length = 16 * self.chunk_size
+        for piece in pieces:
+            buffer += piece
+            start = 0
+            for match in _SEGMENT_END.finditer(buffer):
+                # The whitespace at the end of the buffer may go on in the
+                # next piece
+                if match.end() == len(buffer):
+                    break
+                yield buffer[start:match.end()]
+                start = match.end()
+            while len(buffer) - start > max_segment_length:
+                end = buffer.rfind(" ", start, start + max_segment_length) + 1
+                if end <= start:
+                    end = start + max_segment_length
+                yield buffer[start:end]
+                start = end
+            buffer = buffer[start:]
+        if buffer:
+            yield buffer
+
+    def chunk_stream(self, pieces: Iterable[str]) -> Iterator[str]:
+        r"""Chunks a text given as successive pieces, e.g. the lines of a
+        file, keeping only the current chunk in memory.
+
+        Args:
+            pieces (Iterable[str]): The pieces of the text.
+
+        Yields:
+            str: The chunks of the text.
+        """
+        # The segments of the current chunk, with their number of tokens
+        segments: Deque[str] = deque()
+        num_tokens: Deque[int] = deque()
+        total = 0
+        for segment in self._split_segments(pieces):
+            tokens = self.encode(segment)
+            if len(tokens) > self.chunk_size:
+                if segments:
+                    yield "".join(segments)
+                    segments.clear()
+                    num_tokens.clear()
+                    total = 0
+                step = self.chunk_size - self.overlap
+                start = 0
+                while len(tokens) - start > self.chunk_size:
+                    yield self.encoding.decode(tokens[start:start +
+                                                      self.chunk_size])
+                    start += step
+                # The end of the segment starts the next chunk
+                segment = self.encoding.decode(tokens[start:])
+                tokens = tokens[start:]
+
+            if total + len(tokens) > self.chunk_size and segments:
+                yield "".join(segments)
+                # Keep the trailing segments fitting in the overlap
+                while segments and total > self.overlap:
+                    segments.popleft()
+                    total -= num_tokens.popleft()
+                while segments and total + len(tokens) > self.chunk_size:
+                    segments.popleft()
+                    total -= num_tokens.popleft()
+            segments.append(segment)
+            num_tokens.append(len(tokens))
+            total += len(tokens)
+        if segments:
+            yield "".join(segments)
+
+    def chunk(self, text: str) -> List[str]:
+        r"""Chunks a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            List[str]: The chunks of the text.
+        """
+        return list(self.chunk_stream([text]))
@@ -12,18 +12,21 @@
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
 from abc import ABC, abstractmethod
-from typing import List
+from typing import TYPE_CHECKING, List
 
-from camel.messages import OpenAIMessage
 from camel.types import ModelType
 
+if TYPE_CHECKING:
+    from camel.messages import OpenAIMessage
 
-def messages_to_prompt(messages: List[OpenAIMessage], model: ModelType) -> str:
+
+def messages_to_prompt(messages: List["OpenAIMessage"],
+                       model: ModelType) -> str:
     r"""Parse the message list into a single prompt following model-specifc
     formats.
 
     Args:
-        messages (List[OpenAIMessage]): Message list with the chat history
+        messages (List["OpenAIMessage"]): Message list with the chat history
             in OpenAI API format.
         model (ModelType): Model type for which messages will be parsed.
 
@@ -97,11 +100,12 @@ class BaseTokenCounter(ABC):
     r"""Base class for token counters of different kinds of models."""
 
     @abstractmethod
-    def count_tokens_from_messages(self, messages: List[OpenAIMessage]) -> int:
+    def count_tokens_from_messages(self,
+                                   messages: List["OpenAIMessage"]) -> int:
         r"""Count number of tokens in the provided message list.
 
         Args:
-            messages (List[OpenAIMessage]): Message list with the chat history
+            messages (List["OpenAIMessage"]): Message list with the chat history
                 in OpenAI API format.
 
         Returns:
@@ -144,12 +148,13 @@ class OpenSourceTokenCounter(BaseTokenCounter):
         self.tokenizer = tokenizer
         self.model_type = model_type
 
-    def count_tokens_from_messages(self, messages: List[OpenAIMessage]) -> int:
+    def count_tokens_from_messages(self,
+                                   messages: List["OpenAIMessage"]) -> int:
         r"""Count number of tokens in the provided message list using
         loaded tokenizer specific for this type of model.
 
         Args:
-            messages (List[OpenAIMessage]): Message list with the chat history
+            messages (List["OpenAIMessage"]): Message list with the chat history
                 in OpenAI API format.
 
         Returns:
@@ -196,12 +201,13 @@ class OpenAITokenCounter(BaseTokenCounter):
 
         self.encoding = get_model_encoding(self.model)
 
-    def count_tokens_from_messages(self, messages: List[OpenAIMessage]) -> int:
+    def count_tokens_from_messages(self,
+                                   messages: List["OpenAIMessage"]) -> int:
         r"""Count number of tokens in the provided message list with the
         help of package tiktoken.
 
         Args:
-            messages (List[OpenAIMessage]): Message list with the chat history
+            messages (List["OpenAIMessage"]): Message list with the chat history
                 in OpenAI API format.
 
         Returns:
@@ -0,0 +1,92 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import ast
+import itertools
+import re
+import time
+from typing import Callable
+
+from camel.models import StubModel
+from camel.societies import BabyAGI
+from camel.types import ModelType
+
+
+class SimulatedModel(StubModel):
+    r"""A stub model with the latency of a remote model, answering with a
+    function of the last message."""
+
+    def __init__(self, respond: Callable[[str], str], latency: float) -> None:
+        super().__init__(ModelType.STUB, {})
+        self.respond = respond
+        self.latency = latency
+
+    def run(self, messages):
+        time.sleep(self.latency)
+        response = super().run(messages)
+        response.choices[0].message.content = self.respond(
+            messages[-1]["content"])
+        return response
+
+
+def create_babyagi(max_pending_updates: int, latency: float) -> BabyAGI:
+    babyagi = BabyAGI(
+        assistant_role_name="Python Programmer",
+        assistant_agent_kwargs=dict(model_type=ModelType.STUB),
+        user_role_name="Stock Trader",
+        task_prompt="Develop a trading bot for the stock market",
+        task_specify_agent_kwargs=dict(model_type=ModelType.STUB),
+        task_creation_agent_kwargs=dict(model_type=ModelType.STUB),
+        task_prioritization_agent_kwargs=dict(model_type=ModelType.STUB),
+        message_window_size=4,
+        max_pending_updates=max_pending_updates,
+    )
+    task_ids = itertools.count(1)
+
+    def create(content: str) -> str:
+        # Create more tasks than are solved, so there is always a next one.
+        return f"1. Task {next(task_ids)}\n2. Task {next(task_ids)}"
+
+    def prioritize(content: str) -> str:
+        task_list = ast.literal_eval(
+            re.search(r"tasks : (\[.*?\])\.\n", content).group(1))
+        return "\n".join(f"{i + 1}. {task}"
+                         for i, task in enumerate(task_list))
+
+    babyagi.assistant_agent.model_backend = SimulatedModel(
+        lambda content: "Done.", latency)
+    babyagi.task_creation_agent.model_backend = SimulatedModel(create, latency)
+    babyagi.task_prioritization_agent.model_backend = SimulatedModel(
+        prioritize, latency)
+    return babyagi
+
+
+def main(num_steps: int = 20, latency: float = 0.05) -> None:
+    print(f"Simulated model latency: {latency * 1e3:.0f} ms per request")
+    for max_pending_updates in [0, 1, 2]:
+        with create_babyagi(max_pending_updates, latency) as babyagi:
+            # Leave out the initial task creation, which is the same for all.
+            babyagi.step()
+            start = time.perf_counter()
+            for _ in range(num_steps):
+                babyagi.step()
+            step_time = time.perf_counter() - start
+            babyagi.wait_for_updates()
+            total_time = time.perf_counter() - start
+        print(f"max_pending_updates={max_pending_updates}: "
+              f"{step_time / num_steps * 1e3:.1f} ms per step, "
+              f"{total_time / num_steps * 1e3:.1f} ms per solved task")
+
+
+if __name__ == "__main__":
+    main()
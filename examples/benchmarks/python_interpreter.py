@@ -0,0 +1,89 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import time
+from typing import Any, Dict
+
+from camel.utils import PythonInterpreter
+from camel.utils.python_interpreter import _parse_code
+
+# Snippets in the style of the code written by embodied agents
+ACTIONS_SNIPPET = """from math import sqrt
+points = [(0, 0), (3, 4), (6, 8), (9, 12)]
+distances = []
+for x, y in points:
+    distances.append(round(sqrt(x ** 2 + y ** 2), 2))
+move(distances[-1])
+f"Moved {distances[-1]} meters after {len(distances)} checks"
+"""
+
+BRANCHES_SNIPPET = """inventory = {"apple": 3, "pear": 0, "plum": 7}
+for fruit in ["apple", "pear", "plum"]:
+    if inventory[fruit] > 0:
+        pick(fruit)
+    else:
+        report(fruit)
+total = inventory["apple"] + inventory["pear"] + inventory["plum"]
+total % 4 == 2
+"""
+
+ARITHMETIC_SNIPPET = """width = 12
+height = 7
+area = width * height
+perimeter = 2 * (width + height)
+ratio = area / perimeter
+steps = [area // 10, perimeter - 5, -ratio, not area < 50]
+steps
+"""
+
+SNIPPETS: Dict[str, str] = {
+    "actions": ACTIONS_SNIPPET,
+    "branches": BRANCHES_SNIPPET,
+    "arithmetic": ARITHMETIC_SNIPPET,
+}
+
+
+def make_interpreter() -> PythonInterpreter:
+    action_space: Dict[str, Any] = {
+        "len": len,
+        "round": round,
+        "move": lambda distance: distance,
+        "pick": lambda item: item,
+        "report": lambda item: item,
+    }
+    return PythonInterpreter(action_space=action_space,
+                             import_white_list=["math"])
+
+
+def time_snippet(code: str, num_runs: int, cold: bool) -> float:
+    interpreter = make_interpreter()
+    start = time.perf_counter()
+    for _ in range(num_runs):
+        if cold:
+            _parse_code.cache_clear()
+        interpreter.execute(code, keep_state=False)
+    return (time.perf_counter() - start) / num_runs
+
+
+def main(num_runs: int = 2000) -> None:
+    print(f"Mean time per execution over {num_runs} runs")
+    for name, code in SNIPPETS.items():
+        cold_time = time_snippet(code, num_runs, cold=True)
+        warm_time = time_snippet(code, num_runs, cold=False)
+        print(f"{name:>10}: {cold_time * 1e6:7.1f} us parsed, "
+              f"{warm_time * 1e6:7.1f} us cached "
+              f"({cold_time / warm_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
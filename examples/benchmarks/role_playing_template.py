@@ -0,0 +1,63 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import time
+from typing import Callable
+
+from camel.societies import RolePlaying, RolePlayingTemplate
+from camel.types import ModelType
+
+
+def time_per_call(func: Callable[[], object], num_calls: int) -> float:
+    func()  # Warm up the caches of the first call.
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        func()
+    return (time.perf_counter() - start) / num_calls
+
+
+def main(model_type: ModelType = ModelType.STUB,
+         num_sessions: int = 500) -> None:
+    task_prompt = "Develop a trading bot for the stock market"
+
+    for with_task_specify in [False, True]:
+        # With a real model, the request of the task specify agent dominates
+        # the setup time of both variants.
+        kwargs = dict(model_type=model_type,
+                      with_task_specify=with_task_specify,
+                      with_critic_in_the_loop=True,
+                      critic_kwargs=dict(verbose=False))
+
+        def create_session() -> RolePlaying:
+            return RolePlaying("Python Programmer", "Stock Trader",
+                               task_prompt=task_prompt, **kwargs)
+
+        template = RolePlayingTemplate("Python Programmer", "Stock Trader",
+                                       **kwargs)
+
+        def create_session_from_template() -> RolePlaying:
+            return template.create_session(task_prompt)
+
+        baseline = time_per_call(create_session, num_sessions)
+        templated = time_per_call(create_session_from_template, num_sessions)
+
+        print(f"with_task_specify={with_task_specify}")
+        print(f"  RolePlaying.__init__:               {baseline * 1e3:.3f} ms")
+        print(f"  RolePlayingTemplate.create_session: "
+              f"{templated * 1e3:.3f} ms")
+        print(f"  Speedup:                            "
+              f"{baseline / templated:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
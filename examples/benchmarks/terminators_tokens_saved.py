@@ -0,0 +1,111 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import glob
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from camel.messages import BaseMessage
+from camel.terminators import (
+    NoProgressTerminator,
+    RepetitionTerminator,
+    ResponseTerminator,
+    RoleFlipTerminator,
+)
+from camel.types import ModelType, RoleType
+from camel.utils import get_model_encoding
+
+
+def load_conversations(data_dir: str) -> Iterator[Dict[str, Any]]:
+    r"""Loads the conversations of a dataset in the CAMEL format, stored
+    either as one JSON file per conversation or as JSON Lines shards."""
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        with open(path) as f:
+            yield json.load(f)
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.jsonl"))):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def make_terminators(
+) -> Tuple[List[ResponseTerminator], List[ResponseTerminator]]:
+    return ([RepetitionTerminator(),
+             RoleFlipTerminator()],
+            [RepetitionTerminator(),
+             NoProgressTerminator()])
+
+
+def replay(conversation: Dict[str, Any]) -> Optional[int]:
+    r"""Replays a conversation through fresh terminators.
+
+    Returns:
+        Optional[int]: The number of the message terminating the
+            conversation, or `None` if the conversation went to its end.
+    """
+    assistant_terminators, user_terminators = make_terminators()
+    for i in range(1, conversation["num_messages"] + 1):
+        message_dict = conversation[f"message_{i}"]
+        message = BaseMessage(role_name=message_dict["role_name"],
+                              role_type=RoleType[message_dict["role_type"]],
+                              meta_dict=None, content=message_dict["content"])
+        terminators = (user_terminators if message.role_type == RoleType.USER
+                       else assistant_terminators)
+        if any(
+                terminator.is_terminated([message])[0]
+                for terminator in terminators):
+            return i
+    return None
+
+
+def main(data_dir: str = "./camel_data/ai_society",
+         count_tokens: Optional[Callable[[str], int]] = None) -> None:
+    if count_tokens is None:
+        encoding = get_model_encoding(
+            ModelType.GPT_3_5_TURBO.value_for_tiktoken)
+
+        def count_tokens(text: str) -> int:
+            return len(encoding.encode(text))
+
+    num_conversations = num_terminated = 0
+    completion_tokens = completion_tokens_saved = 0
+    prompt_tokens = prompt_tokens_saved = 0
+    for conversation in load_conversations(data_dir):
+        num_conversations += 1
+        terminated_at = replay(conversation)
+        num_terminated += terminated_at is not None
+        context_tokens = 0
+        for i in range(1, conversation["num_messages"] + 1):
+            message_tokens = count_tokens(
+                conversation[f"message_{i}"]["content"])
+            skipped = terminated_at is not None and i > terminated_at
+            # Every message is generated with the history as prompt.
+            prompt_tokens += context_tokens
+            completion_tokens += message_tokens
+            if skipped:
+                prompt_tokens_saved += context_tokens
+                completion_tokens_saved += message_tokens
+            context_tokens += message_tokens
+
+    print(f"Replayed conversations: {num_conversations}")
+    print(f"Terminated early:       {num_terminated}")
+    print(f"Completion tokens saved: {completion_tokens_saved} "
+          f"of {completion_tokens}")
+    print(f"Prompt tokens saved:     {prompt_tokens_saved} "
+          f"of {prompt_tokens}")
+
+
+if __name__ == "__main__":
+    main()
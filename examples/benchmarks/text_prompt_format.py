@@ -0,0 +1,58 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import time
+from typing import Callable, Dict
+
+from camel.prompts import AISocietyPromptTemplateDict, TextPrompt
+
+
+def time_per_call(func: Callable[[], object], num_calls: int,
+                  num_repeats: int = 5) -> float:
+    func()  # Warm up the caches of the first call.
+    best = float("inf")
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        for _ in range(num_calls):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / num_calls
+
+
+def make_cases() -> Dict[str, Callable[[], object]]:
+    short = TextPrompt("Hi, {name}! How are you {status}?")
+    system = AISocietyPromptTemplateDict.ASSISTANT_PROMPT
+    roles = dict(assistant_role="Python Programmer", user_role="Stock Trader")
+    task = dict(task="Develop a trading bot for the stock market")
+    # The system prompt with the roles, formatted with the task many times
+    system_with_roles = system.format(**roles)
+    return {
+        "short, all keywords":
+        lambda: short.format(name="Camel", status="today"),
+        "system, all keywords": lambda: system.format(**roles, **task),
+        "system, some keywords": lambda: system.format(**roles),
+        "system, rest keywords": lambda: system_with_roles.format(**task),
+        "system, no keywords": lambda: system.format(),
+    }
+
+
+def main(num_calls: int = 20000) -> None:
+    print(f"Best mean time per call over {num_calls} calls")
+    for name, func in make_cases().items():
+        call_time = time_per_call(func, num_calls)
+        print(f"{name:>22}: {call_time * 1e6:6.2f} us "
+              f"({1 / call_time:9.0f} calls per second)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import json
+
+import examples.benchmarks.babyagi_pipelining
+import examples.benchmarks.python_interpreter
+import examples.benchmarks.role_playing_template
+import examples.benchmarks.terminators_tokens_saved
+import examples.benchmarks.text_prompt_format
+from camel.types import ModelType
+
+
+def test_role_playing_template_benchmark():
+    examples.benchmarks.role_playing_template.main(ModelType.STUB,
+                                                   num_sessions=2)
+
+
+def test_babyagi_pipelining_benchmark():
+    examples.benchmarks.babyagi_pipelining.main(num_steps=2, latency=0.0)
+
+
+def test_terminators_tokens_saved_benchmark(tmp_path, capsys):
+    messages = [
+        "Instruction: Collect the data.\nInput: None",
+        "Solution: I collected the data.\nNext request."
+    ]
+    messages += ["Thank you, have a great day!"] * 6
+    conversation = {"num_messages": len(messages)}
+    for i, content in enumerate(messages, start=1):
+        role_type = "USER" if i % 2 == 1 else "ASSISTANT"
+        conversation[f"message_{i}"] = dict(role_name=role_type.lower(),
+                                            role_type=role_type,
+                                            content=content)
+    with open(tmp_path / "0001.json", "w") as f:
+        json.dump(conversation, f)
+
+    examples.benchmarks.terminators_tokens_saved.main(
+        str(tmp_path), count_tokens=lambda text: len(text.split()))
+    output = capsys.readouterr().out
+    assert "Terminated early:       1" in output
+    assert "Completion tokens saved: 0 " not in output
+
+
+def test_python_interpreter_benchmark():
+    examples.benchmarks.python_interpreter.main(num_runs=2)
+
+
+def test_text_prompt_format_benchmark():
+    examples.benchmarks.text_prompt_format.main(num_calls=2)
@@ -11,12 +11,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import ast
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional, Sequence
+
 import pytest
 
 from camel.agents import ChatAgent, TaskCreationAgent, TaskPrioritizationAgent
 from camel.messages import BaseMessage
+from camel.models import StubModel
 from camel.societies import BabyAGI
 from camel.types import ModelType, RoleType, TaskType
+from camel.utils import TaskIndex
 
 parametrize = pytest.mark.parametrize('model', [
     None,
@@ -82,3 +91,206 @@ def test_babyagi_playing_step(model: ModelType):
 
     assert len(babyagi_playing.subtasks) > 0
     assert len(babyagi_playing.solved_subtasks) == 1
+
+
+def test_babyagi_playing_snapshot_and_restore():
+    babyagi_playing = BabyAGI(
+        assistant_role_name="Python Programmer",
+        assistant_agent_kwargs=dict(model_type=ModelType.STUB),
+        user_role_name="Stock Trader",
+        task_prompt="Develop a trading bot for the stock market",
+        task_specify_agent_kwargs=dict(model_type=ModelType.STUB),
+        task_creation_agent_kwargs=dict(model_type=ModelType.STUB),
+        task_prioritization_agent_kwargs=dict(model_type=ModelType.STUB),
+        message_window_size=5,
+    )
+    # The stub model cannot produce a parsable task list, so the progress of
+    # the session is set up by hand.
+    babyagi_playing.subtasks = deque(["Collect data", "Backtest"])
+    babyagi_playing.solved_subtasks = ["Pick a broker"]
+    babyagi_playing.assistant_agent.step(
+        BaseMessage.make_user_message(role_name="Stock Trader",
+                                      content="Pick a broker"))
+
+    restored = BabyAGI.from_snapshot(babyagi_playing.snapshot())
+
+    assert restored.specified_task_prompt == (
+        babyagi_playing.specified_task_prompt)
+    assert list(restored.subtasks) == list(babyagi_playing.subtasks)
+    assert restored.solved_subtasks == babyagi_playing.solved_subtasks
+    for agent, restored_agent in [
+        (babyagi_playing.assistant_agent, restored.assistant_agent),
+        (babyagi_playing.task_creation_agent, restored.task_creation_agent),
+        (babyagi_playing.task_prioritization_agent,
+         restored.task_prioritization_agent),
+    ]:
+        assert restored_agent.model_type == agent.model_type
+        assert (
+            restored_agent.memory.get_records() == agent.memory.get_records())
+
+
+class ScriptedModel(StubModel):
+    r"""A stub model answering with a function of the last message."""
+
+    def __init__(self, respond: Callable[[str], str],
+                 delay: float = 0.0) -> None:
+        super().__init__(ModelType.STUB, {})
+        self.respond = respond
+        self.delay = delay
+
+    def run(self, messages):
+        time.sleep(self.delay)
+        response = super().run(messages)
+        response.choices[0].message.content = self.respond(
+            messages[-1]["content"])
+        return response
+
+
+def make_scripted_babyagi(
+    max_pending_updates: int,
+    creation_gate: Optional[threading.Event] = None,
+    delay: float = 0.0,
+    created_task_lists: Sequence[str] = (
+        "1. Collect data\n2. Build model",
+        "1. Backtest",
+    ),
+    task_index: Optional[TaskIndex] = None,
+) -> BabyAGI:
+    babyagi_playing = BabyAGI(
+        assistant_role_name="Python Programmer",
+        assistant_agent_kwargs=dict(model_type=ModelType.STUB),
+        user_role_name="Stock Trader",
+        task_prompt="Develop a trading bot for the stock market",
+        task_specify_agent_kwargs=dict(model_type=ModelType.STUB),
+        task_creation_agent_kwargs=dict(model_type=ModelType.STUB),
+        task_prioritization_agent_kwargs=dict(model_type=ModelType.STUB),
+        max_pending_updates=max_pending_updates,
+        task_index=task_index,
+    )
+    responses = iter(created_task_lists)
+
+    def create(content: str) -> str:
+        if creation_gate is not None and "Collect data" in content:
+            creation_gate.wait()
+        return next(responses, "No tasks to add.")
+
+    def prioritize(content: str) -> str:
+        match = re.search(r"tasks : (\[.*?\])\.\n", content)
+        assert match is not None
+        task_list = ast.literal_eval(match.group(1))
+        return "\n".join(f"{i + 1}. {task}"
+                         for i, task in enumerate(task_list))
+
+    babyagi_playing.assistant_agent.model_backend = ScriptedModel(
+        lambda content: "Done.", delay)
+    babyagi_playing.task_creation_agent.model_backend = ScriptedModel(
+        create, delay)
+    babyagi_playing.task_prioritization_agent.model_backend = ScriptedModel(
+        prioritize, delay)
+    return babyagi_playing
+
+
+@pytest.mark.parametrize("max_pending_updates", [0, 1, 2])
+def test_babyagi_playing_pipelined_steps(max_pending_updates: int):
+    babyagi_playing = make_scripted_babyagi(max_pending_updates)
+
+    for _ in range(10):
+        response = babyagi_playing.step()
+        if response.terminated:
+            break
+
+    assert response.terminated
+    assert response.info['termination_reasons'] == "All tasks are solved"
+    assert babyagi_playing.solved_subtasks == [
+        "Collect data", "Build model", "Backtest"
+    ]
+    assert babyagi_playing.num_pending_updates == 0
+    babyagi_playing.close()
+
+
+def test_babyagi_playing_step_does_not_wait_for_updates():
+    creation_gate = threading.Event()
+    babyagi_playing = make_scripted_babyagi(1, creation_gate)
+
+    response = babyagi_playing.step()
+    # The update for the first task is blocked, but the step returned.
+    assert not response.terminated
+    assert response.info['task_name'] == "Collect data"
+    assert babyagi_playing.num_pending_updates == 1
+    assert list(babyagi_playing.subtasks) == ["Build model"]
+
+    creation_gate.set()
+    babyagi_playing.wait_for_updates()
+    assert list(babyagi_playing.subtasks) == ["Build model", "Backtest"]
+    babyagi_playing.close()
+
+
+def test_babyagi_playing_close_stops_update_thread():
+    creation_gate = threading.Event()
+    with make_scripted_babyagi(1, creation_gate) as babyagi_playing:
+        babyagi_playing.step()
+        update_thread = babyagi_playing._update_executor._threads.copy().pop()
+        creation_gate.set()
+    # The pending update was applied before the thread stopped.
+    assert babyagi_playing.num_pending_updates == 0
+    assert list(babyagi_playing.subtasks) == ["Build model", "Backtest"]
+    assert babyagi_playing._update_executor is None
+    assert not update_thread.is_alive()
+
+
+def test_babyagi_playing_overlapping_updates_keep_tasks():
+    creation_gate = threading.Event()
+    babyagi_playing = make_scripted_babyagi(
+        2, creation_gate, created_task_lists=[
+            "1. Collect data\n2. Build model\n3. Clean data",
+            "1. Backtest",
+            "1. Deploy",
+        ])
+
+    try:
+        babyagi_playing.step()
+        # The second update starts before the first one, which queues
+        # "Backtest", is applied.
+        babyagi_playing.step()
+        assert babyagi_playing.num_pending_updates == 2
+    finally:
+        creation_gate.set()
+    babyagi_playing.wait_for_updates()
+    assert list(
+        babyagi_playing.subtasks) == ["Clean data", "Deploy", "Backtest"]
+
+    for _ in range(10):
+        response = babyagi_playing.step()
+        if response.terminated:
+            break
+    assert babyagi_playing.solved_subtasks == [
+        "Collect data", "Build model", "Clean data", "Deploy", "Backtest"
+    ]
+    babyagi_playing.close()
+
+
+@pytest.mark.parametrize("max_pending_updates", [0, 1])
+def test_babyagi_playing_with_task_index(max_pending_updates: int):
+    created_task_lists = [
+        "1. Collect stock price data\n2. Build a prediction model",
+        "1. Collect the stock price data\n2. Backtest",
+        "1. Build the prediction model.",
+    ]
+    babyagi_playing = make_scripted_babyagi(
+        max_pending_updates, created_task_lists=created_task_lists,
+        task_index=TaskIndex())
+
+    for _ in range(10):
+        response = babyagi_playing.step()
+        if response.terminated:
+            break
+
+    assert response.terminated
+    assert babyagi_playing.solved_subtasks == [
+        "Collect stock price data", "Build a prediction model", "Backtest"
+    ]
+    assert babyagi_playing.num_duplicate_subtasks == 2
+    # Two assistant steps, two task creations and one prioritization.
+    assert babyagi_playing.num_llm_calls_saved == 5
+    assert response.info['num_llm_calls_saved'] == 5
+    babyagi_playing.close()
@@ -11,19 +11,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import asyncio
+import time
 from typing import List
 
 import pytest
+from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice
+from openai.types.chat.chat_completion_chunk import ChoiceDelta
+from openai.types.chat.chat_completion_message import FunctionCall
 
 from camel.agents import ChatAgent
 from camel.agents.chat_agent import FunctionCallingRecord
 from camel.configs import ChatGPTConfig, FunctionCallingConfig
-from camel.functions import MATH_FUNCS
+from camel.functions import MATH_FUNCS, FunctionCache, OpenAIFunction
 from camel.generators import SystemMessageGenerator
-from camel.memories import MemoryRecord
+from camel.memories import BaseMemory, MemoryRecord
 from camel.messages import BaseMessage
 from camel.terminators import ResponseWordsTerminator
-from camel.types import ModelType, OpenAIBackendRole, RoleType, TaskType
+from camel.types import (
+    ChatCompletion,
+    ChatCompletionChunk,
+    ChatCompletionMessage,
+    Choice,
+    ModelType,
+    OpenAIBackendRole,
+    RoleType,
+    TaskType,
+)
 
 parametrize = pytest.mark.parametrize('model', [
     ModelType.STUB,
@@ -80,6 +94,34 @@ def test_chat_agent_stored_messages():
     assert context == expected_context
 
 
+def test_chat_agent_get_state_without_snapshot_support():
+
+    class ListMemory(BaseMemory):
+
+        def __init__(self):
+            self.records: List[MemoryRecord] = []
+
+        def get_context(self):
+            return [record.to_openai_message() for record in self.records], 0
+
+        def write_records(self, records):
+            self.records.extend(records)
+
+        def clear(self):
+            self.records.clear()
+
+    system_msg = BaseMessage(role_name="assistant",
+                             role_type=RoleType.ASSISTANT, meta_dict=None,
+                             content="You are a help assistant.")
+    assistant = ChatAgent(system_msg, model_type=ModelType.STUB,
+                          memory=ListMemory())
+    assistant.reset()
+    assert len(assistant.memory.get_context()[0]) == 1
+    with pytest.raises(NotImplementedError,
+                       match="ListMemory does not support snapshots"):
+        assistant.get_state()
+
+
 @pytest.mark.model_backend
 def test_chat_agent_messages_window():
     system_msg = BaseMessage(role_name="assistant",
@@ -173,6 +215,35 @@ def test_chat_agent_stream_output():
         "completion_tokens"] + stream_usage["prompt_tokens"]
 
 
+def test_chat_agent_stream_callback(monkeypatch):
+    system_msg = BaseMessage.make_assistant_message(
+        role_name="doctor", content="You are a doctor.")
+    tokens = []
+    assistant = ChatAgent(
+        system_msg, model_type=ModelType.STUB,
+        stream_callback=lambda index, content: tokens.append((index, content)))
+    monkeypatch.setattr(assistant, "get_usage_dict", lambda *args: {})
+
+    def make_chunk(content, finish_reason=None):
+        return ChatCompletionChunk(
+            id="chunk", created=0, model="stub",
+            object="chat.completion.chunk", choices=[
+                ChunkChoice(index=0, delta=ChoiceDelta(content=content),
+                            finish_reason=finish_reason)
+            ])
+
+    chunks = [
+        make_chunk("Take "),
+        make_chunk("a rest."),
+        make_chunk(None, "stop")
+    ]
+    output_messages, finish_reasons, _, _ = (assistant.handle_stream_response(
+        iter(chunks), 0))
+    assert tokens == [(0, "Take "), (0, "a rest.")]
+    assert output_messages[0].content == "Take a rest."
+    assert finish_reasons == ["stop"]
+
+
 @pytest.mark.model_backend
 def test_set_output_language():
     system_message = BaseMessage(role_name="assistant",
@@ -292,6 +363,68 @@ def test_function_calling():
     assert called_funcs[0].result == 16
 
 
+def test_function_calling_with_cache():
+    system_message = BaseMessage(role_name="assistant",
+                                 role_type=RoleType.ASSISTANT, meta_dict=None,
+                                 content="You are a help assistant.")
+    mul = MATH_FUNCS[2]
+    cached_mul = OpenAIFunction(mul.func, cache=FunctionCache())
+    agent = ChatAgent(system_message=system_message, model_type=ModelType.STUB,
+                      function_list=[cached_mul])
+    response = ChatCompletion(
+        id="stub_model_id", model="stub", object="chat.completion",
+        created=int(time.time()), choices=[
+            Choice(
+                finish_reason="function_call", index=0,
+                message=ChatCompletionMessage(
+                    role="assistant", content=None,
+                    function_call=FunctionCall(name="mul",
+                                               arguments='{"a": 2, "b": 8}')))
+        ])
+
+    records = [agent.step_function_call(response)[2] for _ in range(2)]
+    assert [record.result for record in records] == [16, 16]
+    assert [record.cache_hit for record in records] == [False, True]
+    assert [record.cache_hit_rate for record in records] == [0.0, 0.5]
+    assert str(records[1]).endswith("Cache: hit (hit rate: 50%)")
+
+
+def test_function_calling_timeout():
+    system_message = BaseMessage(role_name="assistant",
+                                 role_type=RoleType.ASSISTANT, meta_dict=None,
+                                 content="You are a help assistant.")
+
+    async def wait(seconds: float) -> str:
+        r"""Waits.
+
+        Args:
+            seconds (number): The number of seconds to wait.
+
+        Returns:
+            string: A message.
+        """
+        await asyncio.sleep(seconds)
+        return "done"
+
+    agent = ChatAgent(system_message=system_message, model_type=ModelType.STUB,
+                      function_list=[OpenAIFunction(wait, timeout=0.1)])
+    response = ChatCompletion(
+        id="stub_model_id", model="stub", object="chat.completion",
+        created=int(time.time()), choices=[
+            Choice(
+                finish_reason="function_call", index=0,
+                message=ChatCompletionMessage(
+                    role="assistant", content=None,
+                    function_call=FunctionCall(name="wait",
+                                               arguments='{"seconds": 10}')))
+        ])
+
+    # The timeout is reported to the model as the result of the call
+    record = agent.step_function_call(response)[2]
+    assert record.result == ("Execution of function wait timed out after "
+                             "0.1 seconds.")
+
+
 def test_response_words_termination():
     system_message = BaseMessage(role_name="assistant",
                                  role_type=RoleType.ASSISTANT, meta_dict=None,
@@ -11,11 +11,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import time
+from typing import Any, Dict, List, Optional
+
 import pytest
+from openai.types.chat.chat_completion_message import FunctionCall
 
 from camel.agents import CriticAgent
-from camel.messages import BaseMessage
-from camel.types import RoleType
+from camel.messages import BaseMessage, OpenAIMessage
+from camel.models import StubModel
+from camel.types import (
+    ChatCompletion,
+    ChatCompletionMessage,
+    Choice,
+    CompletionUsage,
+    CriticSelectionMode,
+    ModelType,
+    RoleType,
+)
 
 
 @pytest.fixture
@@ -115,3 +128,134 @@ def test_reduce_step(critic_agent: CriticAgent):
     critic_response = critic_agent.reduce_step(messages)
     assert (critic_response.msg == messages[0]) or (critic_response.msg
                                                     == messages[1])
+
+
+class SelectionModel(StubModel):
+    r"""A stub model answering with a given message, and recording the
+    configuration it is created with and the calls it gets."""
+
+    def __init__(self, model_config_dict: Dict[str, Any],
+                 message: ChatCompletionMessage) -> None:
+        super().__init__(ModelType.STUB, model_config_dict)
+        self.message = message
+        self.calls: List[List[OpenAIMessage]] = []
+
+    def run(self, messages: List[OpenAIMessage]) -> ChatCompletion:
+        self.calls.append(messages)
+        return ChatCompletion(
+            id="stub_model_id",
+            model="stub",
+            object="chat.completion",
+            created=int(time.time()),
+            choices=[
+                Choice(finish_reason="stop", index=0, message=self.message)
+            ],
+            usage=CompletionUsage(completion_tokens=1, prompt_tokens=10,
+                                  total_tokens=11),
+        )
+
+
+def make_selection_critic(monkeypatch, selection_mode: CriticSelectionMode,
+                          message: ChatCompletionMessage) -> CriticAgent:
+    critic_agent = CriticAgent(
+        BaseMessage("critic", RoleType.CRITIC, None,
+                    content="You are a critic."), model_type=ModelType.STUB,
+        selection_mode=selection_mode)
+
+    def create(model_type: ModelType,
+               model_config_dict: Dict[str, Any]) -> SelectionModel:
+        return SelectionModel(model_config_dict, message)
+
+    monkeypatch.setattr("camel.agents.critic_agent.ModelFactory.create",
+                        create)
+    return critic_agent
+
+
+def make_options_message(critic_agent: CriticAgent,
+                         num_options: int) -> BaseMessage:
+    messages = [
+        BaseMessage(role_name="user", role_type=RoleType.USER,
+                    meta_dict=dict(), content=f"Fruit {i}")
+        for i in range(num_options)
+    ]
+    return BaseMessage(role_name="user", role_type=RoleType.USER,
+                       meta_dict=dict(),
+                       content=critic_agent.flatten_options(messages))
+
+
+def test_select_option_with_function_call(monkeypatch):
+    message = ChatCompletionMessage(
+        role="assistant", content=None,
+        function_call=FunctionCall(name="choose_option",
+                                   arguments='{"option": "2"}'))
+    critic_agent = make_selection_critic(monkeypatch,
+                                         CriticSelectionMode.FUNCTION_CALL,
+                                         message)
+    input_message = make_options_message(critic_agent, 3)
+
+    assert critic_agent.get_option(input_message) == "Fruit 1"
+    backend: Optional[Any] = critic_agent._selection_backends[3]
+    assert len(backend.calls) == 1
+    config_dict = backend.model_config_dict
+    assert config_dict["function_call"] == {"name": "choose_option"}
+    option_schema = (
+        config_dict["functions"][0]["parameters"]["properties"]["option"])
+    assert option_schema["enum"] == ["1", "2", "3"]
+    # Only the input message and the choice are recorded
+    records = critic_agent.memory.get_records()
+    assert [record.message.content
+            for record in records][-2:] == [input_message.content, "Option 2"]
+
+    # Same backend for the same number of options
+    critic_agent.get_option(make_options_message(critic_agent, 3))
+    assert critic_agent._selection_backends[3] is backend
+    assert len(backend.calls) == 2
+
+
+def test_select_option_with_logit_bias(monkeypatch):
+
+    class DigitEncoding:
+
+        def encode(self, text: str) -> List[int]:
+            return [ord(char) for char in text]
+
+    monkeypatch.setattr("camel.agents.critic_agent.get_model_encoding",
+                        lambda value_for_tiktoken: DigitEncoding())
+    message = ChatCompletionMessage(role="assistant", content="1")
+    critic_agent = make_selection_critic(monkeypatch,
+                                         CriticSelectionMode.LOGIT_BIAS,
+                                         message)
+
+    assert critic_agent.get_option(make_options_message(critic_agent,
+                                                        2)) == "Fruit 0"
+    config_dict = critic_agent._selection_backends[2].model_config_dict
+    assert config_dict["logit_bias"] == {ord("1"): 100, ord("2"): 100}
+    assert config_dict["max_tokens"] == 1
+
+    with pytest.raises(ValueError, match="not a single token"):
+        critic_agent.get_option(make_options_message(critic_agent, 10))
+
+
+def test_select_option_without_function_call_parses_text(monkeypatch):
+    message = ChatCompletionMessage(role="assistant",
+                                    content="I choose option 2.")
+    critic_agent = make_selection_critic(monkeypatch,
+                                         CriticSelectionMode.FUNCTION_CALL,
+                                         message)
+
+    assert critic_agent.get_option(make_options_message(critic_agent,
+                                                        3)) == "Fruit 1"
+
+
+def test_select_option_invalid_answer_does_not_retry(monkeypatch):
+    message = ChatCompletionMessage(role="assistant", content="Lorem Ipsum")
+    critic_agent = make_selection_critic(monkeypatch,
+                                         CriticSelectionMode.FUNCTION_CALL,
+                                         message)
+    num_records = len(critic_agent.memory.get_records())
+
+    with pytest.warns(UserWarning, match="failed to get a valid option"):
+        option = critic_agent.get_option(make_options_message(critic_agent, 2))
+    assert option in ["Fruit 0", "Fruit 1"]
+    assert len(critic_agent._selection_backends[2].calls) == 1
+    assert len(critic_agent.memory.get_records()) == num_records
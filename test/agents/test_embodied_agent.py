@@ -16,10 +16,16 @@ import binascii
 import pytest
 import requests
 
-from camel.agents import EmbodiedAgent, HuggingFaceToolAgent
+from camel.agents import (
+    BaseToolAgent,
+    ChatAgent,
+    EmbodiedAgent,
+    HuggingFaceToolAgent,
+)
 from camel.generators import SystemMessageGenerator
 from camel.messages import BaseMessage
-from camel.types import RoleType
+from camel.responses import ChatAgentResponse
+from camel.types import ModelType, RoleType
 
 
 @pytest.mark.skip(reason="Wait huggingface to update openaiv1")
@@ -61,3 +67,47 @@ def test_step():
     assert isinstance(response.msg, BaseMessage)
     assert not response.terminated
     assert isinstance(response.info, dict)
+
+
+class EchoToolAgent(BaseToolAgent):
+
+    def __init__(self) -> None:
+        super().__init__("echo", "Returns its argument.")
+
+    def __call__(self, value):
+        return value
+
+
+def test_step_keeps_interpreter_session(monkeypatch):
+    sys_msg = BaseMessage.make_assistant_message(
+        role_name="Embodied", content="Actions:\n{action_space}")
+    agent = EmbodiedAgent(sys_msg, model_type=ModelType.STUB,
+                          action_space=[EchoToolAgent()], max_value_length=20,
+                          max_reported_variables=2)
+    interpreter = agent.interpreter
+    codes = iter([
+        "```python\nx = echo(1)\nwords = echo('word ' * 100)\n```",
+        "```python\ny = x + 1\n```\n```python\nz = y\na = 1\nb = 2\n```",
+    ])
+
+    def step(self, input_message):
+        msg = BaseMessage.make_assistant_message(role_name="Embodied",
+                                                 content=next(codes))
+        return ChatAgentResponse([msg], False, {})
+
+    monkeypatch.setattr(ChatAgent, "step", step)
+    user_msg = BaseMessage.make_user_message(role_name="User", content="Go")
+
+    content = agent.step(user_msg).msg.content
+    assert "    x = 1\n" in content
+    assert "    words = 'word wo...rd word '\n" in content
+    assert "echo" not in content.split("Executed Results:")[1]
+
+    content = agent.step(user_msg).msg.content
+    assert agent.interpreter is interpreter
+    block_0, block_1 = content.split("Executing code block")[1:]
+    assert "    y = 2\n" in block_0 and "x =" not in block_0
+    assert "    z = 2\n    a = 1\n    ... and 1 more" in block_1
+
+    agent.reset()
+    assert "x" not in agent.interpreter.state
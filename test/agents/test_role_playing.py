@@ -19,6 +19,7 @@ from camel.functions import MATH_FUNCS
 from camel.human import Human
 from camel.messages import BaseMessage
 from camel.societies import RolePlaying
+from camel.terminators import RepetitionTerminator, RoleFlipTerminator
 from camel.types import ModelType, RoleType, TaskType
 
 
@@ -178,3 +179,70 @@ def test_role_playing_role_sequence(model_type=None):
     assert assistant_role_sequence == [
         'system', 'user', 'user', 'assistant', 'user', 'assistant'
     ]
+
+
+def test_role_playing_snapshot_and_restore():
+    role_playing = RolePlaying(
+        assistant_role_name="Python Programmer",
+        assistant_agent_kwargs=dict(model_type=ModelType.STUB),
+        user_role_name="Stock Trader",
+        user_agent_kwargs=dict(model_type=ModelType.STUB),
+        task_prompt="Develop a trading bot for the stock market",
+        with_task_specify=True,
+        task_specify_agent_kwargs=dict(model_type=ModelType.STUB),
+        with_critic_in_the_loop=True,
+        critic_role_name="critic",
+        critic_kwargs=dict(model_type=ModelType.STUB, verbose=False),
+    )
+    input_assistant_msg, _ = role_playing.init_chat()
+    assistant_response, _ = role_playing.step(input_assistant_msg)
+
+    restored = RolePlaying.from_snapshot(role_playing.snapshot())
+
+    assert restored.task_prompt == role_playing.task_prompt
+    assert restored.specified_task_prompt == role_playing.specified_task_prompt
+    assert restored.assistant_sys_msg == role_playing.assistant_sys_msg
+    assert restored.user_sys_msg == role_playing.user_sys_msg
+    assert isinstance(restored.critic, CriticAgent)
+    for agent, restored_agent in [
+        (role_playing.assistant_agent, restored.assistant_agent),
+        (role_playing.user_agent, restored.user_agent),
+        (role_playing.critic, restored.critic),
+    ]:
+        assert restored_agent.role_name == agent.role_name
+        assert restored_agent.model_type == agent.model_type
+        assert (
+            restored_agent.memory.get_records() == agent.memory.get_records())
+
+    # The restored session goes on from where the original one was.
+    assistant_response, user_response = restored.step(assistant_response.msg)
+    assert not assistant_response.terminated
+    assert not user_response.terminated
+    assert len(restored.user_agent.memory.get_records()) == len(
+        role_playing.user_agent.memory.get_records()) + 2
+
+
+def test_role_playing_with_response_terminators():
+    role_playing = RolePlaying(
+        assistant_role_name="Python Programmer",
+        user_role_name="Stock Trader",
+        task_prompt="Develop a trading bot for the stock market",
+        with_task_specify=False,
+        model_type=ModelType.STUB,
+        assistant_response_terminators=[RoleFlipTerminator()],
+        user_response_terminators=[RepetitionTerminator(patience=2)],
+    )
+    assert isinstance(role_playing.assistant_agent.response_terminators[0],
+                      RoleFlipTerminator)
+
+    # The stub model always gives the same answer.
+    input_assistant_msg, _ = role_playing.init_chat()
+    for num_turns in range(1, 10):
+        assistant_response, user_response = role_playing.step(
+            input_assistant_msg)
+        if user_response.terminated:
+            break
+        input_assistant_msg = assistant_response.msg
+    assert num_turns == 3
+    assert "consecutive responses repeat" in (
+        user_response.info['termination_reasons'][0])
@@ -0,0 +1,199 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import asyncio
+import json
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from camel.generators import RoleNameGenerator
+from camel.societies import (
+    RolePlayingJob,
+    RolePlayingRunner,
+    run_role_playing_session,
+)
+from camel.terminators import RepetitionTerminator
+from camel.types import ExecutorType, ModelType
+
+ROLE_PLAYING_KWARGS = dict(model_type=ModelType.STUB, with_task_specify=False)
+
+
+def make_jobs():
+    role_generator = RoleNameGenerator(
+        assistant_role_names=["Programmer", "Chef"],
+        user_role_names=["Student"])
+    return RolePlayingJob.from_role_generator(
+        role_generator, lambda assistant, user: [
+            f"Teach {user} to be a {assistant}",
+            f"Help {user} hire a {assistant}",
+        ])
+
+
+def read_shards(runner: RolePlayingRunner):
+    records: List[Dict[str, Any]] = []
+    for shard_index in range(runner.num_shards):
+        path = runner.shard_path(shard_index)
+        if os.path.exists(path):
+            with open(path) as f:
+                records.extend(json.loads(line) for line in f)
+    return records
+
+
+def test_role_playing_job_from_role_generator():
+    jobs = list(make_jobs())
+    assert [job.session_id for job in jobs
+            ] == ["001_001_001", "001_001_002", "002_001_001", "002_001_002"]
+    assert jobs[2].assistant_role_name == "Chef"
+    assert jobs[2].task_prompt == "Teach Student to be a Chef"
+
+
+def test_run_role_playing_session():
+    job = next(make_jobs())
+    message_dict = run_role_playing_session(job, ROLE_PLAYING_KWARGS,
+                                            max_num_messages=4)
+    assert message_dict["id"] == job.session_id
+    assert message_dict["original_task"] == job.task_prompt
+    assert message_dict["num_messages"] == 4
+    assert message_dict["termination_reason"] == "max_num_messages"
+    assert "message_4" in message_dict
+
+
+@pytest.mark.parametrize("executor_type",
+                         [ExecutorType.INLINE, ExecutorType.THREAD])
+def test_role_playing_runner(tmp_path, executor_type):
+    runner = RolePlayingRunner(str(tmp_path), ROLE_PLAYING_KWARGS,
+                               max_num_messages=2, executor_type=executor_type,
+                               num_workers=2, num_shards=3)
+    stats = runner.run(make_jobs())
+    assert stats.num_completed == 4
+    assert stats.num_skipped == 0
+    records = read_shards(runner)
+    assert sorted(record["id"] for record in records) == [
+        "001_001_001", "001_001_002", "002_001_001", "002_001_002"
+    ]
+    for record in records:
+        assert runner.get_shard_index(record["id"]) in range(3)
+
+    # Resuming a finished run does not run any session again.
+    stats = runner.run(make_jobs())
+    assert stats.num_completed == 0
+    assert stats.num_skipped == 4
+    assert len(read_shards(runner)) == 4
+
+
+@pytest.mark.parametrize("executor_type",
+                         [ExecutorType.INLINE, ExecutorType.THREAD])
+def test_role_playing_runner_arun(tmp_path, executor_type):
+    runner = RolePlayingRunner(str(tmp_path), ROLE_PLAYING_KWARGS,
+                               max_num_messages=2, executor_type=executor_type,
+                               num_workers=2, num_shards=3)
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        stats = await runner.arun(make_jobs())
+        ticker.cancel()
+        return stats, ticks
+
+    stats, ticks = asyncio.run(run())
+    assert stats.num_completed == 4
+    # The loop kept running other tasks meanwhile.
+    assert ticks > 0
+    assert sorted(record["id"] for record in read_shards(runner)) == [
+        "001_001_001", "001_001_002", "002_001_001", "002_001_002"
+    ]
+
+    stats = asyncio.run(runner.arun(make_jobs()))
+    assert stats.num_skipped == 4
+
+
+def test_role_playing_runner_retries(tmp_path):
+    failing_job = RolePlayingJob(
+        "001_001_001", "Programmer", "Student", "Perform the task",
+        role_playing_kwargs=dict(model_type="not a model type"))
+    runner = RolePlayingRunner(str(tmp_path), ROLE_PLAYING_KWARGS,
+                               max_num_messages=2,
+                               executor_type=ExecutorType.INLINE,
+                               max_retries=1)
+    stats = runner.run([failing_job])
+    assert stats.num_failed == 1
+    assert stats.num_retries == 1
+    assert read_shards(runner) == []
+    with open(os.path.join(str(tmp_path), "failed.jsonl")) as f:
+        assert json.loads(f.readline())["id"] == "001_001_001"
+
+
+def test_role_playing_runner_resumes_after_truncated_write(tmp_path):
+    runner = RolePlayingRunner(str(tmp_path), ROLE_PLAYING_KWARGS,
+                               max_num_messages=2,
+                               executor_type=ExecutorType.INLINE)
+    with open(runner.shard_path(0), "w") as f:
+        f.write('{"id": "001_001_001"}\n{"id": "001_00')
+    stats = runner.run(make_jobs())
+    assert stats.num_skipped == 1
+    assert stats.num_completed == 3
+    assert len(runner.load_completed_ids()) == 4
+
+
+def test_run_role_playing_session_resumes_from_checkpoint(tmp_path):
+    job = RolePlayingJob("001_001_001", "Programmer", "Student",
+                         "Perform the task")
+    checkpoint_path = os.path.join(str(tmp_path), "checkpoint.pkl")
+    first = run_role_playing_session(job, ROLE_PLAYING_KWARGS,
+                                     max_num_messages=2,
+                                     checkpoint_path=checkpoint_path)
+    assert first["num_messages"] == 2
+    assert os.path.exists(checkpoint_path)
+
+    # The checkpoint was taken before the last turn, which is replayed.
+    resumed = run_role_playing_session(job, ROLE_PLAYING_KWARGS,
+                                       max_num_messages=4,
+                                       checkpoint_path=checkpoint_path)
+    assert resumed["num_messages"] == 4
+    assert resumed["message_1"] == first["message_1"]
+    assert resumed["specified_task"] == first["specified_task"]
+
+
+def test_role_playing_runner_with_checkpoints(tmp_path):
+    runner = RolePlayingRunner(str(tmp_path), ROLE_PLAYING_KWARGS,
+                               max_num_messages=2,
+                               executor_type=ExecutorType.THREAD,
+                               num_workers=2, with_checkpoints=True)
+    stats = runner.run(make_jobs())
+    assert stats.num_completed == 4
+    assert len(read_shards(runner)) == 4
+    # Checkpoints of finished sessions are cleaned up.
+    assert os.listdir(os.path.join(str(tmp_path), "checkpoints")) == []
+
+
+def test_run_role_playing_session_with_terminators():
+    job = RolePlayingJob("001_001_001", "Programmer", "Student",
+                         "Perform the task")
+    terminator = RepetitionTerminator(patience=2)
+    message_dict = run_role_playing_session(
+        job, dict(ROLE_PLAYING_KWARGS, user_response_terminators=[terminator]),
+        max_num_messages=40)
+    # The stub model always gives the same answer.
+    assert message_dict["num_messages"] == 4
+    assert message_dict["termination_reason"].startswith("RoleType.USER: ")
+    # The session worked on its own copy of the terminator.
+    assert not terminator._terminated
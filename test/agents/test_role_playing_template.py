@@ -0,0 +1,126 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import pickle
+
+import pytest
+
+from camel.human import Human
+from camel.societies import RolePlaying, RolePlayingTemplate
+from camel.terminators import RepetitionTerminator
+from camel.types import ModelType, TaskType
+
+
+@pytest.mark.parametrize(
+    "task_type, extend_sys_msg_meta_dicts, extend_task_specify_meta_dict",
+    [(TaskType.AI_SOCIETY, None, None),
+     (TaskType.CODE, [dict(domain="science", language="python")] * 2,
+      dict(domain="science", language="python")),
+     (TaskType.MISALIGNMENT, None, None)])
+@pytest.mark.parametrize("with_task_planner", [True, False])
+def test_role_playing_template_matches_role_playing(
+        task_type, extend_sys_msg_meta_dicts, extend_task_specify_meta_dict,
+        with_task_planner):
+    kwargs = dict(
+        with_task_specify=True,
+        with_task_planner=with_task_planner,
+        # Only the AI society prompts include a critic template.
+        with_critic_in_the_loop=task_type == TaskType.AI_SOCIETY,
+        model_type=ModelType.STUB,
+        task_type=task_type,
+        critic_kwargs=dict(verbose=False),
+        extend_sys_msg_meta_dicts=extend_sys_msg_meta_dicts,
+        extend_task_specify_meta_dict=extend_task_specify_meta_dict,
+    )
+    template = RolePlayingTemplate("Python Programmer", "Stock Trader",
+                                   **kwargs)
+
+    for task_prompt in ["Develop a trading bot", "Use {curly} braces"]:
+        expected = RolePlaying("Python Programmer", "Stock Trader",
+                               task_prompt=task_prompt, **kwargs)
+        role_playing = template.create_session(task_prompt)
+
+        assert role_playing.task_prompt == expected.task_prompt
+        assert (role_playing.specified_task_prompt ==
+                expected.specified_task_prompt)
+        assert (
+            role_playing.planned_task_prompt == expected.planned_task_prompt)
+        assert role_playing.assistant_sys_msg == expected.assistant_sys_msg
+        assert role_playing.user_sys_msg == expected.user_sys_msg
+        assert role_playing.critic_sys_msg == expected.critic_sys_msg
+        assert isinstance(role_playing.critic, type(expected.critic))
+        for agent in [role_playing.assistant_agent, role_playing.user_agent]:
+            assert agent.model_type == ModelType.STUB
+
+        assistant_msg, _ = role_playing.init_chat()
+        assistant_response, user_response = role_playing.step(assistant_msg)
+        assert not assistant_response.terminated
+        assert not user_response.terminated
+
+
+def test_role_playing_template_with_special_role_names():
+    template = RolePlayingTemplate("Programmer {x}", "User }",
+                                   model_type=ModelType.STUB,
+                                   with_task_specify=False)
+    expected = RolePlaying("Programmer {x}", "User }", task_prompt="Do {task}",
+                           model_type=ModelType.STUB, with_task_specify=False)
+    role_playing = template.create_session("Do {task}")
+    assert role_playing.assistant_sys_msg == expected.assistant_sys_msg
+    assert role_playing.user_sys_msg == expected.user_sys_msg
+
+
+def test_role_playing_template_with_human_critic():
+    template = RolePlayingTemplate("Programmer", "Student",
+                                   critic_role_name="human",
+                                   with_critic_in_the_loop=True,
+                                   with_task_specify=False,
+                                   model_type=ModelType.STUB)
+    role_playing = template.create_session("Perform the task")
+    assert isinstance(role_playing.critic, Human)
+    assert role_playing.critic_sys_msg is None
+
+
+def test_role_playing_template_sessions_are_independent():
+    template = RolePlayingTemplate("Programmer", "Student",
+                                   model_type=ModelType.STUB)
+    first = template.create_session("First task")
+    second = template.create_session("Second task")
+    assert first.assistant_agent is not second.assistant_agent
+    assistant_msg, _ = first.init_chat()
+    first.step(assistant_msg)
+    assert (len(first.assistant_agent.memory.get_records()) > len(
+        second.assistant_agent.memory.get_records()))
+
+
+def test_role_playing_template_pickle():
+    template = RolePlayingTemplate("Programmer", "Student",
+                                   model_type=ModelType.STUB)
+    template.create_session("Perform the task")
+    restored = pickle.loads(pickle.dumps(template))
+    role_playing = restored.create_session("Perform the task")
+    assert (role_playing.assistant_sys_msg == template.create_session(
+        "Perform the task").assistant_sys_msg)
+
+
+def test_role_playing_template_copies_terminators():
+    terminator = RepetitionTerminator(patience=1)
+    template = RolePlayingTemplate("Programmer", "Student",
+                                   model_type=ModelType.STUB,
+                                   user_response_terminators=[terminator])
+    first = template.create_session("First task")
+    second = template.create_session("Second task")
+    first_terminator = first.user_agent.response_terminators[0]
+    second_terminator = second.user_agent.response_terminators[0]
+    assert isinstance(first_terminator, RepetitionTerminator)
+    assert first_terminator is not second_terminator
+    assert first_terminator is not terminator
@@ -11,11 +11,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
-from io import BytesIO
+from hashlib import md5
+from io import BufferedReader, BytesIO
 from pathlib import Path
+from typing import IO
 
 import pytest
 
+from camel.functions import data_io_functions
 from camel.functions.data_io_functions import (
     DocxFile,
     File,
@@ -23,9 +26,14 @@ from camel.functions.data_io_functions import (
     JsonFile,
     PdfFile,
     TxtFile,
+    hash_file,
+    iter_file_docs,
     read_file,
+    read_files,
+    split_file,
     strip_consecutive_newlines,
 )
+from camel.utils import TextChunker
 
 
 # Define a FakeFile class for testing purposes
@@ -33,7 +41,7 @@ class FakeFile(File):
     """A fake file for testing purposes"""
 
     @classmethod
-    def from_bytes(cls, file: BytesIO) -> "FakeFile":
+    def from_bytes(cls, file: IO[bytes]) -> "FakeFile":
         return NotImplemented
 
 
@@ -220,3 +228,100 @@ def test_strip_consecutive_newlines():
     text = "\nHello\nWorld\n"
     expected = "\nHello\nWorld\n"
     assert strip_consecutive_newlines(text) == expected
+
+
+def test_split_file():
+
+    class CharEncoding:
+
+        def encode(self, text):
+            return list(text)
+
+        def decode(self, tokens):
+            return "".join(tokens)
+
+    file = FakeFile(
+        "test_file", "test_id", metadata={"author": "test"}, docs=[
+            dict(page_content="One. Two. Three.", page=1),
+            dict(page_content="Four.", page=2)
+        ])
+    chunker = TextChunker(chunk_size=10, encoding=CharEncoding())
+    split = split_file(file, chunker)
+
+    assert isinstance(split, FakeFile)
+    assert (split.name, split.id, split.metadata) == (file.name, file.id,
+                                                      file.metadata)
+    assert split.docs == [
+        dict(page_content="One. Two. ", page=1, chunk=0),
+        dict(page_content="Three.", page=1, chunk=1),
+        dict(page_content="Four.", page=2, chunk=0),
+    ]
+    assert len(file.docs) == 2
+
+
+def test_hash_file():
+    path = SAMPLE_ROOT / "test_hello_multi.pdf"
+    expected = md5(path.read_bytes()).hexdigest()
+    assert hash_file(path) == expected
+    assert hash_file(BytesIO(path.read_bytes())) == expected
+    # A stream that is neither in memory nor a local file is read by blocks
+    # from its start
+    stream = BufferedReader(BytesIO(path.read_bytes()))
+    stream.read(10)
+    assert hash_file(stream) == expected
+    assert stream.tell() == 10
+
+
+def test_txt_file_from_buffered_stream():
+    content = b"Hello World\n"
+    raw = BytesIO(content)
+    raw.name = "test.txt"
+    # The contents are read before they are hashed
+    txt_file = TxtFile.from_bytes(BufferedReader(raw))
+    assert txt_file.id == md5(content).hexdigest()
+    assert txt_file.docs == [{"page_content": "Hello World"}]
+
+
+def test_read_file_from_path():
+    path = SAMPLE_ROOT / "test_hello_multi.pdf"
+    pdf_file = read_file(path)
+    assert isinstance(pdf_file, PdfFile)
+    assert pdf_file.id == md5(path.read_bytes()).hexdigest()
+    assert [doc["page"] for doc in pdf_file.docs] == [1, 2, 3]
+
+
+def test_iter_file_docs_pdf():
+    path = SAMPLE_ROOT / "test_hello_multi.pdf"
+    docs = iter_file_docs(path)
+    assert next(docs) == read_file(path).docs[0]
+    assert len(list(docs)) == 2
+
+
+def test_iter_file_docs_docx():
+    docs = list(iter_file_docs(SAMPLE_ROOT / "test_hello_multi.docx"))
+    assert [doc["page_content"] for doc in docs
+            ] == ["Hello World 1", "Hello World 2", "Hello World 3"]
+    assert [doc["section"] for doc in docs] == [0, 1, 2]
+
+
+def test_iter_file_docs_txt(monkeypatch):
+    # Blocks of a few bytes cut lines and multi-byte characters
+    monkeypatch.setattr(data_io_functions, "_BLOCK_SIZE", 3)
+    file = BytesIO("Première ligne\n  suite \n\n\nDeuxième\n".encode())
+    file.name = "test.txt"
+    assert list(iter_file_docs(file)) == [
+        dict(page_content="Première ligne\nsuite", section=0),
+        dict(page_content="Deuxième", section=1),
+    ]
+
+
+def test_read_files_in_processes():
+    paths = [
+        SAMPLE_ROOT / f"test_hello{ext}"
+        for ext in [".pdf", ".txt", ".json", ".html", ".docx"]
+    ]
+    files = read_files(paths, max_workers=2)
+    assert [file.id
+            for file in files] == [read_file(path).id for path in paths]
+    assert [type(file) for file in files
+            ] == [PdfFile, TxtFile, JsonFile, HtmlFile, DocxFile]
@@ -0,0 +1,160 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import multiprocessing
+import os
+import time
+from typing import Optional
+
+from camel.functions import FunctionCache, OpenAIFunction
+
+calls = []
+
+
+def search(query: str, max_results: int = 3) -> str:
+    r"""Searches for a query.
+
+    Args:
+        query (string): The query to search for.
+        max_results (integer): The maximum number of results.
+
+    Returns:
+        string: The results.
+    """
+    calls.append((query, max_results))
+    return f"{max_results} results for {query}"
+
+
+def test_function_cache_canonicalizes_arguments():
+    calls.clear()
+    func = OpenAIFunction(search, cache=FunctionCache())
+    assert func.call(dict(query="camel"))[1] is False
+    # Defaults are filled in, and the order of the arguments is irrelevant
+    assert func.call(dict(max_results=3,
+                          query="camel")) == ("3 results for camel", True)
+    assert func("camel", 3) == "3 results for camel"
+    assert func.call(dict(query="camel", max_results=4))[1] is False
+    assert len(calls) == 2
+    assert func.cache.num_hits == 2
+    assert func.cache.num_misses == 2
+    assert func.cache.hit_rate == 0.5
+
+
+def test_function_cache_custom_canonicalization():
+    calls.clear()
+    cache = FunctionCache(
+        canonicalize=lambda args: dict(args, query=args["query"].lower()))
+    func = OpenAIFunction(search, cache=cache)
+    func(query="CAMEL")
+    func(query="camel")
+    assert len(calls) == 1
+
+
+def test_function_cache_lru():
+    calls.clear()
+    func = OpenAIFunction(search, cache=FunctionCache(max_size=2))
+    func("a")
+    func("b")
+    func("a")
+    func("c")  # Evicts "b", the least recently used
+    assert len(func.cache) == 2
+    func("a")
+    func("b")
+    assert calls == [("a", 3), ("b", 3), ("c", 3), ("b", 3)]
+
+
+def test_function_cache_ttl(monkeypatch):
+    calls.clear()
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    func = OpenAIFunction(search, cache=FunctionCache(ttl=10))
+    func("camel")
+    monkeypatch.setattr(time, "time", lambda: now + 5)
+    func("camel")
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    func("camel")
+    assert len(calls) == 2
+
+
+def test_function_cache_bypass():
+    calls.clear()
+    func = OpenAIFunction(search, cache=FunctionCache())
+    func("camel")
+    assert func.call(dict(query="camel"),
+                     use_cache=False) == ("3 results for camel", None)
+    assert len(calls) == 2
+    assert func.cache.num_hits == 0
+
+
+def call_search(cache_dir: str) -> Optional[bool]:
+    func = OpenAIFunction(search, cache=FunctionCache(cache_dir=cache_dir))
+    return func.call(dict(query="camel"))[1]
+
+
+def test_function_cache_disk_tier_is_shared(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    assert call_search(cache_dir) is False
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        assert pool.apply(call_search, (cache_dir, )) is True
+
+    cache = FunctionCache(cache_dir=cache_dir)
+    cache.clear("search")
+    assert call_search(cache_dir) is False
+
+
+def test_function_cache_clear_keeps_other_functions(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    cache = FunctionCache(cache_dir=cache_dir)
+    other_cache = FunctionCache(cache_dir=cache_dir)
+    key = cache.make_key("search", dict(query="camel"))
+    other_key = other_cache.make_key("add", dict(a=1, b=2))
+    cache.put(key, "result")
+    other_cache.put(other_key, 3)
+
+    cache.clear()
+    # Already removed, e.g. by another worker
+    cache.clear()
+    assert cache.get(key) is FunctionCache.MISSING
+    assert FunctionCache(cache_dir=cache_dir).get(other_key) == 3
+
+
+def test_function_cache_prunes_expired_files(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    cache = FunctionCache(ttl=0.05, cache_dir=cache_dir)
+    keys = [cache.make_key("search", dict(query=str(i))) for i in range(3)]
+    for key in keys:
+        cache.put(key, "result")
+    time.sleep(0.1)
+
+    # Read from disk by another worker
+    assert FunctionCache(cache_dir=cache_dir).get(
+        keys[0]) is FunctionCache.MISSING
+    assert not os.path.exists(cache._get_path(keys[0]))
+    assert cache.prune() == 2
+    assert os.listdir(
+        os.path.join(cache_dir, cache._get_func_dir_name("search"))) == []
+
+
+def test_function_cache_keeps_similar_names_apart(tmp_path):
+    cache = FunctionCache(cache_dir=str(tmp_path / "cache"))
+    key = cache.make_key("math.add", dict(a=1, b=2))
+    other_key = cache.make_key("math_add", dict(a=1, b=2))
+    assert key.split("/")[0] != other_key.split("/")[0]
+    cache.put(key, 3)
+    cache.put(other_key, 4)
+
+    cache.clear("math_add")
+    # Read from disk by another worker
+    other_cache = FunctionCache(cache_dir=str(tmp_path / "cache"))
+    assert other_cache.get(key) == 3
+    assert other_cache.get(other_key) is FunctionCache.MISSING
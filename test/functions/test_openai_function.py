@@ -11,9 +11,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import asyncio
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from camel.functions import OpenAIFunction
+from camel.types import ExecutorType
 
 
 def add_with_doc(a: int, b: int) -> int:
@@ -80,3 +88,162 @@ def test_function_with_wrong_doc():
             match=(r"Number of parameters in function signature \(2\)"
                    r" does not match that in docstring \(1\)")):
         _ = OpenAIFunction(add_with_wrong_doc, name="add")
+
+
+def sleep_and_get_pid(seconds: float) -> int:
+    r"""Sleeps, then returns the process id.
+
+    Args:
+        seconds (number): The number of seconds to sleep.
+
+    Returns:
+        integer: The process id.
+    """
+    time.sleep(seconds)
+    return os.getpid()
+
+
+async def async_sleep(seconds: float) -> str:
+    r"""Sleeps asynchronously.
+
+    Args:
+        seconds (number): The number of seconds to sleep.
+
+    Returns:
+        string: A message.
+    """
+    await asyncio.sleep(seconds)
+    return f"slept {seconds}"
+
+
+def test_async_function():
+    func = OpenAIFunction(async_sleep, timeout=1)
+    assert func(0) == "slept 0"
+    with pytest.raises(TimeoutError, match="timed out after 1 seconds"):
+        func.call(dict(seconds=5))
+
+
+def test_inline_timeout_requires_executor():
+    with pytest.raises(ValueError, match="requires a THREAD or PROCESS"):
+        OpenAIFunction(sleep_and_get_pid, timeout=1)
+
+
+def test_thread_executor_timeout():
+    func = OpenAIFunction(sleep_and_get_pid, executor_type=ExecutorType.THREAD,
+                          timeout=0.2)
+    assert func(0) == os.getpid()
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        func(2)
+    assert time.perf_counter() - start < 1
+    func.shutdown(cancel=False)
+
+
+def test_process_executor_timeout_restarts_pool():
+    func = OpenAIFunction(sleep_and_get_pid,
+                          executor_type=ExecutorType.PROCESS, timeout=5,
+                          max_concurrency=1)
+    worker_pid = func(0)
+    assert worker_pid != os.getpid()
+    # The pool is warm, the same worker runs the next call
+    assert func(0) == worker_pid
+
+    func.timeout = 0.5
+    with pytest.raises(TimeoutError):
+        func(30)
+    # The stuck worker was stopped, and a new one runs the next call
+    func.timeout = 5
+    assert func(0) != worker_pid
+    func.shutdown()
+
+
+def test_process_executor_timeout_spares_other_calls():
+    func = OpenAIFunction(sleep_and_get_pid,
+                          executor_type=ExecutorType.PROCESS, timeout=2,
+                          max_concurrency=2)
+    with ThreadPoolExecutor(max_workers=2) as callers:
+        stuck = callers.submit(func, 30)
+        time.sleep(1)
+        # Still running when the stuck call times out
+        running = callers.submit(func, 1.5)
+        with pytest.raises(TimeoutError):
+            stuck.result()
+        assert running.result() != os.getpid()
+    func.shutdown()
+
+
+def test_process_executor_shutdown_stops_running_calls():
+    func = OpenAIFunction(sleep_and_get_pid,
+                          executor_type=ExecutorType.PROCESS,
+                          max_concurrency=1)
+    with ThreadPoolExecutor(max_workers=1) as callers:
+        call = callers.submit(func, 30)
+        time.sleep(0.5)
+        start = time.perf_counter()
+        func.shutdown()
+        with pytest.raises(RuntimeError, match="worker process exited"):
+            call.result()
+        assert time.perf_counter() - start < 5
+
+
+def sleep_all_and_get_pid(*seconds: float) -> int:
+    r"""Sleeps for each duration, then returns the process id.
+
+    Args:
+        seconds (number): The numbers of seconds to sleep.
+
+    Returns:
+        integer: The process id.
+    """
+    time.sleep(sum(seconds))
+    return os.getpid()
+
+
+def test_variadic_function_follows_execution_policy():
+    func = OpenAIFunction(sleep_all_and_get_pid,
+                          executor_type=ExecutorType.PROCESS, timeout=0.5,
+                          max_concurrency=1)
+    assert func(0, 0) != os.getpid()
+    with pytest.raises(TimeoutError):
+        func(10, 20)
+    func.shutdown()
+
+
+def test_max_concurrency():
+    lock = threading.Lock()
+    num_running = 0
+    max_running = 0
+
+    def track(seconds: float) -> None:
+        r"""Tracks the number of concurrent calls.
+
+        Args:
+            seconds (number): The duration of the call.
+        """
+        nonlocal num_running, max_running
+        with lock:
+            num_running += 1
+            max_running = max(max_running, num_running)
+        time.sleep(seconds)
+        with lock:
+            num_running -= 1
+
+    for executor_type in [ExecutorType.INLINE, ExecutorType.THREAD]:
+        max_running = 0
+        func = OpenAIFunction(track, executor_type=executor_type,
+                              max_concurrency=2)
+        with ThreadPoolExecutor(max_workers=6) as callers:
+            list(callers.map(func, [0.05] * 6))
+        assert max_running == 2
+        func.shutdown()
+
+
+def test_function_with_executor_is_picklable():
+    func = OpenAIFunction(sleep_and_get_pid, executor_type=ExecutorType.THREAD,
+                          timeout=1, max_concurrency=2)
+    func(0)
+    copied = pickle.loads(pickle.dumps(func))
+    assert copied(0) == os.getpid()
+    assert (copied.timeout, copied.max_concurrency) == (1, 2)
+    func.shutdown()
+    copied.shutdown()
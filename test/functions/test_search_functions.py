@@ -12,14 +12,26 @@
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
 import os
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import List
 
+import pytest
 import requests
 import wikipedia
 
+import camel.agents
+from camel.functions import search_functions
 from camel.functions.search_functions import (
+    create_chunks,
+    prompt_single_step_agent,
     search_google_and_summarize,
     search_wiki,
+    summarize_text,
 )
+from camel.utils import TextChunker
 
 
 def test_search_wiki_normal():
@@ -66,3 +78,187 @@ def test_web_search():
     answer = search_google_and_summarize(query)
 
     assert answer is not None
+
+
+def test_create_chunks():
+    text = "First sentence.\nSecond one, a bit longer.\nThird."
+    chunks = create_chunks(text, 20)
+    assert "".join(chunks) == text
+    # Cut at n characters when no sentence ends between 0.8 * n and 1.2 * n
+    assert chunks == [
+        "First sentence.\nSeco", "nd one, a bit longer.\n", "Third."
+    ]
+
+
+class WordEncoding:
+    r"""A tokenizer with one token per word, with its trailing spaces."""
+
+    def encode(self, text: str) -> List[str]:
+        return re.findall(r"\S+\s*|\s+", text)
+
+    def decode(self, tokens: List[str]) -> str:
+        return "".join(tokens)
+
+
+def fake_prompt(prompt: str) -> str:
+    verdict = "good" if "good" in prompt else "bad"
+    if prompt.startswith("Do you think"):
+        return "yes" if verdict == "good" else "no"
+    if prompt.startswith("Here are"):
+        return f"answer: {verdict}"
+    return verdict
+
+
+def test_summarize_text_reduces_hierarchically(monkeypatch):
+    prompts = []
+
+    def record_prompt(prompt: str) -> str:
+        prompts.append(prompt)
+        return fake_prompt(prompt)
+
+    monkeypatch.setattr(search_functions, "prompt_single_step_agent",
+                        record_prompt)
+    monkeypatch.setattr(
+        search_functions, "_get_summary_chunker",
+        lambda chunk_size: TextChunker(chunk_size, encoding=WordEncoding()))
+    monkeypatch.setattr(search_functions, "SUMMARY_REDUCE_FAN_IN", 2)
+    monkeypatch.setattr(search_functions, "SUMMARY_CHUNK_SIZE", 3)
+    text = "A good sentence.\n" * 5
+
+    assert summarize_text(text, "query") == "answer: good"
+    # 5 chunk summaries, reduced to 3, then to 2, then answered
+    assert len(prompts) == 5 + 3 + 2 + 1
+    assert prompts[-1].endswith("Text: good\ngood\n")
+
+
+def test_search_google_and_summarize_stops_at_sufficient_answer(monkeypatch):
+    release = threading.Event()
+    pages = {"bad_url": "A bad page.", "good_url": "A good page."}
+
+    def fetch(url: str) -> str:
+        if url == "slow_url":
+            release.wait(10)
+            return "A slow page."
+        return pages[url]
+
+    monkeypatch.setattr(
+        search_functions, "search_google", lambda query:
+        [dict(url=url) for url in ["bad_url", "good_url", "slow_url"]])
+    monkeypatch.setattr(search_functions, "text_extract_from_web", fetch)
+    monkeypatch.setattr(search_functions, "prompt_single_step_agent",
+                        fake_prompt)
+    monkeypatch.setattr(
+        search_functions, "_get_summary_chunker",
+        lambda chunk_size: TextChunker(chunk_size, encoding=WordEncoding()))
+
+    start = time.perf_counter()
+    try:
+        assert search_google_and_summarize("query") == "answer: good"
+        assert time.perf_counter() - start < 5
+    finally:
+        release.set()
+
+
+def test_search_google_and_summarize_prefers_higher_ranked_answer(monkeypatch):
+    release = threading.Event()
+    pages = {"first_url": "A first page.", "second_url": "A second page."}
+
+    def fetch(url: str) -> str:
+        if url == "first_url":
+            release.wait(10)
+        return pages[url]
+
+    def prompt(prompt: str) -> str:
+        source = "first" if "first" in prompt else "second"
+        if prompt.startswith("Do you think"):
+            # The second answer is checked before the first page is fetched
+            if source == "second":
+                release.set()
+            return "yes"
+        if prompt.startswith("Here are"):
+            return f"answer: {source}"
+        return source
+
+    monkeypatch.setattr(
+        search_functions, "search_google",
+        lambda query: [dict(url=url) for url in ["first_url", "second_url"]])
+    monkeypatch.setattr(search_functions, "text_extract_from_web", fetch)
+    monkeypatch.setattr(search_functions, "prompt_single_step_agent", prompt)
+    monkeypatch.setattr(
+        search_functions, "_get_summary_chunker",
+        lambda chunk_size: TextChunker(chunk_size, encoding=WordEncoding()))
+
+    assert search_google_and_summarize("query") == "answer: first"
+
+
+def test_search_steps_stop_once_answered(monkeypatch):
+    release = threading.Event()
+    prompts = []
+
+    def fetch(url: str) -> str:
+        if url == "slow_url":
+            release.wait(10)
+            return "A slow page."
+        return "A good page."
+
+    def prompt(prompt: str) -> str:
+        prompts.append(prompt)
+        return fake_prompt(prompt)
+
+    monkeypatch.setattr(
+        search_functions, "search_google",
+        lambda query: [dict(url=url) for url in ["good_url", "slow_url"]])
+    monkeypatch.setattr(search_functions, "text_extract_from_web", fetch)
+    monkeypatch.setattr(search_functions, "prompt_single_step_agent", prompt)
+    monkeypatch.setattr(
+        search_functions, "_get_summary_chunker",
+        lambda chunk_size: TextChunker(chunk_size, encoding=WordEncoding()))
+
+    assert search_google_and_summarize("query") == "answer: good"
+    num_prompts = len(prompts)
+    release.set()
+    # The running fetch of the slow page does not lead to more prompts
+    time.sleep(0.1)
+    assert len(prompts) == num_prompts
+    assert not any("slow" in prompt for prompt in prompts)
+
+
+def test_cancelled_steps_do_not_prompt(monkeypatch):
+    prompts = []
+    monkeypatch.setattr(search_functions, "prompt_single_step_agent",
+                        prompts.append)
+    cancelled = threading.Event()
+    cancelled.set()
+    with pytest.raises(search_functions._SearchCancelled):
+        search_functions._summarize_chunk("query", 1, "text", cancelled)
+    with pytest.raises(search_functions._SearchCancelled):
+        search_functions._is_sufficient_answer("query", "answer", cancelled)
+    assert prompts == []
+
+
+def test_search_executor_is_shared():
+    executor = search_functions._get_search_executor()
+    assert search_functions._get_search_executor() is executor
+
+
+def test_single_step_agent_is_reused(monkeypatch):
+    agents = []
+
+    class FakeAgent:
+
+        def __init__(self, system_message):
+            agents.append(self)
+
+        def reset(self):
+            pass
+
+        def step(self, input_message):
+            msg = SimpleNamespace(content=input_message.content.upper())
+            return SimpleNamespace(msgs=[msg], msg=msg)
+
+    monkeypatch.setattr(camel.agents, "ChatAgent", FakeAgent)
+    monkeypatch.setattr(search_functions, "_single_step_agents",
+                        threading.local())
+    assert prompt_single_step_agent("a") == "A"
+    assert prompt_single_step_agent("b") == "B"
+    assert len(agents) == 1
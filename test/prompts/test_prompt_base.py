@@ -11,12 +11,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+from types import SimpleNamespace
+
 import pytest
 
 from camel.prompts.base import (
     CodePrompt,
     TextPrompt,
     TextPromptDict,
+    _compile_template,
     return_prompt_wrapper,
     wrap_prompt_functions,
 )
@@ -96,6 +99,43 @@ def test_text_prompt_format():
     assert prompt.format(name=name) == 'Your name and age are: John, {age}'
 
 
+def test_text_prompt_format_semantics():
+    prompt = TextPrompt('{{literal}} {name!r:>8} {0}')
+    assert prompt.format('zero', name='x') == "{literal}      'x' zero"
+    with pytest.raises(KeyError):
+        prompt.format('zero')
+    assert prompt.key_words == {'{literal', 'name!r:>8', '0'}
+
+    prompt = TextPrompt('{user.name} {role}')
+    assert prompt.format(user=SimpleNamespace(name='John')) == 'John {role}'
+
+
+def test_text_prompt_compiled_once():
+    prompt = TextPrompt('Hello, {name}! I am {role}.')
+    assert _compile_template(prompt) is _compile_template(
+        'Hello, {name}! I am {role}.')
+    assert isinstance(prompt.format(name='John'), TextPrompt)
+
+
+def test_text_prompt_partial():
+    prompt = TextPrompt('Hello, {name}! I am {role}, {name}.')
+    partial_prompt = prompt.partial(role='a {{robot}}')
+    assert isinstance(partial_prompt, TextPrompt)
+    assert partial_prompt == prompt.format(role='a {{robot}}')
+    assert partial_prompt.key_words == {'name', '{robot'}
+
+    partial_prompt = prompt.partial(role='a robot')
+    assert partial_prompt == 'Hello, {name}! I am a robot, {name}.'
+    assert partial_prompt.key_words == {'name'}
+    assert _compile_template(partial_prompt).parts == [
+        ('Hello, ', 'name', '', None),
+        ('! I am a robot, ', 'name', '', None),
+        ('.', None, None, None),
+    ]
+    assert partial_prompt.format(name='John') == ('Hello, John! I am a robot, '
+                                                  'John.')
+
+
 def test_text_prompt_manipulate():
     prompt1 = TextPrompt('Hello, {name}!')
     prompt2 = TextPrompt('Welcome, {name}!')
@@ -11,9 +11,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from camel.prompts import PromptTemplateGenerator, TextPrompt
+from camel.prompts import (
+    AISocietyPromptTemplateDict,
+    PromptTemplateGenerator,
+    TaskPromptTemplateDict,
+    TextPrompt,
+    TextPromptDict,
+)
+from camel.prompts.prompt_templates import _SharedTaskPromptTemplateDict
 from camel.types import RoleType, TaskType
 
 
@@ -53,3 +62,41 @@ def test_get_task_specify_prompt(task_type):
     prompt_template = PromptTemplateGenerator().get_task_specify_prompt(
         task_type)
     assert isinstance(prompt_template, TextPrompt)
+
+
+def test_prompt_templates_shared():
+    generator_1 = PromptTemplateGenerator()
+    generator_2 = PromptTemplateGenerator()
+    assert (generator_1.task_prompt_template_dict is
+            generator_2.task_prompt_template_dict)
+    assert (generator_1.get_system_prompt(TaskType.CODE, RoleType.USER) is
+            generator_2.get_system_prompt(TaskType.CODE, RoleType.USER))
+
+
+def test_shared_prompt_templates_created_on_first_use():
+    template_dict = _SharedTaskPromptTemplateDict()
+    assert len(template_dict) == 0
+    prompt = template_dict[TaskType.AI_SOCIETY]["generate_tasks"]
+    assert prompt is AISocietyPromptTemplateDict.GENERATE_TASKS
+    assert list(template_dict) == [TaskType.AI_SOCIETY]
+    with pytest.raises(KeyError):
+        template_dict["unknown task"]
+
+
+def test_shared_prompt_templates_thread_safe():
+    template_dict = _SharedTaskPromptTemplateDict()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda _: template_dict[TaskType.CODE], range(64)))
+    assert all(result is results[0] for result in results)
+
+
+def test_custom_prompt_templates():
+    task_prompt_template_dict = TaskPromptTemplateDict()
+    task_prompt_template_dict[TaskType.AI_SOCIETY] = TextPromptDict(
+        {RoleType.USER: TextPrompt("You are a {user_role}.")})
+    generator = PromptTemplateGenerator(task_prompt_template_dict)
+    assert generator.get_system_prompt(
+        TaskType.AI_SOCIETY, RoleType.USER) == "You are a {user_role}."
+    assert PromptTemplateGenerator().get_system_prompt(
+        TaskType.AI_SOCIETY, RoleType.USER) != "You are a {user_role}."
@@ -13,7 +13,9 @@
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
 
 import tempfile
+import threading
 from pathlib import Path
+from typing import Any, Dict, List
 
 import pytest
 
@@ -21,6 +23,7 @@ from camel.storages.key_value_storages import (
     BaseKeyValueStorage,
     InMemoryKeyValueStorage,
     JsonStorage,
+    WriteBehindKeyValueStorage,
 )
 from camel.types import RoleType
 
@@ -34,9 +37,17 @@ def storage(request):
         path = Path(path)
         yield JsonStorage(path)
         path.unlink()
+    elif request.param == "write-behind":
+        _, path = tempfile.mkstemp()
+        path = Path(path)
+        storage = WriteBehindKeyValueStorage(JsonStorage(path))
+        yield storage
+        storage.close()
+        path.unlink()
 
 
-@pytest.mark.parametrize("storage", ["in-memory", "json"], indirect=True)
+@pytest.mark.parametrize("storage", ["in-memory", "json", "write-behind"],
+                         indirect=True)
 def test_key_value_storage(storage: BaseKeyValueStorage):
     msg1 = {
         "key1": "value1",
@@ -64,3 +75,70 @@ def test_key_value_storage(storage: BaseKeyValueStorage):
     storage.clear()
     load_msg = storage.load()
     assert load_msg == []
+
+
+class _BlockingStorage(InMemoryKeyValueStorage):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.unblocked = threading.Event()
+        self.num_saves = 0
+
+    def save(self, records: List[Dict[str, Any]]) -> None:
+        self.unblocked.wait()
+        self.num_saves += 1
+        super().save(records)
+
+
+def test_write_behind_storage_flush():
+    inner = _BlockingStorage()
+    storage = WriteBehindKeyValueStorage(inner, flush_interval=60.0)
+    storage.save([{"key": "value1"}])
+    storage.save([{"key": "value2"}])
+
+    # Reads are served before anything is persisted.
+    assert storage.load() == [{"key": "value1"}, {"key": "value2"}]
+    assert inner.load() == []
+    assert storage.num_pending == 2
+
+    inner.unblocked.set()
+    storage.flush()
+    assert inner.load() == [{"key": "value1"}, {"key": "value2"}]
+    assert inner.num_saves == 1
+    assert storage.num_pending == 0
+
+    storage.close()
+    with pytest.raises(RuntimeError):
+        storage.save([{"key": "value3"}])
+
+
+def test_write_behind_storage_bounded_pending():
+    inner = _BlockingStorage()
+    storage = WriteBehindKeyValueStorage(inner, flush_interval=60.0,
+                                         max_pending=2)
+    storage.save([{"key": 1}, {"key": 2}])
+    saver = threading.Thread(target=storage.save, args=([{"key": 3}], ))
+    saver.start()
+    saver.join(timeout=0.2)
+    # The third record would exceed the bound, so `save` waits for the
+    # background writer.
+    assert saver.is_alive()
+
+    inner.unblocked.set()
+    saver.join()
+    storage.close()
+    assert inner.load() == [{"key": 1}, {"key": 2}, {"key": 3}]
+
+
+def test_write_behind_storage_reports_failure():
+
+    class _FailingStorage(InMemoryKeyValueStorage):
+
+        def save(self, records: List[Dict[str, Any]]) -> None:
+            raise IOError("Disk is full.")
+
+    storage = WriteBehindKeyValueStorage(_FailingStorage())
+    storage.save([{"key": "value"}])
+    with pytest.raises(RuntimeError):
+        storage.flush()
+    assert storage.load() == [{"key": "value"}]
@@ -0,0 +1,115 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+from typing import List
+
+import pytest
+
+from camel.messages import BaseMessage
+from camel.terminators import (
+    NoProgressTerminator,
+    RepetitionTerminator,
+    RoleFlipTerminator,
+)
+from camel.types import RoleType
+
+
+def _create_messages(content: str) -> List[BaseMessage]:
+    return [
+        BaseMessage(role_name="assistant", role_type=RoleType.ASSISTANT,
+                    meta_dict={}, content=content)
+    ]
+
+
+def test_repetition_termination():
+    terminator = RepetitionTerminator(ngram_size=3, window_size=2, patience=2)
+    for content in [
+            "Solution: Install the pandas library with pip.",
+            "Solution: Load the CSV file into a data frame.",
+            "You're welcome! Goodbye and good luck with your project.",
+            "You're welcome! Goodbye and good luck with your project!",
+            "You are welcome! Goodbye and good luck with your project.",
+    ]:
+        terminated, termination_reason = terminator.is_terminated(
+            _create_messages(content))
+    assert terminated
+    assert "2 consecutive responses" in termination_reason
+    # The reason is kept until reset.
+    assert terminator.is_terminated(_create_messages("New content"))[0]
+
+    terminator.reset()
+    assert not terminator._terminated
+    assert terminator._termination_reason is None
+    assert not terminator.is_terminated(_create_messages("Thanks!"))[0]
+
+
+def test_repetition_termination_of_short_responses():
+    terminator = RepetitionTerminator(patience=2)
+    assert not terminator.is_terminated(_create_messages("Thank you!"))[0]
+    assert not terminator.is_terminated(_create_messages("thank you"))[0]
+    assert terminator.is_terminated(_create_messages("Thank you."))[0]
+
+
+def test_repetition_termination_window():
+    terminator = RepetitionTerminator(ngram_size=2, window_size=1, patience=1)
+    assert not terminator.is_terminated(_create_messages("a b c d"))[0]
+    assert not terminator.is_terminated(_create_messages("e f g h"))[0]
+    # The first response fell out of the window.
+    assert not terminator.is_terminated(_create_messages("a b c d"))[0]
+    assert len(terminator._window) == 1
+
+
+def test_repetition_termination_is_not_fooled_by_progress():
+    terminator = RepetitionTerminator(patience=1)
+    for i in range(20):
+        terminated, _ = terminator.is_terminated(
+            _create_messages(f"Instruction: Write the function number {i} "
+                             f"computing the {i}-th moving average. "
+                             f"Input: the prices of day {i}."))
+        assert not terminated
+
+
+def test_role_flip_termination():
+    terminator = RoleFlipTerminator(patience=2)
+    assert not terminator.is_terminated(_create_messages("Solution: Done."))[0]
+    assert not terminator.is_terminated(
+        _create_messages("Instruction: Do it."))[0]
+    assert not terminator.is_terminated(_create_messages("Solution: Done."))[0]
+    assert not terminator.is_terminated(
+        _create_messages("Instruction: Do it."))[0]
+    terminated, termination_reason = terminator.is_terminated(
+        _create_messages("Instruction: Do that."))
+    assert terminated
+    assert "Instruction:" in termination_reason
+
+
+def test_no_progress_termination():
+    terminator = NoProgressTerminator(patience=2)
+    assert not terminator.is_terminated(_create_messages("Thanks!"))[0]
+    assert not terminator.is_terminated(
+        _create_messages("Instruction: Do it."))[0]
+    assert not terminator.is_terminated(_create_messages("Thanks!"))[0]
+    terminated, termination_reason = terminator.is_terminated(
+        _create_messages("Bye!"))
+    assert terminated
+    assert "2 consecutive responses" in termination_reason
+    terminator.reset()
+    assert not terminator.is_terminated(_create_messages("Bye!"))[0]
+
+
+@pytest.mark.parametrize(
+    "terminator_class",
+    [RepetitionTerminator, RoleFlipTerminator, NoProgressTerminator])
+def test_degeneration_terminator_invalid_patience(terminator_class):
+    with pytest.raises(ValueError):
+        terminator_class(patience=0)
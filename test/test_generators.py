@@ -11,8 +11,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import pytest
+
 from camel.generators import (
     AISocietyTaskPromptGenerator,
+    CodeTaskPromptGenerator,
+    GridGenerator,
     RoleNameGenerator,
     SystemMessageGenerator,
 )
@@ -65,3 +69,60 @@ def test_task_prompt_generator():
     assert isinstance(role_names, tuple)
     for role_name in role_names:
         assert isinstance(role_name, str)
+
+
+def test_role_name_generator_random_access():
+    role_name_generator = RoleNameGenerator(
+        assistant_role_names=["Doctor", "Chef", "Artist"],
+        user_role_names=["Student", "Farmer"]).from_role_files()
+    expected = [("Doctor", "Student"), ("Doctor", "Farmer"),
+                ("Chef", "Student"), ("Chef", "Farmer"), ("Artist", "Student"),
+                ("Artist", "Farmer")]
+    assert len(role_name_generator) == 6
+    assert [role_name_generator[i] for i in range(6)] == expected
+    assert role_name_generator[-1] == ("Artist", "Farmer")
+    assert list(role_name_generator[1:5:2]) == [expected[1], expected[3]]
+    assert list(role_name_generator) == expected
+    with pytest.raises(IndexError):
+        role_name_generator[6]
+
+
+def test_grid_generator_shard_and_resume():
+    grid = GridGenerator([range(7), "abc"], lambda i, c: f"{i}{c}")
+    shards = [grid.shard(index, 4) for index in range(4)]
+    assert [len(shard) for shard in shards] == [5, 5, 5, 6]
+    assert [row for shard in shards for row in shard] == list(grid[:])
+
+    shard = grid.shard(2, 4)
+    assert next(shard) == "3b"
+    shard.seek(3)
+    assert list(shard) == ["4b", "4c"]
+    with pytest.raises(ValueError):
+        grid.shard(4, 4)
+
+
+def test_task_prompt_generator_from_grid():
+    role_name_generator = RoleNameGenerator(
+        assistant_role_names=["Doctor", "Chef"],
+        user_role_names=["Student"]).from_role_files()
+    task_prompt_generator = AISocietyTaskPromptGenerator(
+        num_tasks=3).from_role_generator(role_name_generator.shard(1, 2))
+    assert len(task_prompt_generator) == 1
+    task_prompt, role_names = task_prompt_generator[0]
+    assert role_names == ("Chef", "Student")
+    assert "Chef" in task_prompt and "3" in task_prompt
+
+
+def test_code_task_prompt_generator(tmp_path):
+    languages_path = tmp_path / "languages.txt"
+    languages_path.write_text("1. Python\n2. Rust")
+    domains_path = tmp_path / "domains.txt"
+    domains_path.write_text("1. Biology\n2. Music\n3. Sports")
+    task_prompt_generator = CodeTaskPromptGenerator(
+        num_tasks=5).from_role_files(str(languages_path), str(domains_path))
+    assert len(task_prompt_generator) == 6
+    task_prompt, language, domain = task_prompt_generator[4]
+    assert (language, domain) == ("Rust", "Music")
+    assert "Rust" in task_prompt and "Music" in task_prompt
+    assert [row[1:] for row in task_prompt_generator.shard(0, 3)
+            ] == [("Python", "Biology"), ("Python", "Music")]
@@ -0,0 +1,95 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import os
+import subprocess
+import sys
+from typing import Dict, Set, Tuple
+
+import pytest
+
+import camel
+
+# Cold-start budget in microseconds of importing the modules below, as
+# reported by `python -X importtime`, including the standard library modules
+# they import. They take about 80ms on a development machine while openai
+# alone takes more than half a second, so the budget leaves room for slow CI
+# machines while catching a heavy dependency being imported eagerly.
+IMPORT_TIME_BUDGET_US = 500_000
+
+# The imports of a short-lived worker or command line tool that does not call
+# a model
+LIGHT_IMPORTS = """
+import camel
+from camel.generators import SystemMessageGenerator
+from camel.messages import BaseMessage
+from camel.prompts import PromptTemplateGenerator, TextPrompt
+from camel.types import ModelType, RoleType, TaskType
+from camel.utils import PythonInterpreter
+"""
+
+# Dependencies only needed when calling a model or a function
+HEAVY_MODULES = ["openai", "tiktoken", "jsonschema", "requests", "numpy"]
+
+
+def _run_with_importtime(code: str) -> Tuple[Dict[str, int], Set[str]]:
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [repo_root] + env.get("PYTHONPATH", "").split(os.pathsep))
+    code += "\nimport sys\nprint('\\n'.join(sys.modules))\n"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, env=env,
+                            check=True)
+    # The lines are "import time: self | cumulative | name", indented by the
+    # depth of the import
+    cumulative_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        if not name[1:].startswith(" "):
+            cumulative_times[name.strip()] = int(cumulative)
+    return cumulative_times, set(result.stdout.split())
+
+
+def test_import_does_not_load_heavy_dependencies():
+    _, modules = _run_with_importtime(LIGHT_IMPORTS)
+    assert [name for name in HEAVY_MODULES if name in modules] == []
+    assert "camel.agents.chat_agent" not in modules
+
+
+def test_import_time_budget():
+    cumulative_times, _ = _run_with_importtime(LIGHT_IMPORTS)
+    camel_time = sum(time for name, time in cumulative_times.items()
+                     if name.split(".")[0] == "camel")
+    assert camel_time < IMPORT_TIME_BUDGET_US
+
+
+def test_lazy_attributes():
+    assert "agents" in dir(camel)
+    from camel.agents import ChatAgent
+    assert camel.agents.ChatAgent is ChatAgent
+    from camel.messages import OpenAIMessage
+    from camel.types import ChatCompletionMessageParam
+    assert OpenAIMessage is ChatCompletionMessageParam
+    with pytest.raises(AttributeError):
+        camel.unknown_attribute
+
+
+def test_function_registries_built_once():
+    from camel.functions import MATH_FUNCS, math_functions
+    assert [func.name for func in MATH_FUNCS] == ["add", "sub", "mul"]
+    assert math_functions.MATH_FUNCS is MATH_FUNCS
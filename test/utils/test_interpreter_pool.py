@@ -0,0 +1,95 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from camel.prompts import CodePrompt
+from camel.utils import InterpreterPool
+from camel.utils.python_interpreter import InterpreterError
+
+
+@pytest.fixture(scope="module")
+def pool():
+    action_space = {
+        "getpid": os.getpid,
+        "exit": os._exit,
+        "bytearray": bytearray,
+        "len": len,
+    }
+    with InterpreterPool(action_space, num_workers=1, timeout=0.5,
+                         max_memory=256 << 20, max_tasks_per_worker=2,
+                         shared_memory_threshold=1024) as pool:
+        yield pool
+
+
+def test_execute(pool: InterpreterPool):
+    assert pool.execute("x = 1\ny = x + value", state={"value": 2}) == 3
+    with pytest.raises(InterpreterError) as e:
+        pool.execute("y")
+    assert "The variable `y` is not defined." in e.value.args[0]
+
+    code_prompt = CodePrompt("a = 1\na + 1", code_type="python")
+    result, interpreter = code_prompt.execute(interpreter=pool)
+    assert result == 2
+    assert interpreter is pool
+
+
+def test_shared_memory_values(pool: InterpreterPool):
+    image = np.arange(4096, dtype=np.float32).reshape(64, 64)
+    result = pool.execute("input_image.sum()", fuzz_state={"image": image})
+    assert result == image.sum()
+    document = b"x" * 4096
+    result = pool.execute("len(documents)", fuzz_state={"document": document})
+    assert result == 4096
+
+
+def test_workers_recycled(pool: InterpreterPool):
+    pids = [pool.submit("getpid()") for _ in range(6)]
+    pids = [future.result() for future in pids]
+    assert os.getpid() not in pids
+    assert len(set(pids)) >= 3
+    assert all(pids.count(pid) <= 2 for pid in pids)
+
+
+def test_timeout(pool: InterpreterPool):
+    with pytest.raises(TimeoutError):
+        pool.execute("for i in [1] * 10000:\n"
+                     "    for j in [1] * 10000:\n"
+                     "        x = j")
+    assert pool.execute("1 + 1") == 2
+
+
+def test_worker_crash(pool: InterpreterPool):
+    with pytest.raises(RuntimeError) as e:
+        pool.execute("exit(3)")
+    assert e.value.args[0] == "The worker process exited with code 3."
+    assert pool.execute("1 + 1") == 2
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"),
+                    reason="The memory limit is only enforced on Linux")
+def test_memory_limit(pool: InterpreterPool):
+    with pytest.raises(MemoryError):
+        pool.execute("x = bytearray(1 << 30)")
+    assert pool.execute("1 + 1") == 2
+
+
+def test_submit_after_shutdown():
+    pool = InterpreterPool({}, num_workers=1)
+    pool.shutdown()
+    with pytest.raises(RuntimeError):
+        pool.submit("1")
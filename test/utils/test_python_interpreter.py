@@ -11,12 +11,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import threading
+import time
+import tracemalloc
+
 import numpy as np
 import pytest
 import torch
 
 from camel.utils import PythonInterpreter
-from camel.utils.python_interpreter import InterpreterError
+from camel.utils.python_interpreter import InterpreterError, _parse_code
 
 
 def action_function():
@@ -275,3 +279,114 @@ x += 1"""
     exec_msg = e.value.args[0]
     assert exec_msg == ("Evaluation of the code stopped at node 1. See:"
                         "\nAugAssign is not supported.")
+
+
+def test_parsed_code_reused(interpreter: PythonInterpreter):
+    code = """x = 1
+y = x + 1"""
+    assert _parse_code(code) is _parse_code(code)
+    assert interpreter.execute(code) == 2
+    other = PythonInterpreter(action_space={})
+    assert other.execute(code) == 2
+
+
+def test_import_check_memoized(interpreter: PythonInterpreter):
+    code = "from numpy import array"
+    interpreter.execute(code)
+    interpreter.execute(code)
+    assert interpreter._import_checks == {"numpy.array": True}
+    with pytest.raises(InterpreterError):
+        interpreter.execute("from numpy import ndarray")
+    assert interpreter._import_checks["numpy.ndarray"] is False
+
+
+def test_instruction_budget():
+    interpreter = PythonInterpreter(action_space={"range": range},
+                                    max_instructions=100)
+    code = """total = 0
+for i in range(1000000):
+    total = total + i"""
+    with pytest.raises(InterpreterError) as e:
+        interpreter.execute(code)
+    assert e.value.args[0] == ("Evaluation of the code stopped at node 1. "
+                               "See:\nExceeded the budget of 100 "
+                               "instructions.")
+    assert 0 < e.value.partial_result < 1000
+    assert interpreter.state["total"] == e.value.partial_result
+
+    # The budget applies to each execution
+    assert interpreter.execute("x = 1\ny = x + 1") == 2
+
+
+def test_time_budget():
+    interpreter = PythonInterpreter(
+        action_space={"sleep": lambda: time.sleep(0.05)}, max_time=0.02)
+    with pytest.raises(InterpreterError) as e:
+        interpreter.execute("x = 1\nsleep()\ny = 2")
+    assert "Exceeded the time budget of 0.02 seconds." in e.value.args[0]
+    assert e.value.partial_result == 1
+    assert "y" not in interpreter.state
+
+
+def test_memory_budget():
+    interpreter = PythonInterpreter(action_space={"bytearray": bytearray},
+                                    max_memory=1 << 20)
+    assert interpreter.execute("x = bytearray(1000)\n1") == 1
+    with pytest.raises(InterpreterError) as e:
+        interpreter.execute("x = bytearray(10000000)\ny = 1")
+    assert "Exceeded the memory budget" in e.value.args[0]
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_budget_with_concurrent_interpreters():
+    started = threading.Event()
+    release = threading.Event()
+
+    def wait():
+        started.set()
+        release.wait(10)
+
+    action_space = {"bytearray": bytearray, "wait": wait}
+    errors = []
+
+    def run_waiting():
+        interpreter = PythonInterpreter(action_space=action_space,
+                                        max_memory=1 << 20)
+        try:
+            interpreter.execute("wait()\nx = bytearray(10000000)\ny = 1")
+        except InterpreterError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run_waiting)
+    thread.start()
+    assert started.wait(10)
+    # Finishes while the other interpreter is running
+    interpreter = PythonInterpreter(action_space=action_space,
+                                    max_memory=1 << 20)
+    assert interpreter.execute("1") == 1
+    assert tracemalloc.is_tracing()
+    release.set()
+    thread.join()
+    assert len(errors) == 1
+    assert "Exceeded the memory budget" in errors[0].args[0]
+    assert not tracemalloc.is_tracing()
+
+
+def test_profiler():
+    interpreter = PythonInterpreter(action_space={"action1": action_function},
+                                    profile=True)
+    interpreter.execute("""x = action1()
+for i in [1, 2, 3]:
+    y = action1()
+x.upper()""")
+    profiler = interpreter.profiler
+    assert profiler.node_stats["Call"][0] == 5
+    assert profiler.node_stats["For"][0] == 1
+    assert profiler.function_stats["action1"][0] == 4
+    assert profiler.function_stats["action1"][1] > 0
+    assert "x.upper" not in profiler.function_stats
+    report = profiler.report()
+    assert "action1" in report and "Assign" in report
+
+    profiler.reset()
+    assert len(profiler.node_stats) == 0
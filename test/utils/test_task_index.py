@@ -0,0 +1,75 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import pickle
+
+import pytest
+
+from camel.utils import TaskIndex
+
+
+def test_task_index_detects_near_duplicates():
+    index = TaskIndex()
+    assert index.add("Collect historical stock price data")
+    assert not index.add("Collect historical stock price data.")
+    assert not index.add("  collect Historical stock-price data")
+    assert index.find_duplicate("Collect the historical stock prices data"
+                                ) == ("Collect historical stock price data")
+    assert index.add("Backtest the trading strategy")
+    assert len(index) == 2
+
+
+def test_task_index_filter():
+    index = TaskIndex()
+    index.add("Research trading strategies")
+    assert index.filter([
+        "Research trading strategies!",
+        "Implement the order execution module",
+        "Implement the order-execution module",
+        "Set up a brokerage account",
+    ]) == [
+        "Implement the order execution module",
+        "Set up a brokerage account",
+    ]
+    assert index.tasks == [
+        "Research trading strategies",
+        "Implement the order execution module",
+        "Set up a brokerage account",
+    ]
+
+
+def test_task_index_with_embeddings():
+    synonyms = {"purchase": "buy", "equities": "stocks"}
+
+    def embed(task):
+        words = [synonyms.get(word, word) for word in task.lower().split()]
+        return [words.count(word) for word in ["buy", "sell", "stocks"]]
+
+    index = TaskIndex(embedding_fn=embed, embedding_threshold=0.99)
+    assert index.add("buy stocks")
+    assert not index.add("purchase equities")
+    assert index.add("sell stocks")
+    assert TaskIndex().add("buy stocks")
+
+
+def test_task_index_pickle():
+    index = TaskIndex()
+    index.add("Collect historical stock price data")
+    restored = pickle.loads(pickle.dumps(index))
+    assert not restored.add("collect historical stock price data")
+    assert restored.add("Backtest the trading strategy")
+
+
+def test_task_index_invalid_bands():
+    with pytest.raises(ValueError):
+        TaskIndex(num_perm=10, num_bands=3)
@@ -0,0 +1,99 @@
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+# Licensed under the Apache License, Version 2.0 (the “License”);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an “AS IS” BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =========== Copyright 2023 @ CAMEL-AI.org. All Rights Reserved. ===========
+import re
+from typing import Dict, List
+
+import pytest
+
+from camel.utils import TextChunker
+
+
+class WordEncoding:
+    r"""A tokenizer with one token per word, with its trailing spaces."""
+
+    def __init__(self) -> None:
+        self.vocab: Dict[str, int] = {}
+        self.words: List[str] = []
+
+    def encode(self, text: str) -> List[int]:
+        tokens = []
+        for word in re.findall(r"\S+\s*|\s+", text):
+            if word not in self.vocab:
+                self.vocab[word] = len(self.words)
+                self.words.append(word)
+            tokens.append(self.vocab[word])
+        return tokens
+
+    def decode(self, tokens: List[int]) -> str:
+        return "".join(self.words[token] for token in tokens)
+
+
+TEXT = ("The camel walks. It carries water! Does it drink?\n"
+        "A new paragraph starts here.\n"
+        "Then a very long sentence without any end that goes on and on")
+
+
+def test_text_chunker_splits_at_boundaries():
+    encoding = WordEncoding()
+    chunker = TextChunker(chunk_size=6, encoding=encoding)
+    chunks = chunker.chunk(TEXT)
+
+    assert "".join(chunks) == TEXT
+    assert chunks[:3] == [
+        "The camel walks. It carries water! ",
+        "Does it drink?\n",
+        "A new paragraph starts here.\n",
+    ]
+    for chunk in chunks:
+        assert len(encoding.encode(chunk)) <= 6
+
+
+def test_text_chunker_with_overlap():
+    encoding = WordEncoding()
+    chunker = TextChunker(chunk_size=6, overlap=3, encoding=encoding)
+    chunks = chunker.chunk(TEXT)
+
+    # The last segments of a chunk are repeated if they fit in the overlap
+    assert chunks[:3] == [
+        "The camel walks. It carries water! ",
+        "It carries water! Does it drink?\n",
+        "A new paragraph starts here.\n",
+    ]
+    # Long sentences are split at tokens, with overlapping windows
+    assert chunks[3:] == [
+        "Then a very long sentence without ",
+        "long sentence without any end that ",
+        "any end that goes on and ",
+        "goes on and on",
+    ]
+    for chunk in chunks:
+        assert len(encoding.encode(chunk)) <= 6
+
+
+def test_text_chunker_stream_matches_chunk():
+    chunker = TextChunker(chunk_size=6, encoding=WordEncoding())
+    pieces = [TEXT[i:i + 7] for i in range(0, len(TEXT), 7)]
+    assert list(chunker.chunk_stream(pieces)) == chunker.chunk(TEXT)
+
+    # Text without sentence boundaries is still chunked as it streams
+    chunks = list(chunker.chunk_stream("word " for _ in range(1000)))
+    assert "".join(chunks) == "word " * 1000
+    assert all(len(chunk.split()) <= 6 for chunk in chunks)
+
+
+def test_text_chunker_invalid_arguments():
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=0)
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=4, overlap=4)